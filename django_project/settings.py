@@ -91,6 +91,7 @@ MIDDLEWARE = [
     'the_gatehouse.middleware.SetLanguageMiddleware',
     'the_gatehouse.middleware.DailyUserVisitMiddleware',
     'the_gatehouse.middleware.RequestTimingMiddleware',
+    'the_gatehouse.middleware.TaskEnqueueCountMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
@@ -269,6 +270,11 @@ STATIC_URL = '/static/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# How the_forge's pdf_cache fingerprints renders: 'revision' (stored render
+# revisions, default), 'verify' (revisions cross-checked against the full
+# content fingerprint) or 'full' (content fingerprint only).
+FORGE_FINGERPRINT_MODE = config.get('FORGE_FINGERPRINT_MODE', 'revision')
+
 # Storage backends. In production, hash static filenames (e.g.
 # forge_editor.4f2a9c1b.js) so changing a file changes its URL and browsers are
 # forced to refetch — no more stale JS/CSS after a deploy. Requires
@@ -0,0 +1,118 @@
+"""Per-process LRU memo for sheet layout measurements.
+
+SheetLayoutEngine.measure_step_height / measure_content_box_height run for every
+step of the sheet on each compute_layout(), each real render's layout pass, and each
+layout_autogrow check after a step/action/track/box save — re-wrapping the same
+ReportLab paragraphs every time. Measurements are pure functions of their inputs,
+so they are memoized here, keyed by everything that feeds them:
+
+- the Paragraph markup — already resolved by format_step_markup, so it embeds the
+  inline-image set (each image's path and draw size);
+- the ParagraphStyle's attribute values (not its identity: every engine builds its
+  own style objects);
+- the available width(s), plus any layout-shape flags the caller passes.
+
+Only heights are cached, never Paragraph objects: wrap() state is mutated while
+drawing, so the real draw still wraps its own paragraphs. Image pixel sizes (read
+with PIL for inline images and cost icons) are memoized by (path, mtime).
+
+The memo lives in process memory — nothing to invalidate across deploys, and keys
+are content-derived, so an edit simply misses.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+MEMO_SIZE = 4096
+
+
+class LRUMemo:
+    """Small thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+measurements = LRUMemo()
+image_sizes = LRUMemo()
+
+
+def style_key(style):
+    """Hashable value of a ParagraphStyle's attributes (ignoring name/parent)."""
+    return tuple(sorted(
+        (name, repr(value)) for name, value in vars(style).items()
+        if name not in ('name', 'parent')
+    ))
+
+
+def width_key(width):
+    return round(float(width), 3)
+
+
+ParagraphHeights = namedtuple('ParagraphHeights', 'wrap_h true_h')
+
+
+def paragraph_heights(markup, style, width):
+    """(wrap() height, true_paragraph_height) of `markup` in `style` at `width`."""
+    def compute():
+        from reportlab.platypus import Paragraph
+        from .pdf_engine import true_paragraph_height
+
+        para = Paragraph(markup, style)
+        _, wrap_h = para.wrap(width, 9999)
+        probe = Paragraph(markup, style)
+        return ParagraphHeights(wrap_h, true_paragraph_height(probe, width))
+
+    return measurements.get_or_compute(('para', markup, style_key(style), width_key(width)), compute)
+
+
+def memoized(kind, key, compute):
+    """Memoize an arbitrary measurement under (kind, *key)."""
+    return measurements.get_or_compute((kind,) + tuple(key), compute)
+
+
+def image_size(path):
+    """(width, height) in pixels of the image at `path`, or None if it's missing."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    def compute():
+        from PIL import Image as PILImage
+        with PILImage.open(path) as img:
+            return img.size
+
+    return image_sizes.get_or_compute((path, mtime), compute)
+
+
+def clear():
+    measurements.clear()
+    image_sizes.clear()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from the_forge.pdf_cache import (
+    PDF_STORAGE_MAX_BYTES, cache_stats, evict_storage, reset_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = 'Show pdf_cache hit/miss counters and trim the storage tier'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-bytes', type=int, default=PDF_STORAGE_MAX_BYTES,
+                            help='Storage budget to evict down to (default PDF_STORAGE_MAX_BYTES)')
+        parser.add_argument('--reset-stats', action='store_true',
+                            help='Zero the hit/miss counters after reporting them')
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        lookups = stats['memory_hits'] + stats['storage_hits'] + stats['misses']
+        for event, value in stats.items():
+            share = f' ({value / lookups:.1%})' if lookups and event != 'evicted' else ''
+            self.stdout.write(f'{event}: {value}{share}')
+        if options['reset_stats']:
+            reset_cache_stats()
+
+        result = evict_storage(options['max_bytes'])
+        self.stdout.write(self.style.SUCCESS(
+            f"storage: {result['files']} files, {result['bytes'] / 1024 / 1024:.1f} MiB "
+            f"(evicted {result['evicted']} files, {result['evicted_bytes'] / 1024 / 1024:.1f} MiB)"))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from the_forge.models import ForgedFaction
+from the_forge.pdf_cache import cache_key, forget
+from the_forge.render_guard import render_slot
+from the_forge.services.combined_pdf import build_combined_pdf, combined_plan
+
+
+class Command(BaseCommand):
+    help = "Build a faction's combined PDF and print per-part render timings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('faction_pk', type=int)
+        parser.add_argument('--serial', action='store_true',
+                            help='Render parts one after another instead of in a process pool')
+        parser.add_argument('--cold', action='store_true',
+                            help='Drop the cached parts (both tiers) first so every part is rendered')
+
+    def handle(self, *args, **options):
+        faction = ForgedFaction.objects.filter(pk=options['faction_pk']).first()
+        if faction is None:
+            raise CommandError(f"No ForgedFaction with pk={options['faction_pk']}")
+        plan = combined_plan(faction)
+        if plan is None:
+            raise CommandError('Nothing to print: no front, back, components or cards.')
+
+        if options['cold']:
+            fps = plan['fingerprints']
+            for prefix, pk in (('sheet', plan['sheet'] and plan['sheet'].pk),
+                               ('back', plan['back'] and plan['back'].pk),
+                               ('components', faction.pk), ('cards', faction.pk)):
+                if pk:
+                    forget(cache_key(prefix, pk, fps[prefix]))
+
+        timings = {}
+        with render_slot():
+            pdf = build_combined_pdf(faction, plan, parallel=not options['serial'], timings=timings)
+
+        self.stdout.write(f"{faction.faction_name}: {len(pdf) / 1024:.0f} KiB, mode {timings.pop('mode')}")
+        total = timings.pop('total')
+        for part, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {part:<12} {seconds:7.3f}s' + ('  (cached)' if seconds == 0 else ''))
+        self.stdout.write(self.style.SUCCESS(f'  {"total":<12} {total:7.3f}s'))
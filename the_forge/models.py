@@ -136,6 +136,10 @@ class ForgedFaction(models.Model):
     relationship_marker = models.ImageField(upload_to=relationship_marker_upload_path, blank=True, null=True)
     markers_version = models.PositiveIntegerField(default=0)
     print_component_backs = models.BooleanField(default=False)
+    # Random token replaced whenever anything this faction prints outside the
+    # sheet changes; the pdf_cache fingerprint for back/card/components/cards.
+    # See services/render_revision.py.
+    render_revision = models.CharField(max_length=16, blank=True, default='')
 
 
     last_updated = models.DateTimeField(auto_now=True)
@@ -193,12 +197,13 @@ class ForgedFaction(models.Model):
         # If the primary color is legible on tan, the secondary color is no
         # longer surfaced in the editor — reset any boxes/piles still using it
         # so the saved choice doesn't drift from what the UI shows.
+        reset = 0
         if not new and not faction_secondary_in_use(self):
-            BorderedBox.objects.filter(
+            reset += BorderedBox.objects.filter(
                 step__sheet__faction=self,
                 element_color=ElementColor.SECONDARY,
             ).update(element_color=BorderedBox._meta.get_field('element_color').default)
-            CardPile.objects.filter(
+            reset += CardPile.objects.filter(
                 sheet__faction=self,
                 element_color=ElementColor.SECONDARY,
             ).update(element_color=CardPile._meta.get_field('element_color').default)
@@ -206,10 +211,13 @@ class ForgedFaction(models.Model):
         # the 'Faction' ink choice would be invisible. Reset any pile still
         # using it to the default.
         if not new and not faction_has_background(self):
-            CardPile.objects.filter(
+            reset += CardPile.objects.filter(
                 sheet__faction=self,
                 element_color=ElementColor.FACTION,
             ).update(element_color=CardPile._meta.get_field('element_color').default)
+        if reset:
+            from .services.render_revision import bump_faction_and_sheet
+            bump_faction_and_sheet(self.pk)
         if new and not clone_in_progress():
             from the_gatehouse.tasks import send_rich_discord_message_task
             from django.urls import reverse
@@ -265,6 +273,8 @@ class FactionSheet(models.Model):
     ability_bar_extra_h_pts = models.FloatField(default=0.0)
     decree_preview = models.ImageField(upload_to=decree_preview_upload_path, blank=True, null=True)
     decree_fingerprint = models.CharField(max_length=32, blank=True, default='')
+    # Same as ForgedFaction.render_revision, for the sheet and its whole subtree.
+    render_revision = models.CharField(max_length=16, blank=True, default='')
 
     last_updated = models.DateTimeField(auto_now=True)
     last_generated = models.DateTimeField(blank=True, null=True)
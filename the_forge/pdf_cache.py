@@ -1,10 +1,17 @@
 import hashlib
 import json
+import logging
+import os
 
+from django.conf import settings
 from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.forms.models import model_to_dict
 
+logger = logging.getLogger(__name__)
+
 
 CACHE_PREFIX = 'forge_pdf:v8'
 PDF_CACHE_TTL = 60 * 60 * 24
@@ -88,6 +95,47 @@ def _digest(payload):
     return hashlib.sha256(blob).hexdigest()[:16]
 
 
+# --------------------------------------------------------------------------- #
+# Fingerprints. By default they're derived from the stored render revisions
+# (services/render_revision.py): one single-column read of the owning
+# FactionSheet or ForgedFaction instead of serializing the whole tree. FORGE_FINGERPRINT_MODE
+# in settings selects:
+#   'revision' — revision only (default)
+#   'verify'   — revision, cross-checked against the full fingerprint; a revision
+#                whose content changed without a bump is logged and re-issued
+#   'full'     — the full content fingerprint (the old behaviour)
+# --------------------------------------------------------------------------- #
+
+FINGERPRINT_MODES = ('revision', 'verify', 'full')
+
+
+def _fingerprint_mode():
+    return getattr(settings, 'FORGE_FINGERPRINT_MODE', 'revision')
+
+
+def _revision_fingerprint(kind, model_name, pk, full):
+    """Fingerprint of `kind` from the render revision of the_forge.<model_name> `pk`
+    (`full` computes the content fingerprint, for the 'full' and 'verify' modes)."""
+    from .services.render_revision import _bump, current_revision
+
+    mode = _fingerprint_mode()
+    if mode == 'full':
+        return full()
+    revision = current_revision(model_name, pk)
+    fp = _digest({'kind': kind, 'pk': pk, 'revision': revision})
+    if mode == 'verify':
+        expected = full()
+        check_key = f'{CACHE_PREFIX}:revcheck:{kind}:{fp}'
+        if not cache.add(check_key, expected, timeout=PDF_CACHE_TTL):
+            seen = cache.get(check_key)
+            if seen is not None and seen != expected:
+                logger.warning('pdf_cache: %s changed under %s pk=%s revision %s without a bump',
+                               kind, model_name, pk, revision)
+                _bump(model_name, pk)
+                return _revision_fingerprint(kind, model_name, pk, full)
+    return fp
+
+
 def fingerprint_faction(faction):
     sheet = getattr(faction, 'faction_sheet', None)
     back = getattr(faction, 'faction_back', None)
@@ -100,11 +148,13 @@ def fingerprint_faction(faction):
 
 
 def fingerprint_sheet(sheet):
-    return _digest(_sheet_payload(sheet))
+    return _revision_fingerprint('sheet', 'FactionSheet', sheet.pk,
+                                 lambda: _digest(_sheet_payload(sheet)))
 
 
 def fingerprint_back(back):
-    return _digest(_back_payload(back))
+    return _revision_fingerprint('back', 'ForgedFaction', back.faction_id,
+                                 lambda: _digest(_back_payload(back)))
 
 
 def fingerprint_decree(sheet):
@@ -124,6 +174,11 @@ def fingerprint_decree(sheet):
 
 
 def fingerprint_setup_card(card):
+    return _revision_fingerprint('setup_card', 'ForgedFaction', card.faction_id,
+                                 lambda: _setup_card_digest(card))
+
+
+def _setup_card_digest(card):
     return _digest({
         'faction': _faction_payload_for_render(card.faction),
         'card': _serialize_instance(card),
@@ -132,12 +187,17 @@ def fingerprint_setup_card(card):
 
 
 def fingerprint_components_sheet(faction):
+    return _revision_fingerprint('components', 'ForgedFaction', faction.pk,
+                                 lambda: _components_sheet_digest(faction))
+
+
+def _components_sheet_digest(faction):
     card = getattr(faction, 'setup_card', None)
     pieces = []
     for p in faction.pieces.filter(type__in=('B', 'T')).order_by('type', 'pk'):
         pieces.append((p.pk, p.front_version, p.back_version, p.quantity, p.type))
     return _digest({
-        'card_fp': fingerprint_setup_card(card) if card else '',
+        'card_fp': _setup_card_digest(card) if card else '',
         'markers_version': faction.markers_version,
         'vp_marker': faction.vp_marker.name if faction.vp_marker else '',
         'rel_marker': faction.relationship_marker.name if faction.relationship_marker else '',
@@ -147,6 +207,10 @@ def fingerprint_components_sheet(faction):
 
 
 def fingerprint_cards(faction):
+    return _revision_fingerprint('cards', 'ForgedFaction', faction.pk, lambda: _cards_digest(faction))
+
+
+def _cards_digest(faction):
     """Fingerprint every ForgedCard belonging to card-type Pieces on this
     faction. Includes file mtime so re-uploading an image (which may keep the
     same path on overwrite) still busts the cache."""
@@ -241,16 +305,189 @@ def cache_key(prefix, pk, fingerprint):
     return f'{CACHE_PREFIX}:{prefix}:{pk}:{fingerprint}'
 
 
+# --------------------------------------------------------------------------- #
+# Two tiers: the Django cache (Redis) in front of fingerprint-addressed files in
+# default storage (MEDIA_ROOT). Keys are content hashes, so a stored file never
+# goes stale; it only stops being asked for. The file tier survives Redis
+# evictions, flushes and deploys, and is trimmed least-recently-used first by
+# evict_storage (run periodically by the evict_pdf_storage task).
+# --------------------------------------------------------------------------- #
+
+PDF_STORAGE_DIR = 'forge_pdf_cache'
+PDF_STORAGE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+STATS_PREFIX = f'{CACHE_PREFIX}:stats'
+STATS_EVENTS = ('memory_hits', 'storage_hits', 'misses', 'evicted')
+
+
+def _storage_name(key):
+    # forge_pdf:v8:sheet:12:<fp> -> forge_pdf_cache/v8/sheet/12/<fp>.pdf
+    return f"{PDF_STORAGE_DIR}/{'/'.join(key.split(':')[1:])}.pdf"
+
+
+def _local_path(name):
+    """Filesystem path for a storage name, or None for remote backends."""
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def _count(event, amount=1):
+    key = f'{STATS_PREFIX}:{event}'
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.add(key, amount, timeout=None)
+    except Exception:
+        pass
+
+
+def _touch(name):
+    """Mark a stored file as just used (the LRU clock). False if it's missing.
+
+    Only local storage can be touched; remote backends report True and age by
+    write time instead."""
+    path = _local_path(name)
+    if path is None:
+        return True
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return True
+
+
+def _storage_read(name):
+    try:
+        with default_storage.open(name, 'rb') as fh:
+            data = fh.read()
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning('pdf_cache: reading %s failed', name, exc_info=True)
+        return None
+    _touch(name)
+    return data
+
+
+def _storage_write(name, data):
+    """Write bytes under `name`, replacing atomically on local storage so a
+    concurrent reader never sees a partial PDF."""
+    try:
+        path = _local_path(name)
+        if path is None:
+            if not default_storage.exists(name):
+                default_storage.save(name, ContentFile(data))
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        logger.warning('pdf_cache: writing %s failed', name, exc_info=True)
+
+
+def get_cached(key):
+    """PDF bytes for `key` from the cache, then from storage, or None.
+
+    A storage hit is copied back into the cache. A cache hit also refreshes the
+    stored file's LRU time (and writes it if it predates the storage tier), so
+    PDFs that stay hot in Redis aren't the ones evicted from disk."""
+    name = _storage_name(key)
+    data = cache.get(key)
+    if data is not None:
+        _count('memory_hits')
+        if not _touch(name):
+            _storage_write(name, data)
+        return data
+    data = _storage_read(name)
+    if data is not None:
+        _count('storage_hits')
+        if len(data) <= PDF_CACHE_MAX_BYTES:
+            cache.set(key, data, timeout=PDF_CACHE_TTL)
+    return data
+
+
+def store(key, data):
+    """Save freshly rendered bytes to both tiers (the cache only under its size cap)."""
+    if len(data) <= PDF_CACHE_MAX_BYTES:
+        cache.set(key, data, timeout=PDF_CACHE_TTL)
+    _storage_write(_storage_name(key), data)
+
+
+def forget(key):
+    """Drop `key` from both tiers (forces the next request to re-render)."""
+    cache.delete(key)
+    try:
+        default_storage.delete(_storage_name(key))
+    except Exception:
+        logger.warning('pdf_cache: deleting %s failed', key, exc_info=True)
+
+
 def get_or_build(key, builder):
-    cached = cache.get(key)
+    cached = get_cached(key)
     if cached is not None:
         return cached
+    _count('misses')
     data = builder()
-    if len(data) <= PDF_CACHE_MAX_BYTES:
-        cache.set(key, data, timeout=PDF_CACHE_TTL)
+    store(key, data)
     return data
 
 
+def _stored_files(directory=PDF_STORAGE_DIR):
+    """(modified_time, size, name) for every file under the storage tier."""
+    try:
+        dirs, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        name = f'{directory}/{filename}'
+        try:
+            yield default_storage.get_modified_time(name), default_storage.size(name), name
+        except (FileNotFoundError, NotImplementedError):
+            continue
+    for sub in dirs:
+        yield from _stored_files(f'{directory}/{sub}')
+
+
+def evict_storage(max_bytes=PDF_STORAGE_MAX_BYTES):
+    """Delete least-recently-used stored PDFs until the tier fits in `max_bytes`.
+
+    Returns {'files', 'bytes', 'evicted', 'evicted_bytes'} (after eviction)."""
+    entries = sorted(_stored_files())
+    total = sum(size for _, size, _ in entries)
+    evicted = evicted_bytes = 0
+    for _, size, name in entries:
+        if total <= max_bytes:
+            break
+        try:
+            default_storage.delete(name)
+        except Exception:
+            logger.warning('pdf_cache: evicting %s failed', name, exc_info=True)
+            continue
+        total -= size
+        evicted += 1
+        evicted_bytes += size
+    if evicted:
+        _count('evicted', evicted)
+    return {'files': len(entries) - evicted, 'bytes': total,
+            'evicted': evicted, 'evicted_bytes': evicted_bytes}
+
+
+def cache_stats():
+    """Hit/miss/eviction counters since they were last reset (or Redis was flushed)."""
+    keys = {f'{STATS_PREFIX}:{event}': event for event in STATS_EVENTS}
+    found = cache.get_many(list(keys))
+    return {event: int(found.get(key) or 0) for key, event in keys.items()}
+
+
+def reset_cache_stats():
+    cache.delete_many([f'{STATS_PREFIX}:{event}' for event in STATS_EVENTS])
+
+
 # Alias for get_or_build used on the gated render path. The concurrency slot is
 # owned by the *view* (see the_forge/render_guard.render_slot), not by this
 # function, so a cache hit here never touches the gate. Kept as a distinct name so
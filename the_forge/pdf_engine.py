@@ -25,6 +25,7 @@ from reportlab.graphics import renderPDF
 from svglib.svglib import svg2rlg
 from itertools import groupby
 from django.templatetags.static import static
+from .layout_memo import image_size, memoized, paragraph_heights, style_key, width_key
 
 FONT_DIR = os.path.join(os.path.dirname(__file__), '..', 'the_keep', 'static', 'fonts')
 pdfmetrics.registerFont(TTFont('Luminari', os.path.join(FONT_DIR, 'Luminari_edit.ttf')))
@@ -1129,9 +1130,7 @@ def _inline_image_tag(key, img_height=None, sheet=None):
     if not img_path or not os.path.exists(img_path):
         return ''
     h = img_height or INLINE_IMG_H
-    from PIL import Image as PILImage
-    with PILImage.open(img_path) as pil_img:
-        iw, ih = pil_img.size
+    iw, ih = image_size(img_path)
     aspect = iw / ih
     img_w = h * aspect
     return f'<img src="{img_path}" width="{img_w:.1f}" height="{h}" valign="middle"/>'
@@ -3232,11 +3231,15 @@ class SheetLayoutEngine:
         self.collected_snap_points = []
         from the_forge.models import CardboardTrack, FactionSheet, PhaseStep, StepAction
         from django.db.models import Prefetch
+        # Steps are measured many times per layout (once per candidate width),
+        # so every child the measurement reads is prefetched up front.
+        step_children = (
+            Prefetch('actions', queryset=StepAction.objects.order_by('order')),
+            Prefetch('tracks', queryset=CardboardTrack.objects.prefetch_related('slots').order_by('order')),
+            'boxes', 'legends__rows', 'scales__rows',
+        )
         if isinstance(faction_sheet, FactionSheet):
-            all_steps = list(faction_sheet.phase_steps.prefetch_related(
-                Prefetch('actions', queryset=StepAction.objects.order_by('order')),
-                Prefetch('tracks', queryset=CardboardTrack.objects.prefetch_related('slots').order_by('order')),
-            ).all())
+            all_steps = list(faction_sheet.phase_steps.prefetch_related(*step_children).all())
         else:
             all_steps = list(faction_sheet.phase_steps.all())
         self.steps = [s for s in all_steps if s.phase != 'other']
@@ -3250,9 +3253,7 @@ class SheetLayoutEngine:
             faction_sheet.content_boxes.prefetch_related(
                 Prefetch('steps',
                     queryset=PhaseStep.objects.filter(phase='other').prefetch_related(
-                        Prefetch('actions', queryset=StepAction.objects.order_by('order')),
-                        Prefetch('tracks', queryset=CardboardTrack.objects.prefetch_related('slots').order_by('order')),
-                        'boxes',
+                        *step_children
                     ).order_by('number')
                 )
             ).order_by('order')
@@ -3551,8 +3552,6 @@ class SheetLayoutEngine:
         Returns (icon_path, icon_drawing, draw_w, draw_h). At most one of
         icon_path / icon_drawing is non-None. Returns (None, None, 0, 0) if no icon.
         """
-        from PIL import Image as PILImage
-
         cost = action.cost
         if cost == 'other':
             icon_path = action.cost_image.path if action.cost_image else None
@@ -3569,11 +3568,10 @@ class SheetLayoutEngine:
         else:
             icon_path = _cost_icon_path(cost)
 
-        if not icon_path or not os.path.exists(icon_path):
+        size = image_size(icon_path) if icon_path else None
+        if not size:
             return None, None, 0, 0
-
-        with PILImage.open(icon_path) as pil_img:
-            iw, ih = pil_img.size
+        iw, ih = size
         aspect = iw / ih
 
         if cost.startswith('item_'):
@@ -3763,7 +3761,8 @@ class SheetLayoutEngine:
 
         if not hasattr(step, 'actions'):
             return []
-        actions = step.actions.order_by('order') if hasattr(step.actions, 'order_by') else list(step.actions.all())
+        # Prefetched in order by the engine (Meta ordering otherwise).
+        actions = list(step.actions.all())
         if not actions:
             return []
 
@@ -3898,13 +3897,11 @@ class SheetLayoutEngine:
         Does NOT include box padding — that is handled by the Frame's topPadding/bottomPadding."""
         total = 0
         if content_box.title:
-            p = Paragraph(content_box.title, self.content_box_title_style)
-            _, h = p.wrap(width, 9999)
+            h = paragraph_heights(content_box.title, self.content_box_title_style, width).wrap_h
             total += h + self.content_box_title_style.spaceAfter
         if content_box.text:
             markup = format_step_markup(content_box.text, sheet=self.sheet)
-            p = Paragraph(markup, self.content_box_text_style)
-            _, h = p.wrap(width, 9999)
+            h = paragraph_heights(markup, self.content_box_text_style, width).wrap_h
             total += h + self.content_box_text_style.spaceAfter
         steps = list(content_box.steps.all())
         single_step = len(steps) == 1
@@ -4182,26 +4179,18 @@ class SheetLayoutEngine:
             return 0
         return max_needed + (PHASE_INTERNAL_MARGIN * 2)
 
-    def measure_step_height(self, step, width, single_step=False, body_style=None, phase_indent=0):
+    def _measure_step_text(self, markup, style, width, text_col_w, text_content_w,
+                           single_step, single_indent, svg_drawing):
+        """Height of a step's text block, built exactly as _build_phase_story does."""
         from reportlab.platypus import Table, TableStyle
         ICON_COL_W = 0.325 * inch
         ICON_TEXT_GAP = 0.015 * inch
         TEXT_COL_X = ICON_COL_W + ICON_TEXT_GAP
         ICON_NUDGE_DOWN = 4
 
-        style = body_style or self.step_body_style
-        # Content-box single-step (signalled by content_box_text_style) keeps its
-        # centered, zero-indent layout; phase single-step uses phase_indent.
-        is_centered_content_box = (style is self.content_box_text_style)
-        single_indent = phase_indent if (single_step and not is_centered_content_box) else 0
-        text_col_w = single_indent if single_step else TEXT_COL_X
-        text_content_w = width - text_col_w
-        markup = format_step_markup(step.text, sheet=self.sheet)
-
         # Extra padding to compensate for autoLeading underreporting (matches _build_phase_story)
-        probe = Paragraph(markup, style)
-        _, wrap_h = probe.wrap(text_content_w, 9999)
-        extra_h = true_paragraph_height(probe, text_content_w) - wrap_h
+        heights = paragraph_heights(markup, style, text_content_w)
+        extra_h = heights.true_h - heights.wrap_h
 
         # Build table matching _build_phase_story exactly
         para = Paragraph(markup, style)
@@ -4224,7 +4213,6 @@ class SheetLayoutEngine:
             if first_line_has_inline_icon_only_base_font(para):
                 table_h += SINGLE_STEP_INLINE_ICON_PAD_TOP
         else:
-            svg_drawing = self._phase_number_svgs.get(step.number % 10)
             first_col = svg_drawing if svg_drawing else ''
             t = Table([[first_col, para]], colWidths=[text_col_w, text_content_w])
             t.setStyle(TableStyle([
@@ -4238,12 +4226,65 @@ class SheetLayoutEngine:
                 ('BOTTOMPADDING', (0, 0), (-1, -1), extra_h),
             ]))
             _, table_h = t.wrap(width, 9999)
+        return table_h
+
+    @staticmethod
+    def _step_actions(step):
+        if not hasattr(step, 'actions'):
+            return []
+        return list(step.actions.all())
+
+    def _actions_signature(self, actions):
+        """Everything about a step's actions that affects their row layout:
+        resolved text markup, cost type and the cost icon's draw size."""
+        signature = []
+        for action in sorted(actions, key=lambda a: a.order):
+            icon_path, icon_drawing, icon_w, icon_h = self._resolve_cost_icon(action)
+            signature.append((
+                format_step_markup(action.text, sheet=_sheet_of(action)),
+                action.cost, icon_path, round(icon_w, 3), round(icon_h, 3),
+            ))
+        return tuple(signature)
+
+    def _measure_action_rows(self, step, width, text_col_w):
+        """Total height of a step's action rows, by wrapping the same flowables
+        _build_steps_story appends to the story, so the measured height matches
+        what the build path actually consumes."""
+        total = 0
+        for fl in self._build_action_flowables(step, width, text_col_w):
+            _, fh = fl.wrap(width, 9999)
+            total += fh
+        return total
+
+    def measure_step_height(self, step, width, single_step=False, body_style=None, phase_indent=0):
+        """Height of one step as _build_steps_story lays it out: text block,
+        action rows, then boxes/tracks/legends/scales.
+
+        The text block and action rows are memoized per process (layout_memo),
+        keyed by their markup, style and widths, so re-measuring a sheet after
+        one step changes only re-wraps that step."""
+        ICON_COL_W = 0.325 * inch
+        ICON_TEXT_GAP = 0.015 * inch
+        TEXT_COL_X = ICON_COL_W + ICON_TEXT_GAP
+
+        style = body_style or self.step_body_style
+        # Content-box single-step (signalled by content_box_text_style) keeps its
+        # centered, zero-indent layout; phase single-step uses phase_indent.
+        is_centered_content_box = (style is self.content_box_text_style)
+        single_indent = phase_indent if (single_step and not is_centered_content_box) else 0
+        text_col_w = single_indent if single_step else TEXT_COL_X
+        text_content_w = width - text_col_w
+        markup = format_step_markup(step.text, sheet=self.sheet)
+        svg_drawing = None if single_step else self._phase_number_svgs.get(step.number % 10)
+
+        table_h = memoized('step_text', (
+            markup, style_key(style), width_key(width), width_key(text_col_w), single_step,
+            (svg_drawing.width, svg_drawing.height) if svg_drawing else None,
+        ), lambda: self._measure_step_text(
+            markup, style, width, text_col_w, text_content_w, single_step, single_indent, svg_drawing))
 
-        # Add height for StepAction rows by wrapping the same flowables that
-        # _build_steps_story will append to the story. This guarantees the
-        # measured height matches what the build path actually consumes.
-        action_flowables = self._build_action_flowables(step, width, text_col_w)
-        if action_flowables:
+        actions = self._step_actions(step)
+        if actions:
             # When actions follow the step-text paragraph in single_step mode,
             # _build_steps_story appends `para` directly so the Frame consumes
             # the paragraph style's spaceAfter as a gap before the first action.
@@ -4251,9 +4292,10 @@ class SheetLayoutEngine:
             # is absorbed and we don't need to count it.)
             if single_step:
                 table_h += style.spaceAfter
-            for fl in action_flowables:
-                _, fh = fl.wrap(width, 9999)
-                table_h += fh
+            table_h += memoized('step_actions', (
+                self._actions_signature(actions), style_key(self.action_body_style),
+                width_key(width), width_key(text_col_w), bool(step.content_box_id),
+            ), lambda: self._measure_action_rows(step, width, text_col_w))
 
         # Add bordered box + track heights, iterated in the user's intermixed
         # order from the editor (boxes and tracks share an `order` sequence).
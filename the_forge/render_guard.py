@@ -110,6 +110,39 @@ def render_slot(slots=RENDER_SLOTS, ttl=RENDER_SLOT_TTL):
         gc.collect()
 
 
+@contextlib.contextmanager
+def extra_render_slots(wanted, slots=RENDER_SLOTS, ttl=RENDER_SLOT_TTL):
+    """Grab up to `wanted` *additional* free slots without waiting; yield the count.
+
+    For builds that can fan out across processes (the combined PDF): each extra
+    process must hold its own slot, so parallelism never exceeds the same memory
+    budget as `render_slot()`. Yields 0 when Redis is unavailable — unlike
+    `render_slot()` this does not fail open, since the caller can always run
+    serially inside the slot it already holds.
+    """
+    token = uuid.uuid4().hex
+    acquired = []
+    try:
+        r = _redis()
+        for i in range(slots):
+            if len(acquired) >= wanted:
+                break
+            key = f"forge:render:slot:{i}"
+            if r.set(key, token, nx=True, ex=ttl):
+                acquired.append(key)
+    except Exception:
+        logger.warning("extra_render_slots: Redis unavailable, no extra slots", exc_info=True)
+
+    try:
+        yield len(acquired)
+    finally:
+        for key in acquired:
+            try:
+                r.eval(_RELEASE_LUA, 1, key, token)
+            except Exception:
+                logger.warning("extra_render_slots: failed to release %s", key, exc_info=True)
+
+
 def guarded_render(view):
     """Decorator for simple single-build render views: run the view inside one
     render slot and translate RenderBusy into a 503.
@@ -26,6 +26,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 
 from .clone_flag import cloning
+from .render_revision import bump_faction
 from .upload_paths import copy_image_field
 
 
@@ -41,6 +42,7 @@ EXCLUDE_FIELDS = {
     # Sync/regeneration bookkeeping and generated artifacts.
     'icon_synced_name', 'last_generated',
     'preview_fingerprint', 'preview_version', 'decree_fingerprint', 'sprite_hash',
+    'render_revision',
     # slug: root gets one from the create signal; ForgedDeckGroup regenerates its
     # own in save(). Never copy the source value (unique on ForgedFaction).
     'slug',
@@ -197,10 +199,13 @@ def clone_forged_faction(source, *, new_name=None):
         for new in _dedupe(touched):
             new.save()
 
-        # Pass 4: restore scalars that save()/signals recomputed.
+        # Pass 4: restore scalars that save()/signals recomputed. These are
+        # card/piece fields, so the copy's faction render revision moves too.
         _reconcile_scalars(old_nodes, memo)
+        new_root = memo[(source.__class__, source.pk)]
+        bump_faction(new_root.pk)
 
-        return memo[(source.__class__, source.pk)]
+        return new_root
 
 
 def _save_parents_first(old_nodes, memo):
@@ -0,0 +1,283 @@
+"""Combined ("Download All") PDF for a ForgedFaction, built off the request path.
+
+The combined build rasterizes several full pages (sheet, back, setup card,
+components, cards) and used to run synchronously inside forgedfaction_pdf under a
+render slot, so a busy box answered with a 503. Now:
+
+- `combined_plan(faction)` fingerprints every part (cheap DB reads, no render) and
+  derives one cache key for the whole document.
+- The view serves that key straight from the cache on a hit. On a miss it starts
+  (or joins) one `render_combined_pdf_task` per key and hands back a job id to poll.
+- The task holds the render slot on the *worker*, retrying while every slot is busy,
+  so bursts queue instead of failing and web workers never hold raster memory.
+- Uncached parts render concurrently in forked processes when spare render slots
+  allow, and per-part timings are logged by the task.
+"""
+import logging
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.core.cache import cache
+
+from the_forge.pdf_cache import (
+    PDF_CACHE_MAX_BYTES, _count, _digest, cache_key, fingerprint_back, fingerprint_cards,
+    fingerprint_components_sheet, fingerprint_setup_card, fingerprint_sheet,
+    get_cached, render_pdf, store,
+)
+from the_forge.services.previews import maybe_save_image_preview
+from the_forge.tasks import RENDER_MAX_RETRIES, RENDER_RETRY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# A combined PDF above PDF_CACHE_MAX_BYTES only goes to the storage tier; it also
+# sits in the cache this long in case that write failed, so the poller can collect it.
+HANDOFF_TTL = 60 * 10
+# Longest a combined render is expected to take once it holds a slot.
+RENDER_TIME_LIMIT = 60 * 5
+# How long a queued/running job id is remembered for joining duplicate requests:
+# the task's whole wait for a render slot plus the render, so a job still waiting
+# keeps its key. It's also how long the pollers wait for a job before giving up.
+JOB_TTL = RENDER_MAX_RETRIES * RENDER_RETRY_SECONDS + RENDER_TIME_LIMIT
+
+
+def combined_plan(faction):
+    """Parts of the combined PDF with their fingerprints, plus the document key.
+
+    Returns a dict with sheet/back/card (or None), has_components, cards_engine
+    (or None) and `key`, or None when the faction has nothing to print yet."""
+    from the_forge.pdf_engine import ForgedCardsLayoutEngine
+
+    sheet = getattr(faction, 'faction_sheet', None)
+    back = getattr(faction, 'faction_back', None)
+    card = getattr(faction, 'setup_card', None)
+    has_components = bool(
+        card or faction.vp_marker or faction.relationship_marker
+        or faction.pieces.filter(type__in=('B', 'T')).exists()
+    )
+    cards_engine = ForgedCardsLayoutEngine(faction)
+    if not cards_engine.has_cards():
+        cards_engine = None
+    if not (sheet or back or has_components or cards_engine):
+        return None
+
+    fingerprints = {
+        'sheet': fingerprint_sheet(sheet) if sheet else '',
+        'back': fingerprint_back(back) if back else '',
+        'card': fingerprint_setup_card(card) if card else '',
+        'components': fingerprint_components_sheet(faction) if has_components else '',
+        'cards': fingerprint_cards(faction) if cards_engine else '',
+    }
+    return {
+        'sheet': sheet, 'back': back, 'card': card,
+        'has_components': has_components, 'cards_engine': cards_engine,
+        'fingerprints': fingerprints,
+        'key': cache_key('combined', faction.pk, _digest(fingerprints)),
+    }
+
+
+def job_key(key):
+    return f'{key}:job'
+
+
+def _build_part(part, faction_pk, card_preview_path=None):
+    """Render one uncached part of the combined PDF to bytes (no cache access).
+
+    Top-level and keyed by primary key so it can run in a forked pool worker."""
+    from the_forge.models import ForgedFaction
+    from the_forge.pdf_engine import (
+        ComponentsSheetLayoutEngine, FactionBackLayoutEngine, ForgedCardsLayoutEngine,
+        SheetLayoutEngine,
+    )
+
+    faction = ForgedFaction.objects.get(pk=faction_pk)
+    if part == 'sheet':
+        engine = SheetLayoutEngine(faction.faction_sheet)
+    elif part == 'back':
+        engine = FactionBackLayoutEngine(faction.faction_back)
+    elif part == 'components':
+        engine = ComponentsSheetLayoutEngine(faction, card_preview_path=card_preview_path)
+    else:
+        engine = ForgedCardsLayoutEngine(faction)
+    buf = BytesIO()
+    try:
+        engine.build(buf)
+        return buf.getvalue()
+    finally:
+        buf.close()
+
+
+def _timed_build_part(part, faction_pk, card_preview_path=None):
+    started = time.perf_counter()
+    data = _build_part(part, faction_pk, card_preview_path)
+    return part, data, time.perf_counter() - started
+
+
+def _render_missing(faction, missing, card_preview_path, parallel):
+    """{part: (bytes, seconds)} for the uncached parts, the mode used, and why a
+    parallel build fell back to serial (None when it didn't).
+
+    With `parallel`, up to len(missing) parts build at once in forked processes,
+    one per render slot this worker can claim on top of the one it already holds
+    (render_guard.extra_render_slots) — the slot pool is the memory budget. Falls
+    back to building serially in-process when no extra slot is free, a transaction
+    is open (children wouldn't see its rows), this is a daemonic process (which may
+    not fork children, e.g. a prefork Celery worker) or the pool fails to start."""
+    from django.db import connection, connections
+    from the_forge.render_guard import extra_render_slots
+
+    results = {}
+    fallback = None
+    if parallel and len(missing) > 1:
+        if connection.in_atomic_block:
+            fallback = 'open transaction'
+        elif multiprocessing.current_process().daemon:
+            fallback = 'daemonic process'
+        else:
+            with extra_render_slots(len(missing) - 1) as extra:
+                if not extra:
+                    fallback = 'no spare render slot'
+                else:
+                    try:
+                        # Children must open their own DB connections, not share ours.
+                        connections.close_all()
+                        context = multiprocessing.get_context('fork')
+                        with ProcessPoolExecutor(max_workers=extra + 1, mp_context=context) as pool:
+                            futures = [pool.submit(_timed_build_part, part, faction.pk, card_preview_path)
+                                       for part in missing]
+                            for future in futures:
+                                part, data, seconds = future.result()
+                                results[part] = (data, seconds)
+                        return results, f'parallel:{extra + 1}', None
+                    except Exception:
+                        logger.warning('combined PDF: process pool failed, rendering serially', exc_info=True)
+                        fallback = 'process pool failed'
+                        results = {}
+    for part in missing:
+        _, data, seconds = _timed_build_part(part, faction.pk, card_preview_path)
+        results[part] = (data, seconds)
+    return results, 'serial', fallback
+
+
+def merge_pdf_parts(parts):
+    """Concatenate already-rendered PDFs, in order.
+
+    Appends each part's page tree wholesale (no outline import, no per-page
+    add/transform pass) — the parts are fresh single-purpose documents."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for data in parts:
+        writer.append(BytesIO(data), import_outline=False)
+    out = BytesIO()
+    try:
+        writer.write(out)
+        return out.getvalue()
+    finally:
+        out.close()
+
+
+def build_combined_pdf(faction, plan, parallel=True, timings=None):
+    """Render every uncached part and merge them into one PDF.
+
+    Parts come from the pdf_cache (cache, then storage) first; only misses are rendered, concurrently
+    when `parallel` and render slots allow (see _render_missing). Refreshes stale
+    sheet/back/setup-card previews as a side effect, like the old synchronous view.
+    Call inside a held render slot. Pass a dict as `timings` to collect per-part
+    seconds (0.0 = cache hit), the merge time, the render mode and, when a parallel
+    build ran serially, the reason (`fallback`)."""
+    from the_forge.pdf_engine import SetupCardLayoutEngine
+
+    fps = plan['fingerprints']
+    sheet, back, card = plan['sheet'], plan['back'], plan['card']
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+
+    # Combined PDF reads sheet -> back -> components -> cards.
+    order = [name for name, present in (
+        ('sheet', sheet), ('back', back),
+        ('components', plan['has_components']), ('cards', plan['cards_engine']),
+    ) if present]
+    keys = {
+        'sheet': cache_key('sheet', sheet.pk, fps['sheet']) if sheet else None,
+        'back': cache_key('back', back.pk, fps['back']) if back else None,
+        'components': cache_key('components', faction.pk, fps['components']),
+        'cards': cache_key('cards', faction.pk, fps['cards']),
+    }
+
+    card_preview_path = None
+    if plan['has_components'] and card:
+        # The components page embeds the SetupCard preview, so refresh it first
+        # if its fingerprint is stale (also updates the detail-page thumbnail).
+        if card.preview_fingerprint != fps['card'] or not card.image_preview:
+            card_started = time.perf_counter()
+            card_pdf = render_pdf(SetupCardLayoutEngine, card,
+                                  cache_key('setup_card', card.pk, fps['card']))
+            maybe_save_image_preview(card, card_pdf, fps['card'], 'card')
+            timings['setup_card'] = time.perf_counter() - card_started
+        if card.image_preview:
+            card_preview_path = card.image_preview.path
+
+    data = {name: get_cached(keys[name]) for name in order}
+    missing = [name for name in order if data[name] is None]
+    if missing:
+        _count('misses', len(missing))
+    rendered, timings['mode'], fallback = _render_missing(faction, missing, card_preview_path, parallel)
+    if fallback:
+        timings['fallback'] = fallback
+    for name in order:
+        if name in rendered:
+            data[name], timings[name] = rendered[name]
+            store(keys[name], data[name])
+        else:
+            timings[name] = 0.0
+
+    if sheet:
+        maybe_save_image_preview(sheet, data['sheet'], fps['sheet'], 'sheet')
+    if back:
+        maybe_save_image_preview(back, data['back'], fps['back'], 'back')
+
+    merge_started = time.perf_counter()
+    pdf = merge_pdf_parts([data[name] for name in order])
+    timings['merge'] = time.perf_counter() - merge_started
+    timings['total'] = time.perf_counter() - started
+    return pdf
+
+
+def render_combined_pdf(faction, timings=None):
+    """Build the combined PDF and store it under its plan key. Returns the key, or
+    None when there is nothing to print."""
+    plan = combined_plan(faction)
+    if plan is None:
+        return None
+    if get_cached(plan['key']) is None:
+        data = build_combined_pdf(faction, plan, timings=timings)
+        store(plan['key'], data)
+        if len(data) > PDF_CACHE_MAX_BYTES:
+            cache.set(plan['key'], data, timeout=HANDOFF_TTL)
+    return plan['key']
+
+
+def start_combined_job(faction, plan):
+    """Task id of the job building `plan`'s key, starting one if none is running.
+
+    The job key is claimed with cache.add before the task is queued, so concurrent
+    misses join one job instead of each queueing their own."""
+    from the_forge.tasks import render_combined_pdf_task
+
+    key = job_key(plan['key'])
+    task_id = uuid.uuid4().hex
+    if cache.add(key, task_id, timeout=JOB_TTL):
+        render_combined_pdf_task.apply_async(args=[faction.pk], kwargs={'key': plan['key']},
+                                             task_id=task_id)
+        return task_id
+    return cache.get(key) or start_combined_job(faction, plan)
+
+
+def release_combined_job(key, task_id):
+    """Forget the job building `key` if it's still `task_id`, so the next download
+    starts a fresh one instead of joining a finished or failed job."""
+    if cache.get(job_key(key)) == task_id:
+        cache.delete(job_key(key))
@@ -0,0 +1,26 @@
+def maybe_save_image_preview(instance, pdf_bytes, fingerprint, field_prefix):
+    """Rasterize `pdf_bytes` into instance.image_preview unless it's already current.
+
+    Shared by the request-path renders and the async combined-PDF task."""
+    if instance.preview_fingerprint == fingerprint and instance.image_preview:
+        return
+    from django.core.files.base import ContentFile
+    from django.utils import timezone
+    from the_forge.pdf_engine import pdf_bytes_to_webp_bytes, PREVIEW_DPI, CARD_PREVIEW_DPI
+    # SetupCard previews are also embedded in the printable Components sheet,
+    # so render them at higher DPI for crisp print output. These must match the
+    # target_dpi passed into build() in the _ensure_*_preview helpers so the
+    # pre-scaled art and the rasterization DPI stay in sync.
+    dpi = CARD_PREVIEW_DPI if field_prefix == 'card' else PREVIEW_DPI
+    try:
+        webp = pdf_bytes_to_webp_bytes(pdf_bytes, dpi=dpi)
+    except Exception:
+        return
+    if instance.image_preview:
+        instance.image_preview.delete(save=False)
+    filename = f'{field_prefix}_{instance.pk}.webp'
+    instance.image_preview.save(filename, ContentFile(webp), save=False)
+    instance.preview_fingerprint = fingerprint
+    instance.last_generated = timezone.now()
+    instance.preview_version = (instance.preview_version or 0) + 1
+    instance.save(update_fields=['image_preview', 'preview_fingerprint', 'last_generated', 'preview_version'])
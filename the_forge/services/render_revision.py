@@ -0,0 +1,64 @@
+"""Stored render revisions for ForgedFaction and FactionSheet.
+
+pdf_cache used to fingerprint by serializing the whole sheet tree (or stat-ing every
+card image) on every PDF/preview request, just to find the cache key. Instead each of
+these two models carries `render_revision`, a random token that is replaced whenever
+something feeding its renders changes:
+
+- FactionSheet.render_revision: the sheet and everything under it (abilities, content
+  boxes, phase steps and their children, decrees/card slots, piles, images), plus the
+  ForgedFaction fields the sheet draws (pdf_cache._FACTION_RENDER_FIELDS).
+- ForgedFaction.render_revision: everything else the faction prints — those same
+  faction fields, the markers, FactionBack, SetupCard, SetupSteps, Pieces, deck groups
+  and cards.
+
+Tokens are random rather than counters so a restored database can never reissue a
+revision whose PDF is still cached. Saves and deletes are caught by the timestamp
+bubble-up in signals.py; code that writes with QuerySet.update() or bulk_create /
+bulk_update must call bump_sheet / bump_faction itself.
+FORGE_FINGERPRINT_MODE = 'verify' cross-checks revisions against the full
+fingerprints (see pdf_cache).
+"""
+import uuid
+
+from django.apps import apps
+
+
+def new_revision():
+    return uuid.uuid4().hex[:16]
+
+
+def _bump(model_name, pk, instance=None):
+    if pk is None:
+        return None
+    revision = new_revision()
+    apps.get_model('the_forge', model_name).objects.filter(pk=pk).update(render_revision=revision)
+    if instance is not None:
+        instance.render_revision = revision
+    return revision
+
+
+def bump_sheet(sheet_id, instance=None):
+    """New revision for a FactionSheet (and `instance`, if given, in memory)."""
+    return _bump('FactionSheet', sheet_id, instance)
+
+
+def bump_faction(faction_id, instance=None):
+    """New revision for a ForgedFaction's non-sheet renders."""
+    return _bump('ForgedFaction', faction_id, instance)
+
+
+def bump_faction_and_sheet(faction_id):
+    """A ForgedFaction field every render draws changed (name, colors, background)."""
+    bump_faction(faction_id)
+    FactionSheet = apps.get_model('the_forge', 'FactionSheet')
+    bump_sheet(FactionSheet.objects.filter(faction_id=faction_id).values_list('pk', flat=True).first())
+
+
+def current_revision(model_name, pk):
+    """The stored revision (one query), issuing the first one for rows that predate
+    the field. Read fresh rather than off an instance: a view may hold a sheet
+    loaded before one of its children was saved."""
+    Model = apps.get_model('the_forge', model_name)
+    revision = Model.objects.filter(pk=pk).values_list('render_revision', flat=True).first()
+    return revision or _bump(model_name, pk)
@@ -4,6 +4,8 @@ from django.utils import timezone
 
 from the_keep.utils import resize_image_to_webp, resize_image, center_square_crop_in_place
 
+from .pdf_cache import _FACTION_RENDER_FIELDS, _FINGERPRINT_EXCLUDE_FIELDS, _faction_payload_for_render
+from .services.render_revision import bump_faction, bump_faction_and_sheet, bump_sheet
 from .services.slugify_titles import slugify_forged_faction_name
 
 
@@ -106,6 +108,10 @@ def _delete_image_preview(sender, instance, **kwargs):
 #
 # We use Model.objects.filter(pk=...).update(...) instead of save() to
 # avoid running parent save() overrides and to skip signal recursion.
+#
+# The same walk bumps the stored render revisions the fingerprints are built
+# from (services/render_revision.py): sheet subtree -> FactionSheet, anything
+# else the faction prints -> ForgedFaction.
 # ---------------------------------------------------------------------------
 
 def _touch(model_class, pk):
@@ -122,6 +128,7 @@ def _touch_sheet_and_faction(sheet_id):
     faction_id = FactionSheet.objects.filter(pk=sheet_id).values_list('faction_id', flat=True).first()
     _touch(FactionSheet, sheet_id)
     _touch(ForgedFaction, faction_id)
+    bump_sheet(sheet_id)
 
 
 def _touch_back_and_faction(back_id):
@@ -132,6 +139,7 @@ def _touch_back_and_faction(back_id):
     faction_id = FactionBack.objects.filter(pk=back_id).values_list('faction_id', flat=True).first()
     _touch(FactionBack, back_id)
     _touch(ForgedFaction, faction_id)
+    bump_faction(faction_id)
 
 
 def _touch_card_and_faction(card_id):
@@ -142,12 +150,20 @@ def _touch_card_and_faction(card_id):
     faction_id = SetupCard.objects.filter(pk=card_id).values_list('faction_id', flat=True).first()
     _touch(SetupCard, card_id)
     _touch(ForgedFaction, faction_id)
+    bump_faction(faction_id)
 
 
 def _bubble_sheet_back_card(sender, instance, **kwargs):
     """FactionSheet/FactionBack/SetupCard saved — bubble to ForgedFaction."""
     ForgedFaction = apps.get_model('the_forge', 'ForgedFaction')
     _touch(ForgedFaction, getattr(instance, 'faction_id', None))
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= _FINGERPRINT_EXCLUDE_FIELDS:
+        return  # preview bookkeeping, not content
+    if sender.__name__ == 'FactionSheet':
+        bump_sheet(instance.pk, instance)
+    else:
+        bump_faction(getattr(instance, 'faction_id', None))
 
 
 def _bubble_sheet_child(sender, instance, **kwargs):
@@ -228,6 +244,7 @@ def _bubble_piece(sender, instance, **kwargs):
     _touch(ForgedFaction, faction_id)
     back_id = FactionBack.objects.filter(faction_id=faction_id).values_list('pk', flat=True).first()
     _touch(FactionBack, back_id)
+    bump_faction(faction_id)
 
 
 def _bubble_setupstep(sender, instance, **kwargs):
@@ -247,12 +264,14 @@ def _bubble_deckgroup(sender, instance, **kwargs):
         return
     ForgedFaction = apps.get_model('the_forge', 'ForgedFaction')
     _touch(ForgedFaction, faction_id)
+    bump_faction(faction_id)
 
 
 def _bubble_carddeck(sender, instance, **kwargs):
     """ForgedCardDeck (FK 'group') -> ForgedDeckGroup -> Piece -> ForgedFaction.
     The model's save() already suppresses bubbling for sprite-sheet-only writes,
-    but post_delete still routes through here for cleanup."""
+    but post_delete still routes through here for cleanup. Returns the faction
+    id; decks (sprite sheets) aren't printed, so no render revision bump here."""
     group_id = getattr(instance, 'group_id', None)
     if group_id is None:
         return
@@ -266,13 +285,14 @@ def _bubble_carddeck(sender, instance, **kwargs):
         return
     ForgedFaction = apps.get_model('the_forge', 'ForgedFaction')
     _touch(ForgedFaction, faction_id)
+    return faction_id
 
 
 def _bubble_forged_card(sender, instance, **kwargs):
     """ForgedCard (FK 'group') -> same chain as ForgedCardDeck. Also keeps
     the parent Piece.quantity in sync with the deck's actual card count so
     component renders (cardboard pages, faction back) reflect the deck size."""
-    _bubble_carddeck(sender, instance, **kwargs)
+    bump_faction(_bubble_carddeck(sender, instance, **kwargs))
     group_id = getattr(instance, 'group_id', None)
     if group_id is None:
         return
@@ -295,6 +315,7 @@ TIMESTAMP_BUBBLES = {
     'FactionBack':     _bubble_sheet_back_card,
     'SetupCard':       _bubble_sheet_back_card,
     'CharacterImage':  _bubble_sheet_child,
+    'CustomInlineImage': _bubble_sheet_child,
     'FactionAbility':  _bubble_sheet_child,
     'ContentBox':      _bubble_sheet_child,
     'CardPile':        _bubble_sheet_child,
@@ -317,14 +338,37 @@ TIMESTAMP_BUBBLES = {
 }
 
 
+# ForgedFaction fields outside _FACTION_RENDER_FIELDS that only the components
+# sheet draws.
+_FACTION_COMPONENT_FIELDS = frozenset({
+    'vp_marker', 'relationship_marker', 'markers_version', 'print_component_backs',
+})
+
+
 def _forged_faction_pre_save(sender, instance, **kwargs):
     if instance.slug is None:
         slugify_forged_faction_name(instance, save=False)
+    # Remember what every render draws, to tell in post_save whether the sheet's
+    # revision has to move too.
+    update_fields = kwargs.get('update_fields')
+    if instance.pk and (update_fields is None or set(update_fields) & set(_FACTION_RENDER_FIELDS)):
+        old = sender.objects.filter(pk=instance.pk).first()
+        instance._render_payload_before = _faction_payload_for_render(old) if old else None
 
 
 def _forged_faction_post_save(sender, instance, created, **kwargs):
     if created:
         slugify_forged_faction_name(instance, save=True)
+        return
+    update_fields = kwargs.get('update_fields')
+    before = instance.__dict__.pop('_render_payload_before', None)
+    if before is not None and before != _faction_payload_for_render(instance):
+        bump_faction_and_sheet(instance.pk)
+    elif update_fields is None or set(update_fields) & (
+            _FACTION_COMPONENT_FIELDS | {'render_revision'}):
+        # A full save also writes back whatever render_revision the instance
+        # was loaded with, so always issue a fresh one.
+        bump_faction(instance.pk, instance)
 
 
 def _connect():
@@ -129,6 +129,45 @@
     );
   }
 
+  const POLL_MS = 1500;
+  // Poll a job for at most its server-side lifetime (202 `timeout`, in seconds),
+  // and start over at most this many times when the download answers 202 again.
+  const DEFAULT_JOB_TIMEOUT_S = 20 * 60;
+  const MAX_JOB_STARTS = 3;
+
+  function sleep(ms) {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+  }
+
+  // Fetch a download URL. Endpoints that render off the request path (the
+  // combined PDF) answer a cache miss with 202 + {status_url, timeout}; poll that
+  // until the job reports SUCCESS, then fetch the (now cached) download again.
+  // Gives up (throws) when the job fails or is gone, when it outlives its timeout,
+  // or when the download keeps answering 202 after a finished job.
+  async function fetchDownload(url) {
+    for (let starts = 0; ; starts++) {
+      const res = await fetch(url, {
+        credentials: 'same-origin',
+        headers: { 'X-Forge-Async': '1' },
+      });
+      if (res.status !== 202) return res;
+      if (starts >= MAX_JOB_STARTS) throw new Error('download still pending after ' + starts + ' jobs');
+      const job = await res.json();
+      const deadline = Date.now() + (job.timeout || DEFAULT_JOB_TIMEOUT_S) * 1000;
+      for (;;) {
+        if (Date.now() > deadline) throw new Error('render timed out');
+        await sleep(POLL_MS);
+        const statusRes = await fetch(job.status_url, { credentials: 'same-origin' });
+        if (statusRes.status >= 400) throw new Error('render failed (HTTP ' + statusRes.status + ')');
+        const status = await statusRes.json();
+        if (status.state === 'SUCCESS') {
+          url = status.download || url;
+          break;
+        }
+      }
+    }
+  }
+
   function attach(el) {
     el.addEventListener('click', async function (ev) {
       if (ev.defaultPrevented) return;
@@ -148,7 +187,7 @@
 
       setSpinner(spinTarget);
       try {
-        const res = await fetch(el.href, { credentials: 'same-origin' });
+        const res = await fetchDownload(el.href);
         if (!res.ok) throw new Error('HTTP ' + res.status);
         refreshPreviewsFromHeader(res.headers.get('X-Forge-Preview-Versions'));
         const blob = await res.blob();
@@ -20,3 +20,65 @@ def duplicate_forged_faction_task(self, source_pk):
     source = ForgedFaction.objects.get(pk=source_pk)
     new_faction = clone_forged_faction(source)
     return {'new_pk': new_faction.pk}
+
+
+# Worker-side wait for a free render slot: retry every RENDER_RETRY_SECONDS, for up
+# to ~10 minutes, before giving up with a FAILURE the poller reports.
+RENDER_RETRY_SECONDS = 5
+RENDER_MAX_RETRIES = 120
+
+
+@shared_task(bind=True, max_retries=RENDER_MAX_RETRIES)
+def render_combined_pdf_task(self, faction_pk, key=None):
+    """Build a faction's combined PDF into the pdf_cache, off the request path.
+
+    The render slot is held here on the worker, not in a web request: when all
+    slots are busy the task retries (stays queued) instead of the user getting a
+    503. The view serves the finished bytes from the cache key returned here.
+    `key` is the document key the job was started for (start_combined_job); its
+    job entry is released when the task finishes or fails for good.
+    """
+    from .models import ForgedFaction
+    from .render_guard import RenderBusy, render_slot
+    from .services.combined_pdf import release_combined_job, render_combined_pdf
+
+    faction = ForgedFaction.objects.get(pk=faction_pk)
+    timings = {}
+    try:
+        with render_slot():
+            built = render_combined_pdf(faction, timings=timings)
+    except RenderBusy:
+        if self.request.retries >= self.max_retries:
+            if key:
+                release_combined_job(key, self.request.id)
+            raise
+        raise self.retry(countdown=RENDER_RETRY_SECONDS)
+    except Exception:
+        # Let the next download start a fresh job instead of joining this failure.
+        if key:
+            release_combined_job(key, self.request.id)
+        raise
+    # An edit during the build changes the document key; release the one queued for.
+    for done in {key, built} - {None}:
+        release_combined_job(done, self.request.id)
+    if timings.get('fallback'):
+        logger.warning('Combined PDF for faction %s rendered serially: %s',
+                       faction_pk, timings['fallback'])
+    if timings:
+        logger.info('Combined PDF for faction %s: %s', faction_pk,
+                    ', '.join(f'{k}={v:.2f}s' if isinstance(v, float) else f'{k}={v}'
+                              for k, v in timings.items()))
+    return {'faction_pk': faction_pk, 'key': built, 'timings': timings}
+
+
+@shared_task
+def evict_pdf_storage():
+    """Trim the pdf_cache storage tier back under PDF_STORAGE_MAX_BYTES, least
+    recently used first. Schedule it (e.g. hourly) in the beat admin."""
+    from .pdf_cache import evict_storage
+
+    result = evict_storage()
+    if result['evicted']:
+        logger.info('PDF storage cache: evicted %(evicted)s files (%(evicted_bytes)s bytes), '
+                    '%(files)s files / %(bytes)s bytes kept', result)
+    return result
@@ -3,7 +3,7 @@ import tempfile
 from unittest import mock
 
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase, override_settings
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from the_gatehouse.models import Profile
 
@@ -160,3 +160,324 @@ class CloneForgedFactionTests(TestCase):
             with self.assertRaises(RuntimeError):
                 clone_forged_faction(self.source)
         self.assertFalse(clone_in_progress())
+
+
+@override_settings(MEDIA_ROOT=_MEDIA)
+class CombinedPdfJobTests(TestCase):
+    """The combined PDF is built by a Celery task and served from the pdf_cache."""
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from django.contrib.auth.signals import user_logged_in
+        from django.core.cache import cache
+        from the_gatehouse.signals import user_logged_in_handler
+        user_logged_in.disconnect(user_logged_in_handler)
+        self.addCleanup(user_logged_in.connect, user_logged_in_handler)
+        cache.clear()
+
+        self.user = User.objects.create_user(username='pdfdesigner', password='x')
+        self.faction = ForgedFaction.objects.create(
+            designer=self.user.profile, faction_name='Queued', published_faction=None,
+        )
+        FactionBack.objects.create(faction=self.faction)
+        self.client.force_login(self.user)
+
+    def test_cache_miss_queues_one_job_then_serves_cached_pdf(self):
+        from django.urls import reverse
+        from .tasks import render_combined_pdf_task
+
+        url = reverse('forge-faction-pdf', kwargs={'pk': self.faction.pk})
+        with mock.patch.object(render_combined_pdf_task, 'apply_async') as apply_async:
+            first = self.client.get(url, HTTP_X_FORGE_ASYNC='1')
+            second = self.client.get(url, HTTP_X_FORGE_ASYNC='1')
+        self.assertEqual(first.status_code, 202)
+        task_id = first.json()['task_id']
+        self.assertEqual(second.json()['task_id'], task_id)  # joined, not re-queued
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs['task_id'], task_id)
+
+        result = render_combined_pdf_task.apply(args=[self.faction.pk], task_id=task_id,
+                                                kwargs=apply_async.call_args.kwargs['kwargs']).get()
+        self.assertEqual(result['faction_pk'], self.faction.pk)
+        # The job entry is released, so the status of the (now finished) job is SUCCESS.
+        status = self.client.get(first.json()['status_url'])
+        self.assertEqual(status.json()['state'], 'SUCCESS')
+
+        response = self.client.get(url, HTTP_X_FORGE_ASYNC='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_concurrent_misses_queue_one_job(self):
+        from .services.combined_pdf import combined_plan, job_key, start_combined_job
+        from .tasks import render_combined_pdf_task
+        from django.core.cache import cache
+        plan = combined_plan(self.faction)
+        real_add = cache.add
+
+        def add_after_another_request(key, *args, **kwargs):
+            # Another request claims the key between this one's miss and its add.
+            real_add(key, 'other-job', *args[1:], **kwargs)
+            return real_add(key, *args, **kwargs)
+
+        with mock.patch.object(render_combined_pdf_task, 'apply_async') as apply_async, \
+                mock.patch.object(cache, 'add', side_effect=add_after_another_request):
+            self.assertEqual(start_combined_job(self.faction, plan), 'other-job')
+        apply_async.assert_not_called()
+        self.assertEqual(cache.get(job_key(plan['key'])), 'other-job')
+
+    def test_status_of_a_foreign_or_lost_job_ends_the_polling(self):
+        from django.urls import reverse
+        url = reverse('forge-faction-pdf-status', kwargs={'pk': self.faction.pk, 'task_id': 'other'})
+        other_task = mock.Mock(state='SUCCESS', result={'new_pk': 3})
+        with mock.patch('celery.result.AsyncResult', return_value=other_task):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        with mock.patch('celery.result.AsyncResult', return_value=mock.Mock(state='SUCCESS', result=None)):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        # Never queued for this faction (or its entry expired): PENDING forever in Celery.
+        with mock.patch('celery.result.AsyncResult', return_value=mock.Mock(state='PENDING')):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json()['state'], 'GONE')
+            self.assertEqual(self.client.get(url, HTTP_HX_REQUEST='true').status_code, 286)
+
+    def test_task_out_of_retries_releases_the_job(self):
+        from django.core.cache import cache
+        from .render_guard import RenderBusy
+        from .services.combined_pdf import combined_plan, job_key
+        from .tasks import RENDER_MAX_RETRIES, render_combined_pdf_task
+        plan = combined_plan(self.faction)
+        cache.set(job_key(plan['key']), 'job-1')
+        with mock.patch('the_forge.render_guard.render_slot', side_effect=RenderBusy):
+            result = render_combined_pdf_task.apply(args=[self.faction.pk], kwargs={'key': plan['key']},
+                                                    task_id='job-1', retries=RENDER_MAX_RETRIES)
+        self.assertIsInstance(result.result, RenderBusy)
+        self.assertIsNone(cache.get(job_key(plan['key'])))
+
+    def test_task_logs_a_serial_fallback(self):
+        from .tasks import render_combined_pdf_task
+        FactionSheet.objects.create(faction=self.faction)
+        # A TestCase runs inside a transaction, so the two parts can't fork.
+        with self.assertLogs('the_forge.tasks', 'WARNING') as logs:
+            result = render_combined_pdf_task.apply(args=[self.faction.pk]).get()
+        self.assertEqual(result['timings']['fallback'], 'open transaction')
+        self.assertIn('rendered serially: open transaction', logs.output[0])
+
+
+class CombinedPdfRenderModeTests(TransactionTestCase):
+    """Parallel and serial builds of the combined PDF's parts produce the same document.
+
+    A TransactionTestCase: the parallel path refuses to fork inside a transaction."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from reportlab import rl_config
+        cache.clear()
+        # No creation dates or random document ids, so two renders compare equal.
+        invariant = rl_config.invariant
+        rl_config.invariant = 1
+        self.addCleanup(setattr, rl_config, 'invariant', invariant)
+
+        designer = Profile.objects.create(discord='paralleldesigner')
+        self.faction = ForgedFaction.objects.create(
+            designer=designer, faction_name='Parallel', published_faction=None,
+        )
+        FactionSheet.objects.create(faction=self.faction)
+        FactionBack.objects.create(faction=self.faction)
+
+    def _render(self, extra_slots):
+        import contextlib
+        from .services.combined_pdf import _render_missing, merge_pdf_parts
+
+        @contextlib.contextmanager
+        def slots(wanted):
+            yield min(wanted, extra_slots)
+
+        with mock.patch('the_forge.render_guard.extra_render_slots', slots):
+            results, mode, fallback = _render_missing(self.faction, ['sheet', 'back'], None, parallel=True)
+        return merge_pdf_parts([results['sheet'][0], results['back'][0]]), mode, fallback
+
+    def test_parallel_and_serial_builds_match(self):
+        parallel, mode, fallback = self._render(extra_slots=1)
+        self.assertEqual((mode, fallback), ('parallel:2', None))
+        serial, mode, fallback = self._render(extra_slots=0)
+        self.assertEqual((mode, fallback), ('serial', 'no spare render slot'))
+        self.assertTrue(parallel.startswith(b'%PDF'))
+        self.assertEqual(parallel, serial)
+
+    def test_daemonic_process_renders_serially(self):
+        import multiprocessing
+        with mock.patch.object(type(multiprocessing.current_process()), 'daemon',
+                               new_callable=mock.PropertyMock, return_value=True):
+            _, mode, fallback = self._render(extra_slots=1)
+        self.assertEqual((mode, fallback), ('serial', 'daemonic process'))
+
+
+class RenderSlotTests(TestCase):
+    """Extra render slots are taken only while free and released on exit."""
+
+    def test_extra_slots_share_the_render_slot_pool(self):
+        from .render_guard import RENDER_SLOTS, extra_render_slots, render_slot
+        try:
+            from django.core.cache import cache
+            cache._cache.get_client(write=True).ping()
+        except Exception:
+            self.skipTest("the default cache isn't Redis")
+        with render_slot():
+            with extra_render_slots(RENDER_SLOTS) as extra:
+                self.assertEqual(extra, RENDER_SLOTS - 1)
+                with extra_render_slots(1) as none_left:
+                    self.assertEqual(none_left, 0)
+        with extra_render_slots(RENDER_SLOTS) as extra:
+            self.assertEqual(extra, RENDER_SLOTS)
+
+    def test_no_extra_slots_without_redis(self):
+        from .render_guard import extra_render_slots
+        with mock.patch('the_forge.render_guard._redis', side_effect=ConnectionError):
+            with extra_render_slots(2) as extra:
+                self.assertEqual(extra, 0)
+
+
+@override_settings(MEDIA_ROOT=_MEDIA)
+class PdfStorageTierTests(TestCase):
+    """Rendered PDFs persist in default storage behind the cache, with LRU eviction."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        shutil.rmtree(f'{_MEDIA}/forge_pdf_cache', ignore_errors=True)
+        self.addCleanup(shutil.rmtree, f'{_MEDIA}/forge_pdf_cache', ignore_errors=True)
+
+    def test_storage_hit_survives_cache_flush(self):
+        from django.core.cache import cache
+        from .pdf_cache import cache_key, cache_stats, get_or_build
+
+        key = cache_key('sheet', 1, 'abc')
+        builder = mock.Mock(return_value=b'%PDF-1')
+        self.assertEqual(get_or_build(key, builder), b'%PDF-1')
+        cache.delete(key)  # Redis eviction / flush
+        self.assertEqual(get_or_build(key, builder), b'%PDF-1')
+        self.assertEqual(get_or_build(key, builder), b'%PDF-1')
+        builder.assert_called_once()
+        stats = cache_stats()
+        self.assertEqual((stats['misses'], stats['storage_hits'], stats['memory_hits']), (1, 1, 1))
+
+    def test_evicts_least_recently_used_first(self):
+        import os
+        from django.core.files.storage import default_storage
+        from .pdf_cache import _storage_name, cache_key, evict_storage, get_cached, store
+
+        keys = [cache_key('cards', pk, 'fp') for pk in range(3)]
+        for age, key in zip((300, 200, 100), keys):
+            store(key, b'x' * 100)
+            path = default_storage.path(_storage_name(key))
+            os.utime(path, (os.path.getmtime(path) - age,) * 2)
+        get_cached(keys[0])  # oldest write, but just read
+
+        result = evict_storage(max_bytes=200)
+        self.assertEqual((result['evicted'], result['files'], result['bytes']), (1, 2, 200))
+        self.assertFalse(default_storage.exists(_storage_name(keys[1])))
+        self.assertTrue(default_storage.exists(_storage_name(keys[0])))
+
+
+@override_settings(MEDIA_ROOT=_MEDIA)
+class RenderRevisionTests(TestCase):
+    """Fingerprints come from stored revisions that child saves bump."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.designer = Profile.objects.create(discord='revdesigner')
+        self.faction = ForgedFaction.objects.create(
+            designer=self.designer, faction_name='Revised', published_faction=None,
+        )
+        self.sheet = FactionSheet.objects.create(faction=self.faction)
+        self.back = FactionBack.objects.create(faction=self.faction)
+
+    def _fps(self):
+        from .pdf_cache import fingerprint_back, fingerprint_sheet
+        return fingerprint_sheet(self.sheet), fingerprint_back(self.back)
+
+    def test_lookup_is_one_query(self):
+        from .pdf_cache import fingerprint_sheet
+        fingerprint_sheet(self.sheet)
+        with self.assertNumQueries(1):
+            fingerprint_sheet(self.sheet)
+
+    def test_children_bump_only_their_owner(self):
+        sheet_fp, back_fp = self._fps()
+        self.assertEqual(self._fps(), (sheet_fp, back_fp))
+
+        box = ContentBox.objects.create(sheet=self.sheet, order=1, title='Box')
+        new_sheet_fp, new_back_fp = self._fps()
+        self.assertNotEqual(new_sheet_fp, sheet_fp)
+        self.assertEqual(new_back_fp, back_fp)
+
+        Piece.objects.create(faction=self.faction, type='W', quantity=3, name='Warrior')
+        self.assertEqual(self._fps()[0], new_sheet_fp)
+        self.assertNotEqual(self._fps()[1], new_back_fp)
+
+        sheet_fp = self._fps()[0]
+        box.delete()
+        self.assertNotEqual(self._fps()[0], sheet_fp)
+
+    def test_preview_bookkeeping_and_unrelated_fields_dont_bump(self):
+        sheet_fp, back_fp = self._fps()
+        self.sheet.preview_version = 3
+        self.sheet.save(update_fields=['preview_version'])
+        self.faction.icon_color = '#123456'
+        self.faction.save()
+        self.assertEqual(self._fps()[0], sheet_fp)
+
+        self.faction.faction_name = 'Renamed'
+        self.faction.save()
+        new_sheet_fp, new_back_fp = self._fps()
+        self.assertNotEqual(new_sheet_fp, sheet_fp)
+        self.assertNotEqual(new_back_fp, back_fp)
+
+    def test_verify_mode_reissues_a_revision_that_missed_a_change(self):
+        with override_settings(FORGE_FINGERPRINT_MODE='verify'):
+            ContentBox.objects.create(sheet=self.sheet, order=1, title='Old')
+            sheet_fp = self._fps()[0]
+            # QuerySet.update() skips the signals, so the revision doesn't move.
+            ContentBox.objects.filter(sheet=self.sheet).update(title='New')
+            with self.assertLogs('the_forge.pdf_cache', 'WARNING'):
+                self.assertNotEqual(self._fps()[0], sheet_fp)
+
+
+@override_settings(MEDIA_ROOT=_MEDIA)
+class LayoutMemoTests(TestCase):
+    """Step measurements are memoized per process and match a cold measurement."""
+
+    def setUp(self):
+        from .models import StepAction
+        designer = Profile.objects.create(discord='memodesigner')
+        faction = ForgedFaction.objects.create(
+            designer=designer, faction_name='Measured', published_faction=None,
+            background_preset='cats',
+        )
+        self.sheet = FactionSheet.objects.create(faction=faction)
+        for number, text in enumerate(['Craft.', '<strong>Recruit</strong> at a roost.', 'Move.'], start=1):
+            step = PhaseStep.objects.create(sheet=self.sheet, phase='daylight', number=number, text=text)
+            StepAction.objects.create(step=step, order=1, text='Battle twice.', cost='item_sword')
+
+    def _heights(self):
+        from .pdf_engine import SheetLayoutEngine
+        engine = SheetLayoutEngine(self.sheet)
+        return [engine.measure_phase_height(steps, 200) for steps in engine.phases_grouped.values()]
+
+    def test_warm_measurements_match_cold_and_hit_the_memo(self):
+        from . import layout_memo
+        layout_memo.clear()
+        cold = self._heights()
+        misses = layout_memo.measurements.misses
+        self.assertEqual(self._heights(), cold)
+        self.assertEqual(layout_memo.measurements.misses, misses)
+        self.assertGreater(layout_memo.measurements.hits, 0)
+
+        step = PhaseStep.objects.get(sheet=self.sheet, number=2)
+        step.text = 'Recruit twice.'
+        step.save()
+        self._heights()
+        # Only the edited step's text block is re-measured.
+        self.assertEqual(layout_memo.measurements.misses - misses, 2)  # step block + its paragraph
@@ -27,6 +27,7 @@ urlpatterns = [
     path('forge/faction/<int:pk>/unlink/', views.forgedfaction_unlink, name='forge-faction-unlink'),
     path('forge/faction/<int:pk>/sync/', views.forgedfaction_sync, name='forge-faction-sync'),
     path('forge/faction/<int:pk>/pdf/', views.forgedfaction_pdf, name='forge-faction-pdf'),
+    path('forge/faction/<int:pk>/pdf/status/<str:task_id>/', views.forgedfaction_pdf_status, name='forge-faction-pdf-status'),
     path('forge/faction/<int:pk>/components/pdf/', views.forgedfaction_components_pdf, name='forge-faction-components-pdf'),
     path('forge/faction/<int:pk>/cards/pdf/', views.forgedfaction_cards_pdf, name='forge-faction-cards-pdf'),
     path('forge/faction/<int:pk>/cardboard/', views.forgedfaction_cardboard_edit, name='forge-faction-cardboard-edit'),
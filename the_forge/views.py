@@ -8,10 +8,12 @@ from django.http import (
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
+    Http404,
     JsonResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.templatetags.static import static
+from django.utils.html import format_html
 from django.views.decorators.http import require_http_methods
 
 from django.contrib import messages
@@ -20,6 +22,8 @@ from django.urls import reverse
 from the_gatehouse.views import admin_onboard_required, forge_onboard_required, player_required
 from .inline_images import picker_image_map, picker_keywords, sheet_inline_images, sheet_picker_keywords
 from .layout_autogrow import ensure_step_parent_fits
+from .services.previews import maybe_save_image_preview as _maybe_save_image_preview
+from .services.render_revision import bump_faction, bump_sheet
 
 from the_gatehouse.models import MessageChoices, UserNotification
 from the_gatehouse.utils import build_absolute_uri
@@ -1084,6 +1088,7 @@ def factionback_edit(request, pk):
                     SetupStep.objects.bulk_update(steps_to_update, ['text', 'number'])
                 if steps_to_create:
                     SetupStep.objects.bulk_create(steps_to_create)
+                bump_faction(back.faction_id)  # bulk writes skip the signals
             return redirect('forge-faction-detail', pk=back.faction.pk)
     else:
         form = FactionBackForm(back=back)
@@ -1253,6 +1258,7 @@ def setup_card_edit(request, pk):
                     SetupStep.objects.bulk_update(to_update, ['text', 'number'])
                 if to_create:
                     SetupStep.objects.bulk_create(to_create)
+                bump_faction(card.faction_id)  # bulk writes skip the signals
             return redirect('forge-faction-detail', pk=card.faction.pk)
     else:
         form = SetupCardForm(card=card)
@@ -1331,6 +1337,7 @@ def ability_reorder(request, sheet_pk):
     data = json.loads(request.body)
     for index, aid in enumerate(data.get('order', []), start=1):
         FactionAbility.objects.filter(id=aid, sheet=sheet).update(order=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -1458,6 +1465,7 @@ def contentbox_delete(request, pk):
     for index, sibling in enumerate(sheet.content_boxes.order_by('order'), start=1):
         if sibling.order != index:
             ContentBox.objects.filter(pk=sibling.pk).update(order=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -1470,6 +1478,7 @@ def contentbox_reorder(request, sheet_pk):
     data = json.loads(request.body)
     for index, bid in enumerate(data.get('order', []), start=1):
         ContentBox.objects.filter(id=bid, sheet=sheet).update(order=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -1548,6 +1557,7 @@ def phasestep_delete(request, pk):
     for index, sibling in enumerate(siblings, start=1):
         if sibling.number != index:
             PhaseStep.objects.filter(pk=sibling.pk).update(number=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -1560,6 +1570,7 @@ def phasestep_reorder(request, sheet_pk, phase):
     data = json.loads(request.body)
     for index, sid in enumerate(data.get('order', []), start=1):
         PhaseStep.objects.filter(id=sid, sheet=sheet).update(number=index, phase=phase)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -1572,6 +1583,7 @@ def phasestep_reorder_in_box(request, content_box_pk):
     data = json.loads(request.body)
     for index, sid in enumerate(data.get('order', []), start=1):
         PhaseStep.objects.filter(id=sid, content_box=box).update(number=index)
+    bump_sheet(box.sheet_id)
     return HttpResponse(status=204)
 
 
@@ -1649,6 +1661,7 @@ def stepaction_reorder(request, step_pk):
     data = json.loads(request.body)
     for index, aid in enumerate(data.get('order', []), start=1):
         StepAction.objects.filter(id=aid, step=step).update(order=index)
+    bump_sheet(step.sheet_id)
     return HttpResponse(status=204)
 
 
@@ -1774,6 +1787,7 @@ def step_children_reorder(request, step_pk):
             Legend.objects.filter(id=oid, step=step).update(order=index)
         elif kind == 'scale':
             Scale.objects.filter(id=oid, step=step).update(order=index)
+    bump_sheet(step.sheet_id)
     return HttpResponse(status=204)
 
 
@@ -2039,6 +2053,7 @@ def scale_save(request, pk):
                 range=rng, result=res, order=order)
         else:
             ScaleRow.objects.create(scale=scale, range=rng, result=res, order=order)
+    bump_sheet(scale.step.sheet_id)
     ensure_step_parent_fits(scale.step, check_width=True)
     return render(request, 'the_forge/partials/scale_row.html', {
         'scale': scale, 'inline_keywords': _inline_keywords(scale.step.sheet),
@@ -2128,6 +2143,7 @@ def cardslot_reorder(request, decree_pk):
     data = json.loads(request.body)
     for index, sid in enumerate(data.get('order', []), start=1):
         CardSlot.objects.filter(id=sid, decree=decree).update(number=index)
+    bump_sheet(decree.sheet_id)
     return HttpResponse(status=204)
 
 
@@ -2157,6 +2173,7 @@ def cardslot_delete(request, pk):
     for index, sibling in enumerate(decree.card_slots.order_by('number'), start=1):
         if sibling.number != index:
             CardSlot.objects.filter(pk=sibling.pk).update(number=index)
+    bump_sheet(decree.sheet_id)
     return HttpResponse(status=204)
 
 
@@ -2213,6 +2230,7 @@ def cardpile_delete(request, pk):
     for index, sibling in enumerate(sheet.card_piles.order_by('number'), start=1):
         if sibling.number != index:
             CardPile.objects.filter(pk=sibling.pk).update(number=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -2225,6 +2243,7 @@ def cardpile_reorder(request, sheet_pk):
     data = json.loads(request.body)
     for index, pid in enumerate(data.get('order', []), start=1):
         CardPile.objects.filter(id=pid, sheet=sheet).update(number=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -2272,6 +2291,7 @@ def character_image_delete(request, pk):
     for index, sibling in enumerate(sheet.character_images.order_by('order'), start=1):
         if sibling.order != index:
             CharacterImage.objects.filter(pk=sibling.pk).update(order=index)
+    bump_sheet(sheet.pk)
     return HttpResponse(status=204)
 
 
@@ -2391,31 +2411,6 @@ def _attach_preview_versions(response, **objects):
     return response
 
 
-def _maybe_save_image_preview(instance, pdf_bytes, fingerprint, field_prefix):
-    if instance.preview_fingerprint == fingerprint and instance.image_preview:
-        return
-    from django.core.files.base import ContentFile
-    from django.utils import timezone
-    from .pdf_engine import pdf_bytes_to_webp_bytes, PREVIEW_DPI, CARD_PREVIEW_DPI
-    # SetupCard previews are also embedded in the printable Components sheet,
-    # so render them at higher DPI for crisp print output. These must match the
-    # target_dpi passed into build() in the _ensure_*_preview helpers so the
-    # pre-scaled art and the rasterization DPI stay in sync.
-    dpi = CARD_PREVIEW_DPI if field_prefix == 'card' else PREVIEW_DPI
-    try:
-        webp = pdf_bytes_to_webp_bytes(pdf_bytes, dpi=dpi)
-    except Exception:
-        return
-    if instance.image_preview:
-        instance.image_preview.delete(save=False)
-    filename = f'{field_prefix}_{instance.pk}.webp'
-    instance.image_preview.save(filename, ContentFile(webp), save=False)
-    instance.preview_fingerprint = fingerprint
-    instance.last_generated = timezone.now()
-    instance.preview_version = (instance.preview_version or 0) + 1
-    instance.save(update_fields=['image_preview', 'preview_fingerprint', 'last_generated', 'preview_version'])
-
-
 def _ensure_sheet_preview(sheet, gated=False):
     """Refresh sheet.image_preview and sheet.snap_points if the fingerprint is stale.
 
@@ -2535,108 +2530,92 @@ def _refresh_all_element_previews(forged):
 
 @login_required
 def forgedfaction_pdf(request, pk):
+    """Serve the combined PDF from the pdf_cache (either tier), or start building it.
+
+    A cache hit streams the PDF immediately. On a miss the build runs in
+    render_combined_pdf_task (see services/combined_pdf.py) and this returns 202
+    with the job id: JSON for forge_async_download.js (X-Forge-Async header), or a
+    small page that polls forgedfaction_pdf_status via HTMX for plain navigation.
+    Both land back here once the job is done and the bytes are cached.
+    """
     faction = get_object_or_404(ForgedFaction, pk=pk)
     if (resp := _forbid_if_not_editor(request, faction)):
         return resp
-    from io import BytesIO
-    from pypdf import PdfWriter, PdfReader
-    from .pdf_engine import (
-        SheetLayoutEngine, FactionBackLayoutEngine, SetupCardLayoutEngine,
-        ComponentsSheetLayoutEngine, ForgedCardsLayoutEngine,
-    )
-    from .pdf_cache import (
-        cache_key, fingerprint_sheet, fingerprint_back, fingerprint_setup_card,
-        fingerprint_components_sheet, fingerprint_cards, render_pdf, cached_or_build,
-    )
-    from .render_guard import render_slot, RenderBusy, busy_503
+    from .pdf_cache import get_cached
+    from .services.combined_pdf import JOB_TTL, combined_plan, start_combined_job
 
-    sheet = getattr(faction, 'faction_sheet', None)
-    back = getattr(faction, 'faction_back', None)
-    card = getattr(faction, 'setup_card', None)
+    plan = combined_plan(faction)
+    if plan is None:
+        return HttpResponse(
+            "No content yet — create a Front, Back, or Setup Card first.",
+            status=404, content_type='text/plain',
+        )
 
-    # One render slot for the whole combined build. The parts build serially, so
-    # the memory peak is one part at a time; holding a single slot for the request
-    # avoids a combined download contending with itself over multiple slots.
-    try:
-        with render_slot():
-            parts = []
-
-            if sheet:
-                sheet_fp = fingerprint_sheet(sheet)
-                sheet_pdf = render_pdf(SheetLayoutEngine, sheet, cache_key('sheet', sheet.pk, sheet_fp))
-                _maybe_save_image_preview(sheet, sheet_pdf, sheet_fp, 'sheet')
-                parts.append(sheet_pdf)
-
-            if back:
-                back_fp = fingerprint_back(back)
-                back_pdf = render_pdf(FactionBackLayoutEngine, back, cache_key('back', back.pk, back_fp))
-                _maybe_save_image_preview(back, back_pdf, back_fp, 'back')
-                parts.append(back_pdf)
-
-            has_components = bool(
-                card or faction.vp_marker or faction.relationship_marker
-                or faction.pieces.filter(type__in=('B', 'T')).exists()
-            )
-            if has_components:
-                card_preview_path = None
-                if card:
-                    card_fp = fingerprint_setup_card(card)
-                    # Refresh the SetupCard preview if its fingerprint is stale, so the
-                    # detail-page thumbnail updates as a side effect of Combined PDF.
-                    if card.preview_fingerprint != card_fp or not card.image_preview:
-                        card_pdf = render_pdf(SetupCardLayoutEngine, card,
-                                              cache_key('setup_card', card.pk, card_fp))
-                        _maybe_save_image_preview(card, card_pdf, card_fp, 'card')
-                    if card.image_preview:
-                        card_preview_path = card.image_preview.path
-
-                def build_components():
-                    buf = BytesIO()
-                    try:
-                        ComponentsSheetLayoutEngine(faction, card_preview_path=card_preview_path).build(buf)
-                        return buf.getvalue()
-                    finally:
-                        buf.close()
-                components_fp = fingerprint_components_sheet(faction)
-                parts.append(cached_or_build(
-                    cache_key('components', faction.pk, components_fp), build_components,
-                ))
-
-            # Custom decks — appended after the components page so the combined PDF
-            # reads sheet -> back -> components -> cards.
-            cards_engine = ForgedCardsLayoutEngine(faction)
-            if cards_engine.has_cards():
-                def build_cards():
-                    buf = BytesIO()
-                    try:
-                        cards_engine.build(buf)
-                        return buf.getvalue()
-                    finally:
-                        buf.close()
-                cards_fp = fingerprint_cards(faction)
-                parts.append(cached_or_build(cache_key('cards', faction.pk, cards_fp), build_cards))
-
-            if not parts:
-                return HttpResponse(
-                    "No content yet — create a Front, Back, or Setup Card first.",
-                    status=404, content_type='text/plain',
-                )
+    pdf_bytes = get_cached(plan['key'])
+    if pdf_bytes is not None:
+        response = _pdf_file_response(pdf_bytes, f'{faction.faction_name}.pdf')
+        return _attach_preview_versions(response, sheet=plan['sheet'], back=plan['back'], card=plan['card'])
+
+    task_id = start_combined_job(faction, plan)
+    status_url = reverse('forge-faction-pdf-status', kwargs={'pk': faction.pk, 'task_id': task_id})
+    if request.headers.get('X-Forge-Async'):
+        return JsonResponse({'task_id': task_id, 'status_url': status_url, 'timeout': JOB_TTL},
+                            status=202)
+    return render(request, 'the_forge/pdf_pending.html', {
+        'faction': faction,
+        'status_url': status_url,
+    }, status=202)
 
-            writer = PdfWriter()
-            for data in parts:
-                for page in PdfReader(BytesIO(data)).pages:
-                    writer.add_page(page)
-            out = BytesIO()
-            try:
-                writer.write(out)
-                pdf_bytes = out.getvalue()
-            finally:
-                out.close()
-    except RenderBusy:
-        return busy_503()
 
-    response = _pdf_file_response(pdf_bytes, f'{faction.faction_name}.pdf')
-    return _attach_preview_versions(response, sheet=sheet, back=back, card=card)
+@login_required
+def forgedfaction_pdf_status(request, pk, task_id):
+    """Report combined-PDF job state; on success point back at the download.
+
+    A job counts for this faction only while it's the one start_combined_job
+    recorded for its current document, or once it has finished with this faction's
+    pk. Any other task id, and a job whose entry expired without a result (a lost
+    broker message, a purged result), is reported as gone, which ends the polling
+    either way. HTMX pollers get an HX-Redirect on success; fetch() pollers get
+    JSON with the download URL.
+    """
+    from celery.result import AsyncResult
+    from django.core.cache import cache
+    from .pdf_cache import get_cached
+    from .services.combined_pdf import combined_plan, job_key
+
+    faction = get_object_or_404(ForgedFaction, pk=pk)
+    if (resp := _forbid_if_not_editor(request, faction)):
+        return resp
+    download = reverse('forge-faction-pdf', kwargs={'pk': faction.pk})
+    result = AsyncResult(task_id)
+    state = result.state
+    if state == 'SUCCESS':
+        payload = result.result
+        if not isinstance(payload, dict) or payload.get('faction_pk') != faction.pk:
+            raise Http404
+    elif state != 'FAILURE':
+        plan = combined_plan(faction)
+        if plan is None:
+            state = 'GONE'
+        elif cache.get(job_key(plan['key'])) != task_id:
+            # Released on success before the result is stored, or never ours.
+            state = 'SUCCESS' if get_cached(plan['key']) is not None else 'GONE'
+
+    if state == 'SUCCESS':
+        if request.htmx:
+            response = HttpResponse(status=200)
+            response['HX-Redirect'] = download
+            return response
+        return JsonResponse({'state': 'SUCCESS', 'download': download})
+    if state in ('FAILURE', 'GONE'):
+        if request.htmx:
+            # 286 tells htmx to stop polling.
+            return HttpResponse(
+                format_html('Generating the PDF failed. <a href="{}">Try again</a>.', download), status=286)
+        return JsonResponse({'state': state}, status=500 if state == 'FAILURE' else 404)
+    if request.htmx:
+        return HttpResponse("Still generating…" if state == 'STARTED' else "Waiting for a free renderer…")
+    return JsonResponse({'state': state})  # PENDING / STARTED / RETRY
 
 
 @login_required
@@ -3581,4 +3560,5 @@ def forge_card_reorder(request, group_pk):
     data = json.loads(request.body)
     for index, cid in enumerate(data.get('order', []), start=1):
         ForgedCard.objects.filter(id=cid, group=group).update(order=index)
+    bump_faction(faction.pk)
     return HttpResponse(status=204)
@@ -399,6 +399,8 @@ class ProfileAdmin(admin.ModelAdmin):
 
         from the_warroom.models import Game
         from the_warroom.services.elo_service import mark_games_dirty
+        from the_warroom.services.leaderboard_buckets import PLAYER, month_start
+        from the_warroom.tasks import refresh_leaderboard_buckets
         for player in players:
             summary = {}
 
@@ -437,6 +439,15 @@ class ProfileAdmin(admin.ModelAdmin):
             # systems dirty (from each game's date) so the scheduled recompute replays them.
             mark_games_dirty(elo_dirty_game_ids)
 
+            # Same bulk-update blind spot for the leaderboard buckets: move the loser's
+            # tallies onto the survivor for every month those games fall in.
+            months = {month_start(d) for d in Game.objects.filter(
+                id__in=elo_dirty_game_ids).values_list('date_posted', flat=True)}
+            bucket_keys = [[PLAYER, pid, m.isoformat()]
+                           for pid in (player.pk, survivor.pk) for m in sorted(months)]
+            if bucket_keys:
+                transaction.on_commit(lambda keys=bucket_keys: refresh_leaderboard_buckets.delay(keys))
+
             # Delete the merged-in profile.
             player.delete()
 
@@ -1,15 +1,42 @@
 # Context Processors
+import functools
 from datetime import timedelta
 
-from django.db.models import Q
 from django.utils import timezone
-from the_keep.models import Post, PNPAsset
-from the_warroom.models import Game, ScoreCard, Match, Round, CompetitionStatus
+from the_warroom.models import Match, Round, CompetitionStatus
 from .models import Website
 from .services.context_service import get_theme
+from .services.header_stats import DEFAULTS, header_stats
 
 from django.core.exceptions import ObjectDoesNotExist
 
+
+def _no_stats():
+    return DEFAULTS
+
+
+def _next_scheduled_matches(profile):
+    """Next upcoming scheduled matches the player is seated in. Mirrors
+    _upcoming_scheduled_matches() in the_warroom.views: finalized bracket, a future
+    scheduled_time (6h leeway), and no recorded result yet. Scoped to this player's
+    seats across all tournaments. distinct() guards against duplicate rows when the
+    player holds more than one seat in a series; the first is kept."""
+    schedule_cutoff = timezone.now() - timedelta(hours=6)
+    return list(
+        Match.objects.filter(
+            series__matchseat__stage_participant__tournament_player__profile=profile,
+            round__bracket_status=Round.BracketStatusChoices.FINALIZED,
+            scheduled_time__isnull=False,
+            scheduled_time__gte=schedule_cutoff,
+        )
+        .exclude(status=CompetitionStatus.COMPLETED)
+        .exclude(game__final=True)
+        .select_related('round', 'round__stage', 'round__stage__tournament', 'series')
+        .order_by('scheduled_time')
+        .distinct()[:1]
+    )
+
+
 def active_user_data(request):
     try:
         config = Website.get_singular_instance()
@@ -26,15 +53,11 @@ def active_user_data(request):
         else:
             rdb_feedback_invite = None
 
-        post_count = 0
-        recent_posts = []
-        in_process_games = 0
-        game_count = 0
-        recorded_game_count = 0
-        scorecard_count = 0
-        unassigned_scorecards = 0
-        bookmarks = 0
-        has_shared_assets = False
+        # Per-user values are callables, so the template engine only evaluates them
+        # when a template touches the variable. It calls them again on every use, so
+        # each one is memoized for the request. The counts come from one cached entry
+        # per profile (services/header_stats.py).
+        stats = _no_stats
         approved_invites = []
         user_notifications = []
         next_scheduled_matches = []
@@ -42,23 +65,7 @@ def active_user_data(request):
         if hasattr(request, 'user') and request.user.is_authenticated:
             try:
                 profile = request.user.profile
-                post_count = Post.objects.filter(designer=profile).count()
-                recent_posts = Post.objects.filter(
-                    Q(designer=profile) | Q(co_designers=profile, co_designers_can_edit=True)
-                    ).exclude(status='9').order_by('-date_updated')[:3]
-                in_process_games = Game.objects.filter(final=False, recorder=profile).count()
-                game_count = Game.objects.filter(final=True, efforts__player=profile).distinct().count()
-                recorded_game_count = Game.objects.filter(recorder=profile).distinct().count()
-                scorecard_count = ScoreCard.objects.filter(recorder=profile, final=True).count()
-                unassigned_scorecards = ScoreCard.objects.filter(final=False, recorder=profile).count()
-                bookmarked_games = profile.bookmarkedgames.count()
-                bookmarked_posts = profile.bookmarkedposts.count()
-                bookmarks = bookmarked_posts + bookmarked_games
-
-                # Whether the user has any shared workshop resources (drives the
-                # "My Resources" header sub-item; mirrors `shared_assets` in the
-                # workshop views but as a cheap global existence check).
-                has_shared_assets = PNPAsset.objects.filter(shared_by=profile).exists()
+                stats = functools.cache(lambda: header_stats(profile))
 
                 # Get approved invites for guilds the user is not yet a member of
                 # Excludes completed invites (user already joined) and guilds already in
@@ -75,26 +82,7 @@ def active_user_data(request):
                     is_dismissed=False
                 ).order_by('-created_at')
 
-                # Next upcoming scheduled matches the player is seated in. Mirrors
-                # _upcoming_scheduled_matches() in the_warroom.views: finalized
-                # bracket, a future scheduled_time (6h leeway), and no recorded
-                # result yet. Scoped to this player's seats across all tournaments.
-                # distinct() guards against duplicate rows when the player holds
-                # more than one seat in a series; the first 2 are kept.
-                schedule_cutoff = timezone.now() - timedelta(hours=6)
-                next_scheduled_matches = list(
-                    Match.objects.filter(
-                        series__matchseat__stage_participant__tournament_player__profile=profile,
-                        round__bracket_status=Round.BracketStatusChoices.FINALIZED,
-                        scheduled_time__isnull=False,
-                        scheduled_time__gte=schedule_cutoff,
-                    )
-                    .exclude(status=CompetitionStatus.COMPLETED)
-                    .exclude(game__final=True)
-                    .select_related('round', 'round__stage', 'round__stage__tournament', 'series')
-                    .order_by('scheduled_time')
-                    .distinct()[:1]
-                )
+                next_scheduled_matches = functools.cache(lambda: _next_scheduled_matches(profile))
 
             except ObjectDoesNotExist:
                 pass  # profile or related object not found
@@ -107,16 +95,16 @@ def active_user_data(request):
 
         return {
             'site_title': site_title,
-            'user_posts_count': post_count,
-            'user_recent_posts': recent_posts,
-            'user_active_games_count': in_process_games,
-            'user_games_count': game_count,
-            'user_recorded_game_count': recorded_game_count,
-            'user_active_scorecards_count': unassigned_scorecards,
-            'user_active_count': unassigned_scorecards + in_process_games,
-            'user_bookmarks_count': bookmarks,
-            'user_has_shared_assets': has_shared_assets,
-            'user_scorecard_count': scorecard_count,
+            'user_posts_count': lambda: stats()['post_count'],
+            'user_recent_posts': lambda: stats()['recent_posts'],
+            'user_active_games_count': lambda: stats()['in_process_games'],
+            'user_games_count': lambda: stats()['game_count'],
+            'user_recorded_game_count': lambda: stats()['recorded_game_count'],
+            'user_active_scorecards_count': lambda: stats()['unassigned_scorecards'],
+            'user_active_count': lambda: stats()['unassigned_scorecards'] + stats()['in_process_games'],
+            'user_bookmarks_count': lambda: stats()['bookmarks'],
+            'user_has_shared_assets': lambda: stats()['has_shared_assets'],
+            'user_scorecard_count': lambda: stats()['scorecard_count'],
             'approved_invites': approved_invites,
             'user_notifications': user_notifications,
             'next_scheduled_matches': next_scheduled_matches,
@@ -35,9 +35,12 @@ from the_keep.models import Faction, Map, Deck, Vagabond, Landmark, Hireling, Tw
 from the_warroom.models import Tournament, Match, CompetitionStatus, filtered_winrate, EloParticipant
 from the_gatehouse.models import Profile, BotBlacklist, DiscordGuild, GuildLFGRole
 from .tasks import (
-    record_bot_usage_task, ensure_profile_from_discord_task, notify_lfg_task,
+    ensure_profile_from_discord_task, notify_lfg_task,
     create_lfg_thread_task, record_lfg_components_task, post_interaction_followup_task,
 )
+from .services.autocomplete_index import AutocompleteIndex, current_versions
+from .services.bot_usage import record_usage
+from .services.embed_cache import cached_embed, embed_key, freshness_token, store_embeds
 from .services.discordservice import (
     config, build_post_embed, build_post_image_embed, build_stats_embed,
     build_captain_embed, build_card_embed, build_law_embed, build_help_embed, build_upcoming_embed,
@@ -196,28 +199,57 @@ def _lookup_embed(post, image_field=None):
     return embed
 
 
-def _make_lookup_handler(label, queryset_factory):
+def _resolve_lookup(command, queryset_factory, name):
+    """(pk, title, slug, date_updated) of the published post _lookup_post would
+    pick (exact title first, then substring), from the command's in-memory title
+    index. Queries the database if the index can't be read."""
+    try:
+        index = LOOKUP_INDEXES[command]
+        needle = name.casefold()
+        rows = (index.search(name, limit=1, predicate=lambda row: row[1].casefold() == needle)
+                or index.search(name, limit=1))
+        return rows[0] if rows else None
+    except Exception:
+        logger.exception("lookup index unavailable for /%s; querying the database", command)
+        post = _lookup_post(queryset_factory(), name)
+        return (post.pk, post.title, post.slug, post.date_updated) if post else None
+
+
+def _cached_post_embed(command, queryset_factory, found, build):
+    """The embed for a resolved lookup from the embed cache (services/embed_cache.py),
+    built from the post with `build(post)` on a miss. None if the post is gone."""
+    pk, _title, _slug, date_updated = found
+
+    def build_from_db():
+        post = queryset_factory().filter(pk=pk).first()
+        return build(post) if post else None
+    return cached_embed(command, pk, date_updated, build_from_db)
+
+
+def _make_lookup_handler(command, label, queryset_factory):
     """Build a slash-command handler that looks up a Post by title and replies
     with one embed (info card + large image). `queryset_factory` returns the base
-    queryset to search."""
+    queryset to search. The post is resolved from memory and the embed read from
+    the embed cache, so a repeated lookup doesn't touch the database."""
     def handler(data):
         name = (_get_option(data, "name") or "").strip()
         if not name:
             return _ephemeral(f"Please provide a {label} name to search.")
 
-        post = _lookup_post(queryset_factory(), name)
-        if not post:
+        found = _resolve_lookup(command, queryset_factory, name)
+        embed = found and _cached_post_embed(command, queryset_factory, found, _lookup_embed)
+        if not embed:
             return _ephemeral(f'No {label} found matching "{name}".')
 
         # If used inside an LFG thread, record the looked-up component (a selected
         # map/deck updates the LFGThread FK like a random roll).
-        kind = _LFG_LOOKUP_KIND.get(data.get("name"))
+        kind = _LFG_LOOKUP_KIND.get(command)
         if kind:
-            _capture_lfg_components(data.get("_channel_id"), [_lfg_item(kind, post)])
+            _capture_lfg_components(data.get("_channel_id"), [_lfg_row_item(kind, found)])
 
         return JsonResponse({
             "type": RESPONSE_CHANNEL_MESSAGE,
-            "data": {"embeds": [_lookup_embed(post)]},
+            "data": {"embeds": [embed]},
         })
     return handler
 
@@ -261,6 +293,24 @@ _LFG_LOOKUP_KIND = {
 }
 
 
+def _lookup_rows(queryset_factory):
+    """Rows for a lookup command's title index: the published posts _lookup_post
+    searches, in its order, as (pk, title, slug, date_updated)."""
+    def load():
+        rows = (queryset_factory().filter(status__lte=4)
+                .values_list("pk", "title", "slug", "date_updated"))
+        return [((row[1],), row) for row in rows]
+    return load
+
+
+# Per-command title indexes (services/autocomplete_index.py) that resolve a lookup's
+# `name` to a post without a query; /captain searches captain-capable vagabonds.
+LOOKUP_INDEXES = {
+    name: AutocompleteIndex(["posts"], _lookup_rows(qs))
+    for name, qs in LOOKUP_QUERYSETS.items()
+}
+
+
 def _capture_lfg_components(channel_id, items):
     """Fire-and-forget: record components surfaced by a command into an LFG thread
     (no-op in the worker when the channel isn't a known LFG thread). `items` is a
@@ -274,6 +324,29 @@ def _lfg_item(kind, post):
             "title": getattr(post, "title", None)}
 
 
+def _lfg_row_item(kind, found):
+    """_lfg_item for a (pk, title, slug, date_updated) lookup index row."""
+    _pk, title, slug, _updated = found
+    return {"kind": kind, "slug": slug, "title": title}
+
+
+def _captain_queryset():
+    return Vagabond.objects.filter(captain=True)
+
+
+LOOKUP_INDEXES["captain"] = AutocompleteIndex(["posts"], _lookup_rows(_captain_queryset))
+
+
+def _captain_embed(vagabond):
+    """One embed: the captain (Advanced) profile with the flip-side card_2_image
+    folded in as the large image."""
+    embed = build_captain_embed(vagabond)
+    image_url = _post_image_url(vagabond, field="card_2_image")
+    if image_url:
+        embed["image"] = {"url": image_url}
+    return embed
+
+
 def _handle_captain_command(data):
     """/captain: look up a captain-capable vagabond and show its captain
     (Advanced) profile — captain ability and captain starting items."""
@@ -281,19 +354,13 @@ def _handle_captain_command(data):
     if not name:
         return _ephemeral("Please provide a captain name to search.")
 
-    vagabond = _lookup_post(Vagabond.objects.filter(captain=True), name)
-    if not vagabond:
+    found = _resolve_lookup("captain", _captain_queryset, name)
+    embed = found and _cached_post_embed("captain", _captain_queryset, found, _captain_embed)
+    if not embed:
         return _ephemeral(f'No captain found matching "{name}".')
 
-    # One embed: the captain (Advanced) profile with the flip-side card_2_image
-    # folded in as the large image.
-    embed = build_captain_embed(vagabond)
-    image_url = _post_image_url(vagabond, field="card_2_image")
-    if image_url:
-        embed["image"] = {"url": image_url}
-
     # /captain is its own handler (not in the lookup loop); capture as "Captain".
-    _capture_lfg_components(data.get("_channel_id"), [_lfg_item("Captain", vagabond)])
+    _capture_lfg_components(data.get("_channel_id"), [_lfg_row_item("Captain", found)])
 
     return JsonResponse({
         "type": RESPONSE_CHANNEL_MESSAGE,
@@ -331,9 +398,13 @@ def _handle_card_command(data):
     if not card:
         return _ephemeral(f'No card found matching "{name or from_slug or tag}".')
 
+    # Card rows have no timestamp of their own: the post's date_updated plus the
+    # 'cards' index version (bumped by every Card/DeckGroup save) keys the embed.
+    token = f"{freshness_token(card.group.post.date_updated)}-{current_versions(['cards'])[0]}"
+    embed = cached_embed("card", card.pk, token, lambda: build_card_embed(card))
     return JsonResponse({
         "type": RESPONSE_CHANNEL_MESSAGE,
-        "data": {"embeds": [build_card_embed(card)]},
+        "data": {"embeds": [embed]},
     })
 
 
@@ -500,9 +571,10 @@ def _handle_law_command(data):
     if not law:
         return _ephemeral("No matching law found.")
 
+    embed = cached_embed("law", law.pk, current_versions(["laws"])[0], lambda: build_law_embed(law))
     return JsonResponse({
         "type": RESPONSE_CHANNEL_MESSAGE,
-        "data": {"embeds": [build_law_embed(law)]},
+        "data": {"embeds": [embed]},
     })
 
 
@@ -1401,8 +1473,28 @@ def _handle_lfg_start(payload):
     })
 
 
+def warm_lookup_embeds(language):
+    """Build and store the embed of every published post for each post lookup
+    command and /captain (run by warm_discord_embeds_task). Overwrites existing
+    entries, so edits that don't touch date_updated are picked up. Returns the
+    number of embeds stored."""
+    builders = {name: (qs, _lookup_embed) for name, qs in LOOKUP_QUERYSETS.items()}
+    builders["captain"] = (_captain_queryset, _captain_embed)
+    stored = 0
+    for command, (queryset_factory, build) in builders.items():
+        embeds = {}
+        for post in queryset_factory().filter(status__lte=4).select_related("designer"):
+            try:
+                embeds[embed_key(command, post.pk, post.date_updated, language)] = build(post)
+            except Exception:
+                logger.exception("could not build the /%s embed for post %s", command, post.pk)
+        store_embeds(embeds)
+        stored += len(embeds)
+    return stored
+
+
 COMMAND_HANDLERS = {
-    name: _make_lookup_handler(_LOOKUP_LABELS[name], qs)
+    name: _make_lookup_handler(name, _LOOKUP_LABELS[name], qs)
     for name, qs in LOOKUP_QUERYSETS.items()
 }
 COMMAND_HANDLERS["stats"] = _handle_stats_command
@@ -1588,7 +1680,9 @@ def _ac_law_post(query, _data):
 
 # Keyed by (command_name, focused_option_name) — the lookup commands all share
 # an option literally named "name", so the option name alone isn't enough.
-AUTOCOMPLETE_HANDLERS = {
+# These query the database on every keystroke; AUTOCOMPLETE_HANDLERS below answers
+# from the in-memory indexes and falls back to them.
+AUTOCOMPLETE_DB_HANDLERS = {
     ("stats", "player"): _ac_players,
     ("stats", "faction"): _ac_factions,
     ("stats", "series"): _ac_series,
@@ -1601,7 +1695,129 @@ AUTOCOMPLETE_HANDLERS = {
     ("law", "post"): _ac_law_post,
 }
 for _name, _qs in LOOKUP_QUERYSETS.items():
-    AUTOCOMPLETE_HANDLERS[(_name, "name")] = _title_ac(_qs)
+    AUTOCOMPLETE_DB_HANDLERS[(_name, "name")] = _title_ac(_qs)
+
+
+# ── Indexed autocomplete ──────────────────────────────────────────────────
+# The same suggestions, in the same order, from per-process substring indexes
+# (services/autocomplete_index.py) reloaded when a signal bumps their version.
+# Each loader returns (searchable texts, choice) rows; a choice is the dict Discord
+# receives, except /card `name`, whose rows also carry the slugs of the posts
+# holding the name for the `from` filter. The /upcoming options depend on the
+# clock and stay on the database.
+def _title_rows(queryset_factory):
+    def load():
+        titles = queryset_factory().filter(status__lte=4).values_list("title", flat=True)
+        return [((t,), {"name": t, "value": t}) for t in titles]
+    return load
+
+
+def _captain_rows():
+    titles = Vagabond.objects.filter(status__lte=4, captain=True).values_list("title", flat=True)
+    return [((t,), {"name": t, "value": t}) for t in titles]
+
+
+def _card_name_rows():
+    slugs_by_name = {}
+    rows = (Card.objects.filter(group__post__status__lte=4)
+            .exclude(name__isnull=True).exclude(name="")
+            .order_by("name").values_list("name", "group__post__slug"))
+    for name, slug in rows:
+        slugs_by_name.setdefault(name, set()).add(slug)
+    return [((name,), ({"name": name, "value": name}, frozenset(slugs)))
+            for name, slugs in slugs_by_name.items()]
+
+
+def _card_from_rows():
+    has_cards = Card.objects.filter(group__post=OuterRef("pk"))
+    rows = (Post.objects.filter(Exists(has_cards), status__lte=4)
+            .exclude(slug__isnull=True).values_list("title", "slug"))
+    return [((title,), {"name": title, "value": slug}) for title, slug in rows]
+
+
+def _player_rows():
+    rows = (Profile.objects.exclude(slug__isnull=True)
+            .order_by("display_name").values_list("display_name", "discord", "slug"))
+    return [((dn, disc), {"name": (dn or disc or slug), "value": slug}) for dn, disc, slug in rows]
+
+
+def _faction_rows():
+    rows = (Faction.objects.filter(status__lte=4).exclude(slug__isnull=True)
+            .values_list("title", "slug"))
+    return [((title,), {"name": title, "value": slug}) for title, slug in rows]
+
+
+def _series_rows():
+    rows = Tournament.objects.exclude(slug__isnull=True).order_by("name").values_list("name", "slug")
+    return [((name,), {"name": name, "value": slug}) for name, slug in rows]
+
+
+def _law_rows():
+    entries = []
+    for law_id, code, plain, title in _public_laws().values_list("id", "law_code", "plain_title", "title"):
+        name = (plain or title or "").strip()
+        if not name:
+            continue
+        label = (f"{code} - {name}" if code else name)[:100]
+        entries.append(((code, plain, title), {"name": label, "value": str(law_id)}))
+    return entries
+
+
+def _law_post_rows():
+    rows = Post.objects.filter(
+        Q(lawgroup__public=True, lawgroup__laws__language__code="en")
+        | Q(linked_laws__group__public=True, linked_laws__language__code="en")
+    ).distinct().exclude(slug__isnull=True).values_list("title", "slug")
+    seen = set()
+    entries = []
+    for title, slug in rows:
+        if slug not in seen:
+            seen.add(slug)
+            entries.append(((title,), {"name": title, "value": slug}))
+    return entries
+
+
+AUTOCOMPLETE_INDEXES = {
+    ("stats", "player"): AutocompleteIndex(["profiles"], _player_rows),
+    ("stats", "faction"): AutocompleteIndex(["posts"], _faction_rows),
+    ("stats", "series"): AutocompleteIndex(["tournaments"], _series_rows),
+    ("captain", "name"): AutocompleteIndex(["posts"], _captain_rows),
+    ("card", "name"): AutocompleteIndex(["posts", "cards"], _card_name_rows),
+    ("card", "from"): AutocompleteIndex(["posts", "cards"], _card_from_rows),
+    ("law", "law"): AutocompleteIndex(["laws"], _law_rows),
+    ("law", "post"): AutocompleteIndex(["posts", "laws"], _law_post_rows),
+}
+for _name, _qs in LOOKUP_QUERYSETS.items():
+    AUTOCOMPLETE_INDEXES[(_name, "name")] = AutocompleteIndex(["posts"], _title_rows(_qs))
+
+
+def _indexed_ac(key):
+    index, fallback = AUTOCOMPLETE_INDEXES[key], AUTOCOMPLETE_DB_HANDLERS[key]
+
+    def ac(query, data):
+        try:
+            return index.search(query)
+        except Exception:
+            logger.exception("autocomplete index unavailable for %s; querying the database", key)
+            return fallback(query, data)
+    return ac
+
+
+def _indexed_ac_card_name(query, data):
+    """/card `name` from the index, narrowed to the chosen `from` post's cards."""
+    from_slug = _get_option(data, "from")
+    predicate = (lambda row: from_slug in row[1]) if from_slug else None
+    try:
+        rows = AUTOCOMPLETE_INDEXES[("card", "name")].search(query, predicate=predicate)
+    except Exception:
+        logger.exception("autocomplete index unavailable for /card name; querying the database")
+        return _ac_card_name(query, data)
+    return [choice for choice, _slugs in rows]
+
+
+AUTOCOMPLETE_HANDLERS = dict(AUTOCOMPLETE_DB_HANDLERS)
+AUTOCOMPLETE_HANDLERS.update({key: _indexed_ac(key) for key in AUTOCOMPLETE_INDEXES})
+AUTOCOMPLETE_HANDLERS[("card", "name")] = _indexed_ac_card_name
 
 
 @csrf_exempt
@@ -1636,10 +1852,10 @@ def discord_interactions(request):
         command_name = data.get("name")
         handler = COMMAND_HANDLERS.get(command_name)
         if handler:
-            # Record usage (per guild/user/command) asynchronously — fire-and-forget
-            # so the DB write never delays the 3s response. Only known top-level
-            # commands are counted (not buttons or autocomplete).
-            record_bot_usage_task.delay(guild_id, user_id, command_name)
+            # Count usage (per guild/user/command/day) with one Redis HINCRBY; the
+            # flush_bot_usage_task folds the counters into BotUsage. Only known
+            # top-level commands are counted (not buttons or autocomplete).
+            record_usage(guild_id, user_id, command_name)
             try:
                 # Stash the invoking user (from the top-level payload, not `data`)
                 # so handlers can build author-attributed embeds (_author) and
@@ -0,0 +1,73 @@
+"""
+Compare Discord autocomplete latency: database handlers vs the in-memory indexes.
+
+Runs every indexed option's database handler (AUTOCOMPLETE_DB_HANDLERS) and its
+index-backed handler (AUTOCOMPLETE_HANDLERS) over the same queries, one empty and
+one, two, three and longer prefixes of real values, and prints p50/p99 per option in
+milliseconds. The indexes are loaded before timing, so the indexed numbers are
+steady state (one cache read for the version, then memory).
+
+    python manage.py benchmark_autocomplete
+    python manage.py benchmark_autocomplete --iterations 200 --option card:name
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from the_gatehouse.discord_interactions import (
+    AUTOCOMPLETE_DB_HANDLERS, AUTOCOMPLETE_HANDLERS, AUTOCOMPLETE_INDEXES,
+)
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _queries(index):
+    """'' plus prefixes and a middle slice of the first few indexed values."""
+    queries = ['', 'zzqx']
+    for choice in index.search('', limit=5):
+        name = (choice[0] if isinstance(choice, tuple) else choice)['name']
+        queries.extend([name[:1], name[:2], name[:3], name[1:6], name])
+    return list(dict.fromkeys(queries))
+
+
+def _time(handler, queries, iterations):
+    samples = []
+    for _ in range(iterations):
+        for query in queries:
+            start = time.perf_counter()
+            handler(query, {"options": []})
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+class Command(BaseCommand):
+    help = "Benchmark Discord autocomplete handlers (database vs in-memory index)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Passes over each option\'s queries (default 50).')
+        parser.add_argument('--option', action='append', default=[],
+                            help='Only this command:option (repeatable), e.g. law:law.')
+
+    def handle(self, *args, **options):
+        keys = sorted(AUTOCOMPLETE_INDEXES)
+        if options['option']:
+            wanted = {tuple(o.split(':', 1)) for o in options['option']}
+            keys = [key for key in keys if key in wanted]
+
+        self.stdout.write(f"{'option':<22}{'rows':>7}{'db p50':>10}{'db p99':>10}"
+                          f"{'index p50':>11}{'index p99':>11}")
+        for key in keys:
+            index = AUTOCOMPLETE_INDEXES[key].get()
+            queries = _queries(AUTOCOMPLETE_INDEXES[key])
+            db = _time(AUTOCOMPLETE_DB_HANDLERS[key], queries, options['iterations'])
+            indexed = _time(AUTOCOMPLETE_HANDLERS[key], queries, options['iterations'])
+            self.stdout.write(
+                f"{':'.join(key):<22}{len(index):>7}"
+                f"{statistics.median(db):>10.2f}{_percentile(db, 99):>10.2f}"
+                f"{statistics.median(indexed):>11.3f}{_percentile(indexed, 99):>11.3f}"
+            )
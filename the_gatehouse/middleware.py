@@ -1,6 +1,10 @@
 import time
 import logging
+from collections import Counter
+from contextvars import ContextVar
 
+from celery.signals import before_task_publish
+from django.conf import settings
 from django.utils.timezone import localdate
 from django.utils.translation import activate
 from .models import DailyUserVisit
@@ -80,3 +84,40 @@ class RequestTimingMiddleware:
         if duration > 4:  # Only log if slower than 4 seconds
             logger.warning(f"Slow request: {request.path} took {duration:.2f}s")
         return response
+
+
+# Celery tasks published while handling the current request, by task name.
+_enqueued_tasks = ContextVar('enqueued_tasks', default=None)
+# Requests that enqueue more tasks than this are logged.
+TASKS_PER_REQUEST_WARNING = 5
+
+
+@before_task_publish.connect
+def _count_enqueued_task(sender=None, **kwargs):
+    counts = _enqueued_tasks.get()
+    if counts is not None:
+        counts[sender] += 1
+
+
+class TaskEnqueueCountMiddleware:
+    """Count the Celery tasks each request enqueues (including on_commit ones, which
+    run before the response leaves the view). Logs requests over the threshold, and
+    exposes the count as an X-Tasks-Enqueued header when DEBUG is on."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counts = Counter()
+        token = _enqueued_tasks.set(counts)
+        try:
+            response = self.get_response(request)
+        finally:
+            _enqueued_tasks.reset(token)
+
+        total = sum(counts.values())
+        if total > TASKS_PER_REQUEST_WARNING:
+            logger.warning(f"Request {request.method} {request.path} enqueued {total} tasks: {dict(counts)}")
+        if settings.DEBUG:
+            response['X-Tasks-Enqueued'] = str(total)
+        return response
@@ -1099,8 +1099,9 @@ class DailyUserVisit(models.Model):
 
 class BotUsage(models.Model):
     """Per-(guild, user, command) invocation count for the Discord bot. Stores raw
-    Discord snowflake strings (most bot users have no site Profile), incremented
-    atomically from a Celery task. guild_id is null for DM interactions."""
+    Discord snowflake strings (most bot users have no site Profile), incremented in
+    batches from Redis counters by flush_bot_usage_task (services/bot_usage.py).
+    guild_id is null for DM interactions."""
     guild_id = models.CharField(max_length=32, null=True, blank=True, db_index=True)
     user_id = models.CharField(max_length=32, db_index=True)
     command = models.CharField(max_length=50)
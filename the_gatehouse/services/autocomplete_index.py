@@ -0,0 +1,132 @@
+"""Per-process substring indexes for Discord autocomplete (discord_interactions.py).
+
+Discord sends an autocomplete interaction on every keystroke and gives us three
+seconds to answer, on the box that also serves the website. The option suggestions
+(post titles, card names, profile names, law codes and titles, tournament names) only
+change when an editor saves something, so each option's rows are loaded once into a
+`SubstringIndex` held in the process, and keystrokes are answered from memory.
+
+Freshness: every index depends on one or more version groups ('posts', 'cards',
+'profiles', 'laws', 'tournaments'), each a Redis counter. Signals
+(the_gatehouse/signals.py) bump a group when a row it covers is saved or deleted, and
+the next keystroke in each process sees the new version and reloads that index. A
+keystroke therefore costs one cache read, plus one query only right after a change.
+Like the stats generation (the_warroom/services/leaderboard_cache.py), a counter
+starts at the current time in milliseconds so an evicted key can't come back at an
+old version.
+
+Matching is case-insensitive substring, like the `icontains` queries it replaces:
+queries of three or more characters are narrowed through a trigram posting list and
+then verified, and shorter ones scan in order and stop at the limit.
+"""
+import logging
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'discord:autocomplete:version:{group}'
+GROUPS = ('posts', 'cards', 'profiles', 'laws', 'tournaments')
+CHOICE_LIMIT = 25  # Discord's maximum number of autocomplete choices
+GRAM = 3
+# Joins an entry's searchable fields so a match can't span two of them.
+_SEPARATOR = '\x00'
+
+
+class SubstringIndex:
+    """Case-insensitive substring search over entries, returned in load order.
+
+    `entries` is an iterable of (texts, payload): `texts` the strings a query may
+    match, `payload` what `search` returns for the entry."""
+
+    def __init__(self, entries):
+        self._texts = []
+        self._payloads = []
+        self._grams = defaultdict(list)
+        for texts, payload in entries:
+            position = len(self._texts)
+            text = _SEPARATOR.join(t.casefold() for t in texts if t)
+            self._texts.append(text)
+            self._payloads.append(payload)
+            for gram in {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}:
+                self._grams[gram].append(position)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def search(self, query, limit=CHOICE_LIMIT, predicate=None):
+        """Payloads of the first `limit` entries containing `query` (and accepted by
+        `predicate(payload)`, if given)."""
+        needle = (query or '').casefold()
+        if len(needle) < GRAM:
+            candidates = range(len(self._texts))
+        else:
+            postings = []
+            for i in range(len(needle) - GRAM + 1):
+                posting = self._grams.get(needle[i:i + GRAM])
+                if posting is None:
+                    return []
+                postings.append(posting)
+            # Positions are ascending, so the shortest list keeps load order.
+            candidates = min(postings, key=len)
+        results = []
+        for position in candidates:
+            if needle in self._texts[position]:
+                payload = self._payloads[position]
+                if predicate is None or predicate(payload):
+                    results.append(payload)
+                    if len(results) >= limit:
+                        break
+        return results
+
+
+def current_versions(groups):
+    """The current version of each group, initializing missing counters."""
+    keys = [VERSION_KEY.format(group=group) for group in groups]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def bump_versions(*groups):
+    """Invalidate the indexes depending on `groups` in every process, once the
+    current transaction commits. Never raises."""
+    def _bump():
+        for group in groups:
+            key = VERSION_KEY.format(group=group)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, int(time.time() * 1000), timeout=None)
+            except Exception:
+                logger.warning('Autocomplete index: could not bump %s', key, exc_info=True)
+
+    transaction.on_commit(_bump)
+
+
+class AutocompleteIndex:
+    """A lazily loaded SubstringIndex over `load()`'s entries, reloaded when any of
+    `groups` moves to a new version."""
+
+    def __init__(self, groups, load):
+        self.groups = tuple(groups)
+        self.load = load
+        self._loaded = (None, None)  # (version, SubstringIndex), swapped as one
+
+    def get(self):
+        version = current_versions(self.groups)
+        loaded_version, index = self._loaded
+        if index is None or version != loaded_version:
+            # Concurrent threads may both rebuild; the last assignment wins.
+            index = SubstringIndex(self.load())
+            self._loaded = (version, index)
+        return index
+
+    def search(self, query, limit=CHOICE_LIMIT, predicate=None):
+        return self.get().search(query, limit=limit, predicate=predicate)
@@ -0,0 +1,148 @@
+"""Batched Discord bot usage counters.
+
+Every slash command used to enqueue record_bot_usage_task, which ran a
+get_or_create and an UPDATE ... count + 1 per invocation: a broker message and two
+row-locking writes per command, on the box that answers the interactions. The
+dispatcher now only does an HINCRBY on a Redis hash, and the periodic
+flush_bot_usage_task folds the hash into BotUsage in one pass.
+
+Design notes:
+- Counters live in one hash, PENDING_KEY, with a "day|guild|user|command" field per
+  (guild, user, command, day). The day isn't stored on BotUsage (one row per guild,
+  user and command). It's kept in the field so a backlog can be told apart, and so
+  the counters could feed per-day rows later.
+- A flush renames the hash to a private key (Lua, atomic) before reading it.
+  Increments that land during the flush start a new PENDING_KEY, so none are lost
+  or counted twice.
+- The rows are applied with one SELECT, then one UPDATE of the existing rows that
+  adds each counter in SQL (count = count + CASE pk ...), plus a bulk_create of the
+  new ones. The addition happens in the database because record_bot_usage_task
+  (the fallback below) increments the same rows at any time; writing back counts
+  read earlier would drop those increments. This isn't an ON CONFLICT upsert,
+  because DM rows have a NULL guild_id, which Postgres never treats as a conflict.
+  A row the fallback creates between the SELECT and the insert fails the flush on
+  the unique constraint, and the counts are re-queued for the next one. A lock
+  keeps to one flush at a time.
+- A flush that fails adds its counts back to PENDING_KEY.
+- Fail open: if Redis is unreachable when recording, the old per-invocation
+  record_bot_usage_task is enqueued instead.
+"""
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'discord:bot_usage:pending'
+FLUSHING_KEY = 'discord:bot_usage:flushing:{token}'
+FLUSH_LOCK = 'discord:bot_usage:flush_lock'
+FLUSH_LOCK_TTL = 5 * 60
+# Pending counters outlive a few missed flushes, not an abandoned deployment.
+PENDING_TTL = 7 * 24 * 60 * 60
+
+# Rename KEYS[1] to KEYS[2] if it exists; returns 1 if renamed.
+_TAKE_LUA = (
+    "if redis.call('exists', KEYS[1]) == 1 then "
+    "redis.call('rename', KEYS[1], KEYS[2]) return 1 else return 0 end"
+)
+
+
+def _redis():
+    return cache._cache.get_client(write=True)
+
+
+def _field(day, guild_id, user_id, command):
+    return f'{day}|{guild_id or ""}|{user_id}|{command}'
+
+
+def _parse(field):
+    if isinstance(field, bytes):
+        field = field.decode()
+    day, guild_id, user_id, command = field.split('|', 3)
+    return day, guild_id or None, user_id, command
+
+
+def record_usage(guild_id, user_id, command):
+    """Count one invocation. Called from the interaction dispatcher: one round trip
+    (HINCRBY plus the hash's EXPIRE)."""
+    if not user_id:
+        return
+    field = _field(timezone.now().date().isoformat(), guild_id, user_id, command)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hincrby(PENDING_KEY, field, 1)
+        pipe.expire(PENDING_KEY, PENDING_TTL)
+        pipe.execute()
+    except Exception:
+        logger.warning('bot usage: Redis unavailable, recording directly', exc_info=True)
+        from the_gatehouse.tasks import record_bot_usage_task
+        record_bot_usage_task.delay(guild_id, user_id, command)
+
+
+def apply_usage(counts, now=None):
+    """Add {(guild_id, user_id, command): n} to BotUsage. Returns rows written."""
+    from the_gatehouse.models import BotUsage
+
+    if not counts:
+        return 0
+    now = now or timezone.now()
+    # A user's rows are few, so one user_id__in read beats an OR per counter.
+    users = {user_id for _guild_id, user_id, _command in counts}
+    existing = {(row.guild_id, row.user_id, row.command): row
+                for row in BotUsage.objects.filter(user_id__in=users)}
+
+    updated, created = [], []
+    for key, n in counts.items():
+        row = existing.get(key)
+        if row is not None:
+            updated.append((row.pk, n))
+        else:
+            guild_id, user_id, command = key
+            created.append(BotUsage(guild_id=guild_id, user_id=user_id, command=command,
+                                    count=n, first_used=now, last_used=now))
+    with transaction.atomic():
+        for start in range(0, len(updated), 500):
+            batch = updated[start:start + 500]
+            added = Case(*[When(pk=pk, then=Value(n)) for pk, n in batch], output_field=IntegerField())
+            BotUsage.objects.filter(pk__in=[pk for pk, _n in batch]).update(
+                count=F('count') + added, last_used=now)
+        BotUsage.objects.bulk_create(created, batch_size=500)
+    return len(updated) + len(created)
+
+
+def flush():
+    """Move the pending counters into BotUsage. Returns rows written (None when
+    another flush holds the lock)."""
+    if not cache.add(FLUSH_LOCK, 1, FLUSH_LOCK_TTL):
+        return None
+    try:
+        r = _redis()
+        flushing = FLUSHING_KEY.format(token=uuid.uuid4().hex)
+        if not r.eval(_TAKE_LUA, 2, PENDING_KEY, flushing):
+            return 0
+        r.expire(flushing, PENDING_TTL)  # don't leak it if this worker dies
+        raw = r.hgetall(flushing)
+        counts = {}
+        for field, n in raw.items():
+            _day, guild_id, user_id, command = _parse(field)
+            key = (guild_id, user_id, command)
+            counts[key] = counts.get(key, 0) + int(n)
+        try:
+            written = apply_usage(counts)
+        except Exception:
+            logger.exception('bot usage: flush failed, re-queueing %d counters', len(raw))
+            pipe = r.pipeline()
+            for field, n in raw.items():
+                pipe.hincrby(PENDING_KEY, field, int(n))
+            pipe.expire(PENDING_KEY, PENDING_TTL)
+            pipe.execute()
+            raise
+        finally:
+            r.delete(flushing)
+        return written
+    finally:
+        cache.delete(FLUSH_LOCK)
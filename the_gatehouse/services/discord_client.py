@@ -0,0 +1,255 @@
+"""Shared Discord REST client for the bot-token calls in discordservice.py.
+
+Every bot call used to be a bare requests.post/get: a new TCP and TLS handshake per
+call, no notion of Discord's rate limits beyond failing on a 429, and a fresh
+POST /users/@me/channels before every DM. `DiscordClient` keeps one pooled
+`requests.Session` per process and returns plain `requests.Response` objects, so
+call sites keep their raise_for_status() / RequestException handling.
+
+Design notes:
+- Rate limits (https://discord.com/developers/docs/topics/rate-limits): a
+  response's X-RateLimit-Bucket names the bucket its route belongs to, and
+  X-RateLimit-Remaining / Reset-After say how much of it is left. A bucket is
+  shared per major parameter (channel, guild, webhook), so state is kept per
+  (bucket, major parameters). A call to an exhausted bucket waits for the reset
+  instead of drawing a 429.
+- A 429 is retried after its retry_after, up to MAX_RETRIES times. A global 429
+  holds every route. A wait longer than MAX_WAIT isn't slept through: the 429 is
+  returned, and the caller's error path (usually a Celery retry) takes over. That
+  includes a wait known before sending (an exhausted bucket, an active global
+  limit): nothing is sent, and the caller gets a 429 built locally, whose
+  retry_after is the time left, rather than a request Discord would refuse.
+- Bucket state is per process. Workers sharing the bot's global limit still see
+  the occasional 429, which the backoff absorbs.
+- DM channel ids don't change for a (bot, user) pair, so dm_channel() keeps them
+  in the cache for DM_CHANNEL_TTL and skips the open-DM call on later DMs.
+- fan_out() runs a function over many items on a few threads sharing the client's
+  connection pool, for bulk DMs such as notify_lfg_task. FAN_OUT_WORKERS stays below
+  POOL_SIZE so the workers never wait on a connection.
+- base_url is a constructor argument, so tests run the client against a local
+  fake Discord server.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+DISCORD_API = "https://discord.com/api/v10"
+DEFAULT_TIMEOUT = 10
+POOL_SIZE = 10
+FAN_OUT_WORKERS = 4
+MAX_RETRIES = 3
+# Longest rate-limit wait slept through in-process; longer ones go back to the caller.
+MAX_WAIT = 10.0
+
+DM_CHANNEL_KEY = 'discord:dm_channel:{user_id}'
+DM_CHANNEL_TTL = 60 * 60 * 24 * 30
+
+# Path segments whose following id is a major parameter (its own rate limit).
+_MAJOR = {'channels', 'guilds', 'webhooks'}
+_SNOWFLAKE = re.compile(r'^\d+$')
+
+
+def route_key(method, path):
+    """(route, major) for a request: `route` is the method plus the path with every
+    id replaced by {id}; `major` holds the ids of major parameters (and a webhook's
+    token), which Discord limits separately."""
+    parts = path.strip('/').split('?', 1)[0].split('/')
+    template, major = [], []
+    for i, part in enumerate(parts):
+        previous = parts[i - 1] if i else ''
+        is_webhook_token = i >= 2 and parts[i - 2] == 'webhooks'
+        if previous in _MAJOR or is_webhook_token:
+            major.append(part)
+            part = '{id}'
+        elif _SNOWFLAKE.match(part):
+            part = '{id}'
+        template.append(part)
+    return f"{method.upper()} /{'/'.join(template)}", tuple(major)
+
+
+def _retry_after(response):
+    """Seconds to wait from a 429's body (fractional) or Retry-After header."""
+    try:
+        return float(response.json()['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get('Retry-After', 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _local_429(method, url, wait):
+    """A 429 Response for a request held back by a known rate limit, shaped like
+    Discord's so raise_for_status() and _retry_after() treat it as one."""
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = 'Too Many Requests'
+    response.url = url
+    response.request = requests.Request(method, url).prepare()
+    response.headers['Retry-After'] = f'{wait:.3f}'
+    response.headers['Content-Type'] = 'application/json'
+    response._content = json.dumps({
+        'message': 'Rate limit known locally, request not sent.',
+        'retry_after': round(wait, 3),
+        'global': False,
+    }).encode()
+    return response
+
+
+def _is_global(response):
+    if response.headers.get('X-RateLimit-Global'):
+        return True
+    try:
+        return bool(response.json().get('global'))
+    except (ValueError, AttributeError):
+        return False
+
+
+class DiscordClient:
+    """A pooled, rate-limit-aware client for Discord's REST API."""
+
+    def __init__(self, token, base_url=DISCORD_API, pool_size=POOL_SIZE,
+                 max_retries=MAX_RETRIES, max_wait=MAX_WAIT):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bot {token}',
+            'User-Agent': 'DiscordBot (https://therootdatabase.com, 1.0)',
+        })
+        self._lock = threading.Lock()
+        self._buckets = {}   # route -> bucket hash from X-RateLimit-Bucket
+        self._limits = {}    # (bucket or route, major) -> (remaining, reset_at)
+        self._global_reset_at = 0.0
+
+    def _limit_key(self, route, major):
+        return self._buckets.get(route, route), major
+
+    def _wait_time(self, route, major):
+        """Seconds to hold off before calling `route`, reserving a slot in its
+        bucket when one is left."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._global_reset_at - now)
+            key = self._limit_key(route, major)
+            remaining, reset_at = self._limits.get(key, (None, 0.0))
+            if remaining is not None and reset_at > now:
+                if remaining <= 0:
+                    wait = max(wait, reset_at - now)
+                else:
+                    # Concurrent callers each take a slot rather than all bursting.
+                    self._limits[key] = (remaining - 1, reset_at)
+        return wait
+
+    def _record(self, route, major, response):
+        headers = response.headers
+        bucket = headers.get('X-RateLimit-Bucket')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        with self._lock:
+            if bucket:
+                self._buckets[route] = bucket
+            if remaining is not None and reset_after is not None:
+                try:
+                    self._limits[self._limit_key(route, major)] = (
+                        int(remaining), time.monotonic() + float(reset_after))
+                except ValueError:
+                    pass
+
+    def request(self, method, path, timeout=DEFAULT_TIMEOUT, **kwargs):
+        """Send `method` to base_url + `path`, waiting out known rate limits and
+        retrying 429s. Returns the Response (a 429 only when the retries ran out or
+        the wait exceeded max_wait, in which case nothing was sent); raises requests.RequestException on network
+        errors, like requests itself."""
+        route, major = route_key(method, path)
+        url = f'{self.base_url}{path}'
+        attempt = 0
+        while True:
+            wait = self._wait_time(route, major)
+            if wait > self.max_wait:
+                logger.warning('Discord rate limit on %s: %.1fs left, not sending', route, wait)
+                return _local_429(method, url, wait)
+            if wait > 0:
+                time.sleep(wait)
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+            self._record(route, major, response)
+            if response.status_code != 429:
+                return response
+
+            retry_after = _retry_after(response)
+            if _is_global(response):
+                with self._lock:
+                    self._global_reset_at = time.monotonic() + retry_after
+            attempt += 1
+            if attempt > self.max_retries or retry_after > self.max_wait:
+                logger.warning('Discord 429 on %s (retry_after %.1fs), giving up after %d attempt(s)',
+                               route, retry_after, attempt)
+                return response
+            logger.info('Discord 429 on %s, retrying in %.2fs', route, retry_after)
+            time.sleep(retry_after)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def dm_channel(self, user_id):
+        """The DM channel id with a Discord user, opening it on a cache miss. Raises
+        requests.RequestException if Discord refuses (403: no shared server)."""
+        key = DM_CHANNEL_KEY.format(user_id=user_id)
+        try:
+            channel_id = cache.get(key)
+        except Exception:
+            logger.warning('DM channel cache unavailable', exc_info=True)
+            channel_id = None
+        if channel_id:
+            return channel_id
+        response = self.post('/users/@me/channels', json={'recipient_id': str(user_id)})
+        response.raise_for_status()
+        channel_id = response.json()['id']
+        try:
+            cache.set(key, channel_id, DM_CHANNEL_TTL)
+        except Exception:
+            logger.warning('DM channel cache: could not store %s', key, exc_info=True)
+        return channel_id
+
+    def forget_dm_channel(self, user_id):
+        """Drop a cached DM channel id (e.g. after Discord answered 404 for it)."""
+        try:
+            cache.delete(DM_CHANNEL_KEY.format(user_id=user_id))
+        except Exception:
+            logger.warning('DM channel cache: could not forget %s', user_id, exc_info=True)
+
+
+def fan_out(fn, items, max_workers=FAN_OUT_WORKERS):
+    """[fn(item) for item in items], run on up to `max_workers` threads. Results keep
+    the order of `items`. An exception from `fn` propagates, so pass a function that
+    handles its own failures (send_dm_by_id never raises). Meant for network calls:
+    a thread that touches the ORM opens its own database connection."""
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
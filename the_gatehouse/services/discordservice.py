@@ -1,6 +1,8 @@
 import requests
 import json
 import re
+import threading
+import time
 import emoji
 
 from datetime import timedelta
@@ -14,6 +16,7 @@ from django.core.files.base import ContentFile
 from django.utils import timezone
 
 from the_gatehouse.models import DiscordGuild, DiscordGuildJoinRequest
+from the_gatehouse.services.discord_client import DiscordClient
 
 from django.urls import reverse
 from django.templatetags.static import static
@@ -33,13 +36,30 @@ with open('/etc/config.json') as config_file:
 
 
 def _bot_headers():
-    """Auth headers for Discord bot REST calls (DMs, command registration)."""
+    """Auth headers for one-off bot REST calls (register_discord_commands); the
+    service functions below go through bot_client()."""
     return {
         "Authorization": f"Bot {config['DISCORD_BOT_TOKEN']}",
         "Content-Type": "application/json",
     }
 
 
+_BOT_CLIENT = None
+_BOT_CLIENT_LOCK = threading.Lock()
+
+
+def bot_client():
+    """The process's shared DiscordClient (services/discord_client.py) for bot REST
+    calls: pooled connections, rate-limit buckets and the DM channel cache. Built on
+    first use, so each forked worker gets its own connection pool."""
+    global _BOT_CLIENT
+    if _BOT_CLIENT is None:
+        with _BOT_CLIENT_LOCK:
+            if _BOT_CLIENT is None:
+                _BOT_CLIENT = DiscordClient(config["DISCORD_BOT_TOKEN"], base_url=DISCORD_API)
+    return _BOT_CLIENT
+
+
 # send_discord_dm result codes
 DM_OK = "ok"            # delivered
 DM_BLOCKED = "blocked"  # permanent: no shared server / DMs disabled / no Discord ID — do not retry
@@ -88,16 +108,11 @@ def send_dm_by_id(discord_id, content=None, embed=None, force=False):
     if not discord_id:
         return DM_BLOCKED
 
-    # 1) Open (or fetch) the DM channel with this user
+    client = bot_client()
+
+    # 1) Open (or fetch) the DM channel with this user; cached after the first DM
     try:
-        ch = requests.post(
-            f"{DISCORD_API}/users/@me/channels",
-            headers=_bot_headers(),
-            json={"recipient_id": str(discord_id)},
-            timeout=10,
-        )
-        ch.raise_for_status()
-        channel_id = ch.json()["id"]
+        channel_id = client.dm_channel(discord_id)
     except requests.RequestException as e:
         if _is_terminal_http_error(e):
             logger.info("Cannot DM %s (channel open 403, no shared server).", discord_id)
@@ -113,12 +128,12 @@ def send_dm_by_id(discord_id, content=None, embed=None, force=False):
         payload["embeds"] = [embed]
 
     try:
-        msg = requests.post(
-            f"{DISCORD_API}/channels/{channel_id}/messages",
-            headers=_bot_headers(),
-            json=payload,
-            timeout=10,
-        )
+        msg = client.post(f"/channels/{channel_id}/messages", json=payload)
+        if msg.status_code == 404:
+            # The cached channel is gone (Unknown Channel): open a fresh one once.
+            client.forget_dm_channel(discord_id)
+            channel_id = client.dm_channel(discord_id)
+            msg = client.post(f"/channels/{channel_id}/messages", json=payload)
         # 403 here usually means the bot and user share no server, or the
         # user has DMs from server members disabled.
         msg.raise_for_status()
@@ -145,9 +160,8 @@ def create_message_thread(channel_id, message_id, name, auto_archive_duration=14
     which also post live), not an unsolicited DM."""
     name = (name or "Game")[:100]  # Discord thread name cap
     try:
-        r = requests.post(
-            f"{DISCORD_API}/channels/{channel_id}/messages/{message_id}/threads",
-            headers=_bot_headers(),
+        r = bot_client().post(
+            f"/channels/{channel_id}/messages/{message_id}/threads",
             json={"name": name, "auto_archive_duration": auto_archive_duration},
             timeout=5,
         )
@@ -182,9 +196,8 @@ def create_forum_thread(forum_channel_id, name, content=None, embeds=None, tag_i
     if tag_id:
         body["applied_tags"] = [str(tag_id)]
     try:
-        r = requests.post(
-            f"{DISCORD_API}/channels/{forum_channel_id}/threads",
-            headers=_bot_headers(),
+        r = bot_client().post(
+            f"/channels/{forum_channel_id}/threads",
             json=body,
             timeout=5,
         )
@@ -199,9 +212,8 @@ def post_channel_message(channel_id, content):
     """Post a message into a channel/thread. Returns THREAD_OK / THREAD_ERROR.
     Never raises. No DEBUG_VALUE guard — see create_message_thread."""
     try:
-        r = requests.post(
-            f"{DISCORD_API}/channels/{channel_id}/messages",
-            headers=_bot_headers(),
+        r = bot_client().post(
+            f"/channels/{channel_id}/messages",
             json={"content": content},
             timeout=5,
         )
@@ -216,9 +228,8 @@ def edit_channel_message(channel_id, message_id, embeds):
     """Edit an existing bot message's embeds (PATCH). Returns THREAD_OK / THREAD_ERROR.
     Never raises. No DEBUG_VALUE guard — see create_message_thread."""
     try:
-        r = requests.patch(
-            f"{DISCORD_API}/channels/{channel_id}/messages/{message_id}",
-            headers=_bot_headers(),
+        r = bot_client().patch(
+            f"/channels/{channel_id}/messages/{message_id}",
             json={"embeds": embeds},
             timeout=5,
         )
@@ -235,9 +246,8 @@ def get_bot_guilds():
     or None on failure. Each item is a dict with at least 'id' and 'name'.
     """
     try:
-        response = requests.get(
-            f"{DISCORD_API}/users/@me/guilds",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            "/users/@me/guilds",
             timeout=10,
         )
         response.raise_for_status()
@@ -260,9 +270,8 @@ def bot_in_guild(guild_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/guilds/{guild_id}",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/guilds/{guild_id}",
             timeout=10,
         )
         if response.status_code in (403, 404):
@@ -282,7 +291,7 @@ def register_guild_commands(guild):
     ~instant (unlike global). Call on bot-add and whenever the whitelist changes."""
     from .discord_commands import commands_for_guild, lfg_command_for_roles
     app_id = config["DISCORD_ID"]  # OAuth client ID doubles as the application ID
-    url = f"{DISCORD_API}/applications/{app_id}/guilds/{guild.guild_id}/commands"
+    path = f"/applications/{app_id}/guilds/{guild.guild_id}/commands"
     # commands_for_guild returns references to the shared module-level command dicts, so
     # build a NEW list and substitute the /lfg element with the per-guild variant (SINGLE
     # vs MULTI, choices baked from this guild's tags). lfg_command_for_roles deep-copies,
@@ -295,7 +304,7 @@ def register_guild_commands(guild):
     else:
         body = base
     try:
-        resp = requests.put(url, headers=_bot_headers(), json=body, timeout=10)
+        resp = bot_client().put(path, json=body)
         resp.raise_for_status()
         return True
     except requests.RequestException:
@@ -320,9 +329,8 @@ def get_guild_roles(guild_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/guilds/{guild_id}/roles",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/guilds/{guild_id}/roles",
             timeout=10,
         )
         response.raise_for_status()
@@ -351,9 +359,8 @@ def _get_guild_role_permissions(guild_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/guilds/{guild_id}/roles",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/guilds/{guild_id}/roles",
             timeout=10,
         )
         response.raise_for_status()
@@ -453,9 +460,8 @@ def _get_guild(guild_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/guilds/{guild_id}",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/guilds/{guild_id}",
             timeout=10,
         )
         response.raise_for_status()
@@ -477,9 +483,8 @@ def get_guild_forum_channels(guild_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/guilds/{guild_id}/channels",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/guilds/{guild_id}/channels",
             timeout=10,
         )
         response.raise_for_status()
@@ -507,9 +512,8 @@ def get_forum_channel_info(channel_id):
     if cached is not None:
         return cached
     try:
-        response = requests.get(
-            f"{DISCORD_API}/channels/{channel_id}",
-            headers=_bot_headers(),
+        response = bot_client().get(
+            f"/channels/{channel_id}",
             timeout=10,
         )
         response.raise_for_status()
@@ -1165,21 +1169,39 @@ LAW_GROUP_TYPE_LABELS = {
 }
 
 
-_APP_EMOJI = None  # cache: {emoji_name: "<:name:id>"}, populated once per process
+# The application emoji map is shared by every web process and Celery worker through
+# Redis, so no interaction waits on GET /applications/{id}/emojis:
+# - refresh_application_emoji_task fetches the map and stores it under
+#   APP_EMOJI_CACHE_KEY with its fetch time. It runs on the beat schedule (e.g.
+#   every few hours), at Celery worker startup, and whenever a reader finds the map
+#   missing or older than APP_EMOJI_FRESH_FOR.
+# - Readers never fetch. They serve the stored map even when it's stale
+#   (stale-while-revalidate) and enqueue at most one refresh per
+#   APP_EMOJI_REFRESH_LOCK_TTL. With no map at all (a cold Redis), emoji are
+#   dropped, as for an emoji that was never uploaded, until the refresh lands.
+# - A failed fetch keeps the previous map instead of caching {}.
+# Each process also memoizes the map for APP_EMOJI_LOCAL_TTL, since one embed looks
+# up several emoji.
+APP_EMOJI_CACHE_KEY = "discord:app_emoji"
+APP_EMOJI_REFRESH_LOCK = "discord:app_emoji:refreshing"
+APP_EMOJI_FRESH_FOR = 6 * 60 * 60
+APP_EMOJI_REFRESH_LOCK_TTL = 5 * 60
+APP_EMOJI_LOCAL_TTL = 60
+
+_APP_EMOJI = (None, 0.0)  # ({emoji_name: "<:name:id>"}, monotonic read time)
 
 
 def _fetch_application_emoji():
     """Fetch the bot's application-owned emoji from Discord, returning a
     {name: "<:name:id>"} map (animated emoji use the "<a:name:id>" form).
-    Returns {} on any failure (network, auth, unexpected shape)."""
+    Returns None on any failure (network, auth, unexpected shape)."""
     try:
-        url = f"{DISCORD_API}/applications/{config['DISCORD_ID']}/emojis"
-        response = requests.get(url, headers=_bot_headers(), timeout=10)
+        response = bot_client().get(f"/applications/{config['DISCORD_ID']}/emojis")
         response.raise_for_status()
         items = response.json().get("items", [])
     except (requests.RequestException, ValueError, KeyError):
         logger.exception("Failed to fetch application emoji")
-        return {}
+        return None
 
     emoji_map = {}
     for item in items:
@@ -1192,12 +1214,53 @@ def _fetch_application_emoji():
     return emoji_map
 
 
+def refresh_application_emoji():
+    """Fetch the emoji map from Discord and store it for every process. Returns
+    (map, changed), or (None, False) when the fetch failed and the stored map was
+    kept."""
+    global _APP_EMOJI
+    emoji_map = _fetch_application_emoji()
+    cache.delete(APP_EMOJI_REFRESH_LOCK)
+    if emoji_map is None:
+        return None, False
+    previous = cache.get(APP_EMOJI_CACHE_KEY)
+    cache.set(APP_EMOJI_CACHE_KEY, {"map": emoji_map, "fetched_at": time.time()}, timeout=None)
+    _APP_EMOJI = (emoji_map, time.monotonic())
+    return emoji_map, not previous or previous.get("map") != emoji_map
+
+
+def application_emoji_needs_refresh(entry):
+    return not entry or time.time() - entry.get("fetched_at", 0) > APP_EMOJI_FRESH_FOR
+
+
+def _request_emoji_refresh():
+    """Enqueue one refresh_application_emoji_task across all processes."""
+    try:
+        if cache.add(APP_EMOJI_REFRESH_LOCK, 1, APP_EMOJI_REFRESH_LOCK_TTL):
+            from the_gatehouse.tasks import refresh_application_emoji_task
+            refresh_application_emoji_task.delay()
+    except Exception:
+        logger.warning("Could not enqueue an application emoji refresh", exc_info=True)
+
+
 def get_application_emoji():
-    """Lazily fetch and cache the application emoji map for this process."""
+    """The application emoji map from the shared cache, without ever calling
+    Discord. Stale or missing maps are served as-is ({} when missing) while a
+    refresh is enqueued."""
     global _APP_EMOJI
-    if _APP_EMOJI is None:
-        _APP_EMOJI = _fetch_application_emoji()
-    return _APP_EMOJI
+    emoji_map, read_at = _APP_EMOJI
+    if emoji_map is not None and time.monotonic() - read_at < APP_EMOJI_LOCAL_TTL:
+        return emoji_map
+    try:
+        entry = cache.get(APP_EMOJI_CACHE_KEY)
+    except Exception:
+        logger.warning("Application emoji cache unavailable", exc_info=True)
+        return emoji_map or {}
+    if application_emoji_needs_refresh(entry):
+        _request_emoji_refresh()
+    emoji_map = entry["map"] if entry else {}
+    _APP_EMOJI = (emoji_map, time.monotonic())
+    return emoji_map
 
 
 def law_emoji_for(keyword):
@@ -0,0 +1,91 @@
+"""Cache of built Discord embeds for the lookup commands (discord_interactions.py).
+
+/faction, /map, /deck (and the other post lookups), /captain, /card and /law reply
+with an embed that's the same for every invocation until its source changes, but
+used to be rebuilt each time: related rows, emoji, image URLs, field construction
+and _enforce_embed_limits, inside Discord's three-second window. The built embed is
+stored here as JSON, keyed by
+
+- the command ('faction', 'captain', 'card', 'law', ...),
+- the object's id (post, card or law),
+- the active language (embed labels are translated),
+- a freshness token: the post's date_updated, which the edit forms set; for laws,
+  which have no timestamp, the 'laws' autocomplete version (services/
+  autocomplete_index.py), which every Law and LawGroup save bumps.
+- the application emoji map (a short fingerprint of it). The map is {} until the
+  first refresh_application_emoji_task has run, and an embed built then has no
+  icons; it's keyed apart, so it isn't served once the emoji are known.
+
+Edits that don't touch date_updated (admin, image processing, the status task)
+are picked up when warm_discord_embeds_task rebuilds and overwrites the entries of
+every published post, or when an entry expires after EMBED_TTL. Schedule the task
+(e.g. hourly) in the Celery beat admin.
+"""
+import json
+import logging
+import zlib
+
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from the_gatehouse.services import discordservice
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'discord:embed'
+EMBED_TTL = 60 * 60 * 6
+
+
+def freshness_token(value):
+    """A key-safe token for a date_updated (or any version value)."""
+    if hasattr(value, 'timestamp'):
+        return str(int(value.timestamp() * 1_000_000))
+    return str(value)
+
+
+_EMOJI_FINGERPRINT = (None, '')
+
+
+def emoji_fingerprint():
+    """A key-safe token for the current application emoji map ('none' while it's
+    empty). Recomputed only when get_application_emoji() hands out a new map."""
+    global _EMOJI_FINGERPRINT
+    emoji_map = discordservice.get_application_emoji()
+    if not emoji_map:
+        return 'none'
+    seen, fingerprint = _EMOJI_FINGERPRINT
+    if seen is not emoji_map:
+        fingerprint = format(zlib.crc32(json.dumps(emoji_map, sort_keys=True).encode()), 'x')
+        _EMOJI_FINGERPRINT = (emoji_map, fingerprint)
+    return fingerprint
+
+
+def embed_key(command, obj_id, token, language=None):
+    return (f'{KEY_PREFIX}:{command}:{obj_id}:{language or get_language()}:{freshness_token(token)}'
+            f':{emoji_fingerprint()}')
+
+
+def cached_embed(command, obj_id, token, build):
+    """The embed for this object and token, building (and storing) it on a miss.
+    `build()` returns the embed dict, or None when there's nothing to show (not
+    cached). Falls back to build() if the cache is down."""
+    key = embed_key(command, obj_id, token)
+    try:
+        raw = cache.get(key)
+    except Exception:
+        logger.warning('Embed cache unavailable', exc_info=True)
+        return build()
+    if raw is not None:
+        return json.loads(raw)
+    embed = build()
+    if embed is not None:
+        store_embeds({key: embed})
+    return embed
+
+
+def store_embeds(embeds):
+    """Write {key: embed} entries, replacing what's there. Never raises."""
+    try:
+        cache.set_many({key: json.dumps(embed) for key, embed in embeds.items()}, EMBED_TTL)
+    except Exception:
+        logger.warning('Embed cache: could not store %d embed(s)', len(embeds), exc_info=True)
@@ -0,0 +1,99 @@
+"""Per-profile header stats for active_user_data (context_processors.py).
+
+The header and user menu show a logged-in user's post, game, box score and bookmark
+counts, their recent posts and whether they share workshop assets: nine queries,
+several of them DISTINCT counts over efforts, on every page render. They change only
+when the user posts, records, plays or bookmarks something, so they're computed once
+and cached per profile until a signal (the_gatehouse/signals.py) drops the entry.
+CACHE_TTL is only a safety net for changes that bypass signals (queryset.update(),
+raw SQL).
+
+Notifications, approved invites and upcoming matches are not cached: they're
+dismissed, accepted or go stale with the clock, and stay lazy querysets.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'gatehouse:header_stats'
+CACHE_TTL = 60 * 60
+
+DEFAULTS = {
+    'post_count': 0,
+    'recent_posts': [],
+    'in_process_games': 0,
+    'game_count': 0,
+    'recorded_game_count': 0,
+    'scorecard_count': 0,
+    'unassigned_scorecards': 0,
+    'bookmarks': 0,
+    'has_shared_assets': False,
+}
+
+
+def cache_key(profile_id):
+    return f'{KEY_PREFIX}:{profile_id}'
+
+
+def compute_header_stats(profile):
+    from the_keep.models import Post, PNPAsset
+    from the_warroom.models import Game, ScoreCard
+
+    return {
+        'post_count': Post.objects.filter(designer=profile).count(),
+        'recent_posts': list(Post.objects.filter(
+            Q(designer=profile) | Q(co_designers=profile, co_designers_can_edit=True)
+        ).exclude(status='9').order_by('-date_updated')[:3]),
+        'in_process_games': Game.objects.filter(final=False, recorder=profile).count(),
+        'game_count': Game.objects.filter(final=True, efforts__player=profile).distinct().count(),
+        'recorded_game_count': Game.objects.filter(recorder=profile).distinct().count(),
+        'scorecard_count': ScoreCard.objects.filter(recorder=profile, final=True).count(),
+        'unassigned_scorecards': ScoreCard.objects.filter(final=False, recorder=profile).count(),
+        'bookmarks': profile.bookmarkedposts.count() + profile.bookmarkedgames.count(),
+        # Drives the "My Resources" header sub-item; mirrors `shared_assets` in the
+        # workshop views but as a cheap global existence check.
+        'has_shared_assets': PNPAsset.objects.filter(shared_by=profile).exists(),
+    }
+
+
+def header_stats(profile):
+    """The cached stats for `profile`, computed on a miss. Never raises: the header
+    falls back to zeros rather than failing the page."""
+    key = cache_key(profile.pk)
+    try:
+        stats = cache.get(key)
+    except Exception:
+        logger.warning('Header stats cache unavailable', exc_info=True)
+        stats = None
+    if stats is not None:
+        return stats
+    try:
+        stats = compute_header_stats(profile)
+    except Exception:
+        logger.exception('Could not compute header stats for profile %s', profile.pk)
+        return DEFAULTS
+    try:
+        cache.set(key, stats, CACHE_TTL)
+    except Exception:
+        logger.warning('Header stats cache: could not store %s', key, exc_info=True)
+    return stats
+
+
+def invalidate_header_stats(*profile_ids):
+    """Drop the cached stats of these profiles once the current transaction commits
+    (at once in autocommit), so a render mid-transaction can't re-cache old counts."""
+    keys = [cache_key(pk) for pk in set(profile_ids) if pk]
+    if not keys:
+        return
+
+    def _delete():
+        try:
+            cache.delete_many(keys)
+        except Exception:
+            logger.warning('Header stats cache: could not invalidate %s', keys, exc_info=True)
+
+    transaction.on_commit(_delete)
@@ -4,7 +4,7 @@ from io import BytesIO
 from PIL import Image
 
 from django.core.cache import cache
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete, m2m_changed
 from django.shortcuts import redirect
 from django.dispatch import receiver
 from django.contrib import messages
@@ -17,12 +17,15 @@ from django.db import transaction
 
 from .models import Profile, ForegroundImage, BackgroundImage, Changelog, BotBlacklist
 from .services.discordservice import get_discord_id
+from .services.header_stats import invalidate_header_stats
+from .services import autocomplete_index
 from .utils import slugify_instance_discord, slugify_changelog, slugify_survey_title, build_absolute_uri
 from .tasks import send_discord_message_task, update_discord_avatar_task, refresh_user_guilds_task
 
 from the_keep.utils import resize_image_to_webp, delete_old_image, resize_image_in_place
 from the_keep.models import (Post, Piece, PostTranslation, Faction, Map, Deck, Vagabond, Landmark, Hireling, Tweak,
-                             Expansion, Card, DeckGroup)
+                             Expansion, Card, DeckGroup, PostBookmark, PNPAsset, Law, LawGroup)
+from the_warroom.models import Game, Effort, ScoreCard, GameBookmark, Tournament
 from the_tavern.models import Survey
 
 SMALL_ICON = 100
@@ -483,3 +486,117 @@ def bust_bot_blacklist_cache(sender, instance, **kwargs):
     """Clear the cached blacklist result for this entry so an admin block/unblock
     takes effect immediately instead of waiting out the interaction cache TTL."""
     cache.delete(f"botblacklist:{instance.kind}:{instance.discord_id}")
+
+
+# --- Header stats (services/header_stats.py) ---------------------------------------
+# Drop the cached header counts of every profile a change touches.
+
+@receiver([post_save, pre_delete])
+def invalidate_post_header_stats(sender, instance, **kwargs):
+    # Post subclasses (Faction, Map, ...) are sent as their own model. pre_delete, while
+    # the co-designer rows still exist.
+    if not isinstance(instance, Post):
+        return
+    invalidate_header_stats(instance.designer_id, *instance.co_designers.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Post.co_designers.through)
+def invalidate_co_designer_header_stats(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if isinstance(instance, Post):
+        ids = pk_set if action != 'pre_clear' else instance.co_designers.values_list('id', flat=True)
+        invalidate_header_stats(*ids)
+    else:
+        invalidate_header_stats(instance.pk)
+
+
+# The profile field of each model whose rows count toward one profile's header. A row
+# moved to another profile changes both profiles' counts, so pre_save keeps the old one.
+HEADER_OWNER_FIELDS = {Game: 'recorder', ScoreCard: 'recorder', PNPAsset: 'shared_by'}
+
+
+@receiver(pre_save, sender=Game)
+@receiver(pre_save, sender=ScoreCard)
+@receiver(pre_save, sender=PNPAsset)
+def snapshot_header_owner(sender, instance, update_fields=None, **kwargs):
+    field = HEADER_OWNER_FIELDS[sender]
+    instance._old_header_owner_id = None
+    if instance.pk and (update_fields is None or {field, f'{field}_id'} & set(update_fields)):
+        instance._old_header_owner_id = (
+            sender._base_manager.filter(pk=instance.pk).values_list(f'{field}_id', flat=True).first())
+
+
+def _old_header_owner(instance):
+    return getattr(instance, '_old_header_owner_id', None)
+
+
+@receiver([post_save, post_delete], sender=Game)
+def invalidate_game_header_stats(sender, instance, **kwargs):
+    players = [] if kwargs.get('signal') is post_delete else list(
+        instance.efforts.values_list('player_id', flat=True))
+    invalidate_header_stats(instance.recorder_id, _old_header_owner(instance), *players)
+
+
+@receiver([post_save, post_delete], sender=Effort)
+def invalidate_effort_header_stats(sender, instance, **kwargs):
+    # _old_player_id: the_warroom's effort_pre_save_snapshot, for a reassigned seat.
+    invalidate_header_stats(instance.player_id, getattr(instance, '_old_player_id', None))
+
+
+@receiver([post_save, post_delete], sender=ScoreCard)
+def invalidate_scorecard_header_stats(sender, instance, **kwargs):
+    invalidate_header_stats(instance.recorder_id, _old_header_owner(instance))
+
+
+@receiver([post_save, post_delete], sender=PostBookmark)
+@receiver([post_save, post_delete], sender=GameBookmark)
+def invalidate_bookmark_header_stats(sender, instance, **kwargs):
+    invalidate_header_stats(instance.player_id)
+
+
+@receiver([post_save, post_delete], sender=PNPAsset)
+def invalidate_asset_header_stats(sender, instance, **kwargs):
+    invalidate_header_stats(instance.shared_by_id, _old_header_owner(instance))
+
+
+# --- Discord autocomplete indexes (services/autocomplete_index.py) ------------------
+# Bump the version group of whatever a save or delete touches; saves that only write
+# fields no autocomplete shows (resized images, cached stats) are skipped.
+
+AUTOCOMPLETE_POST_FIELDS = {'title', 'slug', 'status', 'component', 'captain'}
+AUTOCOMPLETE_PROFILE_FIELDS = {'display_name', 'discord', 'slug'}
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver([post_save, post_delete])
+def bump_post_autocomplete(sender, instance, update_fields=None, **kwargs):
+    # Post subclasses (Faction, Map, ...) are sent as their own model
+    if isinstance(instance, Post) and _touches(update_fields, AUTOCOMPLETE_POST_FIELDS):
+        autocomplete_index.bump_versions('posts')
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def bump_profile_autocomplete(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, AUTOCOMPLETE_PROFILE_FIELDS):
+        autocomplete_index.bump_versions('profiles')
+
+
+@receiver([post_save, post_delete], sender=Card)
+@receiver([post_save, post_delete], sender=DeckGroup)
+def bump_card_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.bump_versions('cards')
+
+
+@receiver([post_save, post_delete], sender=Law)
+@receiver([post_save, post_delete], sender=LawGroup)
+def bump_law_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.bump_versions('laws')
+
+
+@receiver([post_save, post_delete], sender=Tournament)
+def bump_tournament_autocomplete(sender, instance, **kwargs):
+    autocomplete_index.bump_versions('tournaments')
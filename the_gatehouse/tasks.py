@@ -1,5 +1,7 @@
 from celery import shared_task
+from celery.signals import worker_ready
 from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import F
 from django.utils import timezone
@@ -9,6 +11,10 @@ from the_warroom.models import Game, Effort
 from .models import BotUsage, DiscordGuild, GuildLFGRole, LFGThread, Profile
 
 from .services.discordservice import send_discord_message, send_rich_discord_message, send_discord_dm, sync_bot_guilds, post_interaction_followup, update_discord_avatar, register_guild_commands, DM_ERROR
+from .services.discordservice import (
+    APP_EMOJI_CACHE_KEY, application_emoji_needs_refresh, refresh_application_emoji,
+)
+from .services import bot_usage
 from .services.context_service import get_daily_user_summary
 from .utils import format_bulleted_list
 
@@ -411,12 +417,59 @@ def register_guild_commands_task(guild_id):
         raise RuntimeError(f"guild command registration failed for {guild.guild_id}")
 
 
+@shared_task
+def refresh_application_emoji_task():
+    """Fetch the bot's application emoji into the shared cache (see
+    get_application_emoji). Meant for the beat schedule (e.g. every 6 hours); also
+    enqueued at worker startup and by readers that find the map stale. When the map
+    changed, the cached lookup embeds (which embed emoji) are rebuilt."""
+    emoji_map, changed = refresh_application_emoji()
+    if emoji_map is None:
+        raise RuntimeError("Failed to fetch application emoji from Discord")
+    if changed:
+        warm_discord_embeds_task.delay()
+    return len(emoji_map)
+
+
+@worker_ready.connect
+def warm_application_emoji(sender=None, **kwargs):
+    """Make sure a fresh emoji map is on its way when a worker comes up."""
+    try:
+        if application_emoji_needs_refresh(cache.get(APP_EMOJI_CACHE_KEY)):
+            refresh_application_emoji_task.delay()
+    except Exception:
+        logger.warning("Could not check the application emoji cache at startup", exc_info=True)
+
+
+@shared_task
+def warm_discord_embeds_task():
+    """Rebuild the cached lookup embeds of every published post in the default
+    language (services/embed_cache.py), so the first /faction, /map, ... after an
+    edit or an expiry is a cache hit. Meant for the beat schedule (e.g. hourly)."""
+    from django.conf import settings
+    from django.utils import translation
+    # Imported here: discord_interactions imports this module.
+    from .discord_interactions import warm_lookup_embeds
+
+    with translation.override(settings.LANGUAGE_CODE):
+        stored = warm_lookup_embeds(translation.get_language())
+    logger.info("Warmed %d Discord lookup embeds", stored)
+    return stored
+
+
+@shared_task
+def flush_bot_usage_task():
+    """Fold the Redis usage counters into BotUsage (services/bot_usage.py). Meant
+    for the beat schedule, every minute or so."""
+    return bot_usage.flush()
+
+
 @shared_task
 def record_bot_usage_task(guild_id, user_id, command):
-    # Best-effort per-(guild, user, command) usage count for the Discord bot.
-    # Fire-and-forget from the interaction dispatch, so it never delays the 3s
-    # response; a lost count is harmless. get_or_create + F() increment is atomic
-    # across workers (no read-modify-write race).
+    # Fallback for services/bot_usage.record_usage when Redis is unreachable:
+    # best-effort per-(guild, user, command) usage count for the Discord bot.
+    # get_or_create + F() increment is atomic across workers (no read-modify-write
+    # race).
     if not user_id:
         return
     try:
@@ -480,18 +533,23 @@ def notify_lfg_task(notify_ids, joiner_name, description, jump_url, owner_id=Non
     """DM every notify subscriber that a new player joined. The game host (owner_id)
     gets a host-specific line (they can start the game); everyone else is told they'll
     be pinged in the thread. Raw-id DMs (subscribers may have no Profile/SocialAccount);
-    Discord's 403 is swallowed per id."""
+    Discord's 403 is swallowed per id. The DMs go out a few at a time through the
+    shared client (fan_out), which waits out the DM route's rate limit."""
+    from .services.discord_client import fan_out
     from .services.discordservice import send_dm_by_id
     game = f"*{description}*" if description else "your game"
     link = f" {jump_url}" if jump_url else ""
-    for uid in notify_ids:
+
+    def notify(uid):
         if owner_id and str(uid) == str(owner_id):
             content = (f"**{joiner_name}** joined {game}.{link}\n"
                        "When it's full, press ✅ to start the thread and ping each player.")
         else:
             content = (f"**{joiner_name}** joined {game}.{link}\n"
                        "You'll be pinged in the game thread when it starts.")
-        send_dm_by_id(uid, content=content)
+        return send_dm_by_id(uid, content=content)
+
+    fan_out(notify, notify_ids)
 
 
 @shared_task
@@ -59,3 +59,400 @@ class UpdatePostStatusTaskTest(TestCase):
 
 
 
+
+
+class HeaderStatsTest(TestCase):
+    """Per-profile header counts are cached, lazy, and dropped by model signals."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from the_gatehouse.services.header_stats import cache_key
+        self.profile = Profile.objects.create(discord='header')
+        cache.delete(cache_key(self.profile.pk))
+
+    def test_cached_until_a_game_changes(self):
+        from the_gatehouse.services.header_stats import header_stats
+        game = Game.objects.create(final=True, recorder=self.profile)
+        self.assertEqual(header_stats(self.profile)['recorded_game_count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(header_stats(self.profile)['game_count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Effort.objects.create(game=game, player=self.profile)
+        self.assertEqual(header_stats(self.profile)['game_count'], 1)
+
+    def test_scorecard_moved_to_another_recorder(self):
+        from unittest import mock
+        from the_gatehouse.services.header_stats import header_stats
+        from the_warroom.models import ScoreCard
+        other = Profile.objects.create(discord='other-recorder')
+        with mock.patch('the_gatehouse.signals.resize_image_in_place'):
+            faction = Faction.objects.create(title='Riverfolk', component='Faction', animal='Otter',
+                                             designer=self.profile)
+        card = ScoreCard.objects.create(recorder=self.profile, faction=faction, final=True)
+        self.assertEqual(header_stats(self.profile)['scorecard_count'], 1)
+        self.assertEqual(header_stats(other)['scorecard_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            card.recorder = other
+            card.save()
+        self.assertEqual(header_stats(self.profile)['scorecard_count'], 0)
+        self.assertEqual(header_stats(other)['scorecard_count'], 1)
+
+    def test_reassigned_rows_drop_both_profiles(self):
+        from the_gatehouse.services.header_stats import header_stats
+        from the_keep.models import PNPAsset
+        other = Profile.objects.create(discord='other-owner')
+        game = Game.objects.create(final=True, recorder=self.profile)
+        effort = Effort.objects.create(game=game, player=self.profile)
+        asset = PNPAsset.objects.create(title='Cards', link='https://example.com/cards',
+                                        category='Other', shared_by=self.profile)
+        stats = header_stats(self.profile)
+        self.assertEqual((stats['game_count'], stats['recorded_game_count'], stats['has_shared_assets']),
+                         (1, 1, True))
+        stats = header_stats(other)
+        self.assertEqual((stats['game_count'], stats['recorded_game_count'], stats['has_shared_assets']),
+                         (0, 0, False))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            effort.player = other
+            effort.save()
+            game.recorder = other
+            game.save()
+            asset.shared_by = other
+            asset.save()
+        stats = header_stats(self.profile)
+        self.assertEqual((stats['game_count'], stats['recorded_game_count'], stats['has_shared_assets']),
+                         (0, 0, False))
+        stats = header_stats(other)
+        self.assertEqual((stats['game_count'], stats['recorded_game_count'], stats['has_shared_assets']),
+                         (1, 1, True))
+
+    def test_context_processor_is_lazy(self):
+        from unittest import mock
+        from django.contrib.auth.models import User
+        from django.test import RequestFactory
+        from the_gatehouse.context_processors import active_user_data
+
+        self.profile.user = User.objects.create(username='header')
+        self.profile.save()
+        request = RequestFactory().get('/')
+        request.user = self.profile.user
+        request.session = {}
+        with mock.patch('the_gatehouse.context_processors.get_theme') as get_theme, \
+                mock.patch('the_gatehouse.context_processors.header_stats',
+                           return_value={'game_count': 3, 'in_process_games': 1,
+                                         'unassigned_scorecards': 2}) as stats:
+            get_theme.return_value.get_artists.return_value = []
+            context = active_user_data(request)
+            stats.assert_not_called()
+            self.assertEqual(context['user_games_count'](), 3)
+            self.assertEqual(context['user_active_count'](), 3)
+        stats.assert_called_once()
+
+
+class AutocompleteIndexTest(TestCase):
+    """Discord autocomplete answers from the in-memory index, like the database handlers."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()  # the in-process indexes follow cache versions across tests
+        self.designer = Profile.objects.create(discord="designer")
+        for title in ("Woodland Alliance", "Lizard Cult", "Riverfolk Company"):
+            Faction.objects.create(title=title, animal="Fox", designer=self.designer,
+                                   status=StatusChoices.STABLE)
+
+    def test_substring_index(self):
+        from the_gatehouse.services.autocomplete_index import SubstringIndex
+        index = SubstringIndex([(("Alpha", "zed"), 1), (("Beta",), 2), (("alphabet",), 3)])
+        self.assertEqual(index.search("ALPH"), [1, 3])
+        self.assertEqual(index.search("al"), [1, 3])
+        self.assertEqual(index.search("aze"), [])  # doesn't span fields
+        self.assertEqual(index.search(""), [1, 2, 3])
+        self.assertEqual(index.search("a", limit=2), [1, 2])
+        self.assertEqual(index.search("alph", predicate=lambda p: p > 1), [3])
+
+    def test_matches_database_handler_and_reloads_on_bump(self):
+        from the_gatehouse.discord_interactions import AUTOCOMPLETE_DB_HANDLERS, AUTOCOMPLETE_HANDLERS
+        key = ("stats", "faction")
+        for query in ("", "o", "LIZ", "folk co", "nothing"):
+            self.assertEqual(AUTOCOMPLETE_HANDLERS[key](query, {}),
+                             AUTOCOMPLETE_DB_HANDLERS[key](query, {}), query)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Faction.objects.create(title="Lizard Two", animal="Lizard", designer=self.designer,
+                                   status=StatusChoices.STABLE)
+        with self.assertNumQueries(1):
+            names = [c["name"] for c in AUTOCOMPLETE_HANDLERS[key]("lizard", {})]
+        self.assertEqual(sorted(names), ["Lizard Cult", "Lizard Two"])
+        with self.assertNumQueries(0):
+            AUTOCOMPLETE_HANDLERS[key]("lizard", {})
+
+
+class LookupEmbedCacheTest(TestCase):
+    """Lookup commands resolve from memory and reply from the embed cache."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()  # the in-process indexes follow cache versions across tests
+        designer = Profile.objects.create(discord="designer")
+        self.faction = Faction.objects.create(title="Lizard Cult", animal="Lizard", designer=designer,
+                                              status=StatusChoices.STABLE)
+
+    def _lookup(self, name):
+        import json
+        from the_gatehouse.discord_interactions import COMMAND_HANDLERS
+        response = COMMAND_HANDLERS["faction"]({"name": "faction", "options": [{"name": "name", "value": name}]})
+        return json.loads(response.content)["data"]
+
+    def test_warmed_lookup_needs_no_queries(self):
+        from the_gatehouse.discord_interactions import LOOKUP_INDEXES
+        from the_gatehouse.tasks import warm_discord_embeds_task
+        self.assertGreaterEqual(warm_discord_embeds_task(), 1)
+        LOOKUP_INDEXES["faction"].get()
+        with self.assertNumQueries(0):
+            data = self._lookup("lizard")
+        self.assertEqual(data["embeds"][0]["title"], "Lizard Cult")
+        self.assertEqual(self._lookup("nothing like it")["content"], 'No faction found matching "nothing like it".')
+
+    def test_edit_changes_the_key(self):
+        self._lookup("Lizard Cult")
+        with self.captureOnCommitCallbacks(execute=True):
+            Faction.objects.filter(pk=self.faction.pk).update(title="Lizard Cult II",
+                                                               date_updated=timezone.now())
+            self.faction.refresh_from_db()
+            self.faction.save()
+        self.assertEqual(self._lookup("Lizard Cult")["embeds"][0]["title"], "Lizard Cult II")
+
+    def test_embed_built_without_emoji_is_not_served_once_they_load(self):
+        from unittest import mock
+        from the_gatehouse.services import discordservice
+        from the_gatehouse.services.embed_cache import cached_embed
+        build = mock.Mock(return_value={"title": "Lizard Cult"})
+        with mock.patch.object(discordservice, "get_application_emoji", return_value={}):
+            cached_embed("faction", self.faction.pk, self.faction.date_updated, build)
+            cached_embed("faction", self.faction.pk, self.faction.date_updated, build)
+        self.assertEqual(build.call_count, 1)
+        with mock.patch.object(discordservice, "get_application_emoji", return_value={"fox": "<:fox:1>"}):
+            cached_embed("faction", self.faction.pk, self.faction.date_updated, build)
+            cached_embed("faction", self.faction.pk, self.faction.date_updated, build)
+        self.assertEqual(build.call_count, 2)
+
+
+class ApplicationEmojiCacheTest(TestCase):
+    """Emoji are read from the shared cache; only the refresh task calls Discord."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from the_gatehouse.services import discordservice
+        cache.clear()
+        discordservice._APP_EMOJI = (None, 0.0)
+        self.addCleanup(setattr, discordservice, "_APP_EMOJI", (None, 0.0))
+
+    def test_readers_never_fetch_and_refresh_once(self):
+        from unittest import mock
+        from the_gatehouse.services import discordservice
+        with mock.patch.object(discordservice, "_fetch_application_emoji") as fetch, \
+                mock.patch("the_gatehouse.tasks.refresh_application_emoji_task.delay") as delay:
+            self.assertEqual(discordservice.get_application_emoji(), {})
+            discordservice._APP_EMOJI = (None, 0.0)
+            discordservice.get_application_emoji()
+        fetch.assert_not_called()
+        delay.assert_called_once()
+
+    def test_failed_refresh_keeps_the_stale_map(self):
+        from unittest import mock
+        from the_gatehouse.services import discordservice
+        from the_gatehouse.tasks import refresh_application_emoji_task
+        with mock.patch.object(discordservice, "_fetch_application_emoji", return_value={"fox": "<:fox:1>"}), \
+                mock.patch("the_gatehouse.tasks.warm_discord_embeds_task.delay") as warm:
+            refresh_application_emoji_task()
+        warm.assert_called_once()
+
+        with mock.patch.object(discordservice, "_fetch_application_emoji", return_value=None):
+            with self.assertRaises(RuntimeError):
+                refresh_application_emoji_task()
+        discordservice._APP_EMOJI = (None, 0.0)
+        with mock.patch.object(discordservice.time, "time", return_value=discordservice.time.time() + 86400), \
+                mock.patch("the_gatehouse.tasks.refresh_application_emoji_task.delay") as delay:
+            self.assertEqual(discordservice.get_application_emoji(), {"fox": "<:fox:1>"})
+        delay.assert_called_once()
+
+
+class BotUsageFlushTest(TestCase):
+    """Flushed usage counters are added to BotUsage in bulk."""
+
+    def test_apply_usage_adds_to_existing_rows(self):
+        from the_gatehouse.models import BotUsage
+        from the_gatehouse.services.bot_usage import _field, _parse, apply_usage
+        BotUsage.objects.create(guild_id=None, user_id="1", command="law", count=2)
+        self.assertEqual(_parse(_field("2026-10-17", None, "1", "law").encode()),
+                         ("2026-10-17", None, "1", "law"))
+
+        # One read, one UPDATE, one INSERT, plus the savepoint pair of atomic() in a TestCase.
+        with self.assertNumQueries(5):
+            written = apply_usage({(None, "1", "law"): 3, ("g", "1", "law"): 1, (None, "2", "map"): 4})
+        self.assertEqual(written, 3)
+        counts = {(u.guild_id, u.user_id, u.command): u.count for u in BotUsage.objects.all()}
+        self.assertEqual(counts, {(None, "1", "law"): 5, ("g", "1", "law"): 1, (None, "2", "map"): 4})
+
+    def test_apply_usage_keeps_increments_made_after_the_read(self):
+        from unittest import mock
+        from django.db.models import F
+        from the_gatehouse.models import BotUsage
+        from the_gatehouse.services.bot_usage import apply_usage
+        row = BotUsage.objects.create(guild_id="g", user_id="1", command="law", count=2)
+        real_filter = BotUsage.objects.filter
+        calls = []
+
+        def filter_then_increment(*args, **kwargs):
+            queryset = real_filter(*args, **kwargs)
+            if not calls:
+                # record_bot_usage_task landing between the flush's read and its write.
+                calls.append(list(queryset))
+                real_filter(pk=row.pk).update(count=F("count") + 1)
+                return calls[0]
+            return queryset
+
+        with mock.patch.object(BotUsage.objects, "filter", side_effect=filter_then_increment):
+            apply_usage({("g", "1", "law"): 3})
+        row.refresh_from_db()
+        self.assertEqual(row.count, 6)
+
+    def test_record_falls_back_to_task_without_redis(self):
+        from unittest import mock
+        from the_gatehouse.services.bot_usage import record_usage
+        with mock.patch("the_gatehouse.services.bot_usage._redis", side_effect=ConnectionError), \
+                mock.patch("the_gatehouse.tasks.record_bot_usage_task.delay") as delay:
+            record_usage("g", "1", "law")
+        delay.assert_called_once_with("g", "1", "law")
+
+
+class DiscordClientTest(TestCase):
+    """The bot REST client against a local fake Discord server."""
+
+    def setUp(self):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from django.core.cache import cache
+        cache.clear()
+        # (method, path) -> [(status, headers, body), ...]; the last reply repeats.
+        self.replies = {}
+        self.calls = []
+        test = self
+
+        class FakeDiscord(BaseHTTPRequestHandler):
+            def _reply(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                test.calls.append((self.command, self.path))
+                queue = test.replies.get((self.command, self.path)) or [(404, {}, {})]
+                status, headers, body = queue.pop(0) if len(queue) > 1 else queue[0]
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_PUT = _reply
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDiscord)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        from the_gatehouse.services.discord_client import DiscordClient
+        self.client = DiscordClient("token", base_url=f"http://127.0.0.1:{self.server.server_port}")
+
+    def test_route_key_keeps_major_parameters(self):
+        from the_gatehouse.services.discord_client import route_key
+        self.assertEqual(route_key("patch", "/channels/123/messages/456"),
+                         ("PATCH /channels/{id}/messages/{id}", ("123",)))
+        self.assertEqual(route_key("GET", "/applications/9/guilds/8/commands"),
+                         ("GET /applications/{id}/guilds/{id}/commands", ("8",)))
+
+    def test_429_is_retried_after_retry_after(self):
+        self.replies[("POST", "/channels/1/messages")] = [
+            (429, {}, {"message": "You are being rate limited.", "retry_after": 0.05, "global": False}),
+            (200, {}, {"id": "m"}),
+        ]
+        response = self.client.post("/channels/1/messages", json={"content": "hi"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_long_429_is_returned_to_the_caller(self):
+        self.replies[("GET", "/guilds/1")] = [(429, {"Retry-After": "60"}, {"retry_after": 60})]
+        self.assertEqual(self.client.get("/guilds/1").status_code, 429)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_exhausted_bucket_waits_for_reset(self):
+        import time
+        self.replies[("GET", "/guilds/1/roles")] = [(200, {
+            "X-RateLimit-Bucket": "roles", "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "0.3",
+        }, [])]
+        self.client.get("/guilds/1/roles")
+        start = time.monotonic()
+        self.client.get("/guilds/1/roles")
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        # Another guild is another bucket: no wait.
+        self.replies[("GET", "/guilds/2/roles")] = [(200, {}, [])]
+        start = time.monotonic()
+        self.client.get("/guilds/2/roles")
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    def test_known_long_limit_sends_nothing(self):
+        import requests
+        self.replies[("GET", "/guilds/1/roles")] = [(200, {
+            "X-RateLimit-Bucket": "roles", "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "60",
+        }, [])]
+        self.client.get("/guilds/1/roles")
+        response = self.client.get("/guilds/1/roles")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(response.json()["retry_after"], 50)
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+        self.assertEqual(len(self.calls), 1)
+
+        # A global 429 past max_wait holds every route, without sending.
+        self.replies[("POST", "/channels/1/messages")] = [
+            (429, {"X-RateLimit-Global": "true"}, {"retry_after": 60, "global": True})]
+        self.assertEqual(self.client.post("/channels/1/messages", json={}).status_code, 429)
+        self.assertEqual(self.client.get("/guilds/2").status_code, 429)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_send_dm_reuses_the_dm_channel(self):
+        from unittest import mock
+        from the_gatehouse.services import discordservice
+        self.replies[("POST", "/users/@me/channels")] = [(200, {}, {"id": "55"})]
+        self.replies[("POST", "/channels/55/messages")] = [(200, {}, {"id": "m"})]
+        with mock.patch.object(discordservice, "_BOT_CLIENT", self.client):
+            self.assertEqual(discordservice.send_dm_by_id("7", content="a", force=True), discordservice.DM_OK)
+            self.assertEqual(discordservice.send_dm_by_id("7", content="b", force=True), discordservice.DM_OK)
+            # The channel disappeared: reopened once, then delivered.
+            self.replies[("POST", "/channels/55/messages")] = [(404, {}, {"code": 10003})]
+            self.replies[("POST", "/users/@me/channels")] = [(200, {}, {"id": "56"})]
+            self.replies[("POST", "/channels/56/messages")] = [(200, {}, {"id": "m"})]
+            self.assertEqual(discordservice.send_dm_by_id("7", content="c", force=True), discordservice.DM_OK)
+        self.assertEqual([path for _method, path in self.calls], [
+            "/users/@me/channels", "/channels/55/messages", "/channels/55/messages",
+            "/channels/55/messages", "/users/@me/channels", "/channels/56/messages",
+        ])
+
+    def test_send_dm_blocked_on_403(self):
+        from unittest import mock
+        from the_gatehouse.services import discordservice
+        self.replies[("POST", "/users/@me/channels")] = [(403, {}, {"code": 50007})]
+        with mock.patch.object(discordservice, "_BOT_CLIENT", self.client):
+            self.assertEqual(discordservice.send_dm_by_id("7", content="a", force=True),
+                             discordservice.DM_BLOCKED)
+
+    def test_fan_out_keeps_order(self):
+        from the_gatehouse.services.discord_client import fan_out
+        self.assertEqual(fan_out(lambda n: n * n, range(10), max_workers=3), [n * n for n in range(10)])
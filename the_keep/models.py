@@ -1679,6 +1679,7 @@ class Faction(Post):
         link_builder: optional callable(faction) -> str URL. Defaults to faction-detail.
         include_fan_content: when True (default) show all factions; pass False to
         exclude unofficial (fan-made) factions (e.g. the /stats default).
+        Test matches are not counted, as in Profile.leaderboard and the cached fields.
         """
         language_code = get_language()
 
@@ -1686,6 +1687,7 @@ class Faction(Post):
         queryset = cls.objects.filter(
             efforts__in=effort_qs,
             efforts__game__final=True,
+            efforts__game__test_match=False,
             component='Faction'
         )
         if not include_fan_content:
@@ -17,7 +17,7 @@ from the_gatehouse.models import Profile
 from .models import (
     Game, Effort, Tournament, GameBookmark, ScoreCard, TurnScore, Round,
     PlayerGroup, TournamentPlayer, Stage, StageParticipant, Match, MatchSeries,
-    EloSystem, EloSeason, EloParticipant, EloRating
+    EloSystem, EloSeason, EloParticipant, EloRating, LeagueBackfillJob, LeagueBackfillWindow
 )
 from .services.root_league_api import get_game_round
 
@@ -73,7 +73,7 @@ class EloSeasonInline(admin.TabularInline):
     fields = ('start_date', 'name', 'reset_mode', 'soft_reset_factor')
 
 class EloSystemAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug', 'owner', 'calculation_type', 'k_factor', 'min_players', 'max_players', 'recompute_from')
+    list_display = ('name', 'slug', 'owner', 'calculation_type', 'k_factor', 'min_players', 'max_players', 'recompute_from', 'full_replay_pending')
     search_fields = ('name',)
     raw_id_fields = ('owner',)
     inlines = [EloSeasonInline]
@@ -664,3 +664,85 @@ class MatchAdmin(admin.ModelAdmin):
     list_display = ['__str__', 'round', 'match_number', 'series', 'game']
     list_filter = ['round__stage__tournament']
     raw_id_fields = ['round', 'series', 'game']
+
+
+class LeagueBackfillWindowInline(admin.TabularInline):
+    model = LeagueBackfillWindow
+    extra = 0
+    can_delete = False
+    fields = ('start', 'end', 'status', 'next_offset', 'api_count', 'imported', 'skipped', 'errors',
+              'attempts', 'passes', 'seconds', 'heartbeat_at', 'last_error')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LeagueBackfillJob)
+class LeagueBackfillJobAdmin(admin.ModelAdmin):
+    """Windows are created on save; 'Start / resume' dispatches them (services/league_backfill.py)."""
+    list_display = ['__str__', 'status', 'windows_done', 'windows_remaining', 'games_imported',
+                    'games_skipped', 'games_errored', 'rate', 'started_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['status', 'created_at', 'started_at', 'finished_at', 'rate']
+    inlines = [LeagueBackfillWindowInline]
+    actions = ['start_backfill', 'cancel_backfill']
+
+    def get_queryset(self, request):
+        from .services.league_backfill import with_progress
+        return with_progress(super().get_queryset(request))
+
+    def get_readonly_fields(self, request, obj=None):
+        # The range and window size are fixed once the windows exist.
+        if obj and obj.pk:
+            return self.readonly_fields + ['date_from', 'date_to', 'window_days', 'tournament_name']
+        return self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        from .services.league_backfill import build_windows
+        super().save_model(request, obj, form, change)
+        if not change:
+            build_windows(obj)
+
+    def windows_done(self, obj):
+        return f'{obj.window_total - obj.windows_remaining - obj.windows_failed}/{obj.window_total}'
+    windows_done.short_description = 'Windows done'
+
+    def games_imported(self, obj):
+        return obj.games_imported
+    games_imported.short_description = 'Imported'
+
+    def games_skipped(self, obj):
+        return obj.games_skipped
+    games_skipped.short_description = 'Skipped'
+
+    def games_errored(self, obj):
+        return obj.games_errored
+    games_errored.short_description = 'Errors'
+
+    def windows_remaining(self, obj):
+        return obj.windows_remaining
+    windows_remaining.short_description = 'Remaining'
+
+    def rate(self, obj):
+        from .services.league_backfill import games_per_second
+        rate = games_per_second(obj)
+        return f'{rate:.2f} games/s' if rate is not None else '-'
+    rate.short_description = 'Rate'
+
+    def start_backfill(self, request, queryset):
+        from django.db import transaction
+        from .services.league_backfill import resume_job
+        from .tasks import run_league_backfill
+        for job in queryset:
+            resume_job(job)
+            transaction.on_commit(lambda pk=job.pk: run_league_backfill.delay(pk))
+        self.message_user(request, f'Dispatched {queryset.count()} backfill job(s).', messages.SUCCESS)
+    start_backfill.short_description = 'Start / resume selected backfills'
+
+    def cancel_backfill(self, request, queryset):
+        from .services.league_backfill import cancel_job
+        for job in queryset:
+            cancel_job(job)
+        self.message_user(request, f'Cancelled {queryset.count()} backfill job(s).', messages.SUCCESS)
+    cancel_backfill.short_description = 'Cancel selected backfills'
@@ -0,0 +1,229 @@
+"""Streaming bulk export of the game API (GameExportView).
+
+GameListView serves cursor pages of at most 500 games through GameSerializer, with a
+prefetch tree (efforts, captains, hirelings, landmarks, rounds, Elo systems and their
+seasons) rebuilt for every page. A full download meant thousands of round trips.
+
+The export walks the GameFilter queryset in keyset order (pk > last pk, CHUNK_SIZE at
+a time) and builds each game's row from `values_list()` tuples: one query for the
+games, one for their efforts, one per M2M table, and a per-export cache of the
+rounds/tournaments/Elo systems seen so far. Rows are yielded as they're built, so
+memory is bounded by one chunk however many games match.
+
+- NDJSON: one object per line, the same fields and values as GameSerializer.
+- CSV: one row per seat, game columns repeated; list values joined with ';'
+  (tournament as round slugs, elo_systems as slug:season).
+
+`since` keeps games whose date_modified is at/after it (incremental pulls); the
+response's X-Export-Started-At header is the value to send as `since` next time.
+"""
+import csv
+import json
+from bisect import bisect_right
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from the_warroom.models import Effort, Game, Round
+
+CHUNK_SIZE = 1000
+
+_datetime = serializers.DateTimeField()
+
+GAME_FIELDS = (
+    'id', 'nickname', 'date_posted', 'date_modified', 'type', 'link', 'random_clearing',
+    'deck__slug', 'map__slug', 'undrafted_faction__slug', 'undrafted_vagabond__slug',
+    'round_id', 'cached_player_count',
+)
+EFFORT_FIELDS = (
+    'game_id', 'id', 'player__slug', 'player_id', 'coalition_with__slug', 'faction__slug',
+    'score', 'dominance', 'vagabond__slug', 'discarded_captain__slug', 'starting_leader',
+    'brazen_demagogue', 'win', 'coalition_with_id', 'seat',
+)
+PARTICIPANT_KEYS = (
+    'id', 'player', 'player_id', 'coalition', 'faction', 'game_score', 'dominance',
+    'vagabond', 'captains', 'discarded_captain', 'starting_leader', 'brazen_demagogue',
+    'tournament_score', 'turn_order',
+)
+CSV_GAME_COLUMNS = (
+    'id', 'title', 'date_registered', 'date_modified', 'date_closed', 'turn_timing',
+    'table_talk_url', 'deck', 'board_map', 'random_suits', 'tournament', 'hirelings',
+    'landmarks', 'undrafted_faction', 'undrafted_vagabond', 'undrafted_captains', 'elo_systems',
+)
+
+
+def _dt(value):
+    return _datetime.to_representation(value) if value else None
+
+
+def game_id_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Lists of matching game ids in ascending pk order, one keyset query per chunk."""
+    ids = queryset.order_by('pk').values_list('pk', flat=True)
+    last = 0
+    while True:
+        chunk = list(ids.filter(pk__gt=last)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def _m2m_slugs(through, owner, related, ids):
+    """{owner_id: [related slug, ...]} for one M2M through table, each list in the
+    related model's Meta ordering (as the serializer's .all() returns them)."""
+    out = defaultdict(list)
+    ordering = [f'-{related}__{field[1:]}' if field.startswith('-') else f'{related}__{field}'
+                for field in through._meta.get_field(related).related_model._meta.ordering]
+    rows = (through.objects.filter(**{f'{owner}_id__in': ids})
+            .order_by(f'{owner}_id', *ordering).values_list(f'{owner}_id', f'{related}__slug'))
+    for owner_id, slug in rows:
+        out[owner_id].append(slug)
+    return out
+
+
+class _RoundCache:
+    """Round -> (tournament entry, tournament, Elo system, season starts), loaded once
+    per round for the whole export."""
+
+    def __init__(self):
+        self.rounds = {}
+
+    def load(self, round_ids):
+        missing = set(round_ids) - self.rounds.keys()
+        if not missing:
+            return
+        rounds = (Round.objects.filter(pk__in=missing)
+                  .select_related('stage__tournament__elo_system', 'tournament__elo_system')
+                  .prefetch_related('stage__tournament__elo_system__seasons',
+                                    'tournament__elo_system__seasons'))
+        for rnd in rounds:
+            stage = rnd.stage
+            series = stage.tournament if stage else None
+            tournament = rnd.get_tournament()
+            elo = tournament.elo_system if tournament else None
+            starts = sorted(s.start_date for s in elo.seasons.all()) if elo else []
+            self.rounds[rnd.pk] = {
+                'entry': {
+                    'display': str(rnd),
+                    'series': series.slug if series else None,
+                    'stage': stage.slug if stage else None,
+                    'round': rnd.slug,
+                },
+                'round_number': rnd.round_number,
+                'tournament_id': tournament.pk if tournament else None,
+                'elo': elo,
+                'starts': starts,
+            }
+
+    def __getitem__(self, round_id):
+        return self.rounds[round_id]
+
+
+def _elo_systems(round_ids, player_count, date_posted, rounds):
+    # Game.get_elo_systems_with_seasons(): tournaments in extra-rounds-then-primary
+    # order, one system per tournament, eligible by player count (games are final).
+    systems, seen_tournaments, seen_elos = [], set(), set()
+    for round_id in round_ids:
+        info = rounds[round_id]
+        if info['tournament_id'] is None or info['tournament_id'] in seen_tournaments:
+            continue
+        seen_tournaments.add(info['tournament_id'])
+        elo = info['elo']
+        if elo and elo.pk not in seen_elos and elo.min_players <= player_count <= elo.max_players:
+            seen_elos.add(elo.pk)
+            systems.append({'name': elo.name, 'slug': elo.slug,
+                            'season': bisect_right(info['starts'], date_posted)})
+    return systems
+
+
+def iter_game_dicts(queryset, chunk_size=CHUNK_SIZE):
+    """GameSerializer-shaped dicts for every game in `queryset`, built chunk by chunk."""
+    rounds = _RoundCache()
+    for ids in game_id_chunks(queryset, chunk_size):
+        games = Game.objects.filter(pk__in=ids).order_by('pk').values_list(*GAME_FIELDS)
+        efforts = defaultdict(list)
+        # Seat order, as Effort.Meta orders the serializer's efforts.
+        for row in Effort.objects.filter(game_id__in=ids).order_by('game_id', 'seat').values_list(*EFFORT_FIELDS):
+            efforts[row[0]].append(row)
+        captains = _m2m_slugs(Effort.captains.through, 'effort', 'vagabond',
+                              [row[1] for seats in efforts.values() for row in seats])
+        hirelings = _m2m_slugs(Game.hirelings.through, 'game', 'hireling', ids)
+        landmarks = _m2m_slugs(Game.landmarks.through, 'game', 'landmark', ids)
+        undrafted = _m2m_slugs(Game.undrafted_captains.through, 'game', 'vagabond', ids)
+        extra_rounds = defaultdict(list)
+        for game_id, round_id in (Game.extra_rounds.through.objects.filter(game_id__in=ids)
+                                  .values_list('game_id', 'round_id')):
+            extra_rounds[game_id].append(round_id)
+
+        games = list(games)
+        rounds.load({g[11] for g in games if g[11]} | {r for rs in extra_rounds.values() for r in rs})
+
+        for (game_id, nickname, date_posted, date_modified, turn_type, link, random_clearing,
+             deck, board_map, undrafted_faction, undrafted_vagabond, round_id, player_count) in games:
+            # Extra rounds in Round's default order (-round_number), as the prefetch returns them.
+            extra = sorted(extra_rounds.get(game_id, ()), key=lambda r: -(rounds[r]['round_number'] or 0))
+            listed = ([round_id] if round_id else []) + [r for r in extra if r != round_id]
+            participants = []
+            for (_, effort_id, player, player_id, coalition, faction, score, dominance, vagabond,
+                 discarded, leader, demagogue, win, coalition_id, seat) in efforts.get(game_id, ()):
+                participants.append({
+                    'id': effort_id, 'player': player, 'player_id': player_id,
+                    'coalition': coalition, 'faction': faction, 'game_score': score,
+                    'dominance': dominance, 'vagabond': vagabond,
+                    'captains': captains.get(effort_id, []), 'discarded_captain': discarded,
+                    'starting_leader': leader, 'brazen_demagogue': demagogue,
+                    'tournament_score': (0.5 if coalition_id else 1) if win else 0,
+                    'turn_order': seat,
+                })
+            yield {
+                'id': game_id,
+                'participants': participants,
+                'tournament': [rounds[r]['entry'] for r in listed],
+                'hirelings': hirelings.get(game_id, []),
+                'landmarks': landmarks.get(game_id, []),
+                'title': nickname,
+                'date_registered': _dt(date_posted),
+                'date_modified': _dt(date_modified),
+                'date_closed': _dt(date_posted),
+                'turn_timing': turn_type.lower() if turn_type else None,
+                'table_talk_url': link,
+                'undrafted_faction': undrafted_faction,
+                'undrafted_vagabond': undrafted_vagabond,
+                'undrafted_captains': undrafted.get(game_id, []),
+                'deck': deck,
+                'board_map': board_map,
+                'random_suits': random_clearing,
+                'elo_systems': _elo_systems(extra + ([round_id] if round_id else []),
+                                            player_count, date_posted, rounds),
+            }
+
+
+def ndjson_lines(games):
+    for game in games:
+        yield json.dumps(game, separators=(',', ':')) + '\n'
+
+
+class _Echo:
+    """File-like object for csv.writer that returns each row instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ';'.join(str(v) for v in value)
+    return '' if value is None else value
+
+
+def csv_lines(games):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_GAME_COLUMNS + tuple(f'participant_{key}' for key in PARTICIPANT_KEYS))
+    for game in games:
+        flat = dict(game,
+                    tournament=[entry['round'] for entry in game['tournament']],
+                    elo_systems=[f"{e['slug']}:{e['season']}" for e in game['elo_systems']])
+        game_cells = [_csv_value(flat[key]) for key in CSV_GAME_COLUMNS]
+        for participant in game['participants'] or [None]:
+            seat = [_csv_value(participant[key]) if participant else '' for key in PARTICIPANT_KEYS]
+            yield writer.writerow(game_cells + seat)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ScoreCardDetailView, FactionAverageTurnScoreView, AverageTurnScoreView, GameScorecardView, PlayerScorecardView, GameListView
+from .views import ScoreCardDetailView, FactionAverageTurnScoreView, AverageTurnScoreView, GameScorecardView, PlayerScorecardView, GameListView, GameExportView
 
 urlpatterns = [
     path('scorecard/detail/<int:pk>/', ScoreCardDetailView.as_view(), name='api-scorecard-detail'),
@@ -8,5 +8,6 @@ urlpatterns = [
     path('scorecard/average/', AverageTurnScoreView.as_view(), name='api-scorecard-all'),
     path('scorecard/player/<slug:slug>/', PlayerScorecardView.as_view(), name='api-scorecard-player'),
     path('games/', GameListView.as_view(), name='api-game-list'),
+    path('games/export/', GameExportView.as_view(), name='api-game-export'),
 
 ]
\ No newline at end of file
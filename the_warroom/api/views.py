@@ -1,15 +1,24 @@
+import json
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer
 from django_filters.rest_framework import DjangoFilterBackend
 from the_warroom.models import ScoreCard, Game, Effort
 from the_keep.models import Faction, PostTranslation
 from the_gatehouse.utils import generate_neon_color
 from .game_serializers import GameSerializer
 from .game_filters import GameFilter
-from django.db.models import Count, Prefetch, Q
+from .game_export import csv_lines, iter_game_dicts, ndjson_lines
+from the_warroom.services.scorecard_stats import faction_turn_averages
+from the_warroom.services.turn_aggregates import SUM_FIELDS, Scope, averages_from_sums, read_scope
+from django.db.models import Prefetch, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from django.utils.translation import get_language
 from collections import defaultdict
@@ -21,7 +30,8 @@ def aggregate_turns(turns_lists):
     Reproduces the old SQL ``.values('turn_number').annotate(Sum(...)/Count('id'))``:
     the count for a turn number is the number of scorecards that have that turn
     (turn_number 1..10), and ``average_game_points`` averages the stored cumulative
-    ``game_points_total``. Returns (averages_list, totals_dict).
+    ``game_points_total``. Returns (averages_list, totals_dict). The faction/type/all
+    charts read the same numbers precomputed (services/turn_aggregates.py).
     """
     sums = defaultdict(lambda: defaultdict(float))
     counts = defaultdict(int)
@@ -31,36 +41,9 @@ def aggregate_turns(turns_lists):
             if tn < 1 or tn > 10:
                 continue
             counts[tn] += 1
-            sums[tn]['total'] += t.get('total_points', 0)
-            sums[tn]['faction'] += t.get('faction_points', 0)
-            sums[tn]['crafting'] += t.get('crafting_points', 0)
-            sums[tn]['battle'] += t.get('battle_points', 0)
-            sums[tn]['other'] += t.get('other_points', 0)
-            sums[tn]['game'] += t.get('game_points_total', 0)
-
-    averages = []
-    totals = {'total_faction_points': 0, 'total_crafting_points': 0,
-              'total_battle_points': 0, 'total_other_points': 0}
-    for tn in sorted(counts):
-        c = counts[tn]
-        avg_faction = sums[tn]['faction'] / c
-        avg_crafting = sums[tn]['crafting'] / c
-        avg_battle = sums[tn]['battle'] / c
-        avg_other = sums[tn]['other'] / c
-        totals['total_faction_points'] += avg_faction
-        totals['total_crafting_points'] += avg_crafting
-        totals['total_battle_points'] += avg_battle
-        totals['total_other_points'] += avg_other
-        averages.append({
-            "turn_number": tn,
-            "average_total_points": sums[tn]['total'] / c,
-            "average_faction_points": avg_faction,
-            "average_crafting_points": avg_crafting,
-            "average_battle_points": avg_battle,
-            "average_other_points": avg_other,
-            "average_game_points": sums[tn]['game'] / c,
-        })
-    return averages, totals
+            for field, key in SUM_FIELDS.items():
+                sums[tn][field] += t.get(key, 0)
+    return averages_from_sums([(tn, counts[tn], sums[tn]) for tn in counts])
 
 
 class ScoreCardDetailView(APIView):
@@ -150,22 +133,23 @@ class FactionAverageTurnScoreView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
         
         color = faction.color if faction.color else generate_neon_color()
-        
-        # Get the filtered scorecards' turns_data in one query.
-        turns_lists = ScoreCard.objects.filter(
-            faction=faction,
-            effort__isnull=False,
-            final=True
-        ).values_list('turns_data', flat=True)
-
-        scorecard_count = len(turns_lists)
+
+        aggregated = read_scope(Scope.FACTION, str(faction.pk))
+        if aggregated is None:
+            # Not built yet (rebuild_turn_aggregates): average the scorecards directly.
+            turns_lists = ScoreCard.objects.filter(
+                faction=faction,
+                effort__isnull=False,
+                final=True
+            ).values_list('turns_data', flat=True)
+            aggregated = (len(turns_lists),) + aggregate_turns(turns_lists)
+        scorecard_count, averages, totals = aggregated
+
         if scorecard_count == 0:
             return Response({
                 "message": "No box scores found."
             }, status=status.HTTP_200_OK)
 
-        averages, totals = aggregate_turns(turns_lists)
-
         average_data = {
             "faction_name": faction.title,
             "count": scorecard_count,
@@ -188,20 +172,22 @@ class AverageTurnScoreView(APIView):
         
         if faction_type:
             scorecard_filter &= Q(faction__type=faction_type, faction__official=True)
+            aggregated = read_scope(Scope.TYPE, faction_type)
         else:
             faction_type = "A"
+            aggregated = read_scope(Scope.ALL, '')
 
-        # Fetch the filtered scorecards' turns_data in one query.
-        turns_lists = ScoreCard.objects.filter(scorecard_filter).values_list('turns_data', flat=True)
+        if aggregated is None:
+            # Not built yet (rebuild_turn_aggregates): average the scorecards directly.
+            turns_lists = ScoreCard.objects.filter(scorecard_filter).values_list('turns_data', flat=True)
+            aggregated = (len(turns_lists),) + aggregate_turns(turns_lists)
+        scorecard_count, averages, totals = aggregated
 
-        scorecard_count = len(turns_lists)
         if scorecard_count == 0:
             return Response({
                 "message": "No scorecards found."
             }, status=status.HTTP_200_OK)
 
-        averages, totals = aggregate_turns(turns_lists)
-
         average_data = {
             "type": faction_type,
             "count": scorecard_count,
@@ -231,38 +217,21 @@ class PlayerScorecardView(APIView):
                 final=True
             )
 
-        language_code = get_language()
-        translations = PostTranslation.objects.filter(language__code=language_code)
-        
-        # Optimize: select_related for faction, prefetch translations
-        scorecards = scorecards.select_related('faction').prefetch_related(
-            Prefetch('faction__translations', queryset=translations, to_attr='filtered_translations')
-        )
+        # Per-faction counts and per-turn averages in one query on Postgres
+        # (jsonb_array_elements); grouped in Python elsewhere.
+        averages_by_faction = faction_turn_averages(scorecards)
 
         # Check if there are no scorecards
-        if not scorecards.exists():
+        if not averages_by_faction:
             return Response({
                 "message": "No box scores found."
             }, status=status.HTTP_200_OK)
 
-        # Get all faction IDs from scorecards
-        faction_ids = scorecards.values_list('faction_id', flat=True).distinct()
-
-        # Group each scorecard's turns_data by faction in one query.
-        turns_by_faction = defaultdict(list)
-        for faction_id, turns in scorecards.values_list('faction_id', 'turns_data'):
-            turns_by_faction[faction_id].append(turns)
+        language_code = get_language()
+        translations = PostTranslation.objects.filter(language__code=language_code)
 
-        # Group scorecards by faction for counting
-        faction_scorecard_counts = (
-            scorecards
-            .values('faction_id')
-            .annotate(count=Count('id'))
-        )
-        scorecard_count_dict = {item['faction_id']: item['count'] for item in faction_scorecard_counts}
-        
         # Get unique factions from scorecards
-        factions = Faction.objects.filter(id__in=faction_ids).prefetch_related(
+        factions = Faction.objects.filter(id__in=averages_by_faction).prefetch_related(
             Prefetch('translations', queryset=translations, to_attr='filtered_translations')
         )
         
@@ -275,13 +244,12 @@ class PlayerScorecardView(APIView):
             if hasattr(faction, 'filtered_translations') and faction.filtered_translations:
                 translated_title = faction.filtered_translations[0].translated_title
             
-            # Aggregate this faction's turns_data into per-turn averages.
-            averages, totals = aggregate_turns(turns_by_faction.get(faction.id, []))
+            count, averages, totals = averages_by_faction[faction.id]
 
             faction_average_data = {
                 "faction": translated_title,
                 "color": faction.color,
-                "count": scorecard_count_dict.get(faction.id, 0),
+                "count": count,
                 "averages": averages,
                 "totals": totals,
             }
@@ -340,4 +308,59 @@ class GameListView(generics.ListAPIView):
                 'extra_rounds__stage__tournament__elo_system__seasons',
                 'round__stage__tournament__elo_system__seasons',
             )
-        )
\ No newline at end of file
+        )
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only error responses are rendered; exports stream their own body.
+        return json.dumps(data) + '\n'
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return ''.join(f'{key},{value}\n' for key, value in (data or {}).items())
+
+
+class GameExportView(APIView):
+    """Stream every finalized game matching GameFilter as NDJSON (default) or CSV
+    (?format=csv or an Accept header). ?since=<ISO date/datetime> limits it to games
+    modified since then. See game_export.py."""
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        started_at = timezone.now()
+        params = request.query_params.copy()
+        params.pop('format', None)
+        since_raw = params.pop('since', [''])[-1]
+        queryset = Game.objects.filter(final=True)
+        if since_raw:
+            since = parse_datetime(since_raw)
+            if since is None and parse_date(since_raw):
+                since = parse_datetime(f'{since_raw}T00:00:00')
+            if since is None:
+                return JsonResponse({'since': ['Enter an ISO 8601 date or datetime.']}, status=400)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            queryset = queryset.filter(date_modified__gte=since)
+
+        filterset = GameFilter(params, queryset=queryset, request=request)
+        if not filterset.is_valid():
+            return JsonResponse(filterset.errors, status=400)
+
+        games = iter_game_dicts(filterset.qs)
+        if request.accepted_renderer.format == 'csv':
+            response = StreamingHttpResponse(csv_lines(games), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="games-{started_at:%Y%m%dT%H%M%S}.csv"'
+        else:
+            response = StreamingHttpResponse(ndjson_lines(games), content_type='application/x-ndjson')
+        response['X-Export-Started-At'] = started_at.isoformat()
+        return response
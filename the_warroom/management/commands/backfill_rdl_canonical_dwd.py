@@ -35,7 +35,7 @@ def _player_strings(in_game_name, in_game_id):
 
     full is the strict concatenation stored in rdl_cannonical_dwd
     ("MrMirz+45"); standard zero-pads the id to 4 digits and matches the
-    Profile.dwd field ("MrMirz+0045"). Mirrors create_efforts_from_api().
+    Profile.dwd field ("MrMirz+0045"). Mirrors league_import.split_player_string().
     """
     number = str(in_game_id)
     full = f'{in_game_name}+{number}'
@@ -126,7 +126,7 @@ class Command(BaseCommand):
             # Match the profile by its dwd string. Prefer the already-standardized
             # form, but fall back to the raw (non-zero-padded) form since ~10% of
             # profiles still store dwd as "name+953" rather than "name+0953".
-            # Mirrors the lookup order in create_efforts_from_api().
+            # Mirrors the lookup order in league_import.PlayerResolver.
             profile = (Profile.objects.filter(dwd__iexact=standard_string).first()
                        or Profile.objects.filter(dwd__iexact=full_string).first())
             if not profile:
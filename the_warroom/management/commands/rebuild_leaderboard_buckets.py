@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from the_warroom.services.leaderboard_buckets import rebuild_all_buckets
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the LeaderboardBucket table (per player/faction, official flag and month) from Efforts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_create batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = rebuild_all_buckets(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} leaderboard buckets in {time.monotonic() - started:.1f}s.'))
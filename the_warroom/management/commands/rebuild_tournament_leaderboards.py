@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from the_warroom.services.tournament_leaderboards import rebuild_all_tournament_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TournamentLeaderboardSnapshot table (per tournament, stage and round) from Efforts'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        tournaments, written = rebuild_all_tournament_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} leaderboard rows for {tournaments} tournaments in {time.monotonic() - started:.1f}s.'))
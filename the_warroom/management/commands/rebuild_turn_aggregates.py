@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from the_warroom.services.turn_aggregates import rebuild_turn_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TurnScoreAggregate table (per faction, faction type and overall) from ScoreCards'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written = rebuild_turn_aggregates()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} turn aggregate rows in {time.monotonic() - started:.1f}s.'))
@@ -4,7 +4,9 @@ from django.core.management.base import BaseCommand
 from dateutil import parser as date_parser
 
 from the_warroom.models import EloSystem
-from the_warroom.services.elo_service import recompute_system_from
+from the_warroom.services.elo_service import (
+    recompute_system_from, incremental_recompute_system_from,
+)
 
 
 class Command(BaseCommand):
@@ -20,6 +22,11 @@ class Command(BaseCommand):
             dest='from_iso',
             help='Replay from this ISO datetime (default: from the beginning).',
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only rewrite games whose ratings actually changed (not after config/season edits).',
+        )
 
     def _resolve_systems(self, system_arg):
         qs = EloSystem.objects.filter(calculation_type=EloSystem.CalculationType.LOCAL)
@@ -43,10 +50,17 @@ class Command(BaseCommand):
 
         total = len(systems)
         self.stdout.write(f'Recomputing elo for {total} LOCAL system(s) from {cutoff.isoformat()}...')
+        replay = incremental_recompute_system_from if options['incremental'] else recompute_system_from
         for i, system in enumerate(systems, 1):
-            recompute_system_from(system, cutoff)
-            # Clear the dirty marker — this rebuild covers everything from `cutoff`.
-            EloSystem.objects.filter(pk=system.pk).update(recompute_from=None)
-            self.stdout.write(f'  {i}/{total}  {system.name}')
+            stats = replay(system, cutoff)
+            if stats['mode'] == 'full':
+                # Clear the dirty marker — this rebuild covers everything from `cutoff`.
+                EloSystem.objects.filter(pk=system.pk).update(
+                    recompute_from=None, full_replay_pending=False)
+            self.stdout.write(
+                f"  {i}/{total}  {system.name}: {stats['games_replayed']} game(s) replayed, "
+                f"{stats['rows_deleted']} row(s) deleted, {stats['rows_created']} created "
+                f"in {stats['elapsed']:.2f}s"
+            )
 
         self.stdout.write(self.style.SUCCESS(f'Done: {total} system(s) recomputed.'))
@@ -1,7 +1,9 @@
+import time
+
 from django.core.management.base import BaseCommand
 from the_keep.models import Faction, Vagabond
 from the_gatehouse.models import Profile
-from the_warroom.services.winrate_service import CACHED_FIELDS, _apply_cached_stats
+from the_warroom.services.winrate_service import bulk_recalculate_cached_winrates
 
 
 class Command(BaseCommand):
@@ -22,30 +24,18 @@ class Command(BaseCommand):
         )
 
     def _recalc(self, model, label, batch_size):
-        """Compute cached fields for every row of model and persist in batches.
+        """Recompute cached fields for every row of model in one grouped aggregate.
 
-        Uses bulk_update instead of per-row save() to stay light on the
-        database during a full backfill. These cached fields don't drive
-        signals, so skipping save()/signals is safe.
+        bulk_recalculate_cached_winrates() tallies all four field sets (overall +
+        per platform) in a single Effort query and bulk_updates only the rows that
+        changed. These cached fields don't drive signals, so skipping save() is safe.
         """
-        qs = model.objects.all()
-        count = qs.count()
-        self.stdout.write(f'Recalculating winrates for {count} {label}...')
-
-        batch = []
-        processed = 0
-        for obj in qs.iterator():
-            _apply_cached_stats(obj)
-            batch.append(obj)
-            processed += 1
-            if len(batch) >= batch_size:
-                model.objects.bulk_update(batch, CACHED_FIELDS, batch_size=batch_size)
-                batch = []
-                self.stdout.write(f'  {processed}/{count}')
-        if batch:
-            model.objects.bulk_update(batch, CACHED_FIELDS, batch_size=batch_size)
-
-        self.stdout.write(self.style.SUCCESS(f'Done: {count} {label} updated.'))
+        self.stdout.write(f'Recalculating winrates for {label}...')
+        started = time.monotonic()
+        checked, updated = bulk_recalculate_cached_winrates(model, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {checked} {label} checked, {updated} updated '
+            f'in {time.monotonic() - started:.1f}s.'))
 
     def handle(self, *args, **options):
         model = options['model']
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from the_warroom.services.winrate_queue import drain, queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the debounced winrate refresh queue: depth, oldest wait and last drain latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--drain',
+            action='store_true',
+            help='Drain every queued entry now (ignores the debounce window) before reporting',
+        )
+
+    def handle(self, *args, **options):
+        if options['drain']:
+            drained = drain(debounce=0)
+            self.stdout.write(self.style.SUCCESS(
+                f"Drained {drained['last_drained']} entries ({drained['last_updated']} rows updated) "
+                f"in {drained['last_drain_seconds']}s."))
+
+        for key, value in sorted(queue_stats().items()):
+            self.stdout.write(f'{key}: {value}')
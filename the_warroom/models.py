@@ -268,6 +268,10 @@ class EloSystem(models.Model):
     # replays eligible games from this date_posted forward, then clears the field. Set by
     # mark-dirty signals to min(existing value, earliest affected game's date_posted).
     recompute_from = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Set alongside recompute_from when the pending change alters the math or the season
+    # layout (every stored row may be off), so the recompute task does a full forward
+    # replay. Game/effort edits leave it False and are replayed incrementally.
+    full_replay_pending = models.BooleanField(default=False)
 
     # Field groups — a change to any field in EITHER group requires a full-history replay.
     # A future EloSystem form uses these to warn the user what kind of change they're making:
@@ -294,11 +298,15 @@ class EloSystem(models.Model):
             and self.min_players <= game.cached_player_count <= self.max_players
         )
 
-    def mark_dirty_from(self, dt):
+    def mark_dirty_from(self, dt, full_replay=False):
         """Lower the recompute_from watermark to dt (earliest affected date). Idempotent.
 
         Uses a filtered .update() so concurrent marks race safely toward the minimum
-        without a lost update. The scheduled recompute task replays from this date."""
+        without a lost update. The scheduled recompute task replays from this date.
+        `full_replay` also flags that an incremental replay can't detect the change."""
+        if dt is not None and full_replay and not self.full_replay_pending:
+            EloSystem.objects.filter(pk=self.pk).update(full_replay_pending=True)
+            self.full_replay_pending = True
         if dt is not None and (self.recompute_from is None or dt < self.recompute_from):
             EloSystem.objects.filter(pk=self.pk).filter(
                 Q(recompute_from__isnull=True) | Q(recompute_from__gt=dt)
@@ -1928,12 +1936,12 @@ class Game(models.Model):
     nickname = models.CharField(max_length=50, null=True, blank=True)
     random_clearing = models.BooleanField(default=True)
     notes = models.TextField(null=True, blank=True)
-    league_id = models.CharField(max_length=300, null=True, blank=True)
+    league_id = models.CharField(max_length=300, null=True, blank=True, db_index=True)
 
 
     # Automatic
     date_posted = models.DateTimeField(default=timezone.now, db_index=True)
-    date_modified = models.DateTimeField(auto_now=True)
+    date_modified = models.DateTimeField(auto_now=True, db_index=True)  # api export `since`
     recorder = models.ForeignKey(Profile, on_delete=models.SET_NULL, null=True, blank=True, related_name='games_recorded')
 
     test_match = models.BooleanField(default=False)
@@ -2274,6 +2282,142 @@ def filtered_winrate(player=None, faction=None, vagabond=None, deck=None, tourna
     return {'total': total, 'games': agg['games'] or 0, 'win_points': win_points, 'win_rate': win_rate, 'qs': qs}
 
 
+# Pre-aggregated leaderboard tallies: one row per player/faction, official flag and
+# calendar month, over final non-test games (the cached_* semantics). Filtered
+# /leaderboard/ requests sum these instead of aggregating every Effort. Maintained by
+# the refresh_leaderboard_buckets task (see services/leaderboard_buckets.py).
+class LeaderboardBucket(models.Model):
+    class SubjectTypes(models.TextChoices):
+        PLAYER = 'player'
+        FACTION = 'faction'
+
+    subject_type = models.CharField(max_length=10, choices=SubjectTypes.choices)
+    # Profile or Faction id. Not a FK: buckets are derived data, rebuilt from Effort.
+    subject_id = models.PositiveBigIntegerField()
+    official = models.BooleanField()  # Game.official
+    month = models.DateField()  # first day of the month (local time)
+    efforts = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    coalition_wins = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['subject_type', 'subject_id', 'official', 'month'],
+                name='uniq_leaderboardbucket_key',
+            )
+        ]
+        indexes = [models.Index(fields=['subject_type', 'month'])]
+
+    def __str__(self):
+        return f'{self.subject_type} {self.subject_id} {self.month:%Y-%m}: {self.wins}/{self.efforts}'
+
+
+# Snapshot of a tournament's unfiltered leaderboards: one row per player/faction for
+# the tournament, each of its stages and each of its rounds, over the final games that
+# count there (primary or extra round). Rebuilt per tournament by update_tournament_counts
+# (see services/tournament_leaderboards.py); unfiltered leaderboard pages read it.
+class TournamentLeaderboardSnapshot(models.Model):
+    class ScopeTypes(models.TextChoices):
+        TOURNAMENT = 'tournament'
+        STAGE = 'stage'
+        ROUND = 'round'
+
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name='leaderboard_snapshot')
+    scope_type = models.CharField(max_length=10, choices=ScopeTypes.choices)
+    # Tournament, Stage or Round id. Not a FK: rows are rebuilt per tournament.
+    scope_id = models.PositiveBigIntegerField()
+    subject_type = models.CharField(max_length=10, choices=LeaderboardBucket.SubjectTypes.choices)
+    subject_id = models.PositiveBigIntegerField()
+    efforts = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    coalition_wins = models.PositiveIntegerField(default=0)
+    # Derived from the tallies so threshold/limit are an indexed filter + order_by.
+    win_rate = models.FloatField(default=0)
+    tourney_points = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope_type', 'scope_id', 'subject_type', 'subject_id'],
+                name='uniq_tournamentleaderboardsnapshot_key',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['scope_type', 'scope_id', 'subject_type', '-win_rate', '-efforts'],
+                         name='tlbsnap_by_winrate'),
+            models.Index(fields=['scope_type', 'scope_id', 'subject_type', '-tourney_points', '-win_rate'],
+                         name='tlbsnap_by_points'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope_type} {self.scope_id} {self.subject_type} {self.subject_id}: {self.wins}/{self.efforts}'
+
+
+# A historical Root League import split into date windows (LeagueBackfillWindow), each
+# imported by its own task with a committed page cursor, so a crash or timeout only
+# repeats the page in flight. See services/league_backfill.py.
+class LeagueBackfillJob(models.Model):
+    class StatusChoices(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+        CANCELLED = 'cancelled'
+
+    date_from = models.DateTimeField()
+    date_to = models.DateTimeField()
+    window_days = models.PositiveSmallIntegerField(default=7, validators=[MinValueValidator(1)])
+    tournament_name = models.CharField(max_length=100, blank=True)
+    page_size = models.PositiveSmallIntegerField(default=25, validators=[MinValueValidator(1), MaxValueValidator(100)])
+    max_concurrency = models.PositiveSmallIntegerField(default=2, validators=[MinValueValidator(1), MaxValueValidator(8)])
+    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def clean(self):
+        if self.date_from and self.date_to and self.date_from >= self.date_to:
+            raise ValidationError({'date_to': 'Must be after the start date.'})
+
+    def __str__(self):
+        return f'League backfill {self.date_from:%Y-%m-%d} to {self.date_to:%Y-%m-%d} ({self.status})'
+
+
+class LeagueBackfillWindow(models.Model):
+    job = models.ForeignKey(LeagueBackfillJob, on_delete=models.CASCADE, related_name='windows')
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=LeagueBackfillJob.StatusChoices.choices,
+                              default=LeagueBackfillJob.StatusChoices.PENDING)
+    # Offset of the next page to fetch; only advanced after a page has committed.
+    next_offset = models.PositiveIntegerField(default=0)
+    # The API's match count for the window when the current pass started.
+    api_count = models.PositiveIntegerField(null=True, blank=True)
+    passes = models.PositiveSmallIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    error_ids = models.TextField(blank=True)
+    last_error = models.TextField(blank=True)
+    seconds = models.FloatField(default=0)  # time spent importing, across attempts
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Set each time the window is claimed; a worker only writes while it's still its own.
+    claim = models.UUIDField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ['start']
+        indexes = [models.Index(fields=['job', 'status'])]
+
+    def __str__(self):
+        return f'{self.start:%Y-%m-%d} to {self.end:%Y-%m-%d} ({self.status})'
+
+
 # This is a collection of Turns that makes up the detailed point breakdown of a game. It should be linked to an effort and is marked as final when the total score matches with the effort's score.
 class ScoreCard(models.Model):
     effort = models.OneToOneField(Effort, related_name='scorecard', on_delete=models.SET_NULL, null=True, blank=True)
@@ -2416,6 +2560,41 @@ class ScoreCard(models.Model):
             TurnScore.objects.bulk_update(updates, ['game_points_total'])
 
 
+# Running per-turn sums over final, effort-linked scorecards, for the average turn-score
+# charts. One row per (scope, turn_number 1..10); the turn_number 0 row only carries the
+# scope's scorecard count. Scopes: each faction, each faction type (official factions
+# only) and all scorecards. Kept current by the ScoreCard signals; see
+# services/turn_aggregates.py.
+class TurnScoreAggregate(models.Model):
+    class ScopeTypes(models.TextChoices):
+        FACTION = 'faction'
+        TYPE = 'type'
+        ALL = 'all'
+
+    scope_type = models.CharField(max_length=10, choices=ScopeTypes.choices)
+    # Faction id, faction type code, or '' for ALL.
+    scope_key = models.CharField(max_length=20, blank=True)
+    turn_number = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+    total_points = models.BigIntegerField(default=0)
+    faction_points = models.BigIntegerField(default=0)
+    crafting_points = models.BigIntegerField(default=0)
+    battle_points = models.BigIntegerField(default=0)
+    other_points = models.BigIntegerField(default=0)
+    game_points = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope_type', 'scope_key', 'turn_number'],
+                name='uniq_turnscoreaggregate_key',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.scope_type} {self.scope_key} turn {self.turn_number}: {self.count}'
+
+
 # This is the poorly named segment of a Scorecard that contains the point breakdown for each Turn
 class TurnScore(models.Model):
     scorecard = models.ForeignKey(ScoreCard, related_name='turns', on_delete=models.CASCADE, null=True, blank=True)
@@ -0,0 +1,108 @@
+"""Per-transaction collection of Game/Effort side effects, flushed as one task.
+
+Each Effort and Game signal used to queue its own work with transaction.on_commit:
+a winrate mark, update_tournament_counts, update_game_player_count and
+refresh_leaderboard_buckets per seat, plus synchronous Elo dirty-marking (several
+queries per effort). Saving one game with four seats put more than a dozen messages
+on the broker, most of them for the same game and tournaments.
+
+Signals now record what changed on the transaction's collector instead:
+
+- `games` — games whose cached_player_count and tournament counts need a refresh
+- `tournaments` — tournament ids known at signal time (a round the game left, a
+  deleted game's tournaments)
+- `winrates` — (app_label, model_name, pk) of factions, vagabonds and players
+- `buckets` — LeaderboardBucket (subject_type, subject_id, month) keys
+- `elo_games` — games whose LOCAL Elo systems are marked dirty from the game's date
+  (resolved in the task, against the committed game)
+- `elo` — explicit Elo system ids with the earliest affected date
+- `stats` — a final game's results changed: cached leaderboards are stale
+  (services/leaderboard_cache.py)
+
+When the outermost transaction commits, one process_collected_changes task is
+enqueued with the deduplicated sets (and the stats generation is bumped, if `stats`). Outside a transaction (autocommit) on_commit runs
+at once, so each change is flushed immediately, as before. A collector whose flush
+callback is no longer registered was started in a transaction or savepoint that rolled
+back, so it's replaced rather than reused. Changes from a rolled-back savepoint inside
+a surviving batch stay in it; every step of the task recomputes from the database, so
+that only costs a redundant refresh.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_ATTR = '_warroom_change_collector'
+
+
+class ChangeCollector:
+    def __init__(self, using):
+        self.using = using
+        self.games = set()
+        self.tournaments = set()
+        self.winrates = set()
+        self.buckets = set()
+        self.elo_games = set()
+        self.elo = {}
+        self.stats = False
+
+    def _registered(self):
+        connection = connections[self.using]
+        return any(func == self.flush for _, func, _ in connection.run_on_commit)
+
+    def add(self, games=(), tournaments=(), winrates=(), buckets=(), elo_games=(),
+            elo_systems=(), elo_from=None, full_replay=False, stats=False):
+        self.games.update(i for i in games if i)
+        self.tournaments.update(i for i in tournaments if i)
+        self.winrates.update(tuple(obj) for obj in winrates)
+        self.buckets.update(tuple(key) for key in buckets)
+        self.elo_games.update(i for i in elo_games if i)
+        self.stats = self.stats or stats
+        if elo_from is not None:
+            for pk in elo_systems:
+                if pk:
+                    earliest, full = self.elo.get(pk, (elo_from, False))
+                    self.elo[pk] = (min(earliest, elo_from), full or full_replay)
+
+    def is_empty(self):
+        return not (self.games or self.tournaments or self.winrates or self.buckets
+                    or self.elo_games or self.elo or self.stats)
+
+    def payload(self):
+        """JSON-serializable task arguments, sorted so equal batches are equal."""
+        return {
+            'games': sorted(self.games),
+            'tournaments': sorted(self.tournaments),
+            'winrates': [list(obj) for obj in sorted(self.winrates)],
+            'buckets': [list(key) for key in sorted(self.buckets)],
+            'elo_games': sorted(self.elo_games),
+            'elo': [[pk, dt.isoformat(), full] for pk, (dt, full) in sorted(self.elo.items())],
+            'stats': self.stats,
+        }
+
+    def flush(self):
+        connection = connections[self.using]
+        if getattr(connection, _ATTR, None) is self:
+            delattr(connection, _ATTR)
+        if self.is_empty():
+            return
+        if self.stats:
+            from the_warroom.services.leaderboard_cache import bump_stats_generation
+            bump_stats_generation()
+        from the_warroom.tasks import process_collected_changes
+        process_collected_changes.delay(self.payload())
+
+
+def record(using=DEFAULT_DB_ALIAS, **changes):
+    """Add changes (see ChangeCollector.add) to the current transaction's batch.
+
+    Outside a transaction the change is already committed, so it's flushed at once."""
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        batch = ChangeCollector(using)
+        batch.add(**changes)
+        batch.flush()
+        return
+    current = getattr(connection, _ATTR, None)
+    if current is None or not current._registered():
+        current = ChangeCollector(using)
+        setattr(connection, _ATTR, current)
+        transaction.on_commit(current.flush, using=using)
+    current.add(**changes)
@@ -5,21 +5,27 @@ Split into a pure math core (no DB) and a DB orchestration layer:
 - `apply_game_to_ratings` — pure, unit-testable winner-vs-field Elo update.
 - `game_participants` — resolve winners/losers/credit from a game's efforts.
 - `_system_games` / `_eligible_games_for_system` — the games a system rates.
-- `affected_local_system_ids` — which LOCAL systems a changed game touches.
+- `affected_local_system_ids` — which LOCAL systems a changed game touches
+  (`local_system_cutoffs` for a batch of games).
 - `elo_config_change_cutoff` — earliest date to replay from on a config edit.
 - `recompute_system_from` — transactional forward-replay orchestrator.
+- `incremental_recompute_system_from` — replays only games whose participants are
+  contaminated by a change, stopping once recomputed ratings match the stored rows.
 
 Ratings are recomputed asynchronously by the scheduled `recompute_dirty_local_elo`
-task, which replays each dirty system from its `recompute_from` watermark.
+task, which replays each dirty system from its `recompute_from` watermark (incrementally
+unless `full_replay_pending` says the math or season layout changed).
 """
 
+import time
 from bisect import bisect_right
+from collections import defaultdict
 
 from django.db import transaction
 from django.db.models import Min, Q
 
 from the_warroom.models import (
-    Game, Effort, EloSystem, EloSeason, EloParticipant, EloRating,
+    Game, Effort, EloSystem, EloSeason, EloParticipant, EloRating, Round,
 )
 
 
@@ -128,6 +134,124 @@ def apply_game_to_ratings(elo_system, winners, losers, ratings, credit):
     return results
 
 
+# --------------------------------------------------------------------------- #
+# Whole-history replay cores (no DB access).
+#
+# Both take the ordered game list as plain arrays — games: [(game_id, date_posted,
+# coalition_win)], seats: {game_id: [(player_id, win), ...]} in effort order — plus the
+# anchored `working` state, and return (rows, current_season) where rows are
+# (game_id, player_id, rating_before, rating_after, win_credit, played_at). `working` is
+# updated in place to the end-of-replay standings.
+# --------------------------------------------------------------------------- #
+
+def replay_games_pairwise(elo_system, games, seats, working, seasons=(), current_season=0):
+    """Reference replay: one `apply_game_to_ratings` call per game, dict state."""
+    starts = [s[0] for s in seasons]
+    rows = []
+    for game_id, date_posted, coalition_win in games:
+        game_season = _season_number_for(starts, date_posted)
+        while current_season < game_season:
+            _apply_boundary_reset(working, seasons[current_season], elo_system.initial_rating)
+            current_season += 1
+
+        winners, losers, credit = _split_participants(seats.get(game_id, ()), coalition_win)
+        if not winners or not losers:
+            continue
+        for pid in winners + losers:
+            working.setdefault(pid, [elo_system.initial_rating, 0, 0.0])
+        ratings = {pid: (working[pid][0], working[pid][1]) for pid in winners + losers}
+        results = apply_game_to_ratings(elo_system, winners, losers, ratings, credit)
+        winner_set = set(winners)
+        for pid, (before, after) in results.items():
+            wc = credit.get(pid, 0.0) if pid in winner_set else 0.0
+            rows.append((game_id, pid, before, after, wc, date_posted))
+            working[pid][0] = after
+            working[pid][1] += 1
+            working[pid][2] += wc
+    return rows, current_season
+
+
+def replay_games(elo_system, games, seats, working, seasons=(), current_season=0):
+    """Batch replay: same rows as `replay_games_pairwise`, bit-for-bit, with less overhead.
+
+    Players are mapped to dense slots in flat rating/games/wins lists, K is resolved once
+    per player per game instead of per pair, and season boundaries are pre-bisected. Every
+    float is produced by the same operations in the same order as `apply_game_to_ratings`
+    and `_soft_seed`, so the results are identical, not merely close.
+    """
+    initial = elo_system.initial_rating
+    k_base, k_prov = elo_system.k_factor, elo_system.k_provisional
+    provisional = elo_system.provisional_games
+    starts = [s[0] for s in seasons]
+    hard, soft = EloSeason.ResetMode.HARD, EloSeason.ResetMode.SOFT
+
+    slot_of = {}
+    slot_pid, rating, played, wins = [], [], [], []
+    for pid, (r, g, w) in working.items():
+        slot_of[pid] = len(slot_pid)
+        slot_pid.append(pid)
+        rating.append(r)
+        played.append(g)
+        wins.append(w)
+
+    rows = []
+    append_row = rows.append
+    for game_id, date_posted, coalition_win in games:
+        game_season = bisect_right(starts, date_posted)
+        while current_season < game_season:
+            _, reset_mode, factor = seasons[current_season]
+            if reset_mode == hard or reset_mode == soft:
+                for i in range(len(slot_pid)):
+                    rating[i] = initial if reset_mode == hard else _soft_seed(rating[i], factor, initial)
+                    played[i] = 0
+                    wins[i] = 0.0
+            current_season += 1
+
+        winners, losers, credit = _split_participants(seats.get(game_id, ()), coalition_win)
+        if not winners or not losers:
+            continue
+
+        # Resolve each distinct player to a slot (seeding newcomers) and freeze the
+        # entering rating and K for this game.
+        slots = {}
+        for pid in winners + losers:
+            if pid not in slots:
+                i = slot_of.get(pid)
+                if i is None:
+                    i = slot_of[pid] = len(slot_pid)
+                    slot_pid.append(pid)
+                    rating.append(initial)
+                    played.append(0)
+                    wins.append(0.0)
+                slots[pid] = i
+        entering = {pid: rating[i] for pid, i in slots.items()}
+        k = {pid: (k_prov if played[i] < provisional else k_base) for pid, i in slots.items()}
+
+        deltas = dict.fromkeys(slots, 0.0)
+        for w in winners:
+            rw, kw = entering[w], k[w]
+            s = credit.get(w, 1.0)
+            for l in losers:
+                rl = entering[l]
+                deltas[w] += kw * (s - 1.0 / (1.0 + 10 ** ((rl - rw) / 400.0)))
+                deltas[l] += k[l] * ((1.0 - s) - 1.0 / (1.0 + 10 ** ((rw - rl) / 400.0)))
+
+        opponents = len(winners) + len(losers) - 1
+        winner_set = set(winners)
+        for pid, i in slots.items():
+            before = entering[pid]
+            after = before + (deltas[pid] / opponents)
+            wc = credit.get(pid, 0.0) if pid in winner_set else 0.0
+            append_row((game_id, pid, before, after, wc, date_posted))
+            rating[i] = after
+            played[i] += 1
+            wins[i] += wc
+
+    for pid, i in slot_of.items():
+        working[pid] = [rating[i], played[i], wins[i]]
+    return rows, current_season
+
+
 # --------------------------------------------------------------------------- #
 # DB helpers.
 # --------------------------------------------------------------------------- #
@@ -140,21 +264,40 @@ def game_participants(game):
     - Returns ([], [], {}) for a degenerate game (no winner, no loser, or <2 rated
       players) so callers skip it — no rating rows written.
     """
+    return _split_participants(((e.player_id, e.win) for e in game.efforts.all()),
+                               game.coalition_win)
+
+
+def _split_participants(seats, coalition_win):
+    """Pure core of `game_participants`: seats is an ordered iterable of (player_id, win)."""
     winners, losers = [], []
-    for effort in game.efforts.all():
-        if not effort.player_id:
+    for player_id, win in seats:
+        if not player_id:
             continue
-        (winners if effort.win else losers).append(effort.player_id)
+        (winners if win else losers).append(player_id)
 
     # Guard: need at least one winner, one loser, and two distinct rated players.
     if not winners or not losers or len(set(winners) | set(losers)) < 2:
         return [], [], {}
 
-    win_value = 0.5 if game.coalition_win else 1.0
+    win_value = 0.5 if coalition_win else 1.0
     credit = {pid: win_value for pid in winners}
     return winners, losers, credit
 
 
+def _seats_for(games_qs):
+    """{game_id: [(player_id, win), ...]} for every game in games_qs, in one query.
+
+    Effort's default ordering (game, seat) matches `game.efforts.all()`, so each list is
+    in the same order `game_participants` would see."""
+    seats = defaultdict(list)
+    for game_id, player_id, win in (Effort.objects
+                                    .filter(game__in=games_qs.values('id'))
+                                    .values_list('game_id', 'player_id', 'win')):
+        seats[game_id].append((player_id, win))
+    return seats
+
+
 def _seasons_for(elo_system):
     """Ascending list of (start_date, reset_mode, soft_reset_factor) for this system.
 
@@ -207,6 +350,33 @@ def affected_local_system_ids(game):
     return set(structural) | set(historical)
 
 
+def local_system_cutoffs(game_ids):
+    """{LOCAL EloSystem id: earliest date_posted} over the given final, non-test games,
+    by the same rule as affected_local_system_ids but in four queries for the whole set."""
+    games = dict(Game.objects.filter(pk__in=game_ids, final=True, test_match=False)
+                 .values_list('pk', 'date_posted'))
+    if not games:
+        return {}
+    pairs = set(Game.objects.filter(pk__in=games).values_list('pk', 'round__stage__tournament_id'))
+    pairs.update(Round.objects.filter(extra_games__in=games).values_list('extra_games', 'stage__tournament_id'))
+    systems_by_tournament = defaultdict(set)
+    for system_id, tournament_id in EloSystem.objects.filter(
+        calculation_type=EloSystem.CalculationType.LOCAL,
+        tournaments__id__in={tid for _, tid in pairs if tid},
+    ).values_list('id', 'tournaments__id'):
+        systems_by_tournament[tournament_id].add(system_id)
+    touched = {(game_id, system_id) for game_id, tid in pairs for system_id in systems_by_tournament.get(tid, ())}
+    touched.update(EloRating.objects.filter(
+        game_id__in=games, elo_system__calculation_type=EloSystem.CalculationType.LOCAL,
+    ).values_list('game_id', 'elo_system_id'))
+    cutoffs = {}
+    for game_id, system_id in touched:
+        dt = games[game_id]
+        if system_id not in cutoffs or dt < cutoffs[system_id]:
+            cutoffs[system_id] = dt
+    return cutoffs
+
+
 def mark_games_dirty(game_ids):
     """Dirty every LOCAL EloSystem for each of the given games, from that game's date_posted.
 
@@ -311,86 +481,305 @@ def _write_participants(elo_system, working):
 # Orchestrator.
 # --------------------------------------------------------------------------- #
 
+def _replay_window(elo_system, cutoff_dt):
+    """Where a replay from cutoff_dt must start so season resets are honored.
+
+    Returns (seasons, starts, effective_cutoff, not_before, current_season):
+      effective_cutoff  — where deletion + replay begin (may be earlier than cutoff_dt).
+      not_before        — floor for the anchor window (None = read all pre-cutoff rows).
+      current_season    — the season the replay cursor is in BEFORE the first game, so the
+                          caller applies the right boundary resets as it walks forward.
+    HARD entry: the [entry_start, cutoff) anchor rows already carry the post-reset
+      ratings, so we can replay cheaply from cutoff_dt without re-crossing the boundary.
+    SOFT entry: the seed is produced by _apply_boundary_reset compressing the PRIOR
+      season's finals, so we must replay the whole season from entry_start, anchor from
+      the prior season (not_before=None), and start the cursor one season back so the
+      crossing into this season actually runs.
+    NONE entry / season 0 / season-free: carry ratings across (anchor unfloored).
+    """
+    seasons = _seasons_for(elo_system)
+    starts = [s[0] for s in seasons]
+
+    not_before = None
+    effective_cutoff = cutoff_dt
+    cutoff_season = _season_number_for(starts, cutoff_dt)  # 0 = preseason
+    current_season = cutoff_season
+    if cutoff_season >= 1:
+        entry_start, entry_mode, _ = seasons[cutoff_season - 1]  # row entered at this season
+        if entry_mode == EloSeason.ResetMode.HARD:
+            not_before = entry_start
+        elif entry_mode == EloSeason.ResetMode.SOFT:
+            effective_cutoff = entry_start          # replay the season from its start
+            current_season = cutoff_season - 1      # so the boundary crossing re-runs
+            # not_before stays None: anchor from the prior season's finals to seed from.
+    return seasons, starts, effective_cutoff, not_before, current_season
+
+
 def recompute_system_from(elo_system, cutoff_dt):
     """Replay LOCAL elo for one system from cutoff_dt forward. Caller ensures LOCAL.
 
     Re-anchors affected players to their state just before cutoff, deletes the history
     from cutoff onward, replays every eligible game chronologically, and upserts the
     current standings. Wrapped in one transaction with a coarse per-system lock.
+
+    Returns a stats dict (see `incremental_recompute_system_from`).
     """
+    started = time.monotonic()
     with transaction.atomic():
         # Coarse per-system lock so overlapping replays serialize.
         EloSystem.objects.select_for_update().get(pk=elo_system.pk)
 
-        seasons = _seasons_for(elo_system)
-        starts = [s[0] for s in seasons]
-
-        # Decide, per the season the cutoff falls in, how to anchor and where to start the
-        # replay so season resets are honored:
-        #   effective_cutoff  — where deletion + replay begin (may be earlier than cutoff_dt).
-        #   not_before        — floor for the anchor window (None = read all pre-cutoff rows).
-        #   current_season    — the season the replay cursor is in BEFORE the loop, so the
-        #                       while-loop below applies the right boundary resets.
-        # HARD entry: the [entry_start, cutoff) anchor rows already carry the post-reset
-        #   ratings, so we can replay cheaply from cutoff_dt without re-crossing the boundary.
-        # SOFT entry: the seed is produced by _apply_boundary_reset compressing the PRIOR
-        #   season's finals, so we must replay the whole season from entry_start, anchor from
-        #   the prior season (not_before=None), and start the cursor one season back so the
-        #   crossing into this season actually runs.
-        # NONE entry / season 0 / season-free: carry ratings across (anchor unfloored).
-        not_before = None
-        effective_cutoff = cutoff_dt
-        cutoff_season = _season_number_for(starts, cutoff_dt)  # 0 = preseason
-        current_season = cutoff_season
-        if cutoff_season >= 1:
-            entry_start, entry_mode, _ = seasons[cutoff_season - 1]  # row entered at this season
-            if entry_mode == EloSeason.ResetMode.HARD:
-                not_before = entry_start
-            elif entry_mode == EloSeason.ResetMode.SOFT:
-                effective_cutoff = entry_start          # replay the season from its start
-                current_season = cutoff_season - 1      # so the boundary crossing re-runs
-                # not_before stays None: anchor from the prior season's finals to seed from.
-
-        games = list(_eligible_games_for_system(elo_system, since=effective_cutoff))
-        affected = set(Effort.objects.filter(game__in=games, player__isnull=False)
-                       .values_list('player_id', flat=True))
+        seasons, starts, effective_cutoff, not_before, current_season = \
+            _replay_window(elo_system, cutoff_dt)
+
+        eligible = _eligible_games_for_system(elo_system, since=effective_cutoff)
+        games = list(eligible.values_list('id', 'date_posted', 'coalition_win'))
+        seats = _seats_for(eligible)
+        affected = {pid for game_seats in seats.values() for pid, _ in game_seats if pid}
 
         # 1. Re-anchor affected players to their state as of just before the cutoff,
         #    without reaching across a HARD boundary (not_before).
         working = _anchor_ratings_before(elo_system, affected, effective_cutoff, not_before)
 
         # 2. Drop the history we're rewriting.
-        EloRating.objects.filter(elo_system=elo_system, played_at__gte=effective_cutoff).delete()
+        rows_deleted, _ = EloRating.objects.filter(
+            elo_system=elo_system, played_at__gte=effective_cutoff).delete()
 
         # 3. Replay chronologically, applying each season reset as the cursor crosses it.
-        new_rows = []
-        for game in games:
-            # Advance across any season boundaries this game sits beyond, resetting the
-            # whole working set at each one per that season's reset_mode.
-            game_season = _season_number_for(starts, game.date_posted)
-            while current_season < game_season:
-                _apply_boundary_reset(working, seasons[current_season], elo_system.initial_rating)
-                current_season += 1
-
-            winners, losers, credit = game_participants(game)
-            if not winners or not losers:
-                continue  # degenerate game — skip (no rating rows written)
-            for pid in winners + losers:
-                working.setdefault(pid, [elo_system.initial_rating, 0, 0.0])
-            ratings = {pid: (working[pid][0], working[pid][1]) for pid in winners + losers}
-            results = apply_game_to_ratings(elo_system, winners, losers, ratings, credit)
-            winner_set = set(winners)
-            for pid, (before, after) in results.items():
-                wc = credit.get(pid, 0.0) if pid in winner_set else 0.0
-                new_rows.append(EloRating(
-                    elo_system=elo_system, game=game, player_id=pid,
-                    rating_before=before, rating_after=after,
-                    win_credit=wc, played_at=game.date_posted))
-                working[pid][0] = after
-                working[pid][1] += 1
-                working[pid][2] += wc
-        if new_rows:
-            EloRating.objects.bulk_create(new_rows, batch_size=500)
+        rows, _ = replay_games(elo_system, games, seats, working, seasons, current_season)
+        EloRating.objects.bulk_create(
+            (EloRating(elo_system=elo_system, game_id=game_id, player_id=pid,
+                       rating_before=before, rating_after=after,
+                       win_credit=wc, played_at=played_at)
+             for game_id, pid, before, after, wc, played_at in rows),
+            batch_size=500)
 
         # 4. Upsert current standings for all touched players.
         _write_participants(elo_system, working)
+
+    return {
+        'mode': 'full',
+        'games_replayed': len(games),
+        'rows_deleted': rows_deleted,
+        'rows_created': len(rows),
+        'elapsed': time.monotonic() - started,
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Incremental replay.
+# --------------------------------------------------------------------------- #
+
+# Two ratings closer than this are "the same" — stored floats round-trip exactly, this only
+# absorbs summation-order noise between effort orderings of tied seats.
+_RATING_EPS = 1e-6
+
+
+def _same_state(a, b):
+    """True when two [rating, games_played, wins] states are interchangeable for the replay."""
+    return (abs(a[0] - b[0]) <= _RATING_EPS and a[1] == b[1]
+            and abs(a[2] - b[2]) <= _RATING_EPS)
+
+
+def _same_rows(stored, fresh):
+    """True when the stored rows of a game ({pid: (id, before, after, credit)}) equal the
+    freshly computed ones ({pid: (before, after, credit)})."""
+    if stored.keys() != fresh.keys():
+        return False
+    for pid, (before, after, credit) in fresh.items():
+        _, s_before, s_after, s_credit = stored[pid]
+        if (abs(before - s_before) > _RATING_EPS or abs(after - s_after) > _RATING_EPS
+                or abs(credit - s_credit) > _RATING_EPS):
+            return False
+    return True
+
+
+def incremental_recompute_system_from(elo_system, cutoff_dt):
+    """Replay LOCAL elo from cutoff_dt, touching only games a change actually reaches.
+
+    Instead of wiping and rewriting every row from the cutoff, this diffs the stored rows
+    against the current eligible games and seeds a "contaminated" player set from the
+    games that changed (participants/result edited, added, dropped, moved or deleted).
+    It walks forward carrying two states per contaminated player — the TRUE state being
+    recomputed and the STORED state the existing rows imply — and only replays games with
+    a contaminated (or changed) participant; an opponent of a contaminated player joins
+    the set. A player leaves the set once both states agree again (rating, games_played
+    and wins), and the walk stops as soon as the set is empty with no changes left ahead.
+    Rows are rewritten only where their values differ.
+
+    Only valid when the system's math and season layout are unchanged since the rows were
+    written — config and season edits set `full_replay_pending` and go through
+    `recompute_system_from` instead.
+
+    Returns {'mode', 'games_replayed', 'rows_deleted', 'rows_created', 'elapsed'}.
+    """
+    started = time.monotonic()
+    initial = elo_system.initial_rating
+    games_replayed = 0
+    delete_ids, new_rows = [], []
+    with transaction.atomic():
+        EloSystem.objects.select_for_update().get(pk=elo_system.pk)
+
+        seasons, starts, effective_cutoff, not_before, current_season = \
+            _replay_window(elo_system, cutoff_dt)
+        start_season = current_season
+
+        eligible = _eligible_games_for_system(elo_system, since=effective_cutoff)
+        games = list(eligible.values_list('id', 'date_posted', 'coalition_win'))
+        seats = _seats_for(eligible)
+
+        # Stored history from the window start: per game (for the diff / row compare) and
+        # per player in replay order (to rebuild a clean player's stored state on demand).
+        stored = defaultdict(dict)       # game_id -> {pid: (row_id, before, after, credit)}
+        stored_at = {}                   # game_id -> played_at of its stored rows
+        player_rows = defaultdict(list)  # pid -> [((played_at, game_id), after, credit)]
+        orphans = defaultdict(dict)      # played_at -> {pid: (row_id, before, after, credit)}
+        for row_id, game_id, pid, before, after, credit, played_at in (
+                EloRating.objects
+                .filter(elo_system=elo_system, played_at__gte=effective_cutoff)
+                .values_list('id', 'game_id', 'player_id', 'rating_before',
+                             'rating_after', 'win_credit', 'played_at')):
+            row = (row_id, before, after, credit)
+            if game_id is None:
+                orphans[played_at][pid] = row  # its game was deleted
+            else:
+                stored[game_id][pid] = row
+                stored_at[game_id] = played_at
+            player_rows[pid].append(((played_at, game_id or 0), after, credit))
+        for rows in player_rows.values():
+            rows.sort(key=lambda r: r[0])
+
+        # Events in replay order. A 'stale' event drops stored rows whose game no longer
+        # counts at that position (deleted, now ineligible, or moved to another date).
+        events = []
+        eligible_at = {}
+        for game_id, date_posted, coalition_win in games:
+            eligible_at[game_id] = date_posted
+            winners, losers, credit = _split_participants(seats[game_id], coalition_win)
+            fresh_credit = {pid: credit.get(pid, 0.0) for pid in winners + losers}
+            rows = stored.get(game_id, {}) if stored_at.get(game_id) == date_posted else {}
+            changed = (rows.keys() != fresh_credit.keys() or any(
+                abs(rows[pid][3] - c) > _RATING_EPS for pid, c in fresh_credit.items()))
+            events.append(((date_posted, game_id), 'game', (winners, losers, credit, rows), changed))
+        for game_id, rows in stored.items():
+            if eligible_at.get(game_id) != stored_at[game_id]:
+                events.append(((stored_at[game_id], game_id), 'stale', rows, True))
+        for played_at, rows in orphans.items():
+            events.append(((played_at, 0), 'stale', rows, True))
+        events.sort(key=lambda e: (e[0], e[1] != 'stale'))
+        pending = sum(1 for e in events if e[3])
+
+        anchors = {}
+
+        def stored_state_before(pid, key):
+            """A clean player's state just before `key`, rebuilt from the stored rows."""
+            state = list(anchors[pid]) if anchors.get(pid) else None
+            season = start_season
+            for row_key, after, credit in player_rows.get(pid, ()):
+                if row_key >= key:
+                    break
+                row_season = _season_number_for(starts, row_key[0])
+                if state is None:
+                    state = [initial, 0, 0.0]
+                while season < row_season:
+                    _apply_boundary_reset({pid: state}, seasons[season], initial)
+                    season += 1
+                state = [after, state[1] + 1, state[2] + credit]
+            if state is None:
+                return [initial, 0, 0.0]
+            key_season = _season_number_for(starts, key[0])
+            while season < key_season:
+                _apply_boundary_reset({pid: state}, seasons[season], initial)
+                season += 1
+            return state
+
+        true_state, stored_state = {}, {}  # the contaminated set, keyed by player_id
+
+        def join(pids, key):
+            missing = [pid for pid in pids if pid not in true_state and pid not in anchors]
+            if missing:
+                anchors.update(dict.fromkeys(missing))
+                anchors.update(_anchor_ratings_before(
+                    elo_system, missing, effective_cutoff, not_before))
+            for pid in pids:
+                if pid not in true_state:
+                    state = stored_state_before(pid, key)
+                    true_state[pid], stored_state[pid] = state, list(state)
+
+        def settle(pids):
+            for pid in pids:
+                if pid in true_state and _same_state(true_state[pid], stored_state[pid]):
+                    del true_state[pid], stored_state[pid]
+
+        for key, kind, payload, changed in events:
+            if not true_state and not pending:
+                break  # nothing contaminated and no changes ahead: the rest is correct
+
+            event_season = _season_number_for(starts, key[0])
+            if current_season < event_season:
+                while current_season < event_season:
+                    for states in (true_state, stored_state):
+                        _apply_boundary_reset(states, seasons[current_season], initial)
+                    current_season += 1
+                settle(list(true_state))  # a HARD reset makes both states identical
+
+            if kind == 'stale':
+                pending -= 1
+                join(payload, key)
+                for pid, (row_id, _, after, credit) in payload.items():
+                    delete_ids.append(row_id)
+                    s = stored_state[pid]
+                    stored_state[pid] = [after, s[1] + 1, s[2] + credit]
+                settle(payload)
+                continue
+
+            winners, losers, credit, rows = payload
+            players = set(winners) | set(losers) | rows.keys()
+            if not changed and not (players & true_state.keys()):
+                continue  # clean game: stored rows stand
+            if changed:
+                pending -= 1
+            games_replayed += 1
+            join(players, key)
+
+            for pid, (_, _, after, row_credit) in rows.items():
+                s = stored_state[pid]
+                stored_state[pid] = [after, s[1] + 1, s[2] + row_credit]
+
+            fresh = {}
+            if winners and losers:
+                ratings = {pid: (true_state[pid][0], true_state[pid][1]) for pid in winners + losers}
+                winner_set = set(winners)
+                for pid, (before, after) in apply_game_to_ratings(
+                        elo_system, winners, losers, ratings, credit).items():
+                    wc = credit.get(pid, 0.0) if pid in winner_set else 0.0
+                    fresh[pid] = (before, after, wc)
+                    t = true_state[pid]
+                    true_state[pid] = [after, t[1] + 1, t[2] + wc]
+
+            if not _same_rows(rows, fresh):
+                delete_ids.extend(row[0] for row in rows.values())
+                new_rows.extend(
+                    EloRating(elo_system=elo_system, game_id=key[1], player_id=pid,
+                              rating_before=before, rating_after=after,
+                              win_credit=wc, played_at=key[0])
+                    for pid, (before, after, wc) in fresh.items())
+            settle(players)
+
+        # Deletes first: a moved game's new rows share (system, game, player) with its old.
+        for i in range(0, len(delete_ids), 500):
+            EloRating.objects.filter(id__in=delete_ids[i:i + 500]).delete()
+        if new_rows:
+            EloRating.objects.bulk_create(new_rows, batch_size=500)
+
+        # Players still contaminated at the end have a different final state; everyone who
+        # settled ends exactly where their stored history (and EloParticipant row) already is.
+        _write_participants(elo_system, true_state)
+
+    return {
+        'mode': 'incremental',
+        'games_replayed': games_replayed,
+        'rows_deleted': len(delete_ids),
+        'rows_created': len(new_rows),
+        'elapsed': time.monotonic() - started,
+    }
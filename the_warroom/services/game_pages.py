@@ -0,0 +1,100 @@
+"""Keyset pages for the infinite-scroll HTML game lists.
+
+The game list partials (game_list_home.html, tournament_game_list.html) append the
+next page when the last card scrolls into view. With Django's Paginator every page
+ran a COUNT(*) over the filtered, joined queryset plus an OFFSET scan, so page 300
+read 300 pages' worth of rows. `game_page` instead orders by (-date_posted, -id),
+like the API's GameCursorPagination, and each "next" link carries a cursor for the
+last game shown: a page is one indexed range query however deep it is, and no page
+needs a count.
+
+The count in the filter card header is only rendered with page 1; `game_count`
+caches it per filter set and audience for the current stats generation
+(services/leaderboard_cache.py), since the lists only show final games.
+
+A `?page=N` link without a cursor (bookmarks, crawlers that learned the old links)
+is served once with OFFSET; its next link carries a cursor.
+"""
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+from the_warroom.services.leaderboard_cache import cached_by_filters
+
+ORDERING = ('-date_posted', '-id')
+
+
+def encode_cursor(game):
+    raw = f'{game.date_posted.isoformat()}|{game.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """(date_posted, id) from a cursor, or None if it's missing or malformed."""
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        posted, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(posted), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class KeysetPage(Sequence):
+    """The subset of django.core.paginator.Page the list templates use, plus
+    `next_cursor` for the next link."""
+
+    def __init__(self, object_list, number, next_cursor):
+        self.object_list = object_list
+        self.number = number
+        self.next_cursor = next_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+
+def game_page(request, queryset, per_page=None):
+    """The requested page of `queryset` in (-date_posted, -id) order."""
+    per_page = per_page or settings.PAGE_SIZE
+    try:
+        number = max(int(request.GET.get('page') or 1), 1)
+    except (TypeError, ValueError):
+        number = 1
+    games = queryset.order_by(*ORDERING)
+    cursor = decode_cursor(request.GET.get('cursor'))
+    if cursor is not None:
+        posted, pk = cursor
+        games = games.filter(Q(date_posted__lt=posted) | Q(date_posted=posted, id__lt=pk))
+        offset = 0
+    else:
+        offset = (number - 1) * per_page
+    rows = list(games[offset:offset + per_page + 1])
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(rows, number, encode_cursor(rows[-1]) if more else None)
+
+
+def game_count(scope, audience, params, queryset):
+    """COUNT of `queryset`, shared across requests with the same filters and audience
+    until the stats generation moves."""
+    return cached_by_filters(f'games:{scope}', audience, params, queryset.count)
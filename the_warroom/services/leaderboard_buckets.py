@@ -0,0 +1,288 @@
+"""Pre-aggregated leaderboard tallies (LeaderboardBucket).
+
+One row per (subject, official, month) holding effort/win/coalition-win counts over
+final, non-test games — the same coalition formula as the cached_* fields, and the same
+games as the live Profile.leaderboard / Faction.leaderboard. Filtered /leaderboard/
+requests whose filters are only official / date range sum whole months from the table
+and aggregate just the partial months at the range edges live, instead of scanning
+every matching Effort.
+
+- `month_start` / `bucket_keys_for_game` — the (subject_type, subject_id, month) keys a
+  game contributes to, used by signals to queue a refresh.
+- `refresh_buckets` — recompute the given keys from Effort (idempotent; never drifts).
+- `rebuild_all_buckets` — from-scratch rebuild (management command).
+- `bucket_leaderboards` — the four boards for a filterset, or None when its filters
+  can't be expressed against the table (caller falls back to the live aggregation).
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.urls import reverse
+from django.utils import timezone
+
+from the_gatehouse.models import Profile
+from the_keep.models import Faction
+from the_warroom.models import Effort, LeaderboardBucket
+
+PLAYER = LeaderboardBucket.SubjectTypes.PLAYER
+FACTION = LeaderboardBucket.SubjectTypes.FACTION
+
+# Effort column holding each subject type's id.
+_SUBJECT_FIELD = {PLAYER: 'player_id', FACTION: 'faction_id'}
+
+# GameFilter params the table can answer. threshold/limit only parameterize the ranking.
+BUCKET_SAFE_PARAMS = {'official', 'date_after', 'date_before', 'threshold', 'limit'}
+
+
+def _counted_efforts():
+    """Efforts that count toward the boards: final, non-test games (cached_* semantics)."""
+    return Effort.objects.filter(game__final=True, game__test_match=False)
+
+
+def _tally_annotations():
+    return {
+        'n_efforts': Count('id'),
+        'n_wins': Count('id', filter=Q(win=True)),
+        'n_coalition': Count('id', filter=Q(win=True, game__coalition_win=True)),
+    }
+
+
+def month_start(value):
+    """First day (a date) of the month containing a datetime or date, in the current tz."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value) if timezone.is_aware(value) else value
+        value = value.date()
+    return value.replace(day=1)
+
+
+def _next_month(month):
+    return date(month.year + (month.month // 12), month.month % 12 + 1, 1)
+
+
+def _aware(d):
+    """Midnight at the start of date `d` in the current timezone."""
+    return timezone.make_aware(datetime.combine(d, time.min))
+
+
+# --------------------------------------------------------------------------- #
+# Maintenance.
+# --------------------------------------------------------------------------- #
+
+def bucket_keys_for_game(game, months=None, extra_subjects=()):
+    """(subject_type, subject_id, 'YYYY-MM-DD') keys a game's efforts contribute to.
+
+    `months` overrides the game's own month (e.g. old + new month after a date edit);
+    `extra_subjects` adds (subject_type, id) pairs that no longer appear on the game
+    (an effort's previous player/faction)."""
+    months = months or {month_start(game.date_posted)}
+    subjects = set(extra_subjects)
+    for player_id, faction_id in game.efforts.values_list('player_id', 'faction_id'):
+        if player_id:
+            subjects.add((PLAYER, player_id))
+        if faction_id:
+            subjects.add((FACTION, faction_id))
+    return sorted(
+        [subject_type, subject_id, month.isoformat()]
+        for subject_type, subject_id in subjects if subject_id
+        for month in months
+    )
+
+
+def refresh_buckets(keys):
+    """Recompute LeaderboardBucket rows for [(subject_type, subject_id, 'YYYY-MM-DD')].
+
+    Each key is re-aggregated from Effort (both official values for that subject/month), so the result is exact no matter how many times a key is queued.
+    One aggregate query per (subject_type, month) group."""
+    grouped = defaultdict(set)
+    for subject_type, subject_id, month in keys:
+        grouped[(subject_type, date.fromisoformat(str(month)[:10]))].add(int(subject_id))
+
+    with transaction.atomic():
+        for (subject_type, month), subject_ids in grouped.items():
+            field = _SUBJECT_FIELD[subject_type]
+            rows = (_counted_efforts()
+                    .filter(**{f'{field}__in': subject_ids},
+                            game__date_posted__gte=_aware(month),
+                            game__date_posted__lt=_aware(_next_month(month)))
+                    .values(field, 'game__official')
+                    .annotate(**_tally_annotations()))
+            LeaderboardBucket.objects.filter(
+                subject_type=subject_type, subject_id__in=subject_ids, month=month).delete()
+            LeaderboardBucket.objects.bulk_create([
+                LeaderboardBucket(
+                    subject_type=subject_type, subject_id=row[field], official=row['game__official'],
+                    month=month, efforts=row['n_efforts'], wins=row['n_wins'],
+                    coalition_wins=row['n_coalition'])
+                for row in rows
+            ], batch_size=500)
+
+
+def rebuild_all_buckets(batch_size=1000):
+    """Drop and rebuild every bucket from Effort. Returns the number of rows written."""
+    written = 0
+    with transaction.atomic():
+        LeaderboardBucket.objects.all().delete()
+        for subject_type, field in _SUBJECT_FIELD.items():
+            rows = (_counted_efforts().filter(**{f'{field}__isnull': False})
+                    .annotate(bucket_month=TruncMonth('game__date_posted'))
+                    .values(field, 'game__official', 'bucket_month')
+                    .annotate(**_tally_annotations())
+                    .order_by())
+            batch = []
+            for row in rows.iterator():
+                batch.append(LeaderboardBucket(
+                    subject_type=subject_type, subject_id=row[field], official=row['game__official'],
+                    month=month_start(row['bucket_month']), efforts=row['n_efforts'],
+                    wins=row['n_wins'], coalition_wins=row['n_coalition']))
+                if len(batch) >= batch_size:
+                    LeaderboardBucket.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                LeaderboardBucket.objects.bulk_create(batch)
+                written += len(batch)
+    return written
+
+
+# --------------------------------------------------------------------------- #
+# Reading.
+# --------------------------------------------------------------------------- #
+
+def _split_range(date_after, date_before):
+    """Split a GameFilter date range into whole months and live-aggregated edges.
+
+    GameFilter compares date_posted >= date_after 00:00 and <= date_before 00:00. Returns
+    (first_month, end_month, edges): buckets with first_month <= month < end_month are
+    entirely inside the range (either bound may be None = open), and `edges` is a list of
+    Q objects on game__date_posted covering the rest of the range exactly."""
+    lo = _aware(date_after) if date_after else None
+    hi = _aware(date_before) if date_before else None
+    if lo is not None and hi is not None and lo > hi:
+        return None, None, None  # empty range
+
+    first_month = None
+    if lo is not None:
+        first_month = month_start(date_after)
+        if first_month != date_after:
+            first_month = _next_month(first_month)
+    end_month = month_start(date_before) if hi is not None else None
+
+    if first_month and end_month and first_month >= end_month:
+        # No whole month inside: the entire range is one live edge.
+        bounds = Q()
+        if lo is not None:
+            bounds &= Q(game__date_posted__gte=lo)
+        return first_month, first_month, [bounds & Q(game__date_posted__lte=hi)]
+
+    edges = []
+    if lo is not None and _aware(first_month) > lo:
+        edges.append(Q(game__date_posted__gte=lo, game__date_posted__lt=_aware(first_month)))
+    if hi is not None:
+        edges.append(Q(game__date_posted__gte=_aware(end_month), game__date_posted__lte=hi))
+    return first_month, end_month, edges
+
+
+def _tallies(subject_type, official, first_month, end_month, edges):
+    """{subject_id: [efforts, wins, coalition_wins]} over the filtered range."""
+    tallies = defaultdict(lambda: [0, 0, 0])
+    buckets = LeaderboardBucket.objects.filter(subject_type=subject_type)
+    efforts = _counted_efforts()
+    if official is not None:
+        buckets = buckets.filter(official=official)
+        efforts = efforts.filter(game__official=official)
+    if first_month is not None:
+        buckets = buckets.filter(month__gte=first_month)
+    if end_month is not None:
+        buckets = buckets.filter(month__lt=end_month)
+
+    if first_month is None or end_month is None or first_month < end_month:
+        for subject_id, n, w, c in (buckets.values('subject_id')
+                                    .annotate(n=Sum('efforts'), w=Sum('wins'), c=Sum('coalition_wins'))
+                                    .values_list('subject_id', 'n', 'w', 'c')):
+            t = tallies[subject_id]
+            t[0] += n
+            t[1] += w
+            t[2] += c
+
+    field = _SUBJECT_FIELD[subject_type]
+    for edge in edges:
+        for row in (efforts.filter(edge).filter(**{f'{field}__isnull': False})
+                    .values(field).annotate(**_tally_annotations())):
+            t = tallies[row[field]]
+            t[0] += row['n_efforts']
+            t[1] += row['n_wins']
+            t[2] += row['n_coalition']
+    return tallies
+
+
+def _ranked(model_qs, tallies, threshold, limit, link_name):
+    """(top_by_winrate, top_by_points) model instances decorated like the live boards."""
+    scored = []
+    for subject_id, (n, wins, coalition) in tallies.items():
+        if n < threshold or n == 0:
+            continue
+        points = wins - coalition / 2
+        scored.append((subject_id, points / n * 100, points, n))
+    allowed = set(model_qs.filter(pk__in=[s[0] for s in scored]).values_list('pk', flat=True))
+    scored = [s for s in scored if s[0] in allowed]
+
+    by_rate = sorted(scored, key=lambda s: (-s[1], -s[3], s[0]))[:limit]
+    by_points = sorted(scored, key=lambda s: (-s[2], -s[1], s[0]))[:limit]
+    objects = model_qs.in_bulk({s[0] for s in by_rate} | {s[0] for s in by_points})
+
+    def decorate(rows):
+        out = []
+        for subject_id, win_rate, points, n in rows:
+            obj = objects[subject_id]
+            obj.win_rate, obj.tourney_points, obj.total_efforts = win_rate, points, n
+            obj.leaderboard_link = reverse(link_name, kwargs={'slug': obj.slug})
+            out.append(obj)
+        return out
+
+    return decorate(by_rate), decorate(by_points)
+
+
+def bucket_leaderboards(params, official_only, threshold, limit):
+    """(top_players, most_players, top_factions, most_factions) from the bucket table.
+
+    `params` is the request's GameFilter data (QueryDict); `official_only` is the
+    audience restriction for non-weird users. Returns None when a filter the table can't
+    express is active, a date value doesn't parse, or the table hasn't been built yet —
+    the caller then runs the live Effort aggregation."""
+    for key, values in params.lists():
+        if key not in BUCKET_SAFE_PARAMS and any(v and v.strip() for v in values):
+            return None
+    if not LeaderboardBucket.objects.exists():
+        return None
+
+    try:
+        date_after = date.fromisoformat(params['date_after']) if params.get('date_after') else None
+        date_before = date.fromisoformat(params['date_before']) if params.get('date_before') else None
+    except ValueError:
+        return None
+
+    # Same parsing as the BooleanFilter's NullBooleanField; anything else = no filter.
+    official = {'True': True, 'true': True, '1': True,
+                'False': False, 'false': False, '0': False}.get(params.get('official'))
+    if official_only:
+        if official is False:
+            return [], [], [], []  # official-only audience asking for fan-content games
+        official = True
+
+    first_month, end_month, edges = _split_range(date_after, date_before)
+    if edges is None:
+        return [], [], [], []
+
+    top_players, most_players = _ranked(
+        Profile.objects.all(),
+        _tallies(PLAYER, official, first_month, end_month, edges),
+        threshold, limit, 'player-detail')
+    top_factions, most_factions = _ranked(
+        Faction.objects.filter(component='Faction'),
+        _tallies(FACTION, official, first_month, end_month, edges),
+        threshold, limit, 'faction-detail')
+    return top_players, most_players, top_factions, most_factions
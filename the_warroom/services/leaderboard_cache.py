@@ -0,0 +1,91 @@
+"""Shared cache of computed leaderboards (leaderboard_view, tournament_leaderboard_page)
+and game list counts (services/game_pages.py).
+
+A filtered leaderboard request builds the GameFilter queryset, counts the games and
+runs four aggregations (or sums buckets/snapshots), even when the same filters were
+requested seconds earlier by someone else. The computed boards and game count are
+cached here, keyed by:
+
+- the page scope ('global', or the tournament id),
+- the audience: 'official' for non-weird logged-in users, 'all' otherwise,
+- the normalized querystring: parameters sorted, blank values, `page` and `cursor`
+  dropped,
+  so "?platform=X&official=" and "?official=&platform=X" share an entry,
+- the stats generation: a Redis counter bumped whenever a final game's stats change.
+
+Entries are never invalidated one by one: bumping the generation moves every reader
+to new keys, and the old entries expire after CACHE_TTL. The generation is bumped
+when the transaction that changed a counted game commits (the live aggregations see
+the new rows at once) and again by process_collected_changes once the buckets and
+tournament snapshots it refreshes are written.
+
+The counter starts at the current time in milliseconds, not 1, so if Redis ever
+evicts it the new generation can't collide with one still cached.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'warroom:stats:generation'
+KEY_PREFIX = 'warroom:leaderboard'
+# Safety net for changes that don't bump the generation (a renamed player, a
+# tournament's rounds rearranged).
+CACHE_TTL = 60 * 60
+IGNORED_PARAMS = {'page', 'cursor'}
+
+
+def stats_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_stats_generation():
+    """Start a new generation so cached leaderboards are recomputed. Never raises."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+    except Exception:
+        logger.warning('Leaderboard cache: could not bump the stats generation', exc_info=True)
+
+
+def normalized_query(params):
+    """`params` (a QueryDict) as a canonical querystring."""
+    items = []
+    for key in sorted(params.keys()):
+        if key in IGNORED_PARAMS:
+            continue
+        values = sorted(v.strip() for v in params.getlist(key) if v and v.strip())
+        items.extend((key, value) for value in values)
+    return urlencode(items)
+
+
+def cache_key(scope, audience, params):
+    digest = hashlib.sha1(normalized_query(params).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{stats_generation()}:{scope}:{audience}:{digest}'
+
+
+def cached_by_filters(scope, audience, params, build):
+    """build()'s result for these filters, from the cache when another request has
+    already computed it this generation. Falls back to build() if Redis is down."""
+    try:
+        key = cache_key(scope, audience, params)
+        value = cache.get(key)
+    except Exception:
+        logger.warning('Leaderboard cache unavailable', exc_info=True)
+        return build()
+    if value is None:
+        value = build()
+        try:
+            cache.set(key, value, CACHE_TTL)
+        except Exception:
+            logger.warning('Leaderboard cache: could not store %s', key, exc_info=True)
+    return value
@@ -0,0 +1,277 @@
+"""Resumable, windowed Root League backfills (LeagueBackfillJob / LeagueBackfillWindow).
+
+import_league_games(date_from=..., date_to=...) walks one offset-paginated query in
+a single task: a crash or time limit restarts the whole range, and nothing records
+how far it got. A backfill job instead splits its range into `window_days` windows:
+
+- `claim_windows` (the run_league_backfill task) starts pending windows, at most
+  `max_concurrency` at a time; each window is its own run_league_backfill_window task,
+  which dispatches again when it finishes so the next window starts.
+- `run_window` imports one window with league_import.import_matches, starting at its
+  `next_offset`. The cursor, counters and heartbeat are saved after every committed
+  page, so a restarted window repeats at most the page in flight (and those games
+  are skipped as already imported).
+- Every claim gives the window a new `claim` token, which its task carries. Every
+  write is a conditional update on status=running and that token, and the token is
+  checked again before each page is written. A window that was cancelled, or
+  requeued and claimed again while its worker only looked dead, stops its old
+  worker at its next page, before that worker imports anything more.
+- Windows are closed date ranges, so offsets only shift if matches are added or
+  removed mid-pass. The API's count is recorded at the first page and compared at
+  the end; if it changed the window makes another pass from offset 0 (new matches
+  are imported, the rest skipped), up to MAX_PASSES.
+- A running window whose heartbeat is older than STALE_AFTER (its worker died or was
+  restarted) is requeued on the next dispatch; resume_league_backfills does that
+  periodically. A window is marked failed after MAX_ATTEMPTS fetch failures.
+"""
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from the_warroom.models import LeagueBackfillJob, LeagueBackfillWindow
+from the_warroom.services.league_import import MATCH_API_URL, PLAYER_API_URL, import_matches
+
+logger = logging.getLogger(__name__)
+
+Status = LeagueBackfillJob.StatusChoices
+
+STALE_AFTER = timedelta(minutes=15)
+MAX_ATTEMPTS = 3
+MAX_PASSES = 3
+# error_ids keeps the most recent ids only.
+MAX_ERROR_IDS = 200
+
+
+def build_windows(job):
+    """Create the job's windows (once). Returns how many exist."""
+    if job.windows.exists():
+        return job.windows.count()
+    step = timedelta(days=job.window_days)
+    windows, start = [], job.date_from
+    while start < job.date_to:
+        end = min(start + step, job.date_to)
+        windows.append(LeagueBackfillWindow(job=job, start=start, end=end))
+        start = end
+    LeagueBackfillWindow.objects.bulk_create(windows)
+    return len(windows)
+
+
+def create_job(date_from, date_to, window_days=7, tournament_name='', page_size=25, max_concurrency=2):
+    job = LeagueBackfillJob(date_from=date_from, date_to=date_to, window_days=window_days,
+                            tournament_name=tournament_name, page_size=page_size,
+                            max_concurrency=max_concurrency)
+    job.full_clean()
+    with transaction.atomic():
+        job.save()
+        build_windows(job)
+    return job
+
+
+def window_params(window):
+    # Both bounds are inclusive in the API; a match closed exactly on a boundary is
+    # listed by both windows and skipped by the second.
+    return {
+        'tournament__name': window.job.tournament_name,
+        'date_closed__gte': window.start.isoformat(),
+        'date_closed__lte': window.end.isoformat(),
+    }
+
+
+def _finish_job(job, now):
+    failed = job.windows.filter(status=Status.FAILED).exists()
+    job.status = Status.FAILED if failed else Status.DONE
+    job.finished_at = now
+    job.save(update_fields=['status', 'finished_at'])
+
+
+def claim_windows(job_id, now=None):
+    """Mark up to the job's free concurrency slots of pending windows as running and
+    return {window id: claim token} (the caller starts a task for each).
+
+    Requeues stale running windows first, and closes the job once no window is
+    pending or running. The job row is locked so concurrent dispatches can't
+    over-claim."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        job = LeagueBackfillJob.objects.select_for_update().get(pk=job_id)
+        if job.status not in (Status.PENDING, Status.RUNNING):
+            return []
+        windows = job.windows.all()
+        stale = windows.filter(status=Status.RUNNING, heartbeat_at__lt=now - STALE_AFTER)
+        stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+            status=Status.FAILED, last_error='Worker stopped responding', finished_at=now)
+        stale.update(status=Status.PENDING, claim=None)
+
+        running = windows.filter(status=Status.RUNNING).count()
+        slots = max(job.max_concurrency - running, 0)
+        pending = list(windows.filter(status=Status.PENDING).order_by('start').values_list('pk', flat=True)[:slots])
+        # One token per claim is enough: it only has to differ from the window's last one.
+        claim = uuid.uuid4()
+        claimed = {pk: claim for pk in pending}
+        if claimed:
+            LeagueBackfillWindow.objects.filter(pk__in=pending, status=Status.PENDING).update(
+                status=Status.RUNNING, heartbeat_at=now, attempts=F('attempts') + 1, claim=claim)
+        if job.status == Status.PENDING:
+            job.status, job.started_at = Status.RUNNING, now
+            job.save(update_fields=['status', 'started_at'])
+        if not running and not claimed:
+            _finish_job(job, now)
+    return claimed
+
+
+def _claimed(window, claim):
+    """The window's row, if it's still running under `claim`."""
+    return LeagueBackfillWindow.objects.filter(pk=window.pk, status=Status.RUNNING, claim=claim)
+
+
+class _Checkpoint:
+    """import_matches on_page hook: persist the window's cursor and counters.
+    Also the before_page hook: check the claim (and heartbeat) before a page is written."""
+
+    def __init__(self, window, claim):
+        self.window = window
+        self.claim = claim
+        self.error_ids = window.error_ids.split() if window.error_ids else []
+        self.seen = {'done': 0, 'skipped': 0, 'errors': 0}
+        self.mark = time.monotonic()
+        self.lost = False
+
+    def _deltas(self, stats):
+        deltas = {}
+        for key in self.seen:
+            deltas[key] = len(stats[key]) - self.seen[key]
+            self.seen[key] = len(stats[key])
+        return deltas
+
+    def save(self, stats, **fields):
+        """Conditional update of the window; False if it's no longer ours."""
+        started = self.seen['errors']
+        deltas = self._deltas(stats)
+        self.error_ids = (self.error_ids + [e for e in stats['errors'][started:] if ' ' not in e])[-MAX_ERROR_IDS:]
+        elapsed, self.mark = time.monotonic() - self.mark, time.monotonic()
+        updated = _claimed(self.window, self.claim).update(
+            imported=F('imported') + deltas['done'],
+            skipped=F('skipped') + deltas['skipped'],
+            errors=F('errors') + deltas['errors'],
+            error_ids=' '.join(self.error_ids),
+            seconds=F('seconds') + elapsed,
+            heartbeat_at=timezone.now(),
+            **fields,
+        )
+        self.lost = not updated
+        return updated
+
+    def still_claimed(self, pager):
+        if not _claimed(self.window, self.claim).update(heartbeat_at=timezone.now()):
+            self.lost = True
+        return not self.lost
+
+    def __call__(self, pager, stats):
+        fields = {'next_offset': pager.page_offset + pager.limit}
+        if self.window.api_count is None and pager.count is not None:
+            self.window.api_count = fields['api_count'] = pager.count
+        return bool(self.save(stats, **fields))
+
+
+def _retry_status(window):
+    return Status.FAILED if window.attempts >= MAX_ATTEMPTS else Status.PENDING
+
+
+def run_window(window_id, claim=None, base_url=MATCH_API_URL, player_url=PLAYER_API_URL, session=None):
+    """Import a claimed (running) window from its cursor, as the holder of `claim`
+    (the token claim_windows returned; None takes the window's current one). Returns
+    its final status, or None if the window wasn't running under that claim or was
+    taken away mid-import."""
+    window = LeagueBackfillWindow.objects.select_related('job').get(pk=window_id)
+    claim = claim or window.claim
+    if window.status != Status.RUNNING or str(window.claim) != str(claim):
+        return None
+    params = window_params(window)
+    while True:
+        checkpoint = _Checkpoint(window, claim)
+        try:
+            stats = import_matches(params, limit=window.job.page_size, base_url=base_url,
+                                   player_url=player_url, session=session,
+                                   offset=window.next_offset, on_page=checkpoint,
+                                   before_page=checkpoint.still_claimed)
+        except Exception as e:
+            logger.exception('League backfill: window %s crashed', window.pk)
+            status = _retry_status(window)
+            if not _claimed(window, claim).update(
+                    status=status, last_error=repr(e), heartbeat_at=timezone.now(),
+                    finished_at=timezone.now() if status == Status.FAILED else None):
+                return None
+            return status
+        if checkpoint.lost:
+            logger.info('League backfill: window %s stopped (no longer running)', window.pk)
+            return None
+
+        if not stats['complete']:
+            fetch_errors = [e for e in stats['errors'] if e.startswith('fetch:')]
+            status = _retry_status(window)
+            if not checkpoint.save(stats, status=status, last_error=fetch_errors[-1] if fetch_errors else '',
+                                   finished_at=timezone.now() if status == Status.FAILED else None):
+                return None
+            logger.warning('League backfill: window %s interrupted (%s)', window.pk, status)
+            return status
+
+        shifted = (window.api_count is not None and stats['count'] is not None
+                   and stats['count'] != window.api_count)
+        if shifted and window.passes + 1 < MAX_PASSES:
+            # Matches were added or removed mid-pass, so offsets moved: go again.
+            logger.info('League backfill: window %s count changed %s -> %s, re-reading',
+                        window.pk, window.api_count, stats['count'])
+            window.passes += 1
+            window.next_offset, window.api_count = 0, None
+            window.error_ids = ' '.join(checkpoint.error_ids)
+            if not checkpoint.save(stats, passes=window.passes, next_offset=0, api_count=None):
+                return None
+            continue
+
+        if not checkpoint.save(stats, status=Status.DONE, finished_at=timezone.now(), last_error=''):
+            return None
+        return Status.DONE
+
+
+def cancel_job(job):
+    """Stop dispatching the job; running windows stop after their current page."""
+    with transaction.atomic():
+        job.windows.filter(status__in=[Status.PENDING, Status.RUNNING]).update(status=Status.CANCELLED)
+        LeagueBackfillJob.objects.filter(pk=job.pk).update(status=Status.CANCELLED, finished_at=timezone.now())
+
+
+def resume_job(job):
+    """Requeue the job's failed and cancelled windows (cursors kept) and reopen it."""
+    with transaction.atomic():
+        job.windows.filter(status__in=[Status.FAILED, Status.CANCELLED]).update(
+            status=Status.PENDING, attempts=0, finished_at=None)
+        LeagueBackfillJob.objects.filter(pk=job.pk).update(
+            status=Status.RUNNING if job.started_at else Status.PENDING, finished_at=None)
+
+
+def with_progress(queryset):
+    """Annotate jobs with their window counters (see progress())."""
+    return queryset.annotate(
+        window_total=Count('windows'),
+        windows_remaining=Count('windows', filter=Q(windows__status__in=[Status.PENDING, Status.RUNNING])),
+        windows_failed=Count('windows', filter=Q(windows__status=Status.FAILED)),
+        games_imported=Sum('windows__imported', default=0),
+        games_skipped=Sum('windows__skipped', default=0),
+        games_errored=Sum('windows__errors', default=0),
+    )
+
+
+def games_per_second(job, now=None):
+    """Imported games per wall-clock second since the job started, or None."""
+    if not job.started_at:
+        return None
+    elapsed = ((job.finished_at or now or timezone.now()) - job.started_at).total_seconds()
+    imported = getattr(job, 'games_imported', None)
+    if imported is None:
+        imported = job.windows.aggregate(n=Sum('imported', default=0))['n']
+    return imported / elapsed if elapsed > 0 else None
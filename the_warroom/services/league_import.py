@@ -0,0 +1,633 @@
+"""Batched, pipelined Root League API import.
+
+import_league_games / update_league_games used to handle the API one match at a
+time: an exists() per league_id, a `.filter(title=...).first()` per deck, map,
+faction, hireling and landmark, up to five Profile queries (and possibly a
+synchronous player-API call) per seat, a save() per Game and Effort, and a 500 ms
+sleep between pages. A page is now handled as a unit:
+
+- `MatchPager` fetches page n+1 on a background thread while page n is imported
+  (one pooled Session; request starts are still spaced by MIN_REQUEST_INTERVAL).
+- `LeagueLookups` maps every API key to its Deck/Map/Faction/Vagabond/Hireling/
+  Landmark with one query per model per run, and caches rounds by name.
+- `PlayerResolver` resolves every seat on the page from one Profile query, keeping
+  the old lookup order (rdl_cannonical_dwd, standardized dwd, raw dwd, bare dwd, bare
+  discord); player-API names for unknown players are fetched concurrently up front.
+- Existing league_ids for the page come from one query; new games, their efforts and
+  hireling/landmark links are written with bulk_create in one transaction per page.
+  If that transaction fails the page is retried one match per transaction, so a bad
+  match is reported as an error instead of sinking its neighbours.
+
+bulk_create skips save() and the model signals, so `_queue_side_effects` does their
+work for the page at once, after commit: game coalition_win / cached_player_count
+are set before insert, and cached winrates, tournament counts, local Elo and
+leaderboard buckets are queued the same way the Effort/Game signals would.
+
+Both entry points return a stats dict with imported/updated, skipped and error ids
+and per-stage timings in seconds (fetch_wait, lookup, players, write, side_effects).
+Long date ranges are imported window by window through services/league_backfill.py.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+
+from dateutil import parser
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from the_gatehouse.models import Profile
+from the_gatehouse.tasks import send_discord_message_task
+from the_keep.models import Deck, Faction, Hireling, Landmark, Map, StatusChoices, Vagabond
+
+from the_warroom.models import Effort, Game, PlatformChoices, Tournament
+from the_warroom.services.root_league_api import (
+    DECK_MAP, FACTION_MAP, HIRELING_MAP, LANDMARK_MAP, MAP_MAP, PLAYER_API_URL, VAGABOND_MAP,
+    fetch_api_discord_name, get_game_round, sanitize_discord,
+)
+from the_warroom.utils import clean_nickname
+
+logger = logging.getLogger(__name__)
+
+MATCH_API_URL = "https://rootleague.pliskin.dev/api/match/"
+LEAGUE_TOURNAMENT_NAME = 'Root Digital League'
+# Minimum spacing between match-API request starts (the old fixed sleep).
+MIN_REQUEST_INTERVAL = 0.5
+# Concurrent player-API lookups for players new to the site.
+PLAYER_LOOKUP_WORKERS = 4
+# Effort fields checked with clean_fields() in place of Effort.save()'s full_clean();
+# the foreign keys come from the lookup tables, so they're skipped.
+_EFFORT_FK_FIELDS = ['game', 'player', 'faction', 'vagabond', 'coalition_with', 'discarded_captain']
+DOMINANCE_MAP = {
+    'fox': Effort.DominanceChoices.FOX,
+    'rabbit': Effort.DominanceChoices.RABBIT,
+    'mouse': Effort.DominanceChoices.MOUSE,
+    'bird': Effort.DominanceChoices.BIRD,
+}
+STAGES = ('fetch_wait', 'lookup', 'players', 'write', 'side_effects')
+
+
+def _api_headers():
+    from django.conf import settings
+    token = getattr(settings, 'RDL_API_TOKEN', '')
+    return {'Authorization': f'Token {token}'} if token else {}
+
+
+# --------------------------------------------------------------------------- #
+# Fetching.
+# --------------------------------------------------------------------------- #
+
+class MatchPager:
+    """Iterate the match API's pages, prefetching the next page while the caller
+    processes the current one. Raises requests.RequestException from the fetch that
+    failed; pages already yielded stay imported.
+
+    Iteration starts at `offset`. While a page is being handled, `page_offset` is its
+    offset and `count` the API's total for the query as of that fetch."""
+
+    def __init__(self, params, limit, session, base_url=MATCH_API_URL, min_interval=MIN_REQUEST_INTERVAL,
+                 offset=0):
+        self.params = params
+        self.limit = limit
+        self.session = session
+        self.base_url = base_url
+        self.min_interval = min_interval
+        self.offset = offset
+        self.page_offset = None
+        self.count = None
+        self.wait_seconds = 0.0
+        self._last_start = None
+
+    def _fetch(self, offset):
+        if self._last_start is not None:
+            delay = self.min_interval - (time.monotonic() - self._last_start)
+            if delay > 0:
+                time.sleep(delay)
+        self._last_start = time.monotonic()
+        response = self.session.get(
+            self.base_url, params={**self.params, 'limit': self.limit, 'offset': offset},
+            headers=_api_headers(), timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def __iter__(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            offset = self.offset
+            future = pool.submit(self._fetch, offset)
+            while future is not None:
+                started = time.perf_counter()
+                try:
+                    data = future.result()
+                finally:
+                    self.wait_seconds += time.perf_counter() - started
+                self.count = data.get('count', self.count)
+                results = data.get('results') or []
+                if not results:
+                    return
+                self.page_offset = offset
+                offset += self.limit
+                future = pool.submit(self._fetch, offset) if data.get('next') is not None else None
+                yield results
+
+
+# --------------------------------------------------------------------------- #
+# Lookups.
+# --------------------------------------------------------------------------- #
+
+def _first_by(queryset, key):
+    """{key(obj): obj}, keeping the object `.filter(...).first()` would have returned."""
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    table = {}
+    for obj in queryset:
+        table.setdefault(key(obj), obj)
+    return table
+
+
+def _iexact_table(model, titles):
+    titles = {t.lower() for t in titles}
+    return _first_by(model.objects.annotate(title_lower=Lower('title')).filter(title_lower__in=titles),
+                     lambda obj: obj.title_lower)
+
+
+class LeagueLookups:
+    """API key -> model instance tables, built once per run."""
+
+    def __init__(self):
+        faction_titles = set(FACTION_MAP.values()) | {'Vagabond'}
+        self.factions = _first_by(Faction.objects.filter(title__in=faction_titles), lambda f: f.title)
+        self.vagabonds = _first_by(Vagabond.objects.filter(title__in=VAGABOND_MAP.values()), lambda v: v.title)
+        self.decks = _first_by(Deck.objects.filter(title__in=DECK_MAP.values()), lambda d: d.title)
+        self.maps = _first_by(Map.objects.filter(title__in=MAP_MAP.values()), lambda m: m.title)
+        self.hirelings = _iexact_table(Hireling, HIRELING_MAP.values())
+        self.landmarks = _iexact_table(Landmark, LANDMARK_MAP.values())
+        self.tournament, _ = Tournament.objects.get_or_create(name=LEAGUE_TOURNAMENT_NAME)
+        self._rounds = {}
+
+    def faction(self, key):
+        """Faction for an API faction key ('Vagabond' for every vagabond key)."""
+        title = FACTION_MAP.get(key)
+        return self.factions.get(title) if title else None
+
+    def vagabond(self, key):
+        title = VAGABOND_MAP.get(key)
+        return self.vagabonds.get(title) if title else None
+
+    def deck(self, key):
+        title = DECK_MAP.get(key)
+        return self.decks.get(title) if title else None
+
+    def map(self, key):
+        title = MAP_MAP.get(key)
+        return self.maps.get(title) if title else None
+
+    def hirelings_for(self, match_data):
+        return self._many(match_data, 'hirelings', ('hirelings_a', 'hirelings_b', 'hirelings_c'),
+                          HIRELING_MAP, self.hirelings)
+
+    def landmarks_for(self, match_data):
+        return self._many(match_data, 'landmarks', ('landmark_a', 'landmark_b'),
+                          LANDMARK_MAP, self.landmarks)
+
+    @staticmethod
+    def _many(match_data, list_field, single_fields, key_map, table):
+        # The match payload carries both the list and the per-slot fields; the old
+        # create path read one and the update path the other, so take their union.
+        keys = list(match_data.get(list_field) or []) + [match_data.get(f) for f in single_fields]
+        found = {}
+        for key in keys:
+            title = key_map.get(key) if key else None
+            obj = table.get(title.lower()) if title else None
+            if obj is not None:
+                found.setdefault(obj.pk, obj)
+        return list(found.values())
+
+    def round(self, round_name, date_closed):
+        """get_game_round, once per round name per run (it may create the round)."""
+        if not round_name:
+            return None
+        if round_name not in self._rounds:
+            self._rounds[round_name] = get_game_round(
+                date_closed=date_closed, round_name=round_name, tournament=self.tournament)
+        return self._rounds[round_name]
+
+    def forget_rounds(self):
+        """Drop cached rounds, e.g. after a rollback may have discarded new ones."""
+        self._rounds = {}
+
+
+# --------------------------------------------------------------------------- #
+# Players.
+# --------------------------------------------------------------------------- #
+
+def split_player_string(full_player_string):
+    """'MrMirz+1445' -> ('MrMirz', 'MrMirz+1445'): bare name and standardized dwd."""
+    parts = full_player_string.split('+', 1)
+    bare = parts[0]
+    number = parts[1] if len(parts) > 1 else "0000"
+    return bare, f'{bare}+{str(number).zfill(4)}'
+
+
+class PlayerResolver:
+    """Resolve a page's API player strings to Profiles from one query.
+
+    Follows create_efforts_from_api's lookup order and side effects (dwd
+    standardization, rdl_cannonical_dwd backfill, new profiles) against in-memory
+    indexes that are kept current as profiles change within the page."""
+
+    def __init__(self, player_strings, session=None, player_url=PLAYER_API_URL):
+        self.session = session
+        self.player_url = player_url
+        fulls, lowered, bares = set(), set(), set()
+        for full in player_strings:
+            bare, standard = split_player_string(full)
+            fulls.add(full)
+            lowered.update({standard.lower(), full.lower(), bare.lower()})
+            bares.add(bare.lower())
+        self.by_canonical, self.by_dwd, self.by_bare_discord = {}, {}, {}
+        if not fulls:
+            return
+        candidates = (Profile.objects
+                      .annotate(dwd_lower=Lower('dwd'), discord_lower=Lower('discord'))
+                      .filter(Q(rdl_cannonical_dwd__in=fulls) | Q(dwd_lower__in=lowered)
+                              | Q(discord_lower__in=bares, dwd__isnull=True)))
+        for profile in candidates:
+            if profile.rdl_cannonical_dwd:
+                self.by_canonical.setdefault(profile.rdl_cannonical_dwd, profile)
+            if profile.dwd:
+                self.by_dwd.setdefault(profile.dwd.lower(), profile)
+            elif profile.discord:
+                self.by_bare_discord.setdefault(profile.discord.lower(), profile)
+
+    def _find(self, full):
+        """(profile or None, whether its dwd must be standardized)."""
+        bare, standard = split_player_string(full)
+        if full in self.by_canonical:
+            return self.by_canonical[full], False
+        if standard.lower() in self.by_dwd:
+            return self.by_dwd[standard.lower()], False
+        for key in (full.lower(), bare.lower()):
+            if key in self.by_dwd:
+                return self.by_dwd[key], True
+        if bare.lower() in self.by_bare_discord:
+            return self.by_bare_discord[bare.lower()], True
+        return None, False
+
+    def prefetch_api_names(self, participants):
+        """{player_id: discord_name} for seats that don't resolve to an existing
+        profile, looked up concurrently (best effort, like fetch_api_discord_name)."""
+        ids = list({p.get('player_id') for p in participants
+                    if p.get('player_id') and self._find(p['player'])[0] is None})
+        if not ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(PLAYER_LOOKUP_WORKERS, len(ids))) as pool:
+            names = pool.map(lambda pid: fetch_api_discord_name(pid, self.session, self.player_url), ids)
+            return dict(zip(ids, names))
+
+    def _index(self, profile, old_dwd=None):
+        if old_dwd and self.by_dwd.get(old_dwd.lower()) is profile:
+            del self.by_dwd[old_dwd.lower()]
+        if profile.dwd:
+            self.by_dwd.setdefault(profile.dwd.lower(), profile)
+            if profile.discord and self.by_bare_discord.get(profile.discord.lower()) is profile:
+                del self.by_bare_discord[profile.discord.lower()]
+        if profile.rdl_cannonical_dwd:
+            self.by_canonical.setdefault(profile.rdl_cannonical_dwd, profile)
+
+    def resolve(self, participant, api_names):
+        """The Profile for a participant, creating or updating it as the old import did."""
+        full = participant['player']
+        bare, standard = split_player_string(full)
+        player, standardize = self._find(full)
+        if player is not None and standardize:
+            old_dwd = player.dwd
+            player.dwd = standard
+            player.save()
+            self._index(player, old_dwd)
+        elif player is None:
+            player_id = participant.get('player_id')
+            api_name = (api_names[player_id] if player_id in api_names
+                        else fetch_api_discord_name(player_id, self.session, self.player_url))
+            preferred = sanitize_discord(api_name) or bare.lower()
+            defaults = {'dwd': standard, 'rdl_cannonical_dwd': full}
+            if Profile.objects.filter(discord__iexact=preferred).exists():
+                disambiguated = sanitize_discord(full) or full.lower()
+                player, _ = Profile.objects.get_or_create(discord=disambiguated, defaults=defaults)
+                message = f'Duplicate user {player} added.'
+                transaction.on_commit(lambda: send_discord_message_task.delay(message, 'user_updates'))
+            else:
+                player, _ = Profile.objects.get_or_create(discord=preferred, defaults=defaults)
+            self._index(player)
+
+        # Backfill the canonical value unless another profile already owns it
+        # (rdl_cannonical_dwd is unique). Every owner of a page value is indexed.
+        if not player.rdl_cannonical_dwd and self.by_canonical.get(full, player) is player:
+            player.rdl_cannonical_dwd = full
+            player.save()
+            self._index(player)
+        return player
+
+
+# --------------------------------------------------------------------------- #
+# Building.
+# --------------------------------------------------------------------------- #
+
+def _date_closed(match_data):
+    return parser.parse(match_data.get('date_closed', match_data.get('date_modified')))
+
+
+def build_efforts(participants, lookups, players):
+    """Unsaved Efforts for a match's participants (`players`: Profile per seat)."""
+    faction_by_player = {p['player']: lookups.faction(p['faction']) for p in participants}
+    efforts = []
+    for participant, player in zip(participants, players):
+        faction_key = participant['faction']
+        score = participant.get('game_score')
+        dominance = participant.get('dominance')
+        effort = Effort(
+            seat=participant.get('turn_order'),
+            player=player,
+            faction=lookups.faction(faction_key),
+            vagabond=lookups.vagabond(faction_key),
+            coalition_with=(faction_by_player.get(participant['coalition'])
+                            if participant.get('coalition') else None),
+            dominance=DOMINANCE_MAP.get(dominance.lower()) if dominance else None,
+            win=float(participant.get('tournament_score', 0)) > 0,
+            score=int(score) if score is not None else None,
+            faction_status=StatusChoices.STABLE,
+        )
+        effort.clean_fields(exclude=_EFFORT_FK_FIELDS)
+        efforts.append(effort)
+    return efforts
+
+
+def apply_match_fields(game, match_data, lookups, efforts):
+    """Set the API-derived fields of `game` (new or existing), including what
+    Game.save() and the Effort save path would otherwise fill in."""
+    date_closed = _date_closed(match_data)
+    undrafted_key = match_data.get('undrafted_faction')
+    game.type = Game.TypeChoices.ASYNC if match_data.get('turn_timing') == 'async' else Game.TypeChoices.LIVE
+    game.platform = PlatformChoices.DWD
+    game.deck = lookups.deck(match_data.get('deck'))
+    game.map = lookups.map(match_data.get('board_map'))
+    game.round = lookups.round(match_data.get('tournament', ''), date_closed)
+    game.undrafted_faction = lookups.faction(undrafted_key) if undrafted_key else None
+    game.undrafted_vagabond = lookups.vagabond(undrafted_key)
+    game.link = match_data.get('table_talk_url', '')
+    game.nickname = clean_nickname(match_data.get('title', ''))
+    game.random_clearing = bool(match_data.get('random_suits'))
+    game.date_posted = date_closed
+    game.coalition_win = any(e.win and e.coalition_with_id for e in efforts)
+    game.cached_player_count = len(efforts)
+    if not game.video_link:
+        game.video_platform = ''
+    return game
+
+
+def new_game(match_data, lookups, efforts):
+    game = Game(
+        league_id=str(match_data['id']),
+        official=True,
+        final=True,
+        status=StatusChoices.STABLE,
+        notes=f"Imported from rootleague.pliskin.dev on {timezone.now().strftime('%m/%d/%y')}",
+    )
+    return apply_match_fields(game, match_data, lookups, efforts)
+
+
+# --------------------------------------------------------------------------- #
+# Writing.
+# --------------------------------------------------------------------------- #
+
+def _link_m2m(games, links):
+    """Bulk-insert hireling/landmark rows: `links` is [(game, hirelings, landmarks)]."""
+    Game.hirelings.through.objects.bulk_create([
+        Game.hirelings.through(game_id=game.pk, hireling_id=h.pk)
+        for game, hirelings, _ in links for h in hirelings
+    ])
+    Game.landmarks.through.objects.bulk_create([
+        Game.landmarks.through(game_id=game.pk, landmark_id=lm.pk)
+        for game, _, landmarks in links for lm in landmarks
+    ])
+
+
+def _queue_side_effects(games, efforts):
+    """Record what the Game/Effort signals would have for these rows on the change
+    collector, so the batch is processed by one task after commit."""
+    from the_gatehouse.services.header_stats import invalidate_header_stats
+    from the_warroom.services.change_collector import record
+    from the_warroom.services.leaderboard_buckets import FACTION, PLAYER, month_start
+    if not games:
+        return
+
+    label = lambda model: (model._meta.app_label, model._meta.model_name)
+    winrates = set()
+    for effort in efforts:
+        if effort.faction_id:
+            winrates.add(label(Faction) + (effort.faction_id,))
+        if effort.vagabond_id:
+            winrates.add(label(Vagabond) + (effort.vagabond_id,))
+        if effort.player_id:
+            winrates.add(label(Profile) + (effort.player_id,))
+
+    counted = [g for g in games if g.final and not g.test_match]
+    month_by_game = {g.pk: month_start(g.date_posted).isoformat() for g in counted}
+    keys = set()
+    for effort in efforts:
+        month = month_by_game.get(effort.game_id)
+        if month is None:
+            continue
+        if effort.player_id:
+            keys.add((PLAYER, effort.player_id, month))
+        if effort.faction_id:
+            keys.add((FACTION, effort.faction_id, month))
+
+    # Games resolve to their tournaments' counts and (final, non-test) Elo systems.
+    # Counted games change results, so cached leaderboards and counts move on too
+    # (stats), as with the Game/Effort signals.
+    record(games=[g.pk for g in games], winrates=winrates, buckets=keys,
+           elo_games=[g.pk for g in counted], stats=bool(counted))
+    # Bulk rows skip the header-stats signals too (the_gatehouse/signals.py).
+    invalidate_header_stats(*{g.recorder_id for g in games}, *{e.player_id for e in efforts})
+
+
+@contextmanager
+def _timed(stats, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats['timings'][stage] += time.perf_counter() - started
+
+
+def _new_stats():
+    return {'done': [], 'skipped': [], 'errors': [], 'timings': dict.fromkeys(STAGES, 0.0),
+            'complete': False, 'count': None}
+
+
+def _write_batch(matches, existing, lookups, resolver, api_names, stats):
+    """Resolve, build and write `matches` (inside the caller's transaction).
+
+    `existing` maps league_id -> Game for the update path, or is None to create
+    games. Returns the ids written; a match that can't be built is recorded as an
+    error and left out."""
+    built = []
+    with _timed(stats, 'players'):
+        for match_data in matches:
+            league_id = str(match_data.get('id'))
+            try:
+                participants = match_data['participants']
+                players = [resolver.resolve(p, api_names) for p in participants]
+                efforts = build_efforts(participants, lookups, players)
+                if existing is None:
+                    game = new_game(match_data, lookups, efforts)
+                else:
+                    game = apply_match_fields(existing[league_id], match_data, lookups, efforts)
+                built.append((league_id, game, efforts,
+                              lookups.hirelings_for(match_data), lookups.landmarks_for(match_data)))
+            except Exception as e:
+                logger.warning('League import: could not build match %s: %s', league_id, e)
+                stats['errors'].append(league_id)
+
+    with _timed(stats, 'write'):
+        games = [game for _, game, _, _, _ in built]
+        if existing is None:
+            Game.objects.bulk_create(games)
+            _link_m2m(games, [(game, hirelings, landmarks) for _, game, _, hirelings, landmarks in built])
+        else:
+            # Existing games keep their signals: old seats are deleted (and their
+            # stats refreshed) and the game saved as before; only the new seats are bulk.
+            Effort.objects.filter(game__in=games).delete()
+            for _, game, _, hirelings, landmarks in built:
+                game.save()
+                game.hirelings.set(hirelings)
+                game.landmarks.set(landmarks)
+        all_efforts = []
+        for _, game, efforts, _, _ in built:
+            for effort in efforts:
+                effort.game = game
+            all_efforts.extend(efforts)
+        Effort.objects.bulk_create(all_efforts)
+
+    with _timed(stats, 'side_effects'):
+        _queue_side_effects(games, all_efforts)
+    return [league_id for league_id, *_ in built]
+
+
+def _import_page(matches, existing, lookups, stats, session, player_url):
+    """Write one page in one transaction, falling back to one transaction per match."""
+    if not matches:
+        return
+    with _timed(stats, 'players'):
+        resolver = PlayerResolver([p['player'] for m in matches for p in m.get('participants') or []],
+                                  session=session, player_url=player_url)
+        api_names = resolver.prefetch_api_names([p for m in matches for p in m.get('participants') or []])
+    errors_before = len(stats['errors'])
+    try:
+        with transaction.atomic():
+            stats['done'].extend(_write_batch(matches, existing, lookups, resolver, api_names, stats))
+        return
+    except Exception:
+        logger.warning('League import: page write failed, retrying match by match', exc_info=True)
+        del stats['errors'][errors_before:]
+        lookups.forget_rounds()
+
+    for match_data in matches:
+        league_id = str(match_data.get('id'))
+        try:
+            with transaction.atomic():
+                resolver = PlayerResolver([p['player'] for p in match_data.get('participants') or []],
+                                          session=session, player_url=player_url)
+                stats['done'].extend(_write_batch([match_data], existing, lookups, resolver,
+                                                  api_names, stats))
+        except Exception as e:
+            logger.warning('League import: match %s failed: %s', league_id, e)
+            lookups.forget_rounds()
+            stats['errors'].append(league_id)
+
+
+def _run(params, limit, handle_page, base_url, session, offset=0, on_page=None, before_page=None):
+    stats = _new_stats()
+    own_session = session is None
+    session = session or requests.Session()
+    lookups = LeagueLookups()
+    pager = MatchPager(params, limit, session, base_url=base_url, offset=offset)
+    try:
+        for results in pager:
+            # Called before a fetched page is written; False stops the run.
+            if before_page is not None and before_page(pager) is False:
+                break
+            handle_page(results, lookups, stats, session)
+            # Checkpoint hook: called once the page is committed; False stops the run.
+            if on_page is not None and on_page(pager, stats) is False:
+                break
+        else:
+            stats['complete'] = True
+    except requests.RequestException as e:
+        logger.warning('League import: error fetching API data: %s', e)
+        stats['errors'].append(f'fetch: {e}')
+    finally:
+        if own_session:
+            session.close()
+    stats['count'] = pager.count
+    stats['timings']['fetch_wait'] = pager.wait_seconds
+    stats['timings'] = {k: round(v, 3) for k, v in stats['timings'].items()}
+    return stats
+
+
+def import_matches(params, limit=25, base_url=MATCH_API_URL, player_url=PLAYER_API_URL, session=None,
+                   offset=0, on_page=None, before_page=None):
+    """Import every match the API lists for `params` that isn't on the site yet.
+
+    Starts at `offset`; `on_page(pager, stats)` runs after each committed page and
+    `before_page(pager)` before each page is written; either can return False to stop
+    early (league_backfill's checkpoints and claim checks).
+    Returns a stats dict: done (imported league ids), skipped, errors, timings,
+    complete (every page was read) and count (the API's total for `params`)."""
+    def handle_page(results, lookups, stats, session):
+        with _timed(stats, 'lookup'):
+            ids = [str(m['id']) for m in results]
+            existing = set(Game.objects.filter(league_id__in=ids).values_list('league_id', flat=True))
+        new, seen = [], set()
+        for match_data, league_id in zip(results, ids):
+            if league_id in existing or league_id in seen:
+                stats['skipped'].append(league_id)
+            else:
+                seen.add(league_id)
+                new.append(match_data)
+        _import_page(new, None, lookups, stats, session, player_url)
+
+    return _run(params, limit, handle_page, base_url, session, offset=offset, on_page=on_page,
+                before_page=before_page)
+
+
+def update_matches(params, limit=50, min_modified_seconds=60, base_url=MATCH_API_URL,
+                   player_url=PLAYER_API_URL, session=None):
+    """Re-import site games whose API match was modified at least
+    `min_modified_seconds` after it closed. Stats as import_matches (done = updated)."""
+    def handle_page(results, lookups, stats, session):
+        modified = []
+        for match_data in results:
+            try:
+                date_closed = parser.parse(match_data.get('date_closed'))
+                date_modified = parser.parse(match_data.get('date_modified'))
+            except (TypeError, ValueError, OverflowError):
+                stats['errors'].append(str(match_data.get('id')))
+                continue
+            if (date_modified - date_closed).total_seconds() < min_modified_seconds:
+                stats['skipped'].append(str(match_data['id']))
+            else:
+                modified.append(match_data)
+        with _timed(stats, 'lookup'):
+            games = {g.league_id: g for g in Game.objects.filter(
+                league_id__in=[str(m['id']) for m in modified])}
+        # Matches that aren't on the site are ignored, as before.
+        _import_page([m for m in modified if str(m['id']) in games], games,
+                     lookups, stats, session, player_url)
+
+    return _run(params, limit, handle_page, base_url, session)
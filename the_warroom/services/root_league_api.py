@@ -2,19 +2,13 @@ import re
 
 import requests
 
-from dateutil import parser, relativedelta
+from dateutil import relativedelta
 from datetime import timedelta, datetime
 
 from django.conf import settings
-from django.db.models import Max, Q
-from django.utils import timezone
+from django.db.models import Max
 
-from the_keep.models import Faction, Vagabond, Deck, Map, Landmark, Hireling, Profile, StatusChoices
-
-from the_warroom.models import Game, Effort, PlatformChoices, Tournament, Round, Stage, CompetitionStatus
-from the_warroom.utils import clean_nickname
-
-from the_gatehouse.tasks import send_discord_message_task
+from the_warroom.models import Tournament, Round, Stage, CompetitionStatus
 
 
 
@@ -145,110 +139,6 @@ HIRELING_MAP = {
     'h_farmer_d': 'Struggling Farmers',
 }
 
-def create_game_from_api(match_data):
-    """Create a Game object from API match data."""
-
-    date_closed = parser.parse(match_data.get('date_closed', match_data.get('date_modified')))
-
-    # Get or create Tournament
-    tournament, created = Tournament.objects.get_or_create(
-        name='Root Digital League'
-    )
-    
-    # Get or create Round based on API tournament name (e.g., "M04", "A08")
-    round_name = match_data.get('tournament', '')
-    game_round = None
-    if round_name:
-        game_round = get_game_round(date_closed=date_closed, round_name=round_name, tournament=tournament)
-
-    # Get deck
-    deck_name = DECK_MAP.get(match_data.get('deck'))
-    deck = None
-    if deck_name:
-        deck = Deck.objects.filter(title=deck_name).first()
-    
-    # Get map
-    map_name = MAP_MAP.get(match_data.get('board_map'))
-    game_map = None
-    if map_name:
-        game_map = Map.objects.filter(title=map_name).first()
-    
-    # Get undrafted faction
-    undrafted_faction = None
-    undrafted_vagabond = None
-    undrafted_faction_key = match_data.get('undrafted_faction')
-    if undrafted_faction_key:
-        faction_name = FACTION_MAP.get(undrafted_faction_key)
-        if faction_name:
-            undrafted_faction = Faction.objects.filter(title=faction_name).first()
-    if undrafted_faction_key in VAGABOND_MAP:
-        undrafted_vagabond_name = VAGABOND_MAP[undrafted_faction_key]
-        undrafted_vagabond = Vagabond.objects.filter(title=undrafted_vagabond_name).first()
-
-    # Determine game type
-    game_type = Game.TypeChoices.ASYNC if match_data.get('turn_timing') == 'async' else Game.TypeChoices.LIVE
-    
-    # Get platform
-    platform = PlatformChoices.DWD
-
-    status = StatusChoices.STABLE
-    
-    random_clearing = bool(match_data.get('random_suits'))
-
-    nickname = clean_nickname(match_data.get('title', ''))
-
-    notes = f"Imported from rootleague.pliskin.dev on {timezone.now().strftime('%m/%d/%y')}"
-
-    # Create the game
-    game = Game.objects.create(
-        type=game_type,
-        platform=platform,
-        deck=deck,
-        map=game_map,
-        round=game_round,
-        undrafted_faction=undrafted_faction,
-        undrafted_vagabond=undrafted_vagabond,
-        link=match_data.get('table_talk_url', ''),
-        nickname=nickname,
-        random_clearing=random_clearing,
-        league_id=str(match_data['id']),
-        date_posted=date_closed,
-        official=True,
-        final=True,
-        status=status,
-        notes=notes,
-    )
-    
-    hireling_keys = match_data.get('hirelings', []) or []
-    landmark_keys = match_data.get('landmarks', []) or []
-
-    # Add hirelings
-    hirelings_to_add = []
-    for key in hireling_keys:
-        title = HIRELING_MAP.get(key) if key else None
-        if title:
-            hireling = Hireling.objects.filter(title__iexact=title).first()
-            if hireling:
-                hirelings_to_add.append(hireling)
-
-    if hirelings_to_add:
-        game.hirelings.add(*hirelings_to_add)
-
-    # Add landmarks
-    landmarks_to_add = []
-    for key in landmark_keys:
-        if key:
-            title = LANDMARK_MAP.get(key)
-            if title:
-                landmark = Landmark.objects.filter(title__iexact=title).first()
-                if landmark:
-                    landmarks_to_add.append(landmark)
-                    
-    if landmarks_to_add:
-        game.landmarks.add(*landmarks_to_add)
-
-    return game
-
 def extract_round_prefix(round_name: str) -> str:
     """Extract the non-numeric prefix from a round name.
     Examples: 'M04' -> 'M', 'A03' -> 'A', 'LH01' -> 'LH'
@@ -327,101 +217,6 @@ def get_game_round(date_closed: datetime, round_name: str, tournament: Tournamen
 
     return new_round
 
-def update_game_from_api(game, match_data):
-    """Update an existing Game object with new data from API."""
-    
-    date_closed = parser.parse(match_data.get('date_closed', match_data.get('date_modified')))
-    
-    # Get or create Tournament
-    tournament, created = Tournament.objects.get_or_create(
-        name='Root Digital League'
-    )
-    
-    # Get or create Round
-    round_name = match_data.get('tournament', '')
-    game_round = None
-    if round_name:
-        game_round = get_game_round(date_closed=date_closed, round_name=round_name, tournament=tournament)
-    
-    # Get deck
-    deck_name = DECK_MAP.get(match_data.get('deck'))
-    deck = None
-    if deck_name:
-        deck = Deck.objects.filter(title=deck_name).first()
-    
-    # Get map
-    map_name = MAP_MAP.get(match_data.get('board_map'))
-    game_map = None
-    if map_name:
-        game_map = Map.objects.filter(title=map_name).first()
-    
-    undrafted_faction_key = match_data.get('undrafted_faction')
-    undrafted_faction = None
-    undrafted_vagabond = None
-    if undrafted_faction_key in VAGABOND_MAP:
-        # Map Vagabond and set Vagabond as faction
-        undrafted_vagabond_name = VAGABOND_MAP[undrafted_faction_key]
-        undrafted_vagabond = Vagabond.objects.filter(title=undrafted_vagabond_name).first()
-    # Get undrafted faction
-    if undrafted_faction_key:
-        faction_name = FACTION_MAP.get(undrafted_faction_key)
-        if faction_name:
-            undrafted_faction = Faction.objects.filter(title=faction_name).first()
-    
-    # Determine game type
-    game_type = Game.TypeChoices.ASYNC if match_data.get('turn_timing') == 'async' else Game.TypeChoices.LIVE
-    
-
-    nickname = clean_nickname(match_data.get('title', ''))
-
-    random_clearing = bool(match_data.get('random_suits'))
-
-    # Update all fields
-    game.type = game_type
-    game.platform = PlatformChoices.DWD
-    game.deck = deck
-    game.map = game_map
-    game.round = game_round
-    game.undrafted_faction = undrafted_faction
-    game.undrafted_vagabond = undrafted_vagabond
-    game.link = match_data.get('table_talk_url', '')
-    game.nickname = nickname
-    game.random_clearing = random_clearing
-    game.date_posted = date_closed
-    
-    # Clear old hirelings
-    game.hirelings.clear()
-    game.landmarks.clear()
-
-    # Add new hirelings
-    hireling_fields = ['hirelings_a', 'hirelings_b', 'hirelings_c']
-    for field in hireling_fields:
-        key = match_data.get(field)
-        if key:
-            title = HIRELING_MAP.get(key)
-            if title:
-                hireling = Hireling.objects.filter(title__iexact=title).first()
-                if hireling:
-                    game.hirelings.add(hireling)
-
-    # Add landmarks
-    landmark_fields = ['landmark_a', 'landmark_b']
-    for field in landmark_fields:
-        key = match_data.get(field)
-        if key:
-            title = LANDMARK_MAP.get(key)
-            if title:
-                landmark = Landmark.objects.filter(title__iexact=title).first()
-                if landmark:
-                    game.landmarks.add(landmark)
-
-
-
-    game.save()
-    
-    return game
-
-
 PLAYER_API_URL = "https://rootleague.pliskin.dev/api/player/"
 _API_HEADERS = (
     {'Authorization': f'Token {settings.RDL_API_TOKEN}'}
@@ -441,182 +236,18 @@ def sanitize_discord(value):
     return cleaned or None
 
 
-def fetch_api_discord_name(player_id):
+def fetch_api_discord_name(player_id, session=None, player_url=PLAYER_API_URL):
     """Return the discord_name for an API player id via /api/player/<id>/, or
     None on any miss/error. Best-effort: a lookup failure must never break the
     import, so all exceptions are swallowed."""
     if not player_id:
         return None
     try:
-        response = requests.get(
-            f'{PLAYER_API_URL}{player_id}/',
+        response = (session or requests).get(
+            f'{player_url}{player_id}/',
             headers=_API_HEADERS, timeout=10,
         )
         response.raise_for_status()
         return response.json().get('discord_name')
     except (requests.RequestException, ValueError):
         return None
-
-
-def create_efforts_from_api(game, participants):
-    """Create Effort objects from API participants data."""
-    
-    # First pass: create a lookup dict of player -> faction for coalition matching
-    player_faction_lookup = {}
-    for participant in participants:
-        faction_key = participant['faction']
-        if faction_key in VAGABOND_MAP:
-            # For vagabonds, store the "Vagabond" faction
-            faction = Faction.objects.filter(title='Vagabond').first()
-        elif faction_key in FACTION_MAP:
-            faction_name = FACTION_MAP[faction_key]
-            faction = Faction.objects.filter(title=faction_name).first() if faction_name else None
-        else:
-            faction = None
-        
-        player_faction_lookup[participant['player']] = faction
-
-    # Second pass: Create efforts
-    for participant in participants:
-        # Get player identifier from API
-        full_player_string = participant['player']  # e.g., "MrMirz+1445"
-
-
-        parts = full_player_string.split('+', 1)
-
-        player_without_number = parts[0] # e.g., "MrMirz"
-        player_number = parts[1] if len(parts) > 1 else "0000"
-        standard_player_number = str(player_number).zfill(4)
-        standard_player_string = f'{player_without_number}+{standard_player_number}'
-        
-        player = Profile.objects.filter(rdl_cannonical_dwd__exact=full_player_string).first()
-
-        # 0. Lookup with standardized player string
-        if not player:
-            player = Profile.objects.filter(dwd__iexact=standard_player_string).first()
-
-        # 1. Non-standardized match on dwd field
-        if not player:
-            player = Profile.objects.filter(dwd__iexact=full_player_string).first()
-            if player:
-                player.dwd = standard_player_string
-                player.save()
-
-        # 2. Match dwd without the +number and update
-        if not player:
-            player = Profile.objects.filter(dwd__iexact=player_without_number).first()
-            if player:
-                player.dwd = standard_player_string
-                player.save()
-    
-        # 3. Match discord without the +number and update
-        if not player:
-            player = Profile.objects.filter(discord__iexact=player_without_number, dwd__isnull=True).first()
-            if player:
-                player.dwd = standard_player_string
-                player.save()
-        
-        # 4. Create new profile if no match found
-        if not player:
-            # Prefer the real discord_name from the player API (looked up by the
-            # participant's player_id), sanitized to the valid discord charset.
-            # Fall back to the name parsed from the player string when the API
-            # has no usable value — we always need *a* discord.
-            api_discord = sanitize_discord(
-                fetch_api_discord_name(participant.get('player_id'))
-            )
-            preferred_discord = api_discord or player_without_number.lower()
-
-            if Profile.objects.filter(discord__iexact=preferred_discord).exists():
-                # Preferred handle is taken; disambiguate with the full string
-                # (sanitized so it stays a valid discord value, e.g. "mrmirz4412").
-                disambiguated = sanitize_discord(full_player_string) or full_player_string.lower()
-                player, created = Profile.objects.get_or_create(
-                    discord=disambiguated,
-                    defaults={
-                        'dwd': standard_player_string,
-                        'rdl_cannonical_dwd': full_player_string,
-                    }
-                )
-                send_discord_message_task.delay(f'Duplicate user {player} added.', 'user_updates')
-            else:
-                player, created = Profile.objects.get_or_create(
-                    discord=preferred_discord,
-                    defaults={
-                        'dwd': standard_player_string,
-                        'rdl_cannonical_dwd': full_player_string,
-                    }
-                )
-
-        # Backfill the canonical value for existing matches. rdl_cannonical_dwd
-        # is unique, so only write it when no other profile already owns this
-        # exact value — otherwise the save would raise IntegrityError and abort
-        # the whole import.
-        if not player.rdl_cannonical_dwd:
-            already_taken = Profile.objects.filter(
-                rdl_cannonical_dwd__exact=full_player_string
-            ).exclude(pk=player.pk).exists()
-            if not already_taken:
-                player.rdl_cannonical_dwd = full_player_string
-                player.save()
-
-        # Determine if this is a faction or vagabond
-        faction_key = participant['faction']
-        faction = None
-        vagabond = None
-        
-        if faction_key in VAGABOND_MAP:
-            # Map Vagabond and set Vagabond as faction
-            vagabond_name = VAGABOND_MAP[faction_key]
-            vagabond = Vagabond.objects.filter(title=vagabond_name).first()
-            # Also set faction to "Vagabond"
-            faction = Faction.objects.filter(title='Vagabond').first()
-        elif faction_key in FACTION_MAP:
-            # Map Faction
-            faction_name = FACTION_MAP[faction_key]
-            if faction_name:
-                faction = Faction.objects.filter(title=faction_name).first()
-        
-        # Handle coalition
-        coalition_with = None
-        if participant.get('coalition'):
-            coalition_player = participant['coalition']
-            coalition_with = player_faction_lookup.get(coalition_player)
-        
-
-        # Determine if winner
-        is_winner = float(participant.get('tournament_score', 0)) > 0
-        
-        # Get score, handle null values
-        score = participant.get('game_score')
-        if score is not None:
-            score = int(score)
-        else:
-            score = None
-
-        # Get dominance if applicable
-        dominance = None
-        if participant.get('dominance'):
-            dominance_map = {
-                'fox': Effort.DominanceChoices.FOX,
-                'rabbit': Effort.DominanceChoices.RABBIT,
-                'mouse': Effort.DominanceChoices.MOUSE,
-                'bird': Effort.DominanceChoices.BIRD,
-            }
-            dominance = dominance_map.get(participant['dominance'].lower())
-        
-        status = StatusChoices.STABLE
-
-        # Create the effort
-        Effort.objects.create(
-            seat=participant.get('turn_order'),
-            player=player,
-            faction=faction,
-            vagabond=vagabond,
-            coalition_with=coalition_with,
-            dominance=dominance,
-            win=is_winner,
-            score=score,
-            game=game,
-            faction_status=status,
-        )
@@ -0,0 +1,89 @@
+"""Per-faction average turn scores for an arbitrary set of scorecards.
+
+PlayerScorecardView (a player's, or a recorder's, box scores) can't use the
+TurnScoreAggregate table, whose scopes are factions, faction types and everything.
+It used to run an exists(), a distinct faction-id query and a per-faction count,
+then pull every turns_data array into Python and group it by faction.
+
+On Postgres `faction_turn_averages` unnests turns_data with jsonb_array_elements and
+groups by faction and turn number in one query, so only the per-turn sums and counts
+come back (turn_number 0 carries each faction's scorecard count). Other databases
+(SQLite in development) group the turns_data lists in Python with aggregate_turns'
+arithmetic. Both return the same numbers.
+"""
+from collections import defaultdict
+
+from django.db import connections
+
+from the_warroom.models import ScoreCard
+from the_warroom.services.turn_aggregates import MAX_TURN, SUM_FIELDS, averages_from_sums
+
+_SUM_COLUMNS = ',\n               '.join(
+    f"SUM(COALESCE((t.turn ->> '{key}')::numeric, 0))" for key in SUM_FIELDS.values())
+_ZERO_COLUMNS = ', '.join('0' for _ in SUM_FIELDS)
+
+# {cards}: the filtered scorecards' ids, as a subquery.
+_POSTGRES_SQL = f"""
+    WITH cards AS (
+        SELECT sc.id, sc.faction_id, sc.turns_data
+        FROM {ScoreCard._meta.db_table} sc
+        WHERE sc.id IN ({{cards}})
+    ), turns AS (
+        SELECT cards.faction_id, elem.turn, (elem.turn ->> 'turn_number')::int AS turn_number
+        FROM cards CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(cards.turns_data) = 'array' THEN cards.turns_data ELSE '[]'::jsonb END
+        ) AS elem(turn)
+    )
+    SELECT faction_id, 0, COUNT(*), {_ZERO_COLUMNS}
+    FROM cards
+    GROUP BY faction_id
+    UNION ALL
+    SELECT t.faction_id, t.turn_number, COUNT(*),
+           {_SUM_COLUMNS}
+    FROM turns t
+    WHERE t.turn_number BETWEEN 1 AND {MAX_TURN}
+    GROUP BY t.faction_id, t.turn_number
+"""
+
+
+def _postgres_sums(scorecards):
+    cards_sql, params = scorecards.order_by().values('pk').query.sql_with_params()
+    with connections[scorecards.db].cursor() as cursor:
+        cursor.execute(_POSTGRES_SQL.format(cards=cards_sql), params)
+        return cursor.fetchall()
+
+
+def _python_sums(scorecards):
+    counts = defaultdict(int)
+    turns = defaultdict(lambda: [0] + [0.0] * len(SUM_FIELDS))
+    for faction_id, turns_data in scorecards.order_by().values_list('faction_id', 'turns_data'):
+        counts[faction_id] += 1
+        for t in (turns_data or []):
+            tn = t.get('turn_number', 0)
+            if tn < 1 or tn > MAX_TURN:
+                continue
+            row = turns[faction_id, tn]
+            row[0] += 1
+            for i, key in enumerate(SUM_FIELDS.values(), start=1):
+                row[i] += t.get(key, 0)
+    rows = [(faction_id, 0, count) + (0,) * len(SUM_FIELDS) for faction_id, count in counts.items()]
+    rows.extend((faction_id, tn, *values) for (faction_id, tn), values in turns.items())
+    return rows
+
+
+def faction_turn_averages(scorecards):
+    """{faction_id: (scorecard count, averages, totals)} over a ScoreCard queryset,
+    averages/totals shaped as api.views.aggregate_turns returns them."""
+    if connections[scorecards.db].vendor == 'postgresql':
+        rows = _postgres_sums(scorecards)
+    else:
+        rows = _python_sums(scorecards)
+
+    counts, turn_rows = {}, defaultdict(list)
+    for faction_id, turn_number, count, *sums in rows:
+        if turn_number == 0:
+            counts[faction_id] = count
+        else:
+            turn_rows[faction_id].append((turn_number, count, dict(zip(SUM_FIELDS, map(float, sums)))))
+    return {faction_id: (count,) + averages_from_sums(turn_rows.get(faction_id, []))
+            for faction_id, count in counts.items()}
@@ -0,0 +1,155 @@
+"""Snapshot of tournament/stage/round leaderboards (TournamentLeaderboardSnapshot).
+
+tournament_leaderboard_page and its stage/round versions ran four Profile/Faction
+leaderboard aggregations over every counted effort on each view. Instead each
+tournament's tallies are rebuilt in one pass whenever update_tournament_counts runs
+(any counted Game/Effort/extra-round change), and unfiltered pages rank the stored
+rows with an indexed filter + order_by.
+
+Counting mirrors the live boards exactly:
+- a game counts toward a scope if it is final and its primary round or one of its
+  extra rounds is in that round/stage/tournament (Game.objects.counting_for_*);
+- players: every profile with an effort there, counting only non-test games
+  (Profile.leaderboard);
+- factions: component='Faction' only, with an effort in a non-test game
+  (Faction.leaderboard).
+
+- `refresh_tournament_leaderboards` — rebuild one tournament's rows (idempotent).
+- `snapshot_leaderboards` — the four boards for a scope, or None when the request
+  filters games or the scope has no snapshot yet (caller aggregates live).
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from the_gatehouse.models import Profile
+from the_keep.models import Faction
+from the_warroom.models import (
+    Effort, Game, LeaderboardBucket, Round, Stage, Tournament, TournamentLeaderboardSnapshot,
+)
+
+PLAYER = LeaderboardBucket.SubjectTypes.PLAYER
+FACTION = LeaderboardBucket.SubjectTypes.FACTION
+Scope = TournamentLeaderboardSnapshot.ScopeTypes
+
+# Query params that only parameterize the ranking, not the game set.
+SNAPSHOT_SAFE_PARAMS = {'threshold', 'limit', 'page'}
+
+
+def _scope_of(obj):
+    if isinstance(obj, Round):
+        return Scope.ROUND, obj.pk
+    if isinstance(obj, Stage):
+        return Scope.STAGE, obj.pk
+    return Scope.TOURNAMENT, obj.pk
+
+
+def _game_scopes(tournament):
+    """{game_id: {(scope_type, scope_id)}} for every final game counting toward the
+    tournament, via its primary round and any extra rounds."""
+    round_stage = dict(Round.objects.filter(stage__tournament=tournament).values_list('pk', 'stage_id'))
+    scopes = defaultdict(set)
+    primary = Game.objects.filter(final=True, round_id__in=round_stage).values_list('pk', 'round_id')
+    extra = (Game.extra_rounds.through.objects
+             .filter(round_id__in=round_stage, game__final=True)
+             .values_list('game_id', 'round_id'))
+    for game_id, round_id in list(primary) + list(extra):
+        scopes[game_id].update({
+            (Scope.TOURNAMENT, tournament.pk),
+            (Scope.STAGE, round_stage[round_id]),
+            (Scope.ROUND, round_id),
+        })
+    return scopes
+
+
+def refresh_tournament_leaderboards(tournament):
+    """Rebuild every snapshot row of `tournament` from its counted efforts.
+
+    One query for the game/round mapping, one for the efforts; tallies are summed in
+    Python so each game is counted once per scope even when it reaches it twice.
+    Returns the number of rows written."""
+    game_scopes = _game_scopes(tournament)
+    tallies = defaultdict(lambda: [0, 0, 0])
+    efforts = (Effort.objects
+               .filter(game__in=Game.objects.counting_for_tournament(tournament).filter(final=True))
+               .values_list('game_id', 'player_id', 'faction_id', 'faction__component',
+                            'win', 'game__coalition_win', 'game__test_match'))
+    for game_id, player_id, faction_id, component, win, coalition, test_match in efforts.iterator():
+        subjects = []
+        if player_id:
+            subjects.append((PLAYER, player_id, not test_match))
+        if faction_id and component == 'Faction' and not test_match:
+            subjects.append((FACTION, faction_id, True))
+        for scope in game_scopes.get(game_id, ()):
+            for subject_type, subject_id, counted in subjects:
+                t = tallies[scope + (subject_type, subject_id)]
+                if counted:
+                    t[0] += 1
+                    t[1] += bool(win)
+                    t[2] += bool(win and coalition)
+
+    rows = []
+    for (scope_type, scope_id, subject_type, subject_id), (n, wins, coalition) in tallies.items():
+        points = wins - coalition / 2
+        rows.append(TournamentLeaderboardSnapshot(
+            tournament_id=tournament.pk, scope_type=scope_type, scope_id=scope_id,
+            subject_type=subject_type, subject_id=subject_id,
+            efforts=n, wins=wins, coalition_wins=coalition,
+            win_rate=points / n * 100 if n else 0.0, tourney_points=points))
+    with transaction.atomic():
+        TournamentLeaderboardSnapshot.objects.filter(tournament_id=tournament.pk).delete()
+        TournamentLeaderboardSnapshot.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _ranked(rows, model_qs, link_builder):
+    """Model instances for snapshot rows, decorated like the live boards."""
+    rows = list(rows)
+    objects = model_qs.in_bulk([row.subject_id for row in rows])
+    out = []
+    for row in rows:
+        obj = objects.get(row.subject_id)
+        if obj is None:
+            continue  # deleted since the last refresh
+        obj.win_rate, obj.tourney_points, obj.total_efforts = row.win_rate, row.tourney_points, row.efforts
+        obj.leaderboard_link = link_builder(obj)
+        out.append(obj)
+    return out
+
+
+def snapshot_leaderboards(scope, params, threshold, limit, player_link, faction_link):
+    """(top_players, most_players, top_factions, most_factions) for a Tournament,
+    Stage or Round from the snapshot table.
+
+    Returns None when `params` (the request's TournamentGameFilter data) narrows the
+    game set, or the scope has no rows yet — the caller then aggregates live."""
+    for key, values in params.lists():
+        if key not in SNAPSHOT_SAFE_PARAMS and any(v and v.strip() for v in values):
+            return None
+    scope_type, scope_id = _scope_of(scope)
+    rows = TournamentLeaderboardSnapshot.objects.filter(scope_type=scope_type, scope_id=scope_id)
+    if not rows.exists():
+        return None
+
+    players = rows.filter(subject_type=PLAYER, efforts__gte=threshold)
+    factions = rows.filter(subject_type=FACTION, efforts__gte=threshold)
+    by_rate = ('-win_rate', '-efforts', 'subject_id')
+    by_points = ('-tourney_points', '-win_rate', 'subject_id')
+    profiles = Profile.objects.all()
+    faction_qs = Faction.objects.filter(component='Faction')
+    return (
+        _ranked(players.order_by(*by_rate)[:limit], profiles, player_link),
+        _ranked(players.order_by(*by_points)[:limit], profiles, player_link),
+        _ranked(factions.order_by(*by_rate)[:limit], faction_qs, faction_link),
+        _ranked(factions.order_by(*by_points)[:limit], faction_qs, faction_link),
+    )
+
+
+def rebuild_all_tournament_leaderboards():
+    """Rebuild the snapshot of every tournament. Returns (tournaments, rows written)."""
+    tournaments = written = 0
+    for tournament in Tournament.objects.all().iterator():
+        written += refresh_tournament_leaderboards(tournament)
+        tournaments += 1
+    return tournaments, written
@@ -0,0 +1,180 @@
+"""Precomputed average turn scores (TurnScoreAggregate).
+
+FactionAverageTurnScoreView and AverageTurnScoreView loaded every matching
+ScoreCard.turns_data blob and averaged it in Python (api.views.aggregate_turns) on
+each request, a cost that grows with the number of scorecards. The aggregate table
+keeps running per-turn sums and counts instead, so a chart is one indexed query.
+
+A scorecard counts when it is final and linked to an effort (the views' old filter).
+It contributes to its faction's scope, to ALL, and to its faction type's scope when
+the faction is official. Turns outside 1..10 are ignored, as aggregate_turns did.
+
+- `scorecard_state` / `apply_change` — the ScoreCard pre_save/post_save signals read
+  the stored row before and after the save and add the difference, in the saving
+  transaction. Deletes (and effort deletion, which un-finalizes the scorecard) go
+  through the same path.
+- `read_scope` — (scorecard count, averages, totals) in the aggregate_turns shape,
+  or None while the table has never been built (the caller aggregates live).
+- `rebuild_turn_aggregates` — recompute the whole table (the rebuild_turn_aggregates
+  command, and the Faction signal after a type/official change).
+
+"Built" is the BUILT_MARKER row, which only the rebuild writes. The signals create
+a scope's rows on its first scorecard save, so rows alone would only prove that the
+scope holds the scorecards saved since deploy.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from the_warroom.models import ScoreCard, TurnScoreAggregate
+
+Scope = TurnScoreAggregate.ScopeTypes
+
+# TurnScoreAggregate field -> turns_data key.
+SUM_FIELDS = {
+    'total_points': 'total_points',
+    'faction_points': 'faction_points',
+    'crafting_points': 'crafting_points',
+    'battle_points': 'battle_points',
+    'other_points': 'other_points',
+    'game_points': 'game_points_total',
+}
+COUNT_TURN = 0
+MAX_TURN = 10
+
+# Written by rebuild_turn_aggregates only; no real scope uses this key.
+BUILT_MARKER = {'scope_type': Scope.ALL, 'scope_key': 'built', 'turn_number': COUNT_TURN}
+
+_STATE_FIELDS = ('faction_id', 'faction__type', 'faction__official', 'turns_data')
+
+
+def _scopes(faction_id, faction_type, official):
+    scopes = [(Scope.FACTION, str(faction_id)), (Scope.ALL, '')]
+    if official and faction_type:
+        scopes.append((Scope.TYPE, faction_type))
+    return scopes
+
+
+def _contribution(state):
+    """{(scope_type, scope_key, turn_number): [count, *sums]} for a counted scorecard
+    state (faction_id, type, official, turns_data), or {} for None."""
+    if state is None:
+        return {}
+    faction_id, faction_type, official, turns = state
+    per_turn = {COUNT_TURN: [1] + [0] * len(SUM_FIELDS)}
+    for turn in turns or []:
+        number = turn.get('turn_number', 0)
+        if 1 <= number <= MAX_TURN:
+            row = per_turn.setdefault(number, [0] * (len(SUM_FIELDS) + 1))
+            row[0] += 1
+            for i, key in enumerate(SUM_FIELDS.values(), start=1):
+                row[i] += turn.get(key, 0) or 0
+    return {scope + (number,): values
+            for scope in _scopes(faction_id, faction_type, official)
+            for number, values in per_turn.items()}
+
+
+def scorecard_state(pk):
+    """The stored scorecard's contribution inputs, or None if it doesn't count."""
+    if pk is None:
+        return None
+    return (ScoreCard.objects.filter(pk=pk, final=True, effort__isnull=False)
+            .values_list(*_STATE_FIELDS).first())
+
+
+def _add(key, values):
+    scope_type, scope_key, number = key
+    deltas = dict(zip(['count'] + list(SUM_FIELDS), values))
+    rows = TurnScoreAggregate.objects.filter(scope_type=scope_type, scope_key=scope_key, turn_number=number)
+    if rows.update(**{field: F(field) + delta for field, delta in deltas.items()}):
+        return
+    try:
+        with transaction.atomic():
+            TurnScoreAggregate.objects.create(scope_type=scope_type, scope_key=scope_key,
+                                              turn_number=number, **deltas)
+    except IntegrityError:
+        # Created concurrently; add to it instead.
+        rows.update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def apply_change(old_state, new_state):
+    """Move a scorecard's contribution from old_state to new_state."""
+    if old_state == new_state:
+        return
+    old, new = _contribution(old_state), _contribution(new_state)
+    with transaction.atomic():
+        for key in sorted(old.keys() | new.keys()):
+            before = old.get(key, [0] * (len(SUM_FIELDS) + 1))
+            after = new.get(key, [0] * (len(SUM_FIELDS) + 1))
+            delta = [a - b for a, b in zip(after, before)]
+            if any(delta):
+                _add(key, delta)
+
+
+def rebuild_turn_aggregates():
+    """Recompute every aggregate row from the scorecards. Returns rows written."""
+    tallies = defaultdict(lambda: [0] * (len(SUM_FIELDS) + 1))
+    states = (ScoreCard.objects.filter(final=True, effort__isnull=False)
+              .values_list(*_STATE_FIELDS))
+    for state in states.iterator(chunk_size=2000):
+        for key, values in _contribution(state).items():
+            tally = tallies[key]
+            for i, value in enumerate(values):
+                tally[i] += value
+    rows = [
+        TurnScoreAggregate(scope_type=scope_type, scope_key=scope_key, turn_number=number,
+                           **dict(zip(['count'] + list(SUM_FIELDS), values)))
+        for (scope_type, scope_key, number), values in tallies.items()
+    ]
+    rows.append(TurnScoreAggregate(**BUILT_MARKER))
+    with transaction.atomic():
+        TurnScoreAggregate.objects.all().delete()
+        TurnScoreAggregate.objects.bulk_create(rows, batch_size=1000)
+    return len(rows) - 1
+
+
+def averages_from_sums(turn_rows):
+    """(averages, totals) as aggregate_turns returns them, from per-turn
+    (turn_number, count, sums-dict) rows."""
+    averages = []
+    totals = {'total_faction_points': 0, 'total_crafting_points': 0,
+              'total_battle_points': 0, 'total_other_points': 0}
+    for number, count, sums in sorted(turn_rows, key=lambda row: row[0]):
+        if not count:
+            continue
+        avg = {field: sums[field] / count for field in SUM_FIELDS}
+        totals['total_faction_points'] += avg['faction_points']
+        totals['total_crafting_points'] += avg['crafting_points']
+        totals['total_battle_points'] += avg['battle_points']
+        totals['total_other_points'] += avg['other_points']
+        averages.append({
+            "turn_number": number,
+            "average_total_points": avg['total_points'],
+            "average_faction_points": avg['faction_points'],
+            "average_crafting_points": avg['crafting_points'],
+            "average_battle_points": avg['battle_points'],
+            "average_other_points": avg['other_points'],
+            "average_game_points": avg['game_points'],
+        })
+    return averages, totals
+
+
+def read_scope(scope_type, scope_key):
+    """(scorecard count, averages, totals) for a scope, or None if the table was never
+    built. One query: the scope's rows plus the marker."""
+    rows = (TurnScoreAggregate.objects
+            .filter(Q(scope_type=scope_type, scope_key=scope_key) | Q(**BUILT_MARKER))
+            .values_list('scope_key', 'turn_number', 'count', *SUM_FIELDS))
+    built, count, turn_rows = False, 0, []
+    for key, number, turn_count, *sums in rows:
+        if key != scope_key:
+            built = True
+        elif number == COUNT_TURN:
+            count = turn_count
+        else:
+            turn_rows.append((number, turn_count, dict(zip(SUM_FIELDS, sums))))
+    if not built:
+        return None
+    averages, totals = averages_from_sums(turn_rows)
+    return count, averages, totals
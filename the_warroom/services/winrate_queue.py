@@ -0,0 +1,130 @@
+"""Debounced, coalescing queue for cached winrate refreshes.
+
+Every Effort/Game change used to enqueue its own update_cached_winrates task, so a
+league import recomputed the same popular factions hundreds of times in a few minutes.
+Signals now only *mark* objects dirty here; the periodic drain_winrate_queue task pops
+every entry that has waited out the debounce window and recomputes each object once
+(bulk_recalculate_cached_winrates, grouped by model).
+
+Design notes:
+- The queue is a Redis sorted set of "app_label.model_name:pk" members scored by the
+  time they were *first* marked (ZADD NX). Re-marking a queued object is a no-op, so a
+  burst collapses to one entry, and an object that is edited continuously is still
+  refreshed within DEBOUNCE_SECONDS + one drain interval (no starvation).
+- Members are popped atomically (Lua) *before* recomputing, and marks are only made
+  after the transaction commits, so any change that lands while a drain is running
+  either was committed before the recompute reads it, or re-queues the object.
+- A failed recompute re-queues its members.
+- Fail open: if Redis is unreachable at mark time, fall back to the old direct
+  update_cached_winrates task so cached stats never silently go stale.
+- Stats (depth, last drain duration, oldest-entry wait, counts) are kept in a small
+  Redis hash for `manage.py winrate_queue_status`.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+QUEUE_KEY = 'warroom:winrate:dirty'
+STATS_KEY = 'warroom:winrate:stats'
+# How long an object waits after its first mark before the drain picks it up. Long
+# enough to coalesce an import batch, short enough that a single game report shows
+# up on the leaderboard within a minute (drain runs every ~30s via celery beat).
+DEBOUNCE_SECONDS = 30
+# Max members popped per drain; the rest wait for the next run.
+DRAIN_BATCH = 5000
+
+# Pop up to ARGV[2] members scored <= ARGV[1], returning member/score pairs.
+_POP_LUA = (
+    "local items = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2]) "
+    "for i = 1, #items, 2 do redis.call('zrem', KEYS[1], items[i]) end "
+    "return items"
+)
+
+
+def _redis():
+    return cache._cache.get_client(write=True)
+
+
+def _member(app_label, model_name, pk):
+    return f'{app_label}.{model_name}:{pk}'
+
+
+def _parse(member):
+    if isinstance(member, bytes):
+        member = member.decode()
+    label, pk = member.rsplit(':', 1)
+    app_label, model_name = label.split('.', 1)
+    return app_label, model_name, int(pk)
+
+
+def mark_winrates_dirty(objects_to_update):
+    """Queue [(app_label, model_name, pk)] for a debounced cached-winrate refresh.
+
+    Call after commit (signals wrap this in transaction.on_commit)."""
+    if not objects_to_update:
+        return
+    now = time.time()
+    try:
+        _redis().zadd(QUEUE_KEY, {_member(*obj): now for obj in objects_to_update}, nx=True)
+    except Exception:
+        logger.warning('winrate queue: Redis unavailable, refreshing directly', exc_info=True)
+        from the_warroom.tasks import update_cached_winrates
+        update_cached_winrates.delay([list(obj) for obj in objects_to_update])
+
+
+def drain(debounce=DEBOUNCE_SECONDS, limit=DRAIN_BATCH):
+    """Pop every entry older than `debounce` seconds and recompute each object once.
+
+    Returns a stats dict (also stored for winrate_queue_status)."""
+    from django.apps import apps
+    from the_warroom.services.winrate_service import bulk_recalculate_cached_winrates
+
+    r = _redis()
+    started = time.time()
+    items = r.eval(_POP_LUA, 1, QUEUE_KEY, started - debounce, limit)
+    members = items[0::2]
+    scores = [float(s) for s in items[1::2]]
+
+    pks_by_model = {}
+    for member in members:
+        app_label, model_name, pk = _parse(member)
+        pks_by_model.setdefault((app_label, model_name), set()).add(pk)
+
+    updated, failed = 0, []
+    for (app_label, model_name), pks in pks_by_model.items():
+        try:
+            model = apps.get_model(app_label, model_name)
+            updated += bulk_recalculate_cached_winrates(model, pks=pks)[1]
+        except Exception:
+            logger.exception('winrate queue: refresh failed for %s.%s', app_label, model_name)
+            failed.extend(_member(app_label, model_name, pk) for pk in pks)
+    if failed:
+        r.zadd(QUEUE_KEY, {m: time.time() for m in failed}, nx=True)
+
+    finished = time.time()
+    stats = {
+        'last_drain_at': finished,
+        'last_drain_seconds': round(finished - started, 3),
+        # Mark-to-refresh latency of the oldest entry in this drain.
+        'last_drain_max_wait': round(finished - min(scores), 3) if scores else 0,
+        'last_drained': len(members),
+        'last_updated': updated,
+        'last_failed': len(failed),
+        'depth': r.zcard(QUEUE_KEY),
+    }
+    r.hset(STATS_KEY, mapping=stats)
+    return stats
+
+
+def queue_stats():
+    """Current depth, age of the oldest queued entry and the last drain's stats."""
+    r = _redis()
+    stats = {k.decode(): v.decode() for k, v in r.hgetall(STATS_KEY).items()}
+    oldest = r.zrange(QUEUE_KEY, 0, 0, withscores=True)
+    stats['depth'] = r.zcard(QUEUE_KEY)
+    stats['oldest_wait'] = round(time.time() - oldest[0][1], 3) if oldest else 0
+    return stats
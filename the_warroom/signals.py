@@ -3,7 +3,10 @@ from django.db.models.signals import pre_delete, pre_save, post_save, post_delet
 from django.dispatch import receiver
 from django.db.models import Min
 from django.utils import timezone
+from the_keep.models import Faction
+
 from .models import Effort, Game, ScoreCard, Tournament, Round, Stage, Match, CompetitionStatus, EloSystem, EloSeason
+from .services.change_collector import record
 from .services.slugify_titles import slugify_tournament_name, slugify_round_name, slugify_stage_name, slugify_elo_system_name
 
 
@@ -42,24 +45,22 @@ def _on_commit(fn):
     transaction.on_commit(fn)
 
 
-def _enqueue_tournament_counts(ids):
-    ids = {i for i in ids if i}
-    if ids:
-        from .tasks import update_tournament_counts
-        ids = list(ids)
-        _on_commit(lambda: update_tournament_counts.delay(ids))
-
-
-def _mark_local_systems_dirty(system_ids, dt):
+def _mark_local_systems_dirty(system_ids, dt, full_replay=False):
     """Lower the recompute_from watermark on the given LOCAL EloSystems. Signals-only
-    (no calculation) — the scheduled recompute_dirty_local_elo task does the replay."""
+    (no calculation) — the scheduled recompute_dirty_local_elo task does the replay.
+    Pass full_replay=True for changes the incremental replay can't see (season edits)."""
     ids = {i for i in system_ids if i}
     if not ids:
         return
     for s in EloSystem.objects.filter(
         pk__in=ids, calculation_type=EloSystem.CalculationType.LOCAL
     ):
-        s.mark_dirty_from(dt)
+        s.mark_dirty_from(dt, full_replay=full_replay)
+
+
+def _game_counts_for_buckets(final, test_match):
+    return bool(final) and not test_match
+
 
 @receiver(pre_save, sender=Effort)
 def effort_pre_save_snapshot(sender, instance, **kwargs):
@@ -137,68 +138,57 @@ def _obj_to_tuple(obj):
 @receiver(post_save, sender=Effort)
 def handle_effort_save_update_winrates(sender, instance, **kwargs):
     objects = _collect_winrate_objects(instance, include_old=True)
-    if objects:
-        from .tasks import update_cached_winrates
-        payload = [_obj_to_tuple(obj) for obj in objects]
-        _on_commit(lambda: update_cached_winrates.delay(payload))
+    record(winrates=[_obj_to_tuple(obj) for obj in objects])
 
 
 @receiver(post_delete, sender=Effort)
 def handle_effort_delete_update_winrates(sender, instance, **kwargs):
     objects = _collect_winrate_objects(instance, include_old=False)
-    if objects:
-        from .tasks import update_cached_winrates
-        payload = [_obj_to_tuple(obj) for obj in objects]
-        _on_commit(lambda: update_cached_winrates.delay(payload))
+    record(winrates=[_obj_to_tuple(obj) for obj in objects])
 
 
 @receiver(post_save, sender=Effort)
 @receiver(post_delete, sender=Effort)
 def handle_effort_change_update_counts(sender, instance, **kwargs):
-    """Player counts depend on efforts — refresh the game's tournament counts."""
-    if instance.game_id:
-        try:
-            game = instance.game
-        except Game.DoesNotExist:
-            return
-        _enqueue_tournament_counts(_tournament_ids_for_game(game))
-
-
-@receiver(post_save, sender=Effort)
-@receiver(post_delete, sender=Effort)
-def handle_effort_change_update_game_count(sender, instance, **kwargs):
-    """Refresh the game's denormalized cached_player_count. Async (like tournament counts)
-    to avoid writing the game once per effort when several are added/removed together."""
-    if instance.game_id:
-        from .tasks import update_game_player_count
-        game_id = instance.game_id
-        _on_commit(lambda: update_game_player_count.delay(game_id))
+    """Player counts depend on efforts — refresh the game's cached_player_count and
+    its tournaments' counts (resolved once per game when the batch is processed)."""
+    record(games=[instance.game_id])
 
 
 @receiver(post_save, sender=Effort)
 def effort_saved_mark_elo_dirty(sender, instance, created, **kwargs):
     """Mark local elo systems dirty only when who-played or who-won changed. Edits to
-    score/faction/vagabond/dominance/etc. don't affect a winner-vs-field result."""
-    if not (created
+    score/faction/vagabond/dominance/etc. don't affect a winner-vs-field result.
+    The game's systems (final, non-test games only) are resolved after commit."""
+    if (created
             or getattr(instance, '_old_player_id', instance.player_id) != instance.player_id
             or getattr(instance, '_old_win', instance.win) != instance.win):
-        return
-    try:
-        game = instance.game
-    except Game.DoesNotExist:
-        return
-    if game.final and not game.test_match:
-        from .services.elo_service import affected_local_system_ids
-        _mark_local_systems_dirty(affected_local_system_ids(game), game.date_posted)
+        record(elo_games=[instance.game_id])
 
 
 @receiver(post_delete, sender=Effort)
 def effort_deleted_mark_elo_dirty(sender, instance, **kwargs):
     """Removing a seat changes the game's result — mark its local elo systems dirty."""
+    record(elo_games=[instance.game_id])
+
+
+@receiver(post_save, sender=Effort)
+@receiver(post_delete, sender=Effort)
+def effort_change_refresh_leaderboard_buckets(sender, instance, **kwargs):
+    """Refresh the leaderboard buckets of this seat's player/faction (and the previous
+    ones if they changed) for the game's month. Only final, non-test games are bucketed."""
     game = Game.objects.filter(pk=instance.game_id).first()
-    if game and game.final and not game.test_match:
-        from .services.elo_service import affected_local_system_ids
-        _mark_local_systems_dirty(affected_local_system_ids(game), game.date_posted)
+    if not game or not _game_counts_for_buckets(game.final, game.test_match):
+        return
+    from .services.leaderboard_buckets import FACTION, PLAYER, month_start
+    subjects = {
+        (PLAYER, instance.player_id), (FACTION, instance.faction_id),
+        (PLAYER, getattr(instance, '_old_player_id', None)),
+        (FACTION, getattr(instance, '_old_faction_id', None)),
+    }
+    month = month_start(game.date_posted).isoformat()
+    record(buckets=[(subject_type, subject_id, month) for subject_type, subject_id in subjects if subject_id],
+           stats=True)
 
 
 def _slug_should_follow_name(instance, model_class, update_fields):
@@ -304,6 +294,7 @@ def elo_system_pre_save_mark_dirty(sender, instance, update_fields=None, **kwarg
     cutoff = elo_config_change_cutoff(old, instance)
     if cutoff is not None:
         instance.recompute_from = min(cutoff, instance.recompute_from or cutoff)
+        instance.full_replay_pending = True
 
 
 # --- EloSeason: adding/moving/retyping a season boundary changes stored ratings from that
@@ -335,7 +326,8 @@ def elo_season_saved_mark_dirty(sender, instance, created, **kwargs):
 
     if created:
         if _season_affects_ratings(instance.reset_mode):
-            _mark_local_systems_dirty([instance.elo_system_id], instance.start_date)
+            _mark_local_systems_dirty([instance.elo_system_id], instance.start_date,
+                                      full_replay=True)
         return
 
     # Update. Dirty when the boundary moved, or the reset behavior changed, or it is
@@ -346,14 +338,15 @@ def elo_season_saved_mark_dirty(sender, instance, created, **kwargs):
             or _season_affects_ratings(instance.reset_mode)):
         return
     dt = min(instance.start_date, old_start) if moved else instance.start_date
-    _mark_local_systems_dirty([instance.elo_system_id], dt)
+    _mark_local_systems_dirty([instance.elo_system_id], dt, full_replay=True)
 
 
 @receiver(post_delete, sender=EloSeason)
 def elo_season_deleted_mark_dirty(sender, instance, **kwargs):
     """Removing a boundary merges its games into the previous season — dirty from its start."""
     if _season_affects_ratings(instance.reset_mode):
-        _mark_local_systems_dirty([instance.elo_system_id], instance.start_date)
+        _mark_local_systems_dirty([instance.elo_system_id], instance.start_date,
+                                  full_replay=True)
 
 
 @receiver(pre_save, sender=Round)
@@ -384,7 +377,8 @@ def stage_post_save(sender, instance, created, *args, **kwargs):
 @receiver(pre_save, sender=Game)
 def game_pre_save_snapshot(sender, instance, **kwargs):
     """Snapshot final, test_match, round, date_posted and elo systems so post_save can
-    detect elo-relevant changes (a game that leaves a system must still dirty it)."""
+    detect elo-relevant changes (a game that leaves a system must still dirty it), plus
+    the other fields the leaderboard buckets are keyed or counted by."""
     if instance.pk:
         try:
             old = Game.objects.get(pk=instance.pk)
@@ -392,6 +386,8 @@ def game_pre_save_snapshot(sender, instance, **kwargs):
             instance._pre_save_test_match = old.test_match
             instance._pre_save_round_id = old.round_id
             instance._pre_save_date_posted = old.date_posted
+            instance._pre_save_official = old.official
+            instance._pre_save_coalition_win = old.coalition_win
             from .services.elo_service import affected_local_system_ids
             instance._pre_save_elo_system_ids = affected_local_system_ids(old)
         except Game.DoesNotExist:
@@ -454,20 +450,20 @@ def game_post_save_check_match(sender, instance, **kwargs):
             if effort.player_id and effort.player_id not in seen['player']:
                 seen['player'].add(effort.player_id)
                 objects_to_update.append(_obj_to_tuple(effort.player))
-        if objects_to_update:
-            from .tasks import update_cached_winrates
-            _on_commit(lambda: update_cached_winrates.delay(objects_to_update))
+        record(winrates=objects_to_update)
 
 
 @receiver(post_save, sender=Game)
 def game_post_save_update_counts(sender, instance, **kwargs):
     """Refresh cached tournament counts when a game's countable state changes.
-    Includes the old round's tournament when the game moved rounds."""
-    ids = _tournament_ids_for_game(instance)
+    Includes the old round's tournament when the game moved rounds. Saving a final
+    game (or un-finalizing one) also starts a new cached-leaderboard generation."""
+    ids = set()
     old_round_id = getattr(instance, '_pre_save_round_id', None)
     if old_round_id and old_round_id != instance.round_id:
-        ids |= _tournament_ids_for_round(old_round_id)
-    _enqueue_tournament_counts(ids)
+        ids = _tournament_ids_for_round(old_round_id)
+    record(games=[instance.pk], tournaments=ids,
+           stats=bool(instance.final or getattr(instance, '_pre_save_final', False)))
 
 
 @receiver(pre_delete, sender=Game)
@@ -479,7 +475,7 @@ def game_pre_delete_snapshot_counts(sender, instance, **kwargs):
 
 @receiver(post_delete, sender=Game)
 def game_post_delete_update_counts(sender, instance, **kwargs):
-    _enqueue_tournament_counts(getattr(instance, '_pre_delete_tournament_ids', set()))
+    record(tournaments=getattr(instance, '_pre_delete_tournament_ids', set()), stats=instance.final)
 
 
 @receiver(post_save, sender=Game)
@@ -498,11 +494,34 @@ def game_post_save_mark_elo_dirty(sender, instance, created, **kwargs):
     )
     if not relevant_change:
         return
-    from .services.elo_service import affected_local_system_ids
-    ids = getattr(instance, '_pre_save_elo_system_ids', set()) | affected_local_system_ids(instance)
-    if ids:
-        cutoff = min(old_date_posted, instance.date_posted)
-        _mark_local_systems_dirty(ids, cutoff)
+    # The systems it left (pre-save snapshot) from the earlier of the two dates; its
+    # current systems are resolved after commit if it's still final and non-test.
+    record(elo_systems=getattr(instance, '_pre_save_elo_system_ids', set()),
+           elo_from=min(old_date_posted, instance.date_posted),
+           elo_games=[instance.pk])
+
+
+@receiver(post_save, sender=Game)
+def game_post_save_refresh_leaderboard_buckets(sender, instance, created, **kwargs):
+    """Refresh the buckets of every seat when a field they're keyed or counted by changed.
+    A new game has no efforts yet; its seats are bucketed by the Effort signal."""
+    if created:
+        return
+    old_date_posted = getattr(instance, '_pre_save_date_posted', instance.date_posted)
+    was_counted = _game_counts_for_buckets(
+        getattr(instance, '_pre_save_final', instance.final),
+        getattr(instance, '_pre_save_test_match', instance.test_match))
+    is_counted = _game_counts_for_buckets(instance.final, instance.test_match)
+    if not (was_counted or is_counted):
+        return
+    if (was_counted == is_counted
+            and old_date_posted == instance.date_posted
+            and getattr(instance, '_pre_save_official', instance.official) == instance.official
+            and getattr(instance, '_pre_save_coalition_win', instance.coalition_win) == instance.coalition_win):
+        return
+    from .services.leaderboard_buckets import bucket_keys_for_game, month_start
+    months = {month_start(old_date_posted), month_start(instance.date_posted)}
+    record(buckets=bucket_keys_for_game(instance, months=months))
 
 
 @receiver(pre_delete, sender=Game)
@@ -517,6 +536,10 @@ def game_pre_delete_snapshot_elo(sender, instance, **kwargs):
 def game_post_delete_mark_elo_dirty(sender, instance, **kwargs):
     ids = getattr(instance, '_pre_delete_elo_system_ids', set())
     dt = getattr(instance, '_pre_delete_date_posted', None)
+    # Marked in the deleting transaction rather than collected: the orphaned rating rows
+    # are the incremental replay's only trace of the game, and recompute_dirty_local_elo
+    # sweeps orphans of clean systems. Committing the mark with the orphans means the
+    # sweep can never see them before the system is dirty.
     if ids and dt is not None:
         _mark_local_systems_dirty(ids, dt)
 
@@ -542,7 +565,7 @@ def game_extra_rounds_changed_mark_elo_dirty(sender, instance, action, pk_set, *
         )
     elif action == 'post_clear':
         system_ids = getattr(instance, '_pre_clear_extra_elo_system_ids', set())
-    _mark_local_systems_dirty(system_ids, instance.date_posted)
+    record(elo_systems=system_ids, elo_from=instance.date_posted)
 
 
 @receiver(m2m_changed, sender=Game.extra_rounds.through)
@@ -563,4 +586,48 @@ def game_extra_rounds_changed_update_counts(sender, instance, action, pk_set, **
         )
     elif action == 'post_clear':
         ids = getattr(instance, '_pre_clear_extra_tournament_ids', set())
-    _enqueue_tournament_counts(ids)
\ No newline at end of file
+    record(tournaments=ids, stats=bool(ids) and instance.final)
+
+
+# ScoreCard -> TurnScoreAggregate running sums (services/turn_aggregates.py). The
+# stored row is read before and after the save, so update_fields saves and changes to
+# final/effort/faction/turns_data are all covered; the delta is applied in the same
+# transaction as the save.
+@receiver(pre_save, sender=ScoreCard)
+def scorecard_pre_save_turn_aggregates(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .services.turn_aggregates import scorecard_state
+    instance._old_turn_aggregate_state = scorecard_state(instance.pk)
+
+
+@receiver(post_save, sender=ScoreCard)
+def scorecard_post_save_turn_aggregates(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .services.turn_aggregates import apply_change, scorecard_state
+    apply_change(getattr(instance, '_old_turn_aggregate_state', None), scorecard_state(instance.pk))
+
+
+@receiver(pre_delete, sender=ScoreCard)
+def scorecard_pre_delete_turn_aggregates(sender, instance, **kwargs):
+    from .services.turn_aggregates import apply_change, scorecard_state
+    apply_change(scorecard_state(instance.pk), None)
+
+
+@receiver(pre_save, sender=Faction)
+def faction_pre_save_turn_aggregates(sender, instance, raw=False, **kwargs):
+    """Snapshot type/official: they decide which faction-type chart a scorecard feeds."""
+    if instance.pk and not raw:
+        instance._old_turn_aggregate_type = (
+            Faction.objects.filter(pk=instance.pk).values_list('type', 'official').first())
+
+
+@receiver(post_save, sender=Faction)
+def faction_post_save_turn_aggregates(sender, instance, created, raw=False, **kwargs):
+    old = getattr(instance, '_old_turn_aggregate_type', None)
+    if created or raw or old is None or old == (instance.type, instance.official):
+        return
+    if ScoreCard.objects.filter(faction=instance, final=True, effort__isnull=False).exists():
+        from .tasks import rebuild_turn_score_aggregates
+        _on_commit(lambda: rebuild_turn_score_aggregates.delay())
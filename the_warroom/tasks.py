@@ -9,7 +9,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, F, Q
 from django.utils import timezone
 
 from the_gatehouse.models import Profile
@@ -17,8 +17,7 @@ from the_gatehouse.utils import format_bulleted_list
 from the_gatehouse.tasks import send_rich_discord_message_task, send_discord_message_task
 
 from .models import Game, Tournament, Stage, Round, CompetitionStatus, EloSystem, EloRating, EloParticipant
-from .services.root_league_api import create_game_from_api, create_efforts_from_api, update_game_from_api
-from .services.winrate_service import calculate_and_cache_winrate
+from .services.winrate_service import bulk_recalculate_cached_winrates
 
 logger = logging.getLogger(__name__)
 
@@ -27,29 +26,61 @@ logger = logging.getLogger(__name__)
 def update_cached_winrates(objects_to_update):
     """
     Recalculate cached winrates for a list of (app_label, model_name, pk) tuples.
-    Called asynchronously from signals after Effort/Game saves.
+    Called asynchronously from signals after Effort/Game saves. Objects are grouped by
+    model so each model is refreshed with one grouped aggregate and one bulk_update.
     """
     from django.apps import apps
+    pks_by_model = {}
     for app_label, model_name, pk in objects_to_update:
+        pks_by_model.setdefault((app_label, model_name), set()).add(pk)
+    for (app_label, model_name), pks in pks_by_model.items():
         try:
             model = apps.get_model(app_label, model_name)
-            obj = model.objects.get(pk=pk)
-            calculate_and_cache_winrate(obj)
+            bulk_recalculate_cached_winrates(model, pks=pks)
         except Exception:
-            pass
+            logger.exception('Cached winrate refresh failed for %s.%s %s', app_label, model_name, sorted(pks))
+
+
+@shared_task
+def drain_winrate_queue():
+    """
+    Recompute cached winrates for every object marked dirty at least
+    winrate_queue.DEBOUNCE_SECONDS ago, once per object. Schedule every ~30s via
+    celery beat; signals only mark objects dirty (services/winrate_queue.py).
+    """
+    from .services.winrate_queue import drain
+    stats = drain()
+    if stats['last_drained']:
+        logger.info('Winrate queue drained: %s', stats)
 
 
 @shared_task
 def update_tournament_counts(tournament_ids):
     """
-    Refresh the denormalized game/player counts for a list of Tournament ids.
+    Refresh the denormalized game/player counts and the leaderboard snapshot
+    (TournamentLeaderboardSnapshot) for a list of Tournament ids.
     Called asynchronously from signals after Game/Effort changes.
     """
+    from .services.tournament_leaderboards import refresh_tournament_leaderboards
     for pk in tournament_ids:
+        tournament = Tournament.objects.filter(pk=pk).first()
+        if tournament is None:
+            continue
         try:
-            Tournament.objects.get(pk=pk).refresh_cached_counts()
+            tournament.refresh_cached_counts()
         except Exception:
             pass
+        try:
+            refresh_tournament_leaderboards(tournament)
+        except Exception:
+            logger.exception('Tournament leaderboard snapshot refresh failed for %s', pk)
+
+
+@shared_task
+def rebuild_turn_score_aggregates():
+    """Rebuild the TurnScoreAggregate table (after a faction's type/official changed)."""
+    from .services.turn_aggregates import rebuild_turn_aggregates
+    return rebuild_turn_aggregates()
 
 
 @shared_task
@@ -63,14 +94,85 @@ def update_game_player_count(game_id):
         game.refresh_cached_player_count()
 
 
+@shared_task
+def refresh_leaderboard_buckets(keys):
+    """
+    Recompute LeaderboardBucket rows for [(subject_type, subject_id, month)] keys.
+    Called asynchronously from Effort/Game signals; each key is rebuilt from Effort,
+    so duplicate or out-of-order deliveries converge on the same rows.
+    """
+    from .services.leaderboard_buckets import refresh_buckets
+    refresh_buckets(keys)
+
+
+@shared_task
+def process_collected_changes(changes):
+    """
+    Apply one transaction's Game/Effort side effects (services/change_collector.py):
+    player counts, tournament counts, winrate marks, Elo dirty-marking, leaderboard
+    buckets and the cached-leaderboard generation, each object once. Steps are independent; one failing doesn't skip the rest.
+    """
+    from .services.elo_service import local_system_cutoffs
+    from .services.leaderboard_buckets import refresh_buckets
+    from .services.leaderboard_cache import bump_stats_generation
+    from .services.winrate_queue import mark_winrates_dirty
+    from .signals import _mark_local_systems_dirty
+
+    game_ids = changes.get('games') or []
+    try:
+        # .update(): a save() would fire the Game signals and collect this game again.
+        stale = (Game.objects.filter(pk__in=game_ids).annotate(n=Count('efforts'))
+                 .exclude(cached_player_count=F('n')).values_list('pk', 'n'))
+        for pk, count in stale:
+            Game.objects.filter(pk=pk).update(cached_player_count=count)
+    except Exception:
+        logger.exception('Player count refresh failed for games %s', game_ids)
+
+    tournament_ids = set(changes.get('tournaments') or [])
+    try:
+        if game_ids:
+            tournament_ids.update(
+                Round.objects.filter(Q(games__in=game_ids) | Q(extra_games__in=game_ids))
+                .values_list('stage__tournament_id', flat=True))
+        tournament_ids.discard(None)
+        if tournament_ids:
+            update_tournament_counts(sorted(tournament_ids))
+    except Exception:
+        logger.exception('Tournament count refresh failed for tournaments %s', tournament_ids)
+
+    if changes.get('winrates'):
+        mark_winrates_dirty([tuple(obj) for obj in changes['winrates']])
+
+    try:
+        elo = {pk: (parser.isoparse(dt), full) for pk, dt, full in changes.get('elo') or []}
+        for pk, cutoff in local_system_cutoffs(changes.get('elo_games') or []).items():
+            dt, full = elo.get(pk, (cutoff, False))
+            elo[pk] = (min(dt, cutoff), full)
+        for pk, (dt, full) in elo.items():
+            _mark_local_systems_dirty([pk], dt, full_replay=full)
+    except Exception:
+        logger.exception('Elo dirty-marking failed for %s', changes)
+
+    if changes.get('buckets'):
+        try:
+            refresh_buckets(changes['buckets'])
+        except Exception:
+            logger.exception('Leaderboard bucket refresh failed for %s', changes['buckets'])
+
+    if changes.get('stats'):
+        # Again, now that the buckets and tournament snapshots are rewritten.
+        bump_stats_generation()
+
+
 @shared_task
 def recompute_dirty_local_elo():
     """Replay every dirty LOCAL EloSystem from its recompute_from watermark, then clear it.
 
     Scheduled (~every 30 min via django_celery_beat, configured in admin). Mark-dirty
-    signals set recompute_from; this task does all the heavy replay.
+    signals set recompute_from; this task does all the heavy replay. Game/effort edits are
+    replayed incrementally; config and season edits (full_replay_pending) replay in full.
     """
-    from .services.elo_service import recompute_system_from
+    from .services.elo_service import recompute_system_from, incremental_recompute_system_from
     systems = EloSystem.objects.filter(
         calculation_type=EloSystem.CalculationType.LOCAL,
         recompute_from__isnull=False,
@@ -78,16 +180,30 @@ def recompute_dirty_local_elo():
     processed = 0
     for system in systems:
         cutoff = system.recompute_from
+        full = system.full_replay_pending
         try:
-            recompute_system_from(system, cutoff)
+            if full:
+                stats = recompute_system_from(system, cutoff)
+            else:
+                stats = incremental_recompute_system_from(system, cutoff)
+            logger.info(
+                "Elo %s replay of %s from %s: %d game(s), %d row(s) deleted, %d created in %.2fs",
+                stats['mode'], system.slug, cutoff.isoformat(), stats['games_replayed'],
+                stats['rows_deleted'], stats['rows_created'], stats['elapsed'],
+            )
             # Clear ONLY if no newer (earlier) mark arrived mid-run — otherwise leave it so
-            # the next run picks up the earlier cutoff. Safe: no mark is ever lost.
-            EloSystem.objects.filter(pk=system.pk, recompute_from=cutoff).update(recompute_from=None)
+            # the next run picks up the earlier cutoff. Safe: no mark is ever lost. Likewise a
+            # full-replay mark that arrived during an incremental run survives.
+            EloSystem.objects.filter(
+                pk=system.pk, recompute_from=cutoff, full_replay_pending=full,
+            ).update(recompute_from=None, full_replay_pending=False)
             processed += 1
         except Exception:
-            pass  # leave recompute_from set so the next run retries this system
-    # Cheap housekeeping: drop rating rows orphaned by games deleted outside a replay window.
-    EloRating.objects.filter(game__isnull=True).delete()
+            logger.exception("Elo replay of %s failed; will retry next run", system.slug)
+    # Cheap housekeeping: drop rating rows orphaned by deleted games, but only in clean
+    # systems. In a dirty one (not yet replayed, or its replay failed) they're the
+    # incremental replay's only evidence of the deletion.
+    EloRating.objects.filter(game__isnull=True, elo_system__recompute_from__isnull=True).delete()
     return f'Recomputed {processed} elo system(s)'
 
 
@@ -172,12 +288,24 @@ def update_competition_statuses():
 BASE_URL = "https://rootleague.pliskin.dev/api/match/"
 API_HEADERS = {'Authorization': f'Token {settings.RDL_API_TOKEN}'} if getattr(settings, 'RDL_API_TOKEN', '') else {}
 
+def _parse_date(value):
+    """A datetime, or an ISO string parsed into one."""
+    return parser.parse(value) if isinstance(value, str) else value
+
+
+def _format_timings(timings):
+    return ', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items())
+
+
 # Imports all games from the last 1 day
 @shared_task
 def import_league_games(limit=25, tournament_name="", days_back=1, date_from=None, date_to=None):
     """
     Import games from the Root League API.
-    
+
+    Pages are fetched one ahead and written in bulk, one transaction per page
+    (services/league_import.py).
+
     Args:
         limit: Number of games to fetch per request
         tournament_name: String included in the tournament's name
@@ -185,131 +313,38 @@ def import_league_games(limit=25, tournament_name="", days_back=1, date_from=Non
         date_from: Optional - specific start date (datetime or ISO string)
         date_to: Optional - specific end date (datetime or ISO string)
     """
-    
-    imported_count = 0
-    skipped_count = 0
-    error_count = 0
+    from .services.league_import import import_matches
 
-    imported_list = []
-    skipped_list = []
-    error_list = []
-    
-    offset = 0
-    has_more = True
-
-    # Determine date range
-    if date_from:
-        # If date_from is a string, parse it
-        if isinstance(date_from, str):
-            start_date = parser.parse(date_from)
-        else:
-            start_date = date_from
-    else:
-        # Use days_back as default
-        start_date = timezone.now() - timedelta(days=days_back)
-    
-    # Parse date_to if provided
-    end_date = None
+    start_date = _parse_date(date_from) if date_from else timezone.now() - timedelta(days=days_back)
+    params = {
+        'tournament__name': tournament_name,
+        'date_closed__gte': start_date.isoformat(),
+    }
+    # Only add date_closed__lte if date_to is provided
     if date_to:
-        if isinstance(date_to, str):
-            end_date = parser.parse(date_to)
-        else:
-            end_date = date_to
-    
-    while has_more:
-        # Fetch data from API
-        params = {
-            'tournament__name': tournament_name,
-            'limit': limit,
-            'offset': offset,
-            'date_closed__gte': start_date.isoformat()
-        }
-        
-        # Only add date_closed__lte if end_date is provided
-        if end_date:
-            params['date_closed__lte'] = end_date.isoformat()
-        
-        try:
-            response = requests.get(BASE_URL, params=params, headers=API_HEADERS, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching API data: {e}")
-            error_count += 1
-            break
-
-        results = data.get('results', [])
-
-        if not results:
-            has_more = False
-            break
-
-        for match_data in results:
-            try:
-                # Check if game already exists by league_id
-                league_id = str(match_data['id'])
-                if Game.objects.filter(league_id=league_id).exists():
-                    # print(f"Game {league_id} already exists, skipping")
-                    skipped_count += 1
-                    skipped_list.append(league_id)
-                    continue
-
-                # Atomic transaction - if anything fails, nothing gets saved to prevent incomplete game submission
-                with transaction.atomic():
-                    # Create the Game
-                    game = create_game_from_api(match_data)
-                    
-                    # Create the Efforts (participants)
-                    create_efforts_from_api(game, match_data['participants'])
-                
-                imported_count += 1
-                imported_list.append(league_id)
-                print(f"Successfully imported game {league_id}")
-                
-            except Exception as e:
-                print(f"Error importing game {str(match_data.get('id'))}: {e}")
-                error_count += 1
-                error_list.append(league_id)
-                continue
-        
-        # Check if there are more results
-        has_more = data.get('next') is not None
-        # Add delay before next API call
-        if has_more:
-            time.sleep(0.5)  # 500ms delay between API requests
-        offset += limit
-    
-    summary = f"Import complete: {imported_count} imported, {skipped_count} skipped, {error_count} errors"
-    message = f"Import complete: {imported_count} imported and {error_count} errors"
+        params['date_closed__lte'] = _parse_date(date_to).isoformat()
+
+    stats = import_matches(params, limit=limit)
+    imported_list, error_list = stats['done'], stats['errors']
+
+    summary = (f"Import complete: {len(imported_list)} imported, {len(stats['skipped'])} skipped, "
+               f"{len(error_list)} errors ({_format_timings(stats['timings'])})")
+    message = f"Import complete: {len(imported_list)} imported and {len(error_list)} errors"
+    logger.info(summary)
 
-    # Create import message
-    fields = []
-    if imported_list:
-        fields.append({
-            'name': 'Imported',
-            'value': format_bulleted_list(imported_list),
-        })
-    # if skipped_list:
-    #     fields.append({
-    #         'name': 'Skipped',
-    #         'value': format_bulleted_list(skipped_list),
-    #     })
     if error_list:
-        if error_list:
-            error_field = {
-                'name': 'Errors',
-                'value': format_bulleted_list(error_list),
-            }
-            fields.append(error_field)
-
-            # Send error message
-            send_rich_discord_message_task.delay(
-                message,
-                author_name='RDB Admin',
-                category='report',
-                title='Import Errors',
-                fields=[error_field]
-            )
+        error_field = {
+            'name': 'Errors',
+            'value': format_bulleted_list(error_list),
+        }
+        # Send error message
+        send_rich_discord_message_task.delay(
+            message,
+            author_name='RDB Admin',
+            category='report',
+            title='Import Errors',
+            fields=[error_field]
+        )
 
     return summary
 
@@ -319,7 +354,7 @@ def import_league_games(limit=25, tournament_name="", days_back=1, date_from=Non
 def update_league_games(limit=50, days_back=2, days_cutoff=1, date_from=None, date_to=None):
     """
     Check for games that were modified after initial submission and update them.
-    
+
     Args:
         limit: Number of games to fetch per request
         days_back: Number of days back to update (default 2, ignored if date_from is provided)
@@ -328,160 +363,104 @@ def update_league_games(limit=50, days_back=2, days_cutoff=1, date_from=None, da
         date_from: Optional - specific start date (datetime or ISO string)
         date_to: Optional - specific end date (datetime or ISO string)
     """
-    
-    updated_count = 0
-    error_count = 0
-    skipped_count = 0
-    updated_list = []
-    error_list = []
-    
-    offset = 0
-    has_more = True
-    
-    # Determine date range
-    if date_from:
-        # If date_from is a string, parse it
-        if isinstance(date_from, str):
-            start_date = parser.parse(date_from)
-        else:
-            start_date = date_from
-    else:
-        # Use days_back as default
-        start_date = timezone.now() - timedelta(days=days_back)
-    
-    # Parse date_to if provided
-    end_date = None
-    if date_to:
-        if isinstance(date_to, str):
-            end_date = parser.parse(date_to)
-        else:
-            end_date = date_to
-    else:
-        end_date = timezone.now() - timedelta(days=days_cutoff)
-
-    while has_more:
-        # Fetch data from API
-        params = {
-            'limit': limit,
-            'offset': offset,
-            'date_modified__gte': start_date.isoformat()
-        }
-        
-        # Only add date_modified__lte if end_date is provided
-        if end_date:
-            params['date_modified__lte'] = end_date.isoformat()
-        
-        try:
-            response = requests.get(BASE_URL, params=params, headers=API_HEADERS, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching API data: {e}")
-            error_count += 1
-            break
+    from .services.league_import import update_matches
 
-        results = data.get('results', [])
+    start_date = _parse_date(date_from) if date_from else timezone.now() - timedelta(days=days_back)
+    end_date = _parse_date(date_to) if date_to else timezone.now() - timedelta(days=days_cutoff)
+    params = {
+        'date_modified__gte': start_date.isoformat(),
+        'date_modified__lte': end_date.isoformat(),
+    }
 
-        if not results:
-            has_more = False
-            break
+    # Games modified less than 60 seconds after closing weren't really edited.
+    stats = update_matches(params, limit=limit, min_modified_seconds=60)
+    updated_list, error_list = stats['done'], stats['errors']
 
-        for match_data in results:
-            try:
+    summary = (f"Update check complete: {len(updated_list)} updated, {len(stats['skipped'])} skipped, "
+               f"{len(error_list)} errors")
+    logger.info('%s (%s)', summary, _format_timings(stats['timings']))
 
-                # Parse dates
-                date_closed = parser.parse(match_data.get('date_closed'))
-                date_modified = parser.parse(match_data.get('date_modified'))
-                
-                # Check if modified at least 5 seconds after closing (to account for API timing)
-                time_diff = (date_modified - date_closed).total_seconds()
-                
-                # Skip if not actually modified (less than 60 seconds difference)
-                if time_diff < 60:
-                    skipped_count += 1
-                    continue
-                
-                league_id = str(match_data['id'])
-                
-                # Check if game exists in Root Database
-                try:
-                    game = Game.objects.get(league_id=league_id)
-                except Game.DoesNotExist:
-                    # Game doesn't exist, skip
-                    continue
-                
-                print(f"Game {league_id} was modified {time_diff:.0f} seconds after closing. Updating...")
-                
-                # Use atomic transaction to update
-                with transaction.atomic():
-                    # Delete existing efforts
-                    game.efforts.all().delete()
-                    
-                    # Update game data
-                    update_game_from_api(game, match_data)
-                    
-                    # Create efforts with new data
-                    create_efforts_from_api(game, match_data['participants'])
-                
-                updated_count += 1
-                updated_list.append(league_id)
-                print(f"Successfully updated game {league_id}")
-                
-            except Exception as e:
-                print(f"Error updating game {str(match_data.get('id'))}: {e}")
-                import traceback
-                traceback.print_exc()
-                error_count += 1
-                error_list.append(str(match_data.get('id')))
-                continue
-        
-        # Check if there are more results
-        has_more = data.get('next') is not None
-        # Add delay before next API call
-        if has_more:
-            time.sleep(0.5)  # 500ms delay between API requests
-        offset += limit
-
-        summary = f"Update check complete: {updated_count} updated, {skipped_count} skipped, {error_count} errors"
-
-        # Build fields for summary message
-        fields = []
+    # Build fields for summary message
+    fields = []
 
-        if updated_list:
-            fields.append({
-                'name': 'Updated',
-                'value': format_bulleted_list(updated_list),
-            })
-
-        if error_list:
-            error_field = {
-                'name': 'Errors',
-                'value': format_bulleted_list(error_list),
-            }
-            fields.append(error_field)
-
-            # Send error message
-            send_rich_discord_message_task.delay(
-                summary,
-                author_name='RDB Admin',
-                category='report',
-                title='Update Errors',
-                fields=[error_field]
-            )
+    if updated_list:
+        fields.append({
+            'name': 'Updated',
+            'value': format_bulleted_list(updated_list),
+        })
 
-        # Send main update summary (only if anything happened)
-        if updated_count > 0 or error_count > 0:
-            send_rich_discord_message_task.delay(
-                summary,
-                author_name='RDB Admin',
-                category='rdl-update',
-                title='RDL Update Check',
-                fields=fields
-            )
+    if error_list:
+        error_field = {
+            'name': 'Errors',
+            'value': format_bulleted_list(error_list),
+        }
+        fields.append(error_field)
+
+        # Send error message
+        send_rich_discord_message_task.delay(
+            summary,
+            author_name='RDB Admin',
+            category='report',
+            title='Update Errors',
+            fields=[error_field]
+        )
+
+    # Send main update summary (only if anything happened)
+    if updated_list or error_list:
+        send_rich_discord_message_task.delay(
+            summary,
+            author_name='RDB Admin',
+            category='rdl-update',
+            title='RDL Update Check',
+            fields=fields
+        )
 
-    print(summary)
     return summary
 
+
+@shared_task
+def run_league_backfill(job_id):
+    """
+    Start the next windows of a LeagueBackfillJob, up to its max_concurrency
+    (services/league_backfill.py). Each window task calls this again when it ends.
+    """
+    from .services.league_backfill import claim_windows
+    claimed = claim_windows(job_id)
+    for window_id, claim in claimed.items():
+        run_league_backfill_window.delay(window_id, str(claim))
+    return len(claimed)
+
+
+@shared_task
+def run_league_backfill_window(window_id, claim=None):
+    """Import one backfill window from its saved cursor, as long as `claim` is still
+    its claim, then dispatch the job again."""
+    from .models import LeagueBackfillWindow
+    from .services.league_backfill import run_window
+    try:
+        status = run_window(window_id, claim)
+    finally:
+        job_id = LeagueBackfillWindow.objects.filter(pk=window_id).values_list('job_id', flat=True).first()
+        if job_id:
+            run_league_backfill.delay(job_id)
+    return status
+
+
+@shared_task
+def resume_league_backfills():
+    """
+    Re-dispatch every running backfill job, requeueing windows whose worker stopped
+    heartbeating (league_backfill.STALE_AFTER). Schedule every ~10 minutes via celery
+    beat so jobs continue after worker restarts.
+    """
+    from .models import LeagueBackfillJob
+    job_ids = list(LeagueBackfillJob.objects.filter(
+        status=LeagueBackfillJob.StatusChoices.RUNNING).values_list('pk', flat=True))
+    for job_id in job_ids:
+        run_league_backfill.delay(job_id)
+    return len(job_ids)
+
+
 @shared_task(bind=True, autoretry_for=(requests.RequestException,), retry_backoff=True, max_retries=3)
 def check_all_league_rounds(delete=False, list_games=True):
     tournament, _ = Tournament.objects.get_or_create(name='Root Digital League')
@@ -1,5 +1,8 @@
+from unittest import skipUnless
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
 from the_gatehouse.models import DiscordGuild, Profile
@@ -435,6 +438,665 @@ class EloSeasonTests(TestCase):
         self.assertEqual(feb[self.system], 1)
 
 
+class IncrementalEloReplayTests(TestCase):
+    """The incremental replay rewrites only the rows a change reaches and ends with the
+    same ratings a full forward replay would produce."""
+
+    def setUp(self):
+        from datetime import datetime, timezone as dt_tz
+        from the_warroom.models import EloSystem
+
+        self.dt = lambda m, d: datetime(2026, m, d, 12, 0, tzinfo=dt_tz.utc)
+        self.system = EloSystem.objects.create(
+            name="Local I", calculation_type=EloSystem.CalculationType.LOCAL,
+            min_players=2, max_players=6, k_factor=32, k_provisional=64,
+            provisional_games=2, initial_rating=1500,
+        )
+        self.tournament = Tournament.objects.create(name="T", elo_system=self.system)
+        self.stage = Stage.objects.create(tournament=self.tournament, name="S", order=1)
+        self.round = Round.objects.create(stage=self.stage, round_number=1)
+        self.players = [Profile.objects.create(discord=f"p{i}") for i in range(6)]
+        self.start = self.dt(1, 1)
+
+    def _make_game(self, month, day, winner, loser):
+        game = Game.objects.create(round=self.round, date_posted=self.dt(month, day),
+                                   final=True, cached_player_count=2)
+        Effort.objects.create(game=game, player=winner, win=True)
+        Effort.objects.create(game=game, player=loser, win=False)
+        return game
+
+    def _snapshot(self):
+        from the_warroom.models import EloRating, EloParticipant
+        rows = sorted(
+            (g, p, round(b, 6), round(a, 6), c) for g, p, b, a, c in
+            EloRating.objects.filter(elo_system=self.system).values_list(
+                'game_id', 'player_id', 'rating_before', 'rating_after', 'win_credit'))
+        standings = sorted(
+            (p, round(r, 6), n, w) for p, r, n, w in
+            EloParticipant.objects.filter(elo_system=self.system).values_list(
+                'player_id', 'rating', 'games_played', 'wins'))
+        return rows, standings
+
+    def _assert_matches_full_replay(self):
+        from the_warroom.services.elo_service import recompute_system_from
+        incremental = self._snapshot()
+        recompute_system_from(self.system, self.start)
+        self.assertEqual(incremental, self._snapshot())
+
+    def _history(self):
+        a, b, c, d, e, f = self.players
+        # Two groups that never meet: (a, b, c) and (d, e, f).
+        return [
+            self._make_game(1, 2, a, b), self._make_game(1, 3, d, e),
+            self._make_game(1, 4, b, c), self._make_game(1, 5, e, f),
+            self._make_game(1, 6, c, a), self._make_game(1, 7, f, d),
+            self._make_game(1, 8, a, b), self._make_game(1, 9, d, e),
+        ]
+
+    def test_untouched_history_writes_nothing(self):
+        from the_warroom.services.elo_service import (
+            recompute_system_from, incremental_recompute_system_from)
+        self._history()
+        recompute_system_from(self.system, self.start)
+        stats = incremental_recompute_system_from(self.system, self.start)
+        self.assertEqual((stats['rows_deleted'], stats['rows_created']), (0, 0))
+        self.assertEqual(stats['games_replayed'], 0)
+
+    def test_result_flip_only_touches_contaminated_players(self):
+        from the_warroom.services.elo_service import (
+            recompute_system_from, incremental_recompute_system_from)
+        games = self._history()
+        recompute_system_from(self.system, self.start)
+        # Flip the winner of the first (a, b) game.
+        for effort in games[0].efforts.all():
+            Effort.objects.filter(pk=effort.pk).update(win=not effort.win)
+        stats = incremental_recompute_system_from(self.system, self.start)
+        # Only the (a, b, c) group's four games are replayed; (d, e, f) is never touched.
+        self.assertEqual(stats['games_replayed'], 4)
+        self.assertEqual(stats['rows_created'], 8)
+        self._assert_matches_full_replay()
+
+    def test_deleted_and_moved_games_match_full_replay(self):
+        from the_warroom.services.elo_service import (
+            recompute_system_from, incremental_recompute_system_from)
+        games = self._history()
+        recompute_system_from(self.system, self.start)
+        games[1].delete()
+        Game.objects.filter(pk=games[2].pk).update(date_posted=self.dt(1, 10))
+        incremental_recompute_system_from(self.system, self.start)
+        self._assert_matches_full_replay()
+
+    def test_orphan_sweep_keeps_evidence_of_a_deleted_game(self):
+        from unittest import mock
+        from the_warroom.models import EloSystem
+        from the_warroom.services.elo_service import recompute_system_from
+        from the_warroom.tasks import recompute_dirty_local_elo
+        games = self._history()
+        recompute_system_from(self.system, self.start)
+        EloSystem.objects.filter(pk=self.system.pk).update(recompute_from=None)
+        games[2].delete()
+        self.system.refresh_from_db()
+        self.assertEqual(self.system.recompute_from, self.dt(1, 4))
+        # The replay fails, but the sweep still runs: the orphans must survive it.
+        with mock.patch('the_warroom.services.elo_service.incremental_recompute_system_from',
+                        side_effect=RuntimeError):
+            recompute_dirty_local_elo()
+        recompute_dirty_local_elo()
+        self.system.refresh_from_db()
+        self.assertIsNone(self.system.recompute_from)
+        self._assert_matches_full_replay()
+
+    def test_new_game_with_season_reset_matches_full_replay(self):
+        from the_warroom.models import EloSeason
+        from the_warroom.services.elo_service import (
+            recompute_system_from, incremental_recompute_system_from)
+        self._history()
+        EloSeason.objects.create(elo_system=self.system, start_date=self.dt(1, 6),
+                                 reset_mode=EloSeason.ResetMode.SOFT, soft_reset_factor=0.5)
+        recompute_system_from(self.system, self.start)
+        a, b = self.players[:2]
+        self._make_game(1, 5, b, a)  # late-recorded game just before the boundary
+        incremental_recompute_system_from(self.system, self.dt(1, 5))
+        self._assert_matches_full_replay()
+
+    def test_season_edit_requests_full_replay(self):
+        from the_warroom.models import EloSeason
+        EloSeason.objects.create(elo_system=self.system, start_date=self.dt(2, 1),
+                                 reset_mode=EloSeason.ResetMode.HARD)
+        self.system.refresh_from_db()
+        self.assertTrue(self.system.full_replay_pending)
+
+
+class BatchEloReplayTests(SimpleTestCase):
+    """The batch replay engine produces exactly the rows of the pairwise reference."""
+
+    def test_batch_matches_pairwise_bit_for_bit(self):
+        from the_warroom.management.commands.benchmark_elo import synthetic_history
+        from the_warroom.models import EloSystem
+        from the_warroom.services.elo_service import replay_games, replay_games_pairwise
+        system = EloSystem(k_factor=40, k_provisional=80, provisional_games=5, initial_rating=1200)
+        games, seats, seasons = synthetic_history(3000, 120, seed=7)
+        anchor = {1: [1310.5, 7, 3.5], 2: [1150.0, 2, 0.0]}
+
+        pairwise_working = {pid: list(state) for pid, state in anchor.items()}
+        batch_working = {pid: list(state) for pid, state in anchor.items()}
+        expected = replay_games_pairwise(system, games, seats, pairwise_working, seasons)
+        actual = replay_games(system, games, seats, batch_working, seasons)
+
+        self.assertEqual(actual, expected)  # exact float equality, not assertAlmostEqual
+        self.assertEqual(batch_working, pairwise_working)
+
+
+class LeaderboardBucketTests(TestCase):
+    """Boards summed from LeaderboardBucket match the live Effort aggregation."""
+
+    def setUp(self):
+        from datetime import datetime, timezone as dt_tz
+        from unittest import mock
+        from the_keep.models import Faction
+        from the_warroom.models import PlatformChoices
+
+        dt = lambda m, d: datetime(2026, m, d, 12, 0, tzinfo=dt_tz.utc)
+        self.players = [Profile.objects.create(discord=f"lb{i}") for i in range(4)]
+        a, b, c, d = self.players
+        with mock.patch('the_gatehouse.signals.resize_image_in_place'):
+            self.factions = [Faction.objects.create(title=title, component='Faction', animal=animal,
+                                                    designer=a, type='M', official=True)
+                             for title, animal in (('Marquise de Cat', 'Cat'), ('Eyrie Dynasties', 'Bird'),
+                                                   ('Woodland Alliance', 'Mouse'))]
+        history = [
+            (dt(1, 3), PlatformChoices.TTS, True, [(a, True), (b, False), (c, False)]),
+            (dt(1, 20), PlatformChoices.DWD, True, [(b, True), (c, False)]),
+            (dt(2, 1), PlatformChoices.TTS, False, [(a, False), (d, True)]),
+            (dt(2, 14), PlatformChoices.IRL, True, [(c, True), (d, False), (a, False)]),
+            (dt(3, 2), PlatformChoices.TTS, True, [(a, True), (b, True), (d, False)]),  # coalition
+            (dt(3, 30), PlatformChoices.DWD, False, [(d, True), (b, False)]),
+            (dt(4, 9), PlatformChoices.TTS, True, [(b, True), (a, False)]),
+        ]
+        self.games = []
+        for when, platform, official, seats in history:
+            game = Game.objects.create(date_posted=when, platform=platform, official=official,
+                                       final=True, coalition_win=sum(w for _, w in seats) > 1)
+            for seat, (player, win) in enumerate(seats):
+                Effort.objects.create(game=game, player=player, win=win,
+                                      faction=self.factions[seat % 2], seat=seat + 1)
+            self.games.append(game)
+        # Only ever played in a test match: on no board, live or bucketed.
+        test_game = Game.objects.create(date_posted=dt(2, 5), final=True, test_match=True)
+        Effort.objects.create(game=test_game, player=a, win=True, faction=self.factions[0], seat=1)
+        Effort.objects.create(game=test_game, player=b, win=False, faction=self.factions[2], seat=2)
+
+    def _boards(self, query):
+        from django.http import QueryDict
+        from the_warroom.filters import GameFilter
+        from the_warroom.services.leaderboard_buckets import bucket_leaderboards
+
+        from the_keep.models import Faction
+
+        params = QueryDict(query)
+        top, most, top_factions, most_factions = bucket_leaderboards(
+            params, official_only=False, threshold=1, limit=50)
+        games = GameFilter(params, queryset=Game.objects.filter(final=True)).qs
+        efforts = Effort.objects.filter(game__in=games)
+        live_top = Profile.leaderboard(efforts, limit=50, game_threshold=1)
+        live_most = Profile.leaderboard(efforts, top_quantity=True, limit=50, game_threshold=1)
+        live_factions = Faction.leaderboard(efforts, limit=50, game_threshold=1)
+        rows = lambda board: sorted((p.pk, round(p.win_rate, 6), p.tourney_points, p.total_efforts)
+                                    for p in board)
+        self.assertEqual(rows(top), rows(live_top))
+        self.assertEqual(rows(most), rows(live_most))
+        self.assertEqual(rows(top_factions), rows(live_factions))
+        self.assertEqual(rows(most_factions), rows(live_factions))
+        self.assertNotIn(self.factions[2].pk, [f.pk for f in top_factions])
+        self.assertEqual([p.win_rate for p in top], sorted((p.win_rate for p in top), reverse=True))
+        self.assertEqual([p.tourney_points for p in most],
+                         sorted((p.tourney_points for p in most), reverse=True))
+
+    def test_filtered_boards_match_live_aggregation(self):
+        from the_warroom.services.leaderboard_buckets import rebuild_all_buckets
+        rebuild_all_buckets()
+        for query in ['', 'official=true', 'official=false', 'date_after=2026-01-15',
+                      'date_after=2026-01-03&date_before=2026-03-30',
+                      'date_after=2026-02-02&date_before=2026-02-20&official=true',
+                      'official=false&date_before=2026-04-01']:
+            with self.subTest(query=query):
+                self._boards(query)
+
+    def test_refresh_follows_game_edits(self):
+        from the_warroom.models import LeaderboardBucket
+        from the_warroom.services.leaderboard_buckets import (
+            bucket_keys_for_game, month_start, rebuild_all_buckets, refresh_buckets)
+        rebuild_all_buckets()
+        game = self.games[1]
+        old_month = month_start(game.date_posted)
+        Game.objects.filter(pk=game.pk).update(official=False, date_posted=self.games[3].date_posted)
+        game.refresh_from_db()
+        refresh_buckets(bucket_keys_for_game(game, months={old_month, month_start(game.date_posted)}))
+
+        snapshot = lambda: sorted(LeaderboardBucket.objects.values_list(
+            'subject_type', 'subject_id', 'official', 'month',
+            'efforts', 'wins', 'coalition_wins'))
+        refreshed = snapshot()
+        rebuild_all_buckets()
+        self.assertEqual(refreshed, snapshot())
+        self._boards('official=false&date_after=2026-02-01&date_before=2026-02-28')
+
+    def test_unsupported_filters_fall_back_to_live(self):
+        from django.http import QueryDict
+        from the_warroom.services.leaderboard_buckets import bucket_leaderboards, rebuild_all_buckets
+        rebuild_all_buckets()
+        params = QueryDict(f'players={self.players[0].pk}')
+        self.assertIsNone(bucket_leaderboards(params, official_only=False, threshold=1, limit=5))
+
+
+class TournamentLeaderboardSnapshotTests(TestCase):
+    """Snapshot boards per tournament/stage/round match the live Effort aggregation,
+    counting extra-round games once per scope."""
+
+    def setUp(self):
+        self.tour = Tournament.objects.create(name="Snapshot Cup", is_active=True)
+        self.stage1 = Stage.objects.create(tournament=self.tour, name="S1", order=1, is_active=True)
+        self.stage2 = Stage.objects.create(tournament=self.tour, name="S2", order=2, is_active=True)
+        self.round1 = Round.objects.create(stage=self.stage1, round_number=1, is_active=True)
+        self.round2 = Round.objects.create(stage=self.stage1, round_number=2, is_active=True)
+        self.round3 = Round.objects.create(stage=self.stage2, round_number=1, is_active=True)
+        a, b, c, d = self.players = [Profile.objects.create(discord=f"ts{i}") for i in range(4)]
+        history = [
+            (self.round1, False, [(a, True), (b, False), (c, False)]),
+            (self.round1, False, [(a, True), (b, True), (d, False)]),  # coalition
+            (self.round2, False, [(c, True), (d, False)]),
+            (self.round3, False, [(b, True), (a, False), (d, False)]),
+            (self.round3, True, [(d, True), (c, False)]),  # test match
+        ]
+        for round, test_match, seats in history:
+            game = Game.objects.create(round=round, final=True, test_match=test_match,
+                                       coalition_win=sum(w for _, w in seats) > 1)
+            for player, win in seats:
+                Effort.objects.create(game=game, player=player, win=win)
+        # Counted in round 2 (same stage) and round 3 (other stage) too.
+        self.shared = Game.objects.get(round=self.round1, coalition_win=True)
+        self.shared.extra_rounds.add(self.round2, self.round3)
+        Game.objects.create(round=self.round2, final=False)
+
+    def _assert_matches_live(self, scope, games, threshold=0):
+        from django.http import QueryDict
+        from the_warroom.services.tournament_leaderboards import snapshot_leaderboards
+
+        link = lambda obj: obj.slug
+        boards = snapshot_leaderboards(scope, QueryDict(), threshold, 50, link, link)
+        self.assertIsNotNone(boards)
+        top, most, _, _ = boards
+        efforts = Effort.objects.filter(game__in=games.filter(final=True))
+        live_top = Profile.leaderboard(efforts, limit=50, game_threshold=threshold)
+        live_most = Profile.leaderboard(efforts, top_quantity=True, limit=50, game_threshold=threshold)
+        rows = lambda board: sorted((p.pk, round(p.win_rate, 6), p.tourney_points, p.total_efforts)
+                                    for p in board)
+        self.assertEqual(rows(top), rows(live_top))
+        self.assertEqual(rows(most), rows(live_most))
+        self.assertEqual([p.win_rate for p in top], sorted((p.win_rate for p in top), reverse=True))
+
+    def test_refresh_matches_live_boards(self):
+        from the_warroom.tasks import update_tournament_counts
+        update_tournament_counts([self.tour.pk])
+        self._assert_matches_live(self.tour, Game.objects.counting_for_tournament(self.tour))
+        self._assert_matches_live(self.tour, Game.objects.counting_for_tournament(self.tour), threshold=3)
+        for stage in (self.stage1, self.stage2):
+            self._assert_matches_live(stage, Game.objects.counting_for_stage(stage))
+        for round in (self.round1, self.round2, self.round3):
+            self._assert_matches_live(round, Game.objects.counting_for_round(round))
+
+    def test_filtered_or_unbuilt_scopes_fall_back_to_live(self):
+        from django.http import QueryDict
+        from the_warroom.services.tournament_leaderboards import (
+            refresh_tournament_leaderboards, snapshot_leaderboards)
+        link = lambda obj: obj.slug
+        self.assertIsNone(snapshot_leaderboards(self.tour, QueryDict(), 0, 5, link, link))
+        refresh_tournament_leaderboards(self.tour)
+        params = QueryDict(f'players={self.players[0].pk}&threshold=1')
+        self.assertIsNone(snapshot_leaderboards(self.tour, params, 0, 5, link, link))
+        self.assertIsNotNone(snapshot_leaderboards(self.tour, QueryDict('threshold=1&limit=3'), 1, 3, link, link))
+
+    def test_leaderboard_page_reads_snapshot(self):
+        from the_warroom.services.tournament_leaderboards import refresh_tournament_leaderboards
+        refresh_tournament_leaderboards(self.tour)
+        response = self.client.get(reverse('tournament-leaderboard-page', args=[self.tour.slug]))
+        self.assertEqual(response.status_code, 200)
+        top = response.context['top_players']
+        self.assertEqual(len(top), 4)
+        self.assertEqual((top[-1].pk, top[-1].total_efforts, top[-1].win_rate), (self.players[3].pk, 3, 0))
+
+
+class LeagueImportTests(TestCase):
+    """The batched league importer against a local stub of the match/player API."""
+
+    @classmethod
+    def setUpClass(cls):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        super().setUpClass()
+        cls.matches = []
+        cls.requests_seen = []
+
+        class StubAPI(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                cls.requests_seen.append(url.path)
+                if url.path.startswith('/api/player/'):
+                    player_id = url.path.rstrip('/').rsplit('/', 1)[-1]
+                    body = {'discord_name': f'API.Name{player_id}'}
+                else:
+                    query = parse_qs(url.query)
+                    offset, limit = int(query['offset'][0]), int(query['limit'][0])
+                    page = cls.matches[offset:offset + limit]
+                    more = offset + limit < len(cls.matches)
+                    body = {'count': len(cls.matches), 'results': page, 'next': 'more' if more else None}
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPI)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        from unittest import mock
+        from the_keep.models import Deck, Faction, Hireling, Vagabond
+        designer = Profile.objects.create(discord='designer')
+        post = lambda model, title, component, **kw: model.objects.create(
+            title=title, component=component, designer=designer, **kw)
+        # Default-picture resizing dominates Post.save(); the import never reads images.
+        with mock.patch('the_gatehouse.signals.resize_image_in_place'):
+            cls.cats = post(Faction, 'Marquise de Cat', 'Faction', animal='Cat')
+            cls.alliance = post(Faction, 'Woodland Alliance', 'Faction', animal='Mouse')
+            cls.vb_faction = post(Faction, 'Vagabond', 'Faction', animal='Raccoon')
+            cls.thief = post(Vagabond, 'Thief', 'Vagabond', animal='Raccoon')
+            cls.deck = post(Deck, 'Exiles & Partisans', 'Deck', card_total=54)
+            cls.patrol = post(Hireling, 'Forest Patrol', 'Hireling', animal='Cat')
+
+    def setUp(self):
+        self.known = Profile.objects.create(discord='known', dwd='Known+12')
+        Game.objects.create(league_id='100', final=True)
+        self.matches[:] = [
+            self._match(100, [('Known+12', 'cats', 1)]),
+            self._match(101, [('Known+12', 'cats', 0), ('Newbie+7', 'alliance', 1)],
+                        hirelings=['h_cats_p'], deck='e&p', board_map='autumn'),
+            self._match(102, [('Known+12', 'alliance', 1), ('Newbie+7', 'vb_thief', 1, 'Known+12')]),
+            self._match(103, [('Newbie+7', 'cats', 1, None, -5)]),  # negative score: invalid
+            self._match(102, [('Known+12', 'alliance', 1)]),  # repeated on a later page
+        ]
+        self.requests_seen[:] = []
+
+    @staticmethod
+    def _match(league_id, seats, **extra):
+        participants = []
+        for i, seat in enumerate(seats, start=1):
+            player, faction, score = seat[:3]
+            coalition = seat[3] if len(seat) > 3 else None
+            game_score = seat[4] if len(seat) > 4 else 30
+            participants.append({
+                'player': player, 'player_id': 900 + i, 'faction': faction,
+                'tournament_score': score, 'game_score': game_score,
+                'turn_order': i, 'coalition': coalition,
+            })
+        return {
+            'id': league_id, 'date_closed': '2026-03-01T12:00:00Z',
+            'date_modified': '2026-03-01T12:00:00Z', 'tournament': 'M04',
+            'participants': participants, **extra,
+        }
+
+    def _import(self):
+        from the_warroom.services.league_import import import_matches
+        return import_matches({}, limit=2, base_url=f'{self.base}/api/match/',
+                              player_url=f'{self.base}/api/player/')
+
+    def test_import_pages_in_bulk(self):
+        from the_warroom.services.league_import import STAGES
+        stats = self._import()
+        self.assertEqual(stats['done'], ['101', '102'])
+        self.assertEqual(stats['skipped'], ['100', '102'])
+        self.assertEqual(stats['errors'], ['103'])
+        self.assertEqual(set(stats['timings']), set(STAGES))
+
+        game = Game.objects.get(league_id='101')
+        self.assertEqual((game.deck, game.map, game.cached_player_count), (self.deck, None, 2))
+        self.assertEqual(list(game.hirelings.all()), [self.patrol])
+        self.assertEqual(game.round.name, 'M04')
+        self.assertEqual(game.round.stage.tournament.name, 'Root Digital League')
+
+        # The existing profile got its dwd standardized and canonical value backfilled;
+        # the new player was created once, named from the player API.
+        self.known.refresh_from_db()
+        self.assertEqual((self.known.dwd, self.known.rdl_cannonical_dwd), ('Known+0012', 'Known+12'))
+        newbie = Profile.objects.get(rdl_cannonical_dwd='Newbie+7')
+        self.assertEqual((newbie.discord, newbie.dwd), ('api.name902', 'Newbie+0007'))
+        self.assertEqual(self.requests_seen.count('/api/player/902/'), 1)
+
+        coalition = Game.objects.get(league_id='102')
+        self.assertTrue(coalition.coalition_win)
+        thief_seat = coalition.efforts.get(player=newbie)
+        self.assertEqual((thief_seat.faction, thief_seat.vagabond, thief_seat.coalition_with),
+                         (self.vb_faction, self.thief, self.alliance))
+        self.assertFalse(Game.objects.filter(league_id='103').exists())
+
+    def test_import_drops_players_header_stats(self):
+        from django.core.cache import cache
+        from the_gatehouse.services.header_stats import header_stats
+        cache.clear()
+        self.assertEqual(header_stats(self.known)['game_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._import()
+        self.assertEqual(header_stats(self.known)['game_count'], 2)
+
+    def test_import_moves_the_stats_generation(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from django.db import connection
+        from the_warroom.services.change_collector import _ATTR
+        from the_warroom.services.leaderboard_cache import stats_generation
+        cache.clear()
+        with mock.patch('the_warroom.tasks.process_collected_changes.delay') as delay:
+            getattr(connection, _ATTR).flush()  # setUp's game
+            before = stats_generation()
+            self._import()
+            # The test's transaction never commits; flush its batch as the commit would.
+            getattr(connection, _ATTR).flush()
+        self.assertGreater(stats_generation(), before)
+        self.assertTrue(delay.call_args.args[0]['stats'])
+
+    def test_update_replaces_seats(self):
+        from the_warroom.services.league_import import update_matches
+        self._import()
+        edited = self._match(101, [('Known+12', 'cats', 1), ('Newbie+7', 'alliance', 0)])
+        edited['date_modified'] = '2026-03-02T12:00:00Z'
+        self.matches[:] = [edited, self._match(102, [('Known+12', 'alliance', 1)])]
+        stats = update_matches({}, limit=2, base_url=f'{self.base}/api/match/',
+                               player_url=f'{self.base}/api/player/')
+        self.assertEqual((stats['done'], stats['skipped'], stats['errors']), (['101'], ['102'], []))
+        game = Game.objects.get(league_id='101')
+        self.assertEqual(list(game.efforts.filter(win=True).values_list('player', flat=True)),
+                         [self.known.pk])
+        self.assertEqual(game.efforts.count(), 2)
+        self.assertEqual(list(game.hirelings.all()), [])
+
+    def test_backfill_windows_resume_from_cursor(self):
+        from datetime import datetime, timedelta, timezone as dt_timezone
+        from django.utils import timezone
+        from the_warroom.models import LeagueBackfillJob
+        from the_warroom.services.league_backfill import claim_windows, create_job, run_window, with_progress
+        Status = LeagueBackfillJob.StatusChoices
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        job = create_job(start, start + timedelta(days=10), window_days=7, page_size=2, max_concurrency=1)
+        first, second = job.windows.all()
+        self.assertEqual((first.end, second.end), (start + timedelta(days=7), start + timedelta(days=10)))
+
+        # One window at a time; the second claim finds no free slot.
+        self.assertEqual(list(claim_windows(job.pk)), [first.pk])
+        self.assertEqual(list(claim_windows(job.pk)), [])
+
+        # A worker died after committing the first page: resume from the saved cursor.
+        first.__class__.objects.filter(pk=first.pk).update(next_offset=2)
+        run = lambda window: run_window(window.pk, base_url=f'{self.base}/api/match/',
+                                        player_url=f'{self.base}/api/player/')
+        self.assertEqual(run(first), Status.DONE)
+        self.assertFalse(Game.objects.filter(league_id='101').exists())
+        first.refresh_from_db()
+        self.assertEqual((first.imported, first.skipped, first.errors, first.error_ids, first.next_offset),
+                         (1, 1, 1, '103', 6))
+
+        # A claimed window whose worker stopped heartbeating is requeued.
+        self.assertEqual(list(claim_windows(job.pk)), [second.pk])
+        second.__class__.objects.filter(pk=second.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(list(claim_windows(job.pk)), [second.pk])
+        self.assertEqual(run(second), Status.DONE)
+        self.assertTrue(Game.objects.filter(league_id='101').exists())
+
+        self.assertEqual(list(claim_windows(job.pk)), [])
+        job = with_progress(LeagueBackfillJob.objects.filter(pk=job.pk)).get()
+        self.assertEqual((job.status, job.windows_remaining, job.games_imported), (Status.DONE, 0, 2))
+
+    def test_stale_worker_stops_after_a_reclaim(self):
+        from datetime import datetime, timedelta, timezone as dt_timezone
+        from django.utils import timezone
+        from the_warroom.models import LeagueBackfillWindow
+        from the_warroom.services.league_backfill import _Checkpoint, claim_windows, create_job, run_window
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        job = create_job(start, start + timedelta(days=7), window_days=7, page_size=2, max_concurrency=1)
+        window = job.windows.get()
+        old_claim = claim_windows(job.pk)[window.pk]
+        # The old worker is only slow: its window is requeued and claimed again.
+        LeagueBackfillWindow.objects.filter(pk=window.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        new_claim = claim_windows(job.pk)[window.pk]
+        self.assertNotEqual(old_claim, new_claim)
+
+        stale = _Checkpoint(window, old_claim)
+        self.assertFalse(stale.save({'done': ['101'], 'skipped': [], 'errors': []}, next_offset=2))
+        self.assertTrue(stale.lost)
+        window.refresh_from_db()
+        self.assertEqual((window.imported, window.next_offset), (0, 0))
+        # A task still carrying the old claim imports nothing.
+        self.assertIsNone(run_window(window.pk, old_claim, base_url=f'{self.base}/api/match/',
+                                     player_url=f'{self.base}/api/player/'))
+        self.assertFalse(Game.objects.filter(league_id='101').exists())
+
+
+def _redis_or_none():
+    """The default cache's Redis client, or None when the cache isn't Redis or is down."""
+    from django.core.cache import cache
+    try:
+        client = cache._cache.get_client(write=True)
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+class WinrateQueueTests(TestCase):
+    """Debounced winrate marks and the drain, against the Redis cache (skipped when the
+    default cache isn't Redis)."""
+
+    def setUp(self):
+        from unittest import mock
+        from the_warroom.services import winrate_queue
+        self.redis = _redis_or_none()
+        if self.redis is None:
+            self.skipTest("the default cache isn't Redis")
+        self.queue = winrate_queue
+        # Private keys, so a run never touches a real queue sharing the database.
+        for name in ('QUEUE_KEY', 'STATS_KEY'):
+            patcher = mock.patch.object(winrate_queue, name, f'test:{getattr(winrate_queue, name)}')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.redis.delete, winrate_queue.QUEUE_KEY, winrate_queue.STATS_KEY)
+        self.redis.delete(winrate_queue.QUEUE_KEY, winrate_queue.STATS_KEY)
+
+    def _mark_at(self, when, *objects):
+        from unittest import mock
+        with mock.patch.object(self.queue.time, 'time', return_value=when):
+            self.queue.mark_winrates_dirty(list(objects))
+
+    def test_remark_keeps_the_first_score(self):
+        self._mark_at(1000.0, ('the_keep', 'faction', 1))
+        self._mark_at(2000.0, ('the_keep', 'faction', 1), ('the_keep', 'faction', 2))
+        self.assertEqual(self.redis.zscore(self.queue.QUEUE_KEY, 'the_keep.faction:1'), 1000.0)
+        self.assertEqual(self.redis.zscore(self.queue.QUEUE_KEY, 'the_keep.faction:2'), 2000.0)
+
+    def test_drain_pops_debounced_entries_once(self):
+        import time
+        from unittest import mock
+        now = time.time()
+        self._mark_at(now - 60, ('the_keep', 'faction', 1), ('the_gatehouse', 'profile', 7))
+        self._mark_at(now, ('the_keep', 'faction', 2))  # still inside the debounce window
+        with mock.patch('the_warroom.services.winrate_service.bulk_recalculate_cached_winrates',
+                        side_effect=lambda model, pks: (None, len(pks))) as recompute:
+            stats = self.queue.drain(debounce=30)
+            self.assertEqual(self.queue.drain(debounce=30)['last_drained'], 0)
+        calls = sorted((c.args[0]._meta.label_lower, c.kwargs['pks']) for c in recompute.call_args_list)
+        self.assertEqual(calls, [('the_gatehouse.profile', {7}), ('the_keep.faction', {1})])
+        self.assertEqual((stats['last_drained'], stats['last_updated'], stats['depth']), (2, 2, 1))
+        self.assertGreaterEqual(stats['last_drain_max_wait'], 60)
+        status = self.queue.queue_stats()
+        self.assertEqual((status['depth'], status['last_drained']), (1, '0'))
+
+    def test_failed_refresh_is_requeued(self):
+        import time
+        from unittest import mock
+        self._mark_at(time.time() - 60, ('the_keep', 'faction', 1))
+        with mock.patch('the_warroom.services.winrate_service.bulk_recalculate_cached_winrates',
+                        side_effect=RuntimeError):
+            stats = self.queue.drain(debounce=30)
+        self.assertEqual((stats['last_failed'], stats['depth']), (1, 1))
+        self.assertIsNotNone(self.redis.zscore(self.queue.QUEUE_KEY, 'the_keep.faction:1'))
+
+
+class BulkCachedWinrateTests(TestCase):
+    """The grouped bulk recompute writes the same cached_* values as the per-object path."""
+
+    def test_bulk_matches_per_object_stats(self):
+        from the_warroom.models import PlatformChoices
+        from the_warroom.services.winrate_service import (
+            CACHED_FIELDS, _apply_cached_stats, bulk_recalculate_cached_winrates)
+        a, b, c, idle = [Profile.objects.create(discord=f"wr{i}") for i in range(4)]
+        history = [
+            (PlatformChoices.TTS, [(a, True), (b, False), (c, False)]),
+            (PlatformChoices.DWD, [(a, True), (b, True), (c, False)]),  # coalition
+            (PlatformChoices.IRL, [(b, True), (c, False)]),
+            (PlatformChoices.TTS, [(c, True), (a, False)]),
+        ]
+        for platform, seats in history:
+            game = Game.objects.create(platform=platform, final=True,
+                                       coalition_win=sum(w for _, w in seats) > 1)
+            for player, win in seats:
+                Effort.objects.create(game=game, player=player, win=win)
+        Profile.objects.filter(pk=idle.pk).update(cached_plays=3, cached_winrate=50.0)
+
+        checked, updated = bulk_recalculate_cached_winrates(Profile)
+        self.assertEqual(checked, Profile.objects.count())
+        for profile in (a, b, c, idle):
+            expected = Profile.objects.get(pk=profile.pk)
+            _apply_cached_stats(expected)
+            stored = Profile.objects.get(pk=profile.pk)
+            self.assertEqual([getattr(stored, f) for f in CACHED_FIELDS],
+                             [getattr(expected, f) for f in CACHED_FIELDS])
+        self.assertEqual(bulk_recalculate_cached_winrates(Profile), (checked, 0))
+
+
 class GameApiTournamentTests(TestCase):
     """The api/games `tournament` field lists every round a game counts toward
     (primary + extra_rounds), and the tournament filter matches games linked to a
@@ -496,3 +1158,376 @@ class GameApiTournamentTests(TestCase):
     def test_filter_excludes_unrelated_tournament(self):
         game = Game.objects.create(round=self.alpha_round, final=True)
         self.assertNotIn(game.pk, self._filter_pks(self.beta))
+
+
+class GameExportTests(TestCase):
+    """The streaming export builds the same game dicts as GameSerializer, chunk by chunk."""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.contrib.auth.signals import user_logged_in
+        from django.utils import timezone
+        from the_gatehouse.signals import user_logged_in_handler
+        from the_warroom.models import EloSeason, EloSystem
+        user_logged_in.disconnect(user_logged_in_handler)
+        self.addCleanup(user_logged_in.connect, user_logged_in_handler)
+
+        self.user = User.objects.create_user(username='analyst', password='x')
+        elo = EloSystem.objects.create(name='League Elo', min_players=2, max_players=4)
+        EloSeason.objects.create(elo_system=elo, start_date=timezone.now() - timedelta(days=30))
+        cup = Tournament.objects.create(name='Export Cup', elo_system=elo)
+        stage = Stage.objects.create(tournament=cup, name='Groups', order=0)
+        round_1 = Round.objects.create(round_number=1, stage=stage, name='R1')
+        round_2 = Round.objects.create(round_number=2, stage=stage, name='R2')
+        players = [Profile.objects.create(discord=f'exporter{i}') for i in range(3)]
+        self.games = []
+        for i in range(5):
+            game = Game.objects.create(round=round_1, final=True, nickname=f'Game {i}')
+            if i % 2:
+                game.extra_rounds.add(round_2)
+            for seat, player in enumerate(players[:2 + i % 2], start=1):
+                Effort.objects.create(game=game, player=player, seat=seat, score=20 + seat, win=seat == 1)
+            # The player count task runs on commit, which TestCase never reaches.
+            Game.objects.filter(pk=game.pk).update(cached_player_count=2 + i % 2)
+            self.games.append(game)
+        Game.objects.create(final=False)  # drafts are never exported
+
+    def _get(self, **params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse('api-game-export'), params)
+
+    def test_ndjson_matches_serializer(self):
+        import json
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from the_keep.models import Hireling, Landmark, Vagabond
+        from the_warroom.api.game_serializers import GameSerializer
+        from the_warroom.api.views import GameListView
+        # Seats saved out of order, and several hirelings, landmarks and captains added
+        # against their Meta ordering (newest post first), so ordering is compared too.
+        designer = Profile.objects.create(discord='post-designer')
+        with mock.patch('the_gatehouse.signals.resize_image_in_place'):
+            posts = {model: [model.objects.create(title=f'{component} {n}', component=component,
+                                                  designer=designer, animal='Cat',
+                                                  date_posted=timezone.now() - timedelta(days=n))
+                             for n in range(1, 4)]
+                     for model, component in ((Hireling, 'Hireling'), (Landmark, 'Landmark'),
+                                              (Vagabond, 'Vagabond'))}
+        game = self.games[0]
+        game.hirelings.add(*posts[Hireling])
+        game.landmarks.add(*posts[Landmark])
+        game.efforts.get(seat=1).captains.add(*posts[Vagabond])
+        Effort.objects.filter(game=self.games[2], seat=1).update(seat=5)
+        with mock.patch('the_warroom.api.game_export.CHUNK_SIZE', 2):
+            response = self._get()
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        expected = json.loads(json.dumps(
+            GameSerializer(GameListView().get_queryset().order_by('pk'), many=True).data))
+        self.assertEqual(rows, expected)
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(row['elo_systems'] for row in rows))
+
+    def test_csv_since_and_filters(self):
+        import csv
+        from datetime import timedelta
+        from django.utils import timezone
+        Game.objects.filter(pk__in=[g.pk for g in self.games[:3]]).update(
+            date_modified=timezone.now() - timedelta(days=10))
+        response = self._get(format='csv', since=(timezone.now() - timedelta(days=1)).date().isoformat())
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('X-Export-Started-At', response)
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        # Games 3 (three seats) and 4 (two seats), one row per seat.
+        self.assertEqual([row['id'] for row in rows], [str(self.games[3].pk)] * 3 + [str(self.games[4].pk)] * 2)
+        self.assertEqual(rows[0]['participant_turn_order'], '1')
+
+        self.assertEqual(self._get(since='last tuesday').status_code, 400)
+        self.client.logout()
+        self.assertIn(self.client.get(reverse('api-game-export')).status_code, (401, 403))
+
+
+class TurnScoreAggregateTests(TestCase):
+    """Signal-maintained turn aggregates agree with averaging the scorecards directly."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from unittest import mock
+        from the_keep.models import Faction
+        designer = Profile.objects.create(discord='designer')
+        with mock.patch('the_gatehouse.signals.resize_image_in_place'):
+            cls.cats = Faction.objects.create(title='Marquise de Cat', component='Faction', animal='Cat',
+                                              designer=designer, type='M', official=True)
+            cls.birds = Faction.objects.create(title='Eyrie Dynasties', component='Faction', animal='Bird',
+                                               designer=designer, type='M', official=True)
+
+    def setUp(self):
+        from the_warroom.services.turn_aggregates import rebuild_turn_aggregates
+        rebuild_turn_aggregates()  # built (empty), so the signals' rows are read
+
+    def _scorecard(self, faction, points, final=True):
+        from the_warroom.models import ScoreCard
+        game = Game.objects.create(final=True)
+        effort = Effort.objects.create(game=game, faction=faction, seat=1, score=sum(points))
+        card = ScoreCard(faction=faction, effort=effort, final=final, total_points=sum(points))
+        card.set_turns([{'turn_number': i, 'faction_points': p, 'total_points': p}
+                        for i, p in enumerate(points, start=1)])
+        card.save()
+        return card
+
+    def _live(self, **filters):
+        from the_warroom.api.views import aggregate_turns
+        from the_warroom.models import ScoreCard
+        turns = ScoreCard.objects.filter(effort__isnull=False, final=True, **filters).values_list('turns_data', flat=True)
+        return (len(turns),) + aggregate_turns(turns)
+
+    def _assert_matches_live(self):
+        from the_warroom.services.turn_aggregates import Scope, read_scope
+        self.assertEqual(read_scope(Scope.FACTION, str(self.cats.pk)), self._live(faction=self.cats))
+        self.assertEqual(read_scope(Scope.TYPE, 'M'), self._live(faction__type='M', faction__official=True))
+        self.assertEqual(read_scope(Scope.ALL, ''), self._live())
+
+    def test_running_sums_follow_scorecard_changes(self):
+        from the_warroom.services.turn_aggregates import Scope, read_scope, rebuild_turn_aggregates
+        first = self._scorecard(self.cats, [3, 5, 8])
+        self._scorecard(self.cats, [2, 4])
+        self._scorecard(self.birds, [6, 6, 6, 6])
+        draft = self._scorecard(self.cats, [9], final=False)
+        self._assert_matches_live()
+
+        # Finalized, re-pointed at another faction, edited, unlinked by effort deletion.
+        draft.final = True
+        draft.save(update_fields=['final'])
+        first.faction = self.birds
+        first.save()
+        first.set_turns([{'turn_number': 1, 'faction_points': 10, 'total_points': 10}])
+        first.save(update_fields=['turns_data', 'dominance'])
+        self._assert_matches_live()
+        draft.effort.delete()
+        self._assert_matches_live()
+        self.assertEqual(read_scope(Scope.FACTION, str(self.cats.pk))[0], 1)
+
+        live = read_scope(Scope.ALL, '')
+        rebuild_turn_aggregates()
+        self.assertEqual(read_scope(Scope.ALL, ''), live)
+
+    def test_unbuilt_table_is_not_read(self):
+        from unittest import mock
+        from the_warroom.models import TurnScoreAggregate
+        from the_warroom.services.turn_aggregates import Scope, read_scope, rebuild_turn_aggregates
+        TurnScoreAggregate.objects.all().delete()
+        with mock.patch('the_warroom.services.turn_aggregates.apply_change'):
+            self._scorecard(self.cats, [3, 5])  # scored before the signals were deployed
+        self._scorecard(self.cats, [4])
+        # The signal created the scope's rows, but they hold only the second scorecard.
+        self.assertEqual(read_scope(Scope.FACTION, str(self.cats.pk)), None)
+        response = self.client.get(reverse('api-scorecard-faction', args=[self.cats.slug]))
+        self.assertEqual(response.data['count'], 2)
+        rebuild_turn_aggregates()
+        self._assert_matches_live()
+        self.assertEqual(read_scope(Scope.TYPE, 'X'), (0, [], self._live(faction__type='X')[2]))
+
+    def test_faction_charts_read_the_aggregates(self):
+        self._scorecard(self.cats, [3, 5])
+        response = self.client.get(reverse('api-scorecard-faction', args=[self.cats.slug]))
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual([t['average_total_points'] for t in response.data['averages']], [3, 5])
+        response = self.client.get(reverse('api-scorecard-all'), {'type': 'M'})
+        self.assertEqual(response.data['totals']['total_faction_points'], 8)
+
+    def test_player_scorecards_grouped_by_faction(self):
+        from the_warroom.api.views import aggregate_turns
+        player = Profile.objects.create(discord='boxscorer')
+        cards = [self._scorecard(self.cats, [3, 5]), self._scorecard(self.cats, [4]),
+                 self._scorecard(self.birds, [1, 1, 9])]
+        for card in cards:
+            Effort.objects.filter(pk=card.effort_id).update(player=player)
+        response = self.client.get(reverse('api-scorecard-player', args=[player.slug]))
+        by_title = response.data
+        self.assertEqual(set(by_title), {self.cats.title, self.birds.title})
+        averages, totals = aggregate_turns([c.turns_data for c in cards[:2]])
+        self.assertEqual((by_title[self.cats.title]['count'], by_title[self.cats.title]['averages'],
+                          by_title[self.cats.title]['totals']), (2, averages, totals))
+
+    @skipUnless(connection.vendor == 'postgresql', 'the jsonb_array_elements path runs on Postgres only')
+    def test_postgres_turn_averages_match_python(self):
+        from unittest import mock
+        from the_warroom.models import ScoreCard
+        from the_warroom.services import scorecard_stats
+        from the_warroom.services.turn_aggregates import MAX_TURN
+        self._scorecard(self.cats, [3, 5, 8])
+        self._scorecard(self.cats, [2.5, 4])
+        self._scorecard(self.birds, [6, 6, 6, 6])
+        self._scorecard(self.birds, [])
+        # Turns outside 1..MAX_TURN, turns missing keys, and turns_data that isn't a list.
+        odd = self._scorecard(self.birds, [1])
+        ScoreCard.objects.filter(pk=odd.pk).update(turns_data=[
+            {'turn_number': 0, 'faction_points': 50}, {'turn_number': MAX_TURN + 1, 'faction_points': 50},
+            {'turn_number': 2}, {'turn_number': 3, 'total_points': 7}])
+        ScoreCard.objects.filter(pk=self._scorecard(self.cats, [9]).pk).update(turns_data={})
+        scorecards = ScoreCard.objects.filter(effort__isnull=False)
+
+        from_sql = scorecard_stats.faction_turn_averages(scorecards)
+        with mock.patch.object(scorecard_stats, '_postgres_sums', scorecard_stats._python_sums):
+            from_python = scorecard_stats.faction_turn_averages(scorecards)
+        self.assertEqual(set(from_sql), {self.cats.pk, self.birds.pk})
+        self.assertEqual(from_sql, from_python)
+
+
+class ChangeCollectorTests(TestCase):
+    """Game/Effort signals within one transaction are flushed as a single batch task."""
+
+    def setUp(self):
+        from the_warroom.models import EloSystem
+        self.system = EloSystem.objects.create(
+            name="Collected", calculation_type=EloSystem.CalculationType.LOCAL,
+            min_players=2, max_players=6,
+        )
+        self.tournament = Tournament.objects.create(name="Collector Cup", elo_system=self.system)
+        stage = Stage.objects.create(tournament=self.tournament, name="S", order=1)
+        self.round = Round.objects.create(stage=stage, round_number=1)
+        self.players = [Profile.objects.create(discord=f"cc{i}") for i in range(4)]
+
+    def test_one_game_submission_enqueues_one_task(self):
+        from unittest import mock
+        from django.db import transaction
+        from the_warroom.tasks import process_collected_changes
+
+        with mock.patch('the_warroom.tasks.process_collected_changes.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    game = Game.objects.create(round=self.round, final=True)
+                    for seat, player in enumerate(self.players, start=1):
+                        Effort.objects.create(game=game, player=player, seat=seat, win=seat == 1)
+                    game.save()
+        self.assertEqual(delay.call_count, 1)
+        changes = delay.call_args.args[0]
+        self.assertEqual(changes['games'], [game.pk])
+        self.assertEqual(changes['elo_games'], [game.pk])
+        self.assertEqual(sorted(pk for _, _, pk in changes['winrates']), [p.pk for p in self.players])
+
+        with mock.patch('the_warroom.services.winrate_queue.mark_winrates_dirty') as mark:
+            process_collected_changes(changes)
+        self.assertEqual(len(mark.call_args.args[0]), 4)
+        game.refresh_from_db()
+        self.system.refresh_from_db()
+        self.tournament.refresh_from_db()
+        self.assertEqual(game.cached_player_count, 4)
+        self.assertEqual(self.system.recompute_from, game.date_posted)
+        self.assertEqual(self.tournament.cached_game_count, 1)
+
+    def test_failing_tournament_refresh_skips_nothing_else(self):
+        from unittest import mock
+        from the_warroom.tasks import process_collected_changes
+        game = Game.objects.create(round=self.round, final=True)
+        changes = {'games': [game.pk], 'elo_games': [game.pk], 'winrates': [['the_gatehouse', 'profile', 1]]}
+        with mock.patch('the_warroom.tasks.update_tournament_counts', side_effect=RuntimeError), \
+                mock.patch('the_warroom.services.winrate_queue.mark_winrates_dirty') as mark, \
+                self.assertLogs('the_warroom.tasks', 'ERROR'):
+            process_collected_changes(changes)
+        mark.assert_called_once()
+        self.system.refresh_from_db()
+        self.assertEqual(self.system.recompute_from, game.date_posted)
+
+    def test_request_task_count(self):
+        from celery.signals import before_task_publish
+        from django.test import RequestFactory, override_settings
+        from the_gatehouse.middleware import TaskEnqueueCountMiddleware
+
+        def view(request):
+            from django.http import HttpResponse
+            for name in ('a', 'b', 'a'):
+                before_task_publish.send(sender=name)
+            return HttpResponse()
+
+        with override_settings(DEBUG=True):
+            response = TaskEnqueueCountMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(response['X-Tasks-Enqueued'], '3')
+
+
+class LeaderboardCacheTests(TestCase):
+    """Filtered leaderboards are shared across requests until the stats generation moves."""
+
+    def setUp(self):
+        from unittest import mock
+        from the_warroom.services.leaderboard_cache import bump_stats_generation
+        # No Theme rows in the test database; the board doesn't depend on the artwork.
+        patcher = mock.patch('the_warroom.views.get_thematic_images', return_value=(None, [], [], None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        bump_stats_generation()
+        self.player = Profile.objects.create(discord='cached')
+        self._game()
+
+    def _game(self):
+        game = Game.objects.create(final=True)
+        Effort.objects.create(game=game, player=self.player, win=True)
+
+    def test_normalized_query(self):
+        from django.http import QueryDict
+        from the_warroom.services.leaderboard_cache import normalized_query
+        self.assertEqual(normalized_query(QueryDict('platform=b&official=&page=2&platform=a')),
+                         normalized_query(QueryDict('platform=a&platform=b')))
+
+    def test_filtered_board_cached_until_generation_bump(self):
+        from the_warroom.services.leaderboard_cache import bump_stats_generation
+        url = reverse('leaderboard-view')
+        query = {'players': self.player.pk, 'threshold': 1}
+        self.assertEqual(self.client.get(url, query).context['games_count'], 1)
+
+        self._game()  # its commit would bump the generation; TestCase never commits
+        self.assertEqual(self.client.get(url, query).context['games_count'], 1)
+        bump_stats_generation()
+        response = self.client.get(url, query)
+        self.assertEqual(response.context['games_count'], 2)
+        self.assertEqual(response.context['top_players'][0].total_efforts, 2)
+
+
+class GamePageTests(TestCase):
+    """Keyset pages for the HTML game lists (services/game_pages.py)."""
+
+    def setUp(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from the_warroom.services.leaderboard_cache import bump_stats_generation
+        patcher = mock.patch('the_warroom.views.get_thematic_images', return_value=(None, [], [], None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        bump_stats_generation()
+        posted = timezone.now()
+        # Ties on date_posted are broken by id.
+        self.games = [Game.objects.create(final=True, date_posted=posted - timedelta(days=i // 2))
+                      for i in range(7)]
+        self.expected = [g.pk for g in sorted(self.games, key=lambda g: (g.date_posted, g.pk), reverse=True)]
+
+    def test_cursor_walk_covers_every_game_once(self):
+        from django.test import RequestFactory
+        from the_warroom.services.game_pages import game_page
+        factory = RequestFactory()
+        seen, params = [], {}
+        for number in range(1, 10):
+            page = game_page(factory.get('/', params), Game.objects.filter(final=True), per_page=3)
+            self.assertEqual(page.number, number)
+            seen.extend(g.pk for g in page)
+            if not page.has_next():
+                break
+            params = {'page': page.next_page_number(), 'cursor': page.next_cursor}
+        self.assertEqual(seen, self.expected)
+
+    def test_legacy_page_link_then_cursor(self):
+        from django.test import override_settings
+        with override_settings(PAGE_SIZE=3):
+            self._walk_games_home()
+
+    def _walk_games_home(self):
+        url = reverse('games-home')
+        response = self.client.get(url, {'page': 2}, HTTP_HX_REQUEST='true')
+        page = response.context['page_obj']
+        self.assertEqual([g.pk for g in page], self.expected[3:6])
+        self.assertIsNone(response.context['games_count'])
+        response = self.client.get(url, {'page': 3, 'cursor': page.next_cursor}, HTTP_HX_REQUEST='true')
+        self.assertEqual([g.pk for g in response.context['page_obj']], self.expected[6:])
+        self.assertFalse(response.context['page_obj'].has_next())
+        self.assertEqual(self.client.get(url).context['games_count'], 7)
@@ -36,6 +36,10 @@ from .models import (Game, Effort, TurnScore, ScoreCard, Round, Tournament, Asse
                      game_counts_for_round_q, game_counts_for_stage_q,
                      game_counts_for_tournament_q)
 from .services.grouping import GroupingService, build_opponent_history
+from .services.leaderboard_buckets import bucket_leaderboards
+from .services.leaderboard_cache import cached_by_filters
+from .services.game_pages import game_page, game_count
+from .services.tournament_leaderboards import snapshot_leaderboards
 from .forms import (GameCreateForm, GameCreateFormV2, EffortCreateForm,
                     TurnScoreCreateForm, TurnScoreForm, ScoreCardCreateForm, AssignScorecardForm, AssignEffortForm,
                     RoundCreateForm, StageCreateForm,
@@ -93,7 +97,8 @@ def game_list_view(request):
     # Build queryset
     t0 = time.perf_counter()
     opts = Game.with_efforts()
-    if request.user.is_authenticated and not request.user.profile.weird:
+    official_only = request.user.is_authenticated and not request.user.profile.weird
+    if official_only:
         queryset = Game.objects.filter(official=True, final=True)
     else:
         queryset = Game.objects.filter(final=True)
@@ -101,7 +106,7 @@ def game_list_view(request):
 
     # Apply filters
     filterset = GameFilter(request.GET, queryset=queryset, user=request.user)
-    games = filterset.qs.order_by('-date_posted')
+    games = filterset.qs
 
     t1 = time.perf_counter()
     # print(f"[TIMING] queryset assembly: {t1 - t0:.4f}s")
@@ -127,20 +132,16 @@ def game_list_view(request):
     t1 = time.perf_counter()
     # print(f"[TIMING] context theme assembly: {t1 - t0:.4f}s")
     
-    # Pagination
-    paginate_by = settings.PAGE_SIZE
-    paginator = Paginator(games, paginate_by)
-    page_number = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    # Pagination (keyset; see services/game_pages.py)
+    page_obj = game_page(request, games)
     
     t12 = time.perf_counter()
     # print(f"[TIMING] context pagination: {t12 - t1:.4f}s")
 
-    games_count = paginator.count
+    # The count is only shown with the first page (or a full page load).
+    games_count = None
+    if page_obj.number == 1 or template_name == 'the_warroom/games_home.html':
+        games_count = game_count('global', 'official' if official_only else 'all', request.GET, games)
     
     t2 = time.perf_counter()
     # print(f"[TIMING] context games count: {t2 - t12:.4f}s")
@@ -151,7 +152,7 @@ def game_list_view(request):
     # Leaderboard data
     context.update({
         'games': page_obj,
-        'is_paginated': paginator.num_pages > 1,
+        'is_paginated': page_obj.has_other_pages(),
         'page_obj': page_obj,
         'games_count': games_count,
         'form': filterset.form,
@@ -241,8 +242,6 @@ def leaderboard_view(request):
 
     # Apply filters
     filterset = GameFilter(request.GET, queryset=queryset, user=request.user)
-    games = filterset.qs.order_by('-date_posted')
-    games_count = games.count()
 
     # The default, unfiltered board (what crawlers hammer) is served from the
     # cached leaderboard fields as plain indexed queries — no aggregation,
@@ -261,10 +260,8 @@ def leaderboard_view(request):
         key not in CACHED_SAFE_PARAMS and any(v and v.strip() for v in values)
         for key, values in request.GET.lists()
     )
-    default_case = (
-        not has_active_filters
-        and (not request.user.is_authenticated or request.user.profile.weird)
-    )
+    official_only = request.user.is_authenticated and not request.user.profile.weird
+    default_case = not has_active_filters and not official_only
 
     # Build context
     context = {}
@@ -280,56 +277,69 @@ def leaderboard_view(request):
     context['background_pattern'] = background_pattern
     context['page_artists'] = theme_artists
 
-    # Leaderboard threshold (min qualifying plays), scaled by dataset size.
-    if leaderboard_threshold == 0:
-        if games_count > 5000:
-            leaderboard_threshold = 25
-        elif games_count > 2000:
-            leaderboard_threshold = 15
-        elif games_count > 1500:
-            leaderboard_threshold = 10
-        elif games_count > 1000:
-            leaderboard_threshold = 5
-        elif games_count > 500:
-            leaderboard_threshold = 3
+    def build_boards():
+        games_count = filterset.qs.count()
+        threshold = leaderboard_threshold
+
+        # Leaderboard threshold (min qualifying plays), scaled by dataset size.
+        if threshold == 0:
+            if games_count > 5000:
+                threshold = 25
+            elif games_count > 2000:
+                threshold = 15
+            elif games_count > 1500:
+                threshold = 10
+            elif games_count > 1000:
+                threshold = 5
+            elif games_count > 500:
+                threshold = 3
+            else:
+                threshold = 1
+
+        if default_case:
+            # Fast path: indexed queries against the cached fields.
+            boards = (
+                _default_player_board(threshold, leaderboard_places, ['-cached_winrate', '-cached_plays']),
+                _default_player_board(threshold, leaderboard_places, ['-cached_tourney_points', '-cached_winrate']),
+                _default_faction_board(threshold, leaderboard_places, ['-cached_winrate', '-cached_plays']),
+                _default_faction_board(threshold, leaderboard_places, ['-cached_tourney_points', '-cached_winrate']),
+            )
         else:
-            leaderboard_threshold = 1
+            # Official / date-range requests (and the non-weird official-only
+            # audience) are summed from the pre-aggregated LeaderboardBucket table. None
+            # means a filter it can't express (factions, players, map...) is active.
+            boards = bucket_leaderboards(
+                request.GET,
+                official_only=official_only,
+                threshold=threshold,
+                limit=leaderboard_places,
+            )
+            if boards is None:
+                # Live path: filtered/logged-in requests aggregate over the scoped efforts.
+                efforts = Effort.objects.filter(game__in=filterset.qs)
+                boards = (
+                    Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts,
+                                        game_threshold=threshold, as_json=False),
+                    Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True,
+                                        game_threshold=threshold, as_json=False),
+                    Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts,
+                                        game_threshold=threshold, as_json=False),
+                    Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True,
+                                        game_threshold=threshold, as_json=False),
+                )
+        return {'games_count': games_count, 'threshold': threshold, 'boards': tuple(boards)}
 
     if default_case:
-        # Fast path: indexed queries against the cached fields.
-        top_players = _default_player_board(
-            leaderboard_threshold, leaderboard_places, ['-cached_winrate', '-cached_plays'])
-        most_players = _default_player_board(
-            leaderboard_threshold, leaderboard_places, ['-cached_tourney_points', '-cached_winrate'])
-        top_factions = _default_faction_board(
-            leaderboard_threshold, leaderboard_places, ['-cached_winrate', '-cached_plays'])
-        most_factions = _default_faction_board(
-            leaderboard_threshold, leaderboard_places, ['-cached_tourney_points', '-cached_winrate'])
+        # The cached fields are refreshed by the winrate queue, which doesn't bump the
+        # stats generation; they're cheap to read anyway.
+        result = build_boards()
     else:
-        # Live path: filtered/logged-in requests aggregate over the scoped efforts.
-        efforts = Effort.objects.filter(game__in=games)
-        top_players = Profile.leaderboard(
-            limit=leaderboard_places,
-            effort_qs=efforts,
-            game_threshold=leaderboard_threshold,
-            as_json=False)
-        most_players = Profile.leaderboard(
-            limit=leaderboard_places,
-            effort_qs=efforts,
-            top_quantity=True,
-            game_threshold=leaderboard_threshold,
-            as_json=False)
-        top_factions = Faction.leaderboard(
-            limit=leaderboard_places,
-            effort_qs=efforts,
-            game_threshold=leaderboard_threshold,
-            as_json=False)
-        most_factions = Faction.leaderboard(
-            limit=leaderboard_places,
-            effort_qs=efforts,
-            top_quantity=True,
-            game_threshold=leaderboard_threshold,
-            as_json=False)
+        # Filtered boards are shared by every request with the same filters and audience.
+        result = cached_by_filters('global', 'official' if official_only else 'all',
+                                    request.GET, build_boards)
+    games_count = result['games_count']
+    leaderboard_threshold = result['threshold']
+    top_players, most_players, top_factions, most_factions = result['boards']
 
     # Leaderboard data
     context.update({
@@ -371,27 +381,8 @@ def player_game_list_view(request, slug=None):
     filterset = PlayerGameFilter(request.GET, queryset=queryset, player=player)
     filtered_qs = filterset.qs
 
-    paginator = Paginator(filtered_qs, settings.PAGE_SIZE)
-    page_number = request.GET.get('page')
-
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
-
-    games_count = paginator.count
-    efforts = Effort.objects.filter(game__in=filtered_qs)
-
-    if games_count > 100:
-        leaderboard_threshold = 10
-    elif games_count > 50:
-        leaderboard_threshold = 5
-    elif games_count > 20:
-        leaderboard_threshold = 3
-    elif games_count > 10:
-        leaderboard_threshold = 2
-    else:
-        leaderboard_threshold = 1
+    page_obj = game_page(request, filtered_qs)
+    is_htmx = getattr(request, 'htmx', False)
 
     # Theme
     theme = get_theme(request)
@@ -401,24 +392,45 @@ def player_game_list_view(request, slug=None):
 
     context = {
         'games': page_obj,
-        'is_paginated': paginator.num_pages > 1,
+        'is_paginated': page_obj.has_other_pages(),
         'page_obj': page_obj,
-        'games_count': games_count,
         'form': filterset.form,
         'filterset': filterset,
-        'leaderboard_threshold': leaderboard_threshold,
         'player_view': True,
         'player_slug': slug,
-        'top_players': Profile.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
-        'most_players': Profile.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
-        'top_factions': Faction.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
-        'most_factions': Faction.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
         'background_image': background_image,
         'foreground_images': foreground_images,
         'background_pattern': background_pattern,
         'page_artists': theme_artists,
     }
 
+    # Count and leaderboards go with the first page only; appended pages are just cards.
+    if page_obj.number == 1 or not is_htmx:
+        official_only = request.user.is_authenticated and not request.user.profile.weird
+        games_count = game_count(f'player:{slug or ""}', 'official' if official_only else 'all',
+                                 request.GET, filtered_qs)
+        efforts = Effort.objects.filter(game__in=filtered_qs)
+
+        if games_count > 100:
+            leaderboard_threshold = 10
+        elif games_count > 50:
+            leaderboard_threshold = 5
+        elif games_count > 20:
+            leaderboard_threshold = 3
+        elif games_count > 10:
+            leaderboard_threshold = 2
+        else:
+            leaderboard_threshold = 1
+
+        context.update({
+            'games_count': games_count,
+            'leaderboard_threshold': leaderboard_threshold,
+            'top_players': Profile.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
+            'most_players': Profile.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
+            'top_factions': Faction.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
+            'most_factions': Faction.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
+        })
+
 
     if player:
         context['player'] = player
@@ -446,29 +458,10 @@ def my_submitted_games_view(request):
     ).distinct()
 
     filterset = GameFilter(request.GET, queryset=queryset, user=request.user)
-    filtered_qs = filterset.qs.order_by('-date_posted')
-
-    paginator = Paginator(filtered_qs, settings.PAGE_SIZE)
-    page_number = request.GET.get('page')
-
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    filtered_qs = filterset.qs
 
-    games_count = paginator.count
-    efforts = Effort.objects.filter(game__in=filtered_qs)
-
-    if games_count > 100:
-        leaderboard_threshold = 10
-    elif games_count > 50:
-        leaderboard_threshold = 5
-    elif games_count > 20:
-        leaderboard_threshold = 3
-    elif games_count > 10:
-        leaderboard_threshold = 2
-    else:
-        leaderboard_threshold = 1
+    page_obj = game_page(request, filtered_qs)
+    is_htmx = getattr(request, 'htmx', False)
 
     # Theme
     theme = get_theme(request)
@@ -478,25 +471,44 @@ def my_submitted_games_view(request):
 
     context = {
         'games': page_obj,
-        'is_paginated': paginator.num_pages > 1,
+        'is_paginated': page_obj.has_other_pages(),
         'page_obj': page_obj,
-        'games_count': games_count,
         'form': filterset.form,
         'filterset': filterset,
-        'leaderboard_threshold': leaderboard_threshold,
         'player_view': False,
         'submitted_view': True,
         'player': player,
-        'top_players': Profile.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
-        'most_players': Profile.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
-        'top_factions': Faction.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
-        'most_factions': Faction.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
         'background_image': background_image,
         'foreground_images': foreground_images,
         'background_pattern': background_pattern,
         'page_artists': theme_artists,
     }
 
+    # Count and leaderboards go with the first page only; appended pages are just cards.
+    if page_obj.number == 1 or not is_htmx:
+        games_count = game_count(f'recorder:{player.pk}', 'all', request.GET, filtered_qs)
+        efforts = Effort.objects.filter(game__in=filtered_qs)
+
+        if games_count > 100:
+            leaderboard_threshold = 10
+        elif games_count > 50:
+            leaderboard_threshold = 5
+        elif games_count > 20:
+            leaderboard_threshold = 3
+        elif games_count > 10:
+            leaderboard_threshold = 2
+        else:
+            leaderboard_threshold = 1
+
+        context.update({
+            'games_count': games_count,
+            'leaderboard_threshold': leaderboard_threshold,
+            'top_players': Profile.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
+            'most_players': Profile.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
+            'top_factions': Faction.leaderboard(limit=10, effort_qs=efforts, game_threshold=leaderboard_threshold),
+            'most_factions': Faction.leaderboard(limit=10, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold),
+        })
+
     template_name = 'the_warroom/partials/game_list_home.html' if getattr(request, 'htmx', False) else 'the_warroom/my_submitted_games.html'
 
     response = render(request, template_name, context)
@@ -2633,14 +2645,29 @@ def tournament_leaderboard_page(request, slug):
     except (TypeError, ValueError):
         leaderboard_places = tournament.leaderboard_positions
 
-    efforts = Effort.objects.filter(game__in=filtered_games)
-
     faction_link = lambda f: reverse('tournament-component-leaderboard', kwargs={'tournament_slug': tournament.slug, 'post_slug': f.slug})
     player_link = lambda p: reverse('tournament-player-leaderboard', kwargs={'tournament_slug': tournament.slug, 'profile_slug': p.slug})
-    top_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    most_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    top_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
-    most_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
+
+    def build_boards():
+        # Unfiltered pages rank the pre-built TournamentLeaderboardSnapshot rows; filtered
+        # requests (or a tournament not snapshotted yet) aggregate the counted efforts live.
+        boards = snapshot_leaderboards(tournament, request.GET, leaderboard_threshold, leaderboard_places, player_link, faction_link)
+        if boards is None:
+            efforts = Effort.objects.filter(game__in=filtered_games)
+            boards = (
+                Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link),
+                Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link),
+                Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link),
+                Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link),
+            )
+        return {'games_count': filtered_games.count(), 'boards': tuple(boards)}
+
+    # The tournament's default threshold/positions are part of the key, so editing
+    # them doesn't serve boards built with the old defaults.
+    params = request.GET.copy()
+    params['threshold'], params['limit'] = str(leaderboard_threshold), str(leaderboard_places)
+    result = cached_by_filters(f'tournament:{tournament.pk}', 'all', params, build_boards)
+    top_players, most_players, top_factions, most_factions = result['boards']
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/leaderboard_list_home.html'
@@ -2660,7 +2687,7 @@ def tournament_leaderboard_page(request, slug):
         'has_most_factions': bool(most_factions),
         'leaderboard_threshold': leaderboard_threshold,
         'leaderboard_places': leaderboard_places,
-        'games_count': filtered_games.count(),
+        'games_count': result['games_count'],
         'form': filterset.form,
         'filterset': filterset,
     })
@@ -2684,24 +2711,24 @@ def tournament_games_page(request, slug):
     filterset = TournamentGameFilter(request.GET, queryset=games_qs, tournament=tournament)
     games = filterset.qs
 
-    paginator = Paginator(games, settings.PAGE_SIZE)
-    page_number = request.GET.get('page')
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    page_obj = game_page(request, games)
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/tournament_game_list.html'
     else:
         template_name = 'the_warroom/tournament_games.html'
 
+    # The count is only rendered with the first page (or a full page load).
+    games_count = None
+    if page_obj.number == 1 or template_name != 'the_warroom/partials/tournament_game_list.html':
+        games_count = game_count(f'tournament:{tournament.pk}', 'all', request.GET, games)
+
     context = _tournament_base_context(request, tournament)
     context.update({
         'active_page': 'games',
         'games': page_obj,
         'page_obj': page_obj,
-        'games_count': paginator.count,
+        'games_count': games_count,
         'form': filterset.form,
         'filterset': filterset,
         'pagination_url': reverse('tournament-games-page', args=[tournament.slug]),
@@ -5398,14 +5425,19 @@ def stage_leaderboard_page(request, tournament_slug, stage_slug):
     except (TypeError, ValueError):
         leaderboard_places = stage.get_leaderboard_positions()
 
-    efforts = Effort.objects.filter(game__in=filtered_games)
-
     faction_link = lambda f: reverse('stage-component-leaderboard', kwargs={'tournament_slug': tournament.slug, 'stage_slug': stage.slug, 'post_slug': f.slug})
     player_link = lambda p: reverse('stage-player-leaderboard', kwargs={'tournament_slug': tournament.slug, 'stage_slug': stage.slug, 'profile_slug': p.slug})
-    top_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    most_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    top_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
-    most_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
+    # Unfiltered pages rank the pre-built TournamentLeaderboardSnapshot rows; filtered
+    # requests (or a stage not snapshotted yet) aggregate the counted efforts live.
+    boards = snapshot_leaderboards(stage, request.GET, leaderboard_threshold, leaderboard_places, player_link, faction_link)
+    if boards is not None:
+        top_players, most_players, top_factions, most_factions = boards
+    else:
+        efforts = Effort.objects.filter(game__in=filtered_games)
+        top_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
+        most_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
+        top_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
+        most_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/leaderboard_list_home.html'
@@ -5450,24 +5482,24 @@ def stage_games_page(request, tournament_slug, stage_slug):
     filterset = TournamentGameFilter(request.GET, queryset=games_qs, stage=stage)
     games = filterset.qs
 
-    paginator = Paginator(games, settings.PAGE_SIZE)
-    page_number = request.GET.get('page')
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    page_obj = game_page(request, games)
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/tournament_game_list.html'
     else:
         template_name = 'the_warroom/stage_games.html'
 
+    # The count is only rendered with the first page (or a full page load).
+    games_count = None
+    if page_obj.number == 1 or template_name != 'the_warroom/partials/tournament_game_list.html':
+        games_count = game_count(f'stage:{stage.pk}', 'all', request.GET, games)
+
     context = _stage_base_context(request, tournament, stage)
     context.update({
         'active_page': 'games',
         'games': page_obj,
         'page_obj': page_obj,
-        'games_count': paginator.count,
+        'games_count': games_count,
         'form': filterset.form,
         'filterset': filterset,
         'pagination_url': reverse('stage-games-page', args=[tournament.slug, stage.slug]),
@@ -5824,14 +5856,19 @@ def round_leaderboard_page(request, tournament_slug, round_slug, stage_slug=None
     except (TypeError, ValueError):
         leaderboard_places = round.get_leaderboard_positions()
 
-    efforts = Effort.objects.filter(game__in=filtered_games)
-
     faction_link = lambda f: reverse('round-component-leaderboard', kwargs={'tournament_slug': tournament.slug, 'stage_slug': stage.slug, 'round_slug': round.slug, 'post_slug': f.slug})
     player_link = lambda p: reverse('round-player-leaderboard', kwargs={'tournament_slug': tournament.slug, 'stage_slug': stage.slug, 'round_slug': round.slug, 'profile_slug': p.slug})
-    top_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    most_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
-    top_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
-    most_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
+    # Unfiltered pages rank the pre-built TournamentLeaderboardSnapshot rows; filtered
+    # requests (or a round not snapshotted yet) aggregate the counted efforts live.
+    boards = snapshot_leaderboards(round, request.GET, leaderboard_threshold, leaderboard_places, player_link, faction_link)
+    if boards is not None:
+        top_players, most_players, top_factions, most_factions = boards
+    else:
+        efforts = Effort.objects.filter(game__in=filtered_games)
+        top_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
+        most_players = Profile.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=player_link)
+        top_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
+        most_factions = Faction.leaderboard(limit=leaderboard_places, effort_qs=efforts, top_quantity=True, game_threshold=leaderboard_threshold, as_json=False, link_builder=faction_link)
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/leaderboard_list_home.html'
@@ -5886,24 +5923,24 @@ def round_games_page(request, tournament_slug, round_slug, stage_slug=None):
     filterset = TournamentGameFilter(request.GET, queryset=games_qs, round=round)
     games = filterset.qs
 
-    paginator = Paginator(games, settings.PAGE_SIZE)
-    page_number = request.GET.get('page')
-    try:
-        page_obj = paginator.get_page(page_number)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
+    page_obj = game_page(request, games)
 
     if hasattr(request, 'htmx') and request.htmx:
         template_name = 'the_warroom/partials/tournament_game_list.html'
     else:
         template_name = 'the_warroom/round_games.html'
 
+    # The count is only rendered with the first page (or a full page load).
+    games_count = None
+    if page_obj.number == 1 or template_name != 'the_warroom/partials/tournament_game_list.html':
+        games_count = game_count(f'round:{round.pk}', 'all', request.GET, games)
+
     context = _round_base_context(request, tournament, stage, round)
     context.update({
         'active_page': 'games',
         'games': page_obj,
         'page_obj': page_obj,
-        'games_count': paginator.count,
+        'games_count': games_count,
         'form': filterset.form,
         'filterset': filterset,
         'pagination_url': reverse('round-games-page', args=[tournament.slug, stage.slug, round.slug]),